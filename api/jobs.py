@@ -0,0 +1,580 @@
+"""
+Ingestion Job Manager
+=====================
+Postgres-backed ingestion jobs for the RAG API Service.
+
+- Jobs are persisted in the ingestion_jobs table (sql/ingestion-jobs-schema.sql)
+- Each job runs in a separate worker process (multiprocessing "spawn"), so Docling
+  conversion and embedding never run on the API's event loop or its connection pool
+- Admission: at most INGEST_MAX_CONCURRENT_JOBS active jobs, one per documents
+  folder; a clean_before_ingest job needs exclusive access
+- Progress (files, chunks, tokens, ETA) is written by the worker after each file
+- Cancellation is cooperative and checked between files
+- Failed or cancelled jobs can be resumed; files already processed are skipped
+- Workers heartbeat; running jobs without a heartbeat are marked failed
+- Workers only write to a job they own (running, their worker_pid); a worker whose
+  job was expired or resumed elsewhere stops at its next write
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import uuid
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from utils.db_utils import close_database, db_pool, initialize_database
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_JOBS = int(os.getenv("INGEST_MAX_CONCURRENT_JOBS", "1"))
+HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("INGEST_HEARTBEAT_INTERVAL", "15"))
+STALE_AFTER_SECONDS = int(os.getenv("INGEST_JOB_STALE_SECONDS", "120"))
+
+RESUMABLE_STATUSES = ("failed", "cancelled")
+
+# Serializes admission checks across API replicas (arbitrary constant key)
+_ADMISSION_LOCK_KEY = 7_311_029
+
+
+class JobError(Exception):
+    """Base class for ingestion job errors."""
+
+
+class JobNotFoundError(JobError):
+    """Raised when a job does not exist."""
+
+
+class JobConflictError(JobError):
+    """Raised when a job conflicts with an active job (folder lock, clean exclusivity)."""
+
+
+class JobLimitError(JobError):
+    """Raised when the concurrent job limit is reached."""
+
+
+class JobStateError(JobError):
+    """Raised when an operation is not valid for the job's current status."""
+
+
+class JobLostError(JobError):
+    """Raised in a worker whose job is no longer running under its pid."""
+
+
+def normalize_folder(folder: str) -> str:
+    """Normalize a documents folder so that 'documents' and 'documents/' share a lock."""
+    return os.path.normpath(folder)
+
+
+def check_admission(
+    active_jobs: List[Dict[str, Any]],
+    documents_folder: str,
+    clean_before_ingest: bool,
+    max_jobs: int = MAX_CONCURRENT_JOBS,
+) -> None:
+    """
+    Check whether a new job may start alongside the currently active jobs.
+
+    Args:
+        active_jobs: Active jobs (dicts with documents_folder, clean_before_ingest)
+        documents_folder: Normalized folder of the new job
+        clean_before_ingest: Whether the new job wipes the knowledge base first
+        max_jobs: Maximum concurrent active jobs
+
+    Raises:
+        JobConflictError: If the folder is locked or a clean job is involved
+        JobLimitError: If the concurrency limit is reached
+    """
+    for job in active_jobs:
+        if job["documents_folder"] == documents_folder:
+            raise JobConflictError(
+                f"An ingestion job is already active for '{documents_folder}' (task {job['id']})"
+            )
+        if job["clean_before_ingest"]:
+            raise JobConflictError(
+                f"A clean ingestion (task {job['id']}) is running and requires exclusive access"
+            )
+
+    if clean_before_ingest and active_jobs:
+        raise JobConflictError("A clean ingestion requires exclusive access; other jobs are active")
+
+    if len(active_jobs) >= max_jobs:
+        raise JobLimitError(f"Concurrent ingestion job limit reached ({max_jobs})")
+
+
+def job_to_status(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the public status view of a job row, including progress and ETA.
+
+    ETA is estimated from the average processing time of the files done so far.
+    """
+    files_total = row.get("files_total") or 0
+    files_done = row.get("files_done") or 0
+    processing_ms = row.get("processing_ms") or 0
+
+    progress_pct = round(files_done / files_total * 100, 1) if files_total else 0.0
+
+    eta_seconds = None
+    if row["status"] == "running" and files_done and files_total > files_done:
+        avg_ms = processing_ms / files_done
+        eta_seconds = round(avg_ms * (files_total - files_done) / 1000, 1)
+
+    return {
+        "task_id": str(row["id"]),
+        "status": row["status"],
+        "documents_folder": row["documents_folder"],
+        "clean_before_ingest": row["clean_before_ingest"],
+        "fast_mode": row["fast_mode"],
+        "files_total": files_total,
+        "files_done": files_done,
+        "files_failed": row.get("files_failed") or 0,
+        "chunks_created": row.get("chunks_created") or 0,
+        "tokens_processed": row.get("tokens_processed") or 0,
+        "progress_pct": progress_pct,
+        "eta_seconds": eta_seconds,
+        "cancel_requested": row.get("cancel_requested", False),
+        "error": row.get("error"),
+        "created_at": row.get("created_at"),
+        "started_at": row.get("started_at"),
+        "finished_at": row.get("finished_at"),
+    }
+
+
+def _parse_job_id(job_id: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(str(job_id))
+    except ValueError:
+        raise JobNotFoundError(f"Ingestion job {job_id} not found")
+
+
+async def _expire_stale_jobs(conn) -> int:
+    """
+    Mark active jobs whose worker stopped heartbeating as failed.
+
+    A worker that is still alive loses ownership and stops at its next write.
+    """
+    rows = await conn.fetch(
+        """
+        UPDATE ingestion_jobs
+        SET status = 'failed',
+            error = 'Worker lost (no heartbeat)',
+            finished_at = NOW(),
+            updated_at = NOW()
+        WHERE status IN ('queued', 'running')
+          AND COALESCE(heartbeat_at, updated_at) < NOW() - make_interval(secs => $1)
+        RETURNING id
+        """,
+        STALE_AFTER_SECONDS,
+    )
+    for row in rows:
+        logger.warning(f"Ingestion job {row['id']} marked failed: worker lost")
+    return len(rows)
+
+
+async def _admit(conn, documents_folder: str, clean_before_ingest: bool, exclude_id=None) -> None:
+    """Run admission checks inside a transaction holding the admission lock."""
+    await conn.execute("SELECT pg_advisory_xact_lock($1)", _ADMISSION_LOCK_KEY)
+    await _expire_stale_jobs(conn)
+
+    active = await conn.fetch(
+        """
+        SELECT id, documents_folder, clean_before_ingest
+        FROM ingestion_jobs
+        WHERE status IN ('queued', 'running') AND id IS DISTINCT FROM $1
+        """,
+        exclude_id,
+    )
+    check_admission([dict(r) for r in active], documents_folder, clean_before_ingest)
+
+
+async def create_job(
+    documents_folder: str, clean_before_ingest: bool = False, fast_mode: bool = False
+) -> Dict[str, Any]:
+    """
+    Create a queued ingestion job and start its worker process.
+
+    Raises:
+        JobConflictError: Folder lock or clean exclusivity violated
+        JobLimitError: Concurrent job limit reached
+    """
+    folder = normalize_folder(documents_folder)
+
+    try:
+        async with db_pool.acquire() as conn:
+            async with conn.transaction():
+                await _admit(conn, folder, clean_before_ingest)
+                row = await conn.fetchrow(
+                    """
+                    INSERT INTO ingestion_jobs (documents_folder, clean_before_ingest, fast_mode)
+                    VALUES ($1, $2, $3)
+                    RETURNING *
+                    """,
+                    folder,
+                    clean_before_ingest,
+                    fast_mode,
+                )
+    except asyncpg.UniqueViolationError:
+        # Backstop for the partial unique index (per-folder lock)
+        raise JobConflictError(f"An ingestion job is already active for '{folder}'")
+
+    job = dict(row)
+    await _start_worker(job["id"])
+    logger.info(f"Ingestion job {job['id']} queued for '{folder}'")
+    return job_to_status(job)
+
+
+async def get_job(job_id: str) -> Dict[str, Any]:
+    """
+    Get job status.
+
+    Raises:
+        JobNotFoundError: If the job does not exist
+    """
+    job_uuid = _parse_job_id(job_id)
+    async with db_pool.acquire() as conn:
+        row = await conn.fetchrow("SELECT * FROM ingestion_jobs WHERE id = $1", job_uuid)
+
+    if row is None:
+        raise JobNotFoundError(f"Ingestion job {job_id} not found")
+    return job_to_status(dict(row))
+
+
+async def cancel_job(job_id: str) -> Dict[str, Any]:
+    """
+    Request cancellation. Queued jobs are cancelled immediately; running jobs stop
+    before their next file.
+
+    Raises:
+        JobNotFoundError: If the job does not exist
+        JobStateError: If the job already finished
+    """
+    job_uuid = _parse_job_id(job_id)
+    async with db_pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            UPDATE ingestion_jobs
+            SET cancel_requested = TRUE,
+                status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+                finished_at = CASE WHEN status = 'queued' THEN NOW() ELSE finished_at END,
+                updated_at = NOW()
+            WHERE id = $1 AND status IN ('queued', 'running')
+            RETURNING *
+            """,
+            job_uuid,
+        )
+        if row is None:
+            existing = await conn.fetchrow(
+                "SELECT status FROM ingestion_jobs WHERE id = $1", job_uuid
+            )
+
+    if row is None:
+        if existing is None:
+            raise JobNotFoundError(f"Ingestion job {job_id} not found")
+        raise JobStateError(f"Ingestion job {job_id} is already {existing['status']}")
+
+    logger.info(f"Cancellation requested for ingestion job {job_id}")
+    return job_to_status(dict(row))
+
+
+async def resume_job(job_id: str) -> Dict[str, Any]:
+    """
+    Resume a failed or cancelled job. Files already processed are skipped.
+
+    Raises:
+        JobNotFoundError: If the job does not exist
+        JobStateError: If the job is not failed or cancelled
+        JobConflictError / JobLimitError: If admission fails
+    """
+    job_uuid = _parse_job_id(job_id)
+    try:
+        row = await _requeue_job(job_uuid)
+    except asyncpg.UniqueViolationError:
+        raise JobConflictError("Another ingestion job is already active for this folder")
+
+    await _start_worker(job_uuid)
+    logger.info(f"Ingestion job {job_id} resumed")
+    return job_to_status(row)
+
+
+async def _requeue_job(job_uuid: uuid.UUID) -> Dict[str, Any]:
+    async with db_pool.acquire() as conn:
+        async with conn.transaction():
+            current = await conn.fetchrow(
+                "SELECT * FROM ingestion_jobs WHERE id = $1 FOR UPDATE", job_uuid
+            )
+            if current is None:
+                raise JobNotFoundError(f"Ingestion job {job_uuid} not found")
+            if current["status"] not in RESUMABLE_STATUSES:
+                raise JobStateError(
+                    f"Only failed or cancelled jobs can be resumed (job is {current['status']})"
+                )
+
+            await _admit(
+                conn,
+                current["documents_folder"],
+                current["clean_before_ingest"],
+                exclude_id=job_uuid,
+            )
+            row = await conn.fetchrow(
+                """
+                UPDATE ingestion_jobs
+                SET status = 'queued', cancel_requested = FALSE, error = NULL,
+                    finished_at = NULL, heartbeat_at = NULL, updated_at = NOW()
+                WHERE id = $1
+                RETURNING *
+                """,
+                job_uuid,
+            )
+    return dict(row)
+
+
+async def recover_stale_jobs() -> int:
+    """Mark jobs orphaned by a crashed worker or API restart as failed (resumable)."""
+    async with db_pool.acquire() as conn:
+        return await _expire_stale_jobs(conn)
+
+
+async def _start_worker(job_id: uuid.UUID) -> None:
+    """Spawn the worker process for a job; mark the job failed if spawning fails."""
+    # Reap finished workers so they do not linger as zombies
+    multiprocessing.active_children()
+
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        process = ctx.Process(
+            target=run_job_process, args=(str(job_id),), name=f"ingest-{job_id}", daemon=False
+        )
+        process.start()
+        logger.info(f"Started ingestion worker pid={process.pid} for job {job_id}")
+    except Exception as e:
+        logger.error(f"Failed to start ingestion worker for job {job_id}: {e}")
+        async with db_pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE ingestion_jobs
+                SET status = 'failed', error = $2, finished_at = NOW(), updated_at = NOW()
+                WHERE id = $1
+                """,
+                job_id,
+                f"Failed to start worker: {e}",
+            )
+        raise
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+
+def run_job_process(job_id: str) -> None:
+    """Entry point of the worker process."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(run_job(job_id))
+
+
+def _create_pipeline(job: Dict[str, Any]):
+    """Create the ingestion pipeline for a job (imported lazily: Docling is heavy)."""
+    from ingestion.ingest import DocumentIngestionPipeline
+    from utils.models import IngestionConfig
+
+    return DocumentIngestionPipeline(
+        config=IngestionConfig(),
+        documents_folder=job["documents_folder"],
+        clean_before_ingest=False,  # handled by run_job so resumes do not wipe again
+        fast_mode=job["fast_mode"],
+    )
+
+
+async def _claim_job(job_uuid: uuid.UUID) -> Optional[Dict[str, Any]]:
+    async with db_pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            UPDATE ingestion_jobs
+            SET status = 'running', worker_pid = $2, started_at = COALESCE(started_at, NOW()),
+                heartbeat_at = NOW(), updated_at = NOW()
+            WHERE id = $1 AND status = 'queued'
+            RETURNING *
+            """,
+            job_uuid,
+            os.getpid(),
+        )
+    return dict(row) if row else None
+
+
+def _check_owned(result: str, job_uuid: uuid.UUID) -> None:
+    """
+    Check the status of a worker's guarded UPDATE on its job.
+
+    Raises:
+        JobLostError: If no row was updated (job expired, cancelled-and-resumed, or
+            claimed by another worker)
+    """
+    if result == "UPDATE 0":
+        raise JobLostError(f"Ingestion job {job_uuid} is no longer running in this worker")
+
+
+async def _heartbeat(job_uuid: uuid.UUID, worker: asyncio.Task) -> None:
+    """Heartbeat until the job is lost, then cancel the worker task."""
+    while True:
+        await asyncio.sleep(HEARTBEAT_INTERVAL_SECONDS)
+        try:
+            async with db_pool.acquire() as conn:
+                result = await conn.execute(
+                    """
+                    UPDATE ingestion_jobs SET heartbeat_at = NOW()
+                    WHERE id = $1 AND status = 'running' AND worker_pid = $2
+                    """,
+                    job_uuid,
+                    os.getpid(),
+                )
+            _check_owned(result, job_uuid)
+        except JobLostError as e:
+            logger.error(f"{e}; stopping")
+            worker.cancel()
+            return
+        except Exception as e:
+            logger.warning(f"Heartbeat failed for job {job_uuid}: {e}")
+
+
+async def _set_files_total(job_uuid: uuid.UUID, files_total: int) -> None:
+    async with db_pool.acquire() as conn:
+        result = await conn.execute(
+            """
+            UPDATE ingestion_jobs SET files_total = $2, updated_at = NOW()
+            WHERE id = $1 AND status = 'running' AND worker_pid = $3
+            """,
+            job_uuid,
+            files_total,
+            os.getpid(),
+        )
+    _check_owned(result, job_uuid)
+
+
+async def _is_cancel_requested(job_uuid: uuid.UUID) -> bool:
+    async with db_pool.acquire() as conn:
+        return bool(
+            await conn.fetchval(
+                "SELECT cancel_requested FROM ingestion_jobs WHERE id = $1", job_uuid
+            )
+        )
+
+
+async def _record_file(job_uuid: uuid.UUID, file_path: str, result) -> None:
+    """Record one processed file: counters, cumulative processing time, resume marker."""
+    async with db_pool.acquire() as conn:
+        update = await conn.execute(
+            """
+            UPDATE ingestion_jobs
+            SET files_done = files_done + 1,
+                files_failed = files_failed + $3,
+                chunks_created = chunks_created + $4,
+                tokens_processed = tokens_processed + $5,
+                processing_ms = processing_ms + $6,
+                processed_files = array_append(processed_files, $2),
+                heartbeat_at = NOW(),
+                updated_at = NOW()
+            WHERE id = $1 AND status = 'running' AND worker_pid = $7
+            """,
+            job_uuid,
+            file_path,
+            1 if result.errors else 0,
+            result.chunks_created,
+            result.tokens_processed,
+            int(result.processing_time_ms),
+            os.getpid(),
+        )
+    _check_owned(update, job_uuid)
+
+
+async def _finish_job(job_uuid: uuid.UUID, status: str, error: Optional[str] = None) -> None:
+    async with db_pool.acquire() as conn:
+        result = await conn.execute(
+            """
+            UPDATE ingestion_jobs
+            SET status = $2, error = $3, finished_at = NOW(), updated_at = NOW()
+            WHERE id = $1 AND status = 'running' AND worker_pid = $4
+            """,
+            job_uuid,
+            status,
+            error,
+            os.getpid(),
+        )
+    _check_owned(result, job_uuid)
+
+
+async def run_job(job_id: str) -> str:
+    """
+    Execute a job: claim it, ingest remaining files, record progress after each file.
+
+    Returns:
+        Final job status ("completed", "cancelled", "failed"), "skipped" if the
+        job was no longer queued, or "lost" if the job stopped being this worker's
+        (expired as stale, then possibly resumed by another worker)
+    """
+    job_uuid = uuid.UUID(job_id)
+    await initialize_database()
+
+    heartbeat_task = None
+    pipeline = None
+    try:
+        job = await _claim_job(job_uuid)
+        if job is None:
+            logger.info(f"Ingestion job {job_id} is not queued; nothing to do")
+            return "skipped"
+
+        heartbeat_task = asyncio.create_task(_heartbeat(job_uuid, asyncio.current_task()))
+
+        pipeline = _create_pipeline(job)
+        await pipeline.initialize()
+
+        processed = set(job.get("processed_files") or [])
+        if job["clean_before_ingest"] and not processed:
+            await pipeline._clean_databases()
+
+        files = pipeline.find_document_files()
+        await _set_files_total(job_uuid, len(files))
+        remaining = [f for f in files if f not in processed]
+        logger.info(f"Ingestion job {job_id}: {len(remaining)} of {len(files)} files to process")
+
+        for file_path in remaining:
+            if await _is_cancel_requested(job_uuid):
+                await _finish_job(job_uuid, "cancelled")
+                logger.info(f"Ingestion job {job_id} cancelled")
+                return "cancelled"
+
+            result = await pipeline.ingest_file(file_path)
+            await _record_file(job_uuid, file_path, result)
+
+        await _finish_job(job_uuid, "completed")
+        logger.info(f"Ingestion job {job_id} completed")
+        return "completed"
+
+    except JobLostError as e:
+        logger.error(f"{e}; stopping")
+        return "lost"
+
+    except asyncio.CancelledError:
+        # Cancelled by the heartbeat (returns once the job is lost): stop quietly
+        if heartbeat_task is None or not heartbeat_task.done() or heartbeat_task.cancelled():
+            raise
+        return "lost"
+
+    except Exception as e:
+        logger.error(f"Ingestion job {job_id} failed: {e}")
+        try:
+            await _finish_job(job_uuid, "failed", str(e))
+        except JobLostError as lost:
+            logger.error(f"{lost}; failure not recorded")
+            return "lost"
+        return "failed"
+
+    finally:
+        if heartbeat_task is not None:
+            heartbeat_task.cancel()
+        if pipeline is not None:
+            await pipeline.close()
+        await close_database()
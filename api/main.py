@@ -2,18 +2,48 @@ import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
 
-from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.models import IngestRequest, IngestResponse, SearchRequest, SearchResponse, SearchResult
+from api import jobs
+from api.models import (
+    DocumentBatchRequest,
+    IngestJobStatus,
+    IngestRequest,
+    IngestResponse,
+    SearchRequest,
+    SearchResponse,
+    SearchResult,
+)
+from core.admission import AdmissionRejectedError, get_admission_controller
 from core.rag_service import (
+    SearchTimeoutError,
     close_global_embedder,
     initialize_global_embedder,
     search_knowledge_base_structured,
 )
-from ingestion.ingest import DocumentIngestionPipeline, IngestionConfig
-from utils.db_utils import close_database, get_document, initialize_database, list_documents
+from core.warmup import get_warmup_status, is_warming
+from docling_mcp.metrics import generate_metrics_output, get_metrics_content_type
+from utils.db_utils import (
+    close_database,
+    close_health_connection,
+    encode_document_cursor,
+    get_chunk_neighbors,
+    get_document,
+    get_document_chunks,
+    get_document_text_range,
+    get_documents_by_ids,
+    get_knowledge_base_stats,
+    initialize_database,
+    list_documents,
+    list_documents_page,
+)
+from utils.embedding_spaces import EmbeddingSpaceError
+from utils.health_monitor import HealthMonitor, is_ready
+from utils.metadata_filter import MetadataFilterError
+from utils.tracing import traced
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +65,16 @@ async def lifespan(app: FastAPI):
         asyncio.create_task(initialize_global_embedder())
         logger.info("✓ Embedder initialization started")
 
+        # Jobs left running by a previous API process lost their worker
+        try:
+            recovered = await jobs.recover_stale_jobs()
+            if recovered:
+                logger.info(f"✓ Marked {recovered} orphaned ingestion jobs as failed")
+        except Exception as e:
+            logger.warning(f"Ingestion job recovery skipped: {e}")
+
+        health_monitor.start()
+
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}")
         raise
@@ -43,6 +83,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("🔄 Shutting down RAG API Service...")
+    await health_monitor.stop()
+    await close_health_connection()
     await close_global_embedder()
     await close_database()
     logger.info("✓ Resources cleaned up")
@@ -65,22 +107,8 @@ app.add_middleware(
 )
 
 
-@app.get("/health")
-async def health_check():
-    """
-    Health check endpoint.
-
-    Returns JSON response with:
-    - status: "ok" | "down"
-    - timestamp: Unix timestamp of the check
-    - services: Status of database
-
-    HTTP Status Codes:
-    - 200: Service healthy
-    - 503: Service unavailable (database down)
-    """
-    from fastapi.responses import JSONResponse
-
+async def _check_health() -> Dict[str, Any]:
+    """Dependency check run by the health monitor (database, search warm-up)."""
     timestamp = time.time()
     db_status = "up"
     db_message = "PostgreSQL connection successful"
@@ -96,32 +124,117 @@ async def health_check():
         db_status = "down"
         db_message = f"Database connection error: {str(e)}"
 
-    overall_status = "ok" if db_status == "up" else "down"
-    http_status = 200 if overall_status == "ok" else 503
+    warming = is_warming()
+    overall_status = "ok" if db_status == "up" and not warming else "down"
 
-    response = {
+    return {
         "status": overall_status,
         "timestamp": timestamp,
         "services": {
             "database": {
                 "status": db_status,
                 "message": db_message,
-            }
+            },
+            "warmup": get_warmup_status(),
         },
     }
 
+
+health_monitor = HealthMonitor(_check_health)
+
+
+@app.get("/health")
+async def health_check():
+    """
+    Health check endpoint.
+
+    Served from the background health monitor (utils/health_monitor.py): probes
+    never open DB connections themselves.
+
+    Returns JSON response with:
+    - status: "ok" | "down"
+    - timestamp: Unix timestamp of the check
+    - checked_at / age_seconds / stale: age of the cached result
+    - services: Status of database and search warm-up (core/warmup.py)
+
+    HTTP Status Codes:
+    - 200: Service healthy
+    - 503: Service unavailable (database down, result stale) or not ready (warm-up running)
+    """
+    from fastapi.responses import JSONResponse
+
+    response = await health_monitor.get()
+    http_status = 200 if is_ready(response) else 503
     return JSONResponse(content=response, status_code=http_status)
 
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process serves requests (no dependency checks)."""
+    return {"status": "alive", "timestamp": time.time()}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe from the cached health result.
+
+    HTTP Status Codes:
+    - 200: Dependencies up and warm-up done
+    - 503: Not ready (see /health for details)
+    """
+    from fastapi.responses import JSONResponse
+
+    result = await health_monitor.get()
+    ready = is_ready(result)
+    return JSONResponse(
+        content={"ready": ready, "status": result["status"], "age_seconds": result["age_seconds"]},
+        status_code=200 if ready else 503,
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus metrics of the API process (search, embedding, admission).
+
+    With several workers (api/serve.py) the samples of every worker are merged.
+    """
+    return Response(content=generate_metrics_output(), media_type=get_metrics_content_type())
+
+
 @app.post("/v1/search", response_model=SearchResponse)
-async def search(request: SearchRequest):
+@traced("api_search", source="api")
+async def search(
+    request: SearchRequest,
+    x_request_timeout_ms: Optional[int] = Header(None),
+):
     """
     Semantic search endpoint.
+
+    Admission-controlled (core/admission.py): under overload requests are shed
+    with 429 (queue full) or 503 (deadline cannot be met) and a Retry-After
+    header. The deadline (timeout_ms, else X-Request-Timeout-Ms, else
+    SEARCH_DEADLINE_MS) also bounds every search stage: a late embedding degrades
+    to lexical results (timing.timed_out_stage), a late DB query returns 504.
+
+    Traced in LangFuse for a TRACE_SAMPLE_RATE_API share of requests (utils/tracing.py).
     """
+    admission = get_admission_controller("search")
+    deadline = admission.deadline_in(request.timeout_ms or x_request_timeout_ms)
     try:
-        result = await search_knowledge_base_structured(
-            query=request.query, limit=request.limit, source_filter=request.source_filter
-        )
+        async with admission.admit(deadline):
+            result = await search_knowledge_base_structured(
+                query=request.query,
+                limit=request.limit,
+                source_filter=request.source_filter,
+                context_window=request.context_window,
+                metadata_filter=request.metadata_filter,
+                include_document_metadata=request.include_document_metadata,
+                embedding_space=request.embedding_space,
+                collection=request.collection,
+                deadline=deadline,
+            )
 
         # Map to response model
         search_results = [
@@ -131,6 +244,14 @@ async def search(request: SearchRequest):
                 source=r["source"],
                 title=r["title"],
                 metadata=r["metadata"],
+                document_metadata=r.get("document_metadata"),
+                chunk_id=r.get("chunk_id"),
+                document_id=r.get("document_id"),
+                chunk_index=r.get("chunk_index"),
+                collection=r.get("collection"),
+                chunk_start=r.get("chunk_start"),
+                chunk_end=r.get("chunk_end"),
+                hit_chunk_ids=r.get("hit_chunk_ids"),
             )
             for r in result["results"]
         ]
@@ -139,21 +260,61 @@ async def search(request: SearchRequest):
             results=search_results,
             count=len(search_results),
             processing_time_ms=result["timing"].get("total_ms", 0),
+            timing=result["timing"],
         )
 
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
+    except SearchTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except (MetadataFilterError, EmbeddingSpaceError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/v1/documents")
-async def get_documents(limit: int = 100, offset: int = 0):
+async def get_documents(
+    limit: int = 100,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    include_metadata: bool = True,
+):
     """
-    List documents in the knowledge base.
+    List documents in the knowledge base, newest first.
+
+    Pass `next_cursor` from the previous response as `cursor` to fetch the next
+    page; cursor pages cost the same at any depth. `offset` is kept for
+    compatibility and only applies when no cursor is given.
+    Pass `include_metadata=false` to skip the per-document `metadata` (smaller,
+    cheaper pages).
+
+    HTTP Status Codes:
+    - 400: Malformed cursor
     """
     try:
-        docs = await list_documents(limit=limit, offset=offset)
-        return {"documents": docs, "count": len(docs)}
+        if offset and not cursor:
+            docs = await list_documents(
+                limit=limit, offset=offset, include_metadata=include_metadata
+            )
+            next_cursor = None
+            if docs and len(docs) == limit:
+                next_cursor = encode_document_cursor(docs[-1]["created_at"], docs[-1]["id"])
+            return {"documents": docs, "count": len(docs), "next_cursor": next_cursor}
+
+        page = await list_documents_page(
+            limit=limit, cursor=cursor, include_metadata=include_metadata
+        )
+        return {
+            "documents": page["documents"],
+            "count": len(page["documents"]),
+            "next_cursor": page["next_cursor"],
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to list documents: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -177,78 +338,189 @@ async def get_document_by_id(document_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/v1/documents/{document_id}/chunks")
+async def get_document_chunk_range(document_id: str, start: int = 0, end: Optional[int] = None):
+    """
+    Get chunks `start`..`end` (inclusive chunk_index) of a document instead of its full content.
+
+    HTTP Status Codes:
+    - 400: Invalid or too wide range
+    - 404: Document not found
+    """
+    try:
+        doc = await get_document_chunks(document_id, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to get chunks of document {document_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"Document {document_id} not found")
+    return doc
+
+
+@app.get("/v1/documents/{document_id}/text")
+async def get_document_text(document_id: str, start: int = 0, end: Optional[int] = None):
+    """
+    Get characters `start`..`end` (end exclusive) of a document's content.
+
+    HTTP Status Codes:
+    - 400: Invalid range
+    - 404: Document not found
+    """
+    try:
+        doc = await get_document_text_range(document_id, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to get text of document {document_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"Document {document_id} not found")
+    return doc
+
+
+@app.post("/v1/documents/batch")
+async def get_documents_batch(request: DocumentBatchRequest):
+    """
+    Get several documents in one request (content only with include_content=true).
+
+    HTTP Status Codes:
+    - 400: Invalid document ID
+    """
+    try:
+        docs = await get_documents_by_ids(
+            request.document_ids, include_content=request.include_content
+        )
+        return {"documents": docs, "count": len(docs)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to get documents batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/v1/chunks/{chunk_id}/neighbors")
+async def get_chunk_context(chunk_id: str, window: int = 2):
+    """
+    Get a search hit's chunk with `window` chunks before and after it.
+
+    HTTP Status Codes:
+    - 400: Invalid window
+    - 404: Chunk not found
+    """
+    try:
+        doc = await get_chunk_neighbors(chunk_id, window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to get neighbors of chunk {chunk_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"Chunk {chunk_id} not found")
+    return doc
+
+
 @app.get("/v1/overview")
 async def get_overview():
     """
     Get a high-level overview of the knowledge base.
-    Returns summary statistics and document list.
+    Returns summary statistics, per-source counts and the most recent documents.
+    Statistics come from rollups maintained at ingestion time (sql/kb-stats-schema.sql).
     """
     try:
-        docs = await list_documents(limit=100, offset=0)
-
-        # Calculate statistics
-        total_documents = len(docs)
-        total_chunks = sum(doc.get("chunk_count", 0) for doc in docs)
-        sources = list(set(doc.get("source", "") for doc in docs))
+        stats = await get_knowledge_base_stats(recent_limit=100)
+        sources = stats["sources"]
 
         return {
-            "total_documents": total_documents,
-            "total_chunks": total_chunks,
+            "total_documents": stats["total_documents"],
+            "total_chunks": stats["total_chunks"],
+            "total_tokens": stats["total_tokens"],
             "unique_sources": len(sources),
-            "sources": sorted(sources),
-            "documents": [
-                {
-                    "id": doc["id"],
-                    "title": doc["title"],
-                    "source": doc["source"],
-                    "chunk_count": doc.get("chunk_count", 0),
-                    "updated_at": doc.get("updated_at"),
-                }
-                for doc in docs
-            ],
+            "sources": [s["source"] for s in sources],
+            "source_stats": sources,
+            "documents": stats["recent_documents"],
         }
     except Exception as e:
         logger.error(f"Failed to get overview: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def run_ingestion_task(request: IngestRequest):
-    """Background task for ingestion."""
-    logger.info(f"Starting ingestion task for {request.documents_folder}")
-    try:
-        config = IngestionConfig()  # Use defaults or load from env
+def _job_http_error(e: jobs.JobError) -> HTTPException:
+    """Map job manager errors to HTTP errors."""
+    if isinstance(e, jobs.JobNotFoundError):
+        return HTTPException(status_code=404, detail=str(e))
+    if isinstance(e, jobs.JobLimitError):
+        return HTTPException(status_code=429, detail=str(e))
+    return HTTPException(status_code=409, detail=str(e))
+
+
+@app.post("/v1/ingest", response_model=IngestResponse)
+async def trigger_ingestion(request: IngestRequest):
+    """
+    Trigger document ingestion as a tracked job running in a worker process.
 
-        pipeline = DocumentIngestionPipeline(
-            config=config,
+    HTTP Status Codes:
+    - 409: A job is already active for the folder (or a clean job is running)
+    - 429: Concurrent job limit reached
+    """
+    try:
+        job = await jobs.create_job(
             documents_folder=request.documents_folder,
             clean_before_ingest=request.clean_before_ingest,
             fast_mode=request.fast_mode,
         )
+        return IngestResponse(
+            status="accepted",
+            message="Ingestion job queued",
+            task_id=job["task_id"],
+        )
+    except jobs.JobError as e:
+        raise _job_http_error(e)
+    except Exception as e:
+        logger.error(f"Failed to trigger ingestion: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 
-        await pipeline.initialize()
-        results = await pipeline.ingest_documents()
-        await pipeline.close()
+@app.get("/v1/ingest/{task_id}", response_model=IngestJobStatus)
+async def get_ingestion_status(task_id: str):
+    """
+    Get ingestion job status and progress (files, chunks, tokens, ETA).
+    """
+    try:
+        return await jobs.get_job(task_id)
+    except jobs.JobError as e:
+        raise _job_http_error(e)
+    except Exception as e:
+        logger.error(f"Failed to get ingestion job {task_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        logger.info(f"Ingestion completed: {len(results)} documents processed")
 
+@app.post("/v1/ingest/{task_id}/cancel", response_model=IngestJobStatus)
+async def cancel_ingestion(task_id: str):
+    """
+    Cancel an ingestion job. Running jobs stop before their next file.
+    """
+    try:
+        return await jobs.cancel_job(task_id)
+    except jobs.JobError as e:
+        raise _job_http_error(e)
     except Exception as e:
-        logger.error(f"Ingestion task failed: {e}")
+        logger.error(f"Failed to cancel ingestion job {task_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/v1/ingest", response_model=IngestResponse)
-async def trigger_ingestion(request: IngestRequest, background_tasks: BackgroundTasks):
+@app.post("/v1/ingest/{task_id}/resume", response_model=IngestJobStatus)
+async def resume_ingestion(task_id: str):
     """
-    Trigger document ingestion in the background.
+    Resume a failed or cancelled ingestion job, skipping files already processed.
     """
     try:
-        background_tasks.add_task(run_ingestion_task, request)
-        return IngestResponse(
-            status="accepted",
-            message="Ingestion task started in background",
-            task_id="ingest-" + str(int(time.time())),
-        )
+        return await jobs.resume_job(task_id)
+    except jobs.JobError as e:
+        raise _job_http_error(e)
     except Exception as e:
-        logger.error(f"Failed to trigger ingestion: {e}")
+        logger.error(f"Failed to resume ingestion job {task_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
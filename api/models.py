@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
@@ -11,6 +12,37 @@ class SearchRequest(BaseModel):
     source_filter: Optional[str] = Field(
         None, description="Filter results by source document path/name"
     )
+    context_window: int = Field(
+        0,
+        ge=0,
+        le=5,
+        description="Include this many chunks before/after each hit, merged into passages",
+    )
+    metadata_filter: Optional[Dict[str, Any]] = Field(
+        None,
+        description=(
+            'Filter on document metadata, e.g. {"version": {"$gte": "2.0"}, "lang": "it"}. '
+            "Supports equality, $ne, $in, $gt, $gte, $lt, $lte and dotted keys."
+        ),
+    )
+    include_document_metadata: bool = Field(
+        False, description="Return each result's document metadata as document_metadata"
+    )
+    embedding_space: Optional[str] = Field(
+        None,
+        description="Embedding space to search (default: deployment SEARCH_EMBEDDING_SPACE)",
+    )
+    collection: Optional[str] = Field(
+        None,
+        description="Only search this collection (top-level source unless "
+        "CHUNK_COLLECTION_KEY is set); prunes partitioned chunk storage",
+    )
+    timeout_ms: Optional[int] = Field(
+        None,
+        ge=1,
+        le=60000,
+        description="Request deadline in ms (default: X-Request-Timeout-Ms or SEARCH_DEADLINE_MS)",
+    )
 
 
 class SearchResult(BaseModel):
@@ -21,6 +53,17 @@ class SearchResult(BaseModel):
     source: str
     title: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    document_metadata: Optional[Dict[str, Any]] = Field(
+        None, description="Set when include_document_metadata is requested"
+    )
+    chunk_id: Optional[str] = Field(None, description="Use with /v1/chunks/{chunk_id}/neighbors")
+    document_id: Optional[str] = None
+    chunk_index: Optional[int] = None
+    collection: Optional[str] = None
+    # Set when context_window > 0: the passage spans chunks chunk_start..chunk_end
+    chunk_start: Optional[int] = None
+    chunk_end: Optional[int] = None
+    hit_chunk_ids: Optional[List[str]] = None
 
 
 class SearchResponse(BaseModel):
@@ -29,6 +72,18 @@ class SearchResponse(BaseModel):
     results: List[SearchResult]
     count: int
     processing_time_ms: float
+    timing: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Stage breakdown (embedding_ms, db_ms, total_ms); timed_out_stage and "
+        "fallback are set when a stage missed its budget",
+    )
+
+
+class DocumentBatchRequest(BaseModel):
+    """Request model for fetching several documents at once."""
+
+    document_ids: List[str] = Field(..., min_length=1, max_length=100)
+    include_content: bool = Field(False, description="Also return full document content")
 
 
 class IngestRequest(BaseModel):
@@ -45,3 +100,25 @@ class IngestResponse(BaseModel):
     status: str
     message: str
     task_id: Optional[str] = None
+
+
+class IngestJobStatus(BaseModel):
+    """Status and progress of an ingestion job."""
+
+    task_id: str
+    status: str = Field(..., description="queued | running | completed | failed | cancelled")
+    documents_folder: str
+    clean_before_ingest: bool
+    fast_mode: bool
+    files_total: int
+    files_done: int
+    files_failed: int
+    chunks_created: int
+    tokens_processed: int
+    progress_pct: float
+    eta_seconds: Optional[float] = Field(None, description="Estimated seconds remaining")
+    cancel_requested: bool
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
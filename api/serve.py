@@ -0,0 +1,190 @@
+"""
+Multi-Worker API Server
+=======================
+Serves api.main:app from several processes on one port.
+
+`uvicorn api.main:app --workers N` starts N fresh interpreters: each imports
+the whole stack, keeps its own embedding cache and warms up from cold. This
+launcher instead:
+
+1. Sets up the state shared by the workers: PROMETHEUS_MULTIPROC_DIR (emptied
+   at start; /metrics merges the samples of every worker, docling_mcp/metrics.py)
+   and EMBEDDING_CACHE_DIR (query embeddings in one file on disk,
+   ingestion/embedding_cache.py), by default under the system temp directory
+2. Preloads the application (api.main and the search stack) and freezes it out
+   of the garbage collector: forked workers share those pages copy-on-write
+3. Binds the listening socket once and forks API_WORKERS workers serving it with
+   uvicorn; the kernel spreads connections across them
+4. Restarts workers that die; SIGINT / SIGTERM stop every worker gracefully
+
+Nothing that opens connections or threads runs before fork: the DB pool
+(DB_POOL_MAX_SIZE connections per worker), the embedder client, warm-up and the
+health monitor start in each worker's lifespan. Warm-up embeddings are read from
+the shared cache once any worker (or a previous run) stored them.
+
+fork() is POSIX-only: elsewhere, or with API_WORKERS=1, the app runs in one process.
+
+Usage:
+    uv run python -m api.serve --workers 4 [--host 0.0.0.0] [--port 8000]
+"""
+
+import argparse
+import gc
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import tempfile
+from multiprocessing.connection import wait
+from typing import Dict
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# Seconds between restarts of a worker that keeps dying
+_RESTART_DELAY = 1.0
+# Seconds a worker gets to finish in-flight requests on shutdown
+_SHUTDOWN_TIMEOUT = 30.0
+
+
+def _shared_dir(variable: str, default_name: str) -> str:
+    path = os.environ.get(variable) or os.path.join(tempfile.gettempdir(), default_name)
+    os.makedirs(path, exist_ok=True)
+    os.environ[variable] = path
+    return path
+
+
+def prepare_shared_state() -> Dict[str, str]:
+    """
+    Set up the directories shared by the workers.
+
+    Must run before prometheus_client and ingestion.embedding_cache are imported:
+    both read their directory from the environment at import time.
+
+    Returns:
+        Metrics and embedding cache directories
+    """
+    metrics_dir = _shared_dir("PROMETHEUS_MULTIPROC_DIR", "docling-rag-metrics")
+    # Samples of a previous run would be merged into this one
+    for name in os.listdir(metrics_dir):
+        if name.endswith(".db"):
+            os.remove(os.path.join(metrics_dir, name))
+    cache_dir = _shared_dir("EMBEDDING_CACHE_DIR", "docling-rag-embeddings")
+    return {"metrics": metrics_dir, "embedding_cache": cache_dir}
+
+
+def preload():
+    """Import the application and the search stack once, before fork."""
+    # ingestion.embedder: imported by the background embedder initialization otherwise
+    import ingestion.embedder  # noqa: F401
+    from api.main import app
+
+    # Keep the GC from touching (and so copying) preloaded objects in the workers
+    gc.freeze()
+    return app
+
+
+def _serve(app, sock: socket.socket, port: int) -> None:
+    """Entry point of a forked worker."""
+    import uvicorn
+
+    config = uvicorn.Config(app, port=port, log_level="info")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _mark_dead(pid: int) -> None:
+    try:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def run_workers(app, workers: int, host: str, port: int) -> None:
+    """Serve app from `workers` forked processes sharing one listening socket."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    ctx = multiprocessing.get_context("fork")
+    processes: Dict[int, multiprocessing.Process] = {}
+    stopping = False
+
+    def start(slot: int) -> None:
+        process = ctx.Process(target=_serve, args=(app, sock, port), name=f"api-worker-{slot}")
+        process.start()
+        processes[slot] = process
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for slot in range(workers):
+        start(slot)
+    logger.info(f"✓ API serving on http://{host}:{port} with {workers} workers")
+
+    try:
+        while not stopping:
+            wait([p.sentinel for p in processes.values()], timeout=_RESTART_DELAY)
+            for slot, process in list(processes.items()):
+                if not stopping and not process.is_alive():
+                    _mark_dead(process.pid)
+                    logger.warning(
+                        f"API worker pid={process.pid} exited ({process.exitcode}), restarting"
+                    )
+                    start(slot)
+    finally:
+        for process in processes.values():
+            process.terminate()  # SIGTERM: uvicorn drains in-flight requests
+        for process in processes.values():
+            process.join(_SHUTDOWN_TIMEOUT)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            _mark_dead(process.pid)
+        sock.close()
+        logger.info("✓ API workers stopped")
+
+
+def main():
+    """Main entry point."""
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Docling RAG API server")
+    parser.add_argument("--workers", "-w", type=int, default=int(os.getenv("API_WORKERS", "1")))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    workers = args.workers
+    if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("fork() not available on this platform: serving from one process")
+        workers = 1
+
+    if workers > 1:
+        shared = prepare_shared_state()
+        logger.info(f"Shared worker state: {shared}")
+
+    app = preload()
+
+    if workers > 1:
+        run_workers(app, workers, args.host, args.port)
+    else:
+        import uvicorn
+
+        uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
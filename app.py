@@ -3,6 +3,7 @@ import logging
 import os
 import time
 from decimal import Decimal
+from typing import Callable, Optional
 
 import nest_asyncio
 import streamlit as st
@@ -26,15 +27,14 @@ logger = logging.getLogger(__name__)
 # We need to make sure we can import from the root directory
 import sys
 
+# Query costs are read from the LangFuse traces in the background
+from utils.cost_backfill import start_cost_backfill
+
 # LangFuse tracing imports (AC3.2.1, AC3.2.2)
-from utils.langfuse_streamlit import (
-    flush_langfuse,
-    with_streamlit_context,
-)
+from utils.langfuse_streamlit import with_streamlit_context
 from utils.session_manager import (
     InMemorySessionStats,
     create_session,
-    extract_cost_from_langfuse,
     generate_session_id,
     get_session_stats,
     log_query,
@@ -43,7 +43,7 @@ from utils.session_manager import (
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from core.agent import agent
+    from core.agent import stream_agent_response
 except ImportError as e:
     st.error(f"Failed to import core.agent: {e}")
     st.stop()
@@ -78,6 +78,35 @@ if "session_initialized" not in st.session_state:
     st.session_state.session_initialized = True
 
 
+@st.cache_resource
+def start_metrics_exporter() -> bool:
+    """Expose Prometheus metrics (TTFT, LLM latency) when STREAMLIT_METRICS_PORT is set."""
+    port = os.getenv("STREAMLIT_METRICS_PORT")
+    if not port:
+        return False
+    try:
+        from prometheus_client import start_http_server
+
+        start_http_server(int(port))
+        logger.info(f"Prometheus metrics exporter listening on :{port}")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not start metrics exporter: {e}")
+        return False
+
+
+start_metrics_exporter()
+
+
+@st.cache_resource
+def start_cost_reconciliation() -> bool:
+    """Backfill query costs from LangFuse traces in a background thread (one per server)."""
+    return start_cost_backfill()
+
+
+start_cost_reconciliation()
+
+
 # Check API health on startup
 async def check_api_health():
     client = RAGClient()
@@ -109,15 +138,19 @@ def convert_streamlit_messages_to_pydantic(messages):
     return pydantic_messages
 
 
-async def run_agent_with_tracking(user_input: str) -> tuple[str, Decimal, Decimal, str | None]:
+async def run_agent_with_tracking(
+    user_input: str, on_text: Optional[Callable[[str], None]] = None
+) -> tuple[str, Decimal, Decimal, str | None]:
     """
     Run the agent with session tracking and LangFuse tracing.
 
     Uses with_streamlit_context() to create root span with session_id
-    propagation to all nested spans (AC3.2.1, AC3.2.2).
+    propagation to all nested spans (AC3.2.1, AC3.2.2). The response is
+    streamed: on_text receives the accumulated text as tokens arrive.
 
     Returns:
-        Tuple of (response_text, cost, latency_ms, trace_id)
+        Tuple of (response_text, cost, latency_ms, trace_id); cost is 0 until the
+        query log is reconciled with the trace (utils/cost_backfill.py)
     """
     start_time = time.perf_counter()
     trace_id = None
@@ -134,34 +167,32 @@ async def run_agent_with_tracking(user_input: str) -> tuple[str, Decimal, Decima
     # This creates root span "streamlit_query" with session_id propagation
     with with_streamlit_context(session_id, user_input) as ctx:
         try:
-            # Run the agent - nested spans inherit session_id via propagate_attributes
-            result = await agent.run(user_input, message_history=history)
-            response_text = result.output if hasattr(result, "output") else str(result)
+            # Stream the agent - nested spans inherit session_id via propagate_attributes
+            response_text, ttft_seconds = await stream_agent_response(
+                user_input, message_history=history, on_text=on_text
+            )
+            if ttft_seconds is not None:
+                logger.info(f"Time to first token: {ttft_seconds * 1000:.0f}ms")
 
         except Exception as e:
             logger.error(f"Agent execution failed: {e}")
             response_text = f"Error: {str(e)}"
 
-        # Get trace_id from context for cost extraction
+        # Get trace_id from context for cost reconciliation
         trace_id = ctx.trace_id
 
     # Calculate latency
     latency_ms = Decimal(str((time.perf_counter() - start_time) * 1000))
 
-    # Extract cost from LangFuse trace (AC3.1.4)
-    if trace_id:
-        try:
-            flush_langfuse()  # Ensure trace is flushed before cost extraction
-            cost = await extract_cost_from_langfuse(trace_id)
-        except Exception as e:
-            logger.debug(f"Could not extract cost from LangFuse trace: {e}")
+    # Cost stays 0 here: the trace is exported in the background and
+    # utils/cost_backfill.py writes the cost from it to the query log (AC3.1.4)
 
     return response_text, cost, latency_ms, trace_id
 
 
-async def run_agent(user_input: str):
+async def run_agent(user_input: str, on_text: Optional[Callable[[str], None]] = None):
     """Run the agent with the user input (backward compatible wrapper)."""
-    response_text, cost, latency_ms, trace_id = await run_agent_with_tracking(user_input)
+    response_text, cost, latency_ms, trace_id = await run_agent_with_tracking(user_input, on_text)
 
     # Log query and update session stats (AC3.1.3, AC3.1.5)
     session_id = st.session_state.session_id
@@ -303,10 +334,15 @@ if prompt := st.chat_input("Ask something about your documents..."):
 
     # Generate response
     with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-            # Run async agent in sync Streamlit context
-            response_text = asyncio.run(run_agent(prompt))
-            st.markdown(response_text)
+        placeholder = st.empty()
+        placeholder.markdown("_Thinking..._")
+
+        def render_partial(text: str):
+            placeholder.markdown(text + "▌")
+
+        # Run async agent in sync Streamlit context, rendering tokens as they stream
+        response_text = asyncio.run(run_agent(prompt, on_text=render_partial))
+        placeholder.markdown(response_text)
 
     # Add assistant message to chat history
     st.session_state.messages.append({"role": "assistant", "content": response_text})
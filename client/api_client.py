@@ -1,5 +1,8 @@
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import os
+import time
+from typing import Any, Dict, List, Optional
 
 import httpx
 from tenacity import (
@@ -12,6 +15,27 @@ from tenacity import (
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+
+    _http2_available = True
+except ImportError:
+    _http2_available = False
+
+
+async def _close_on_loop_shutdown(client: httpx.AsyncClient) -> None:
+    """
+    Close `client` when this task is cancelled, on the loop that opened its connections.
+
+    asyncio.run() cancels pending tasks before closing its loop, so a client used
+    inside an asyncio.run() scope is closed at the end of that scope.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await client.aclose()
+
 
 def _convert_retry_exception(exc: Exception, base_url: str, timeout: float) -> RuntimeError:
     """Convert httpx exceptions to RuntimeError with descriptive messages."""
@@ -32,18 +56,187 @@ def _convert_retry_exception(exc: Exception, base_url: str, timeout: float) -> R
 
 
 class RAGClient:
-    """Client for interacting with the RAG API Service."""
+    """
+    Client for interacting with the RAG API Service.
 
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    Owns a single long-lived httpx.AsyncClient so consecutive calls reuse pooled
+    keep-alive connections instead of paying a TCP/TLS handshake per request.
+    Use it as an async context manager, or call aclose() when done:
+
+        async with RAGClient() as client:
+            await client.search("query")
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = 60.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: API base URL (default: RAG_API_URL env var or http://localhost:8000)
+            timeout: Request timeout in seconds
+            max_connections: Maximum concurrent connections in the pool
+            max_keepalive_connections: Maximum idle connections kept alive
+            keepalive_expiry: Seconds an idle connection is kept before closing
+            http2: Negotiate HTTP/2 (requires the optional `h2` package)
+        """
+        base_url = base_url or os.getenv("RAG_API_URL", "http://localhost:8000")
         self.base_url = base_url.rstrip("/")
-        self.timeout = 60.0  # seconds
+        self.timeout = timeout  # seconds
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+
+        if http2 and not _http2_available:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+        self.http2 = http2 and _http2_available
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_closer: Optional[asyncio.Task] = None
+        self._latency_stats: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def from_env(cls) -> "RAGClient":
+        """Create a client configured from RAG_API_* environment variables."""
+        return cls(
+            base_url=os.getenv("RAG_API_URL"),
+            timeout=float(os.getenv("RAG_API_TIMEOUT", "60")),
+            max_connections=int(os.getenv("RAG_API_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("RAG_API_MAX_KEEPALIVE", "10")),
+            http2=os.getenv("RAG_API_HTTP2", "false").lower() == "true",
+        )
+
+    async def __aenter__(self) -> "RAGClient":
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        closer = self._detach_client()
+        if closer is not None and closer.get_loop() is asyncio.get_running_loop():
+            await asyncio.wait([closer])
+
+    def _detach_client(self) -> Optional[asyncio.Task]:
+        """
+        Detach the pooled client and have it closed on its own event loop.
+
+        Returns:
+            Task closing the client, or None if there is nothing left to close
+        """
+        closer = self._client_closer
+        self._client = None
+        self._client_closer = None
+        if closer is None or closer.done():
+            return None
+        try:
+            closer.get_loop().call_soon_threadsafe(closer.cancel)
+        except RuntimeError:
+            # Loop closed without cancelling its tasks (not an asyncio.run() scope):
+            # its connections can no longer be closed and are dropped with the client
+            logger.debug("Event loop of the previous HTTP client is closed; dropping it")
+            return None
+        return closer
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the pooled HTTP client, creating it on first use.
+
+        Pooled connections are bound to the event loop that opened them. Streamlit
+        runs each interaction in a fresh asyncio.run() loop: each loop gets its own
+        client, closed on that loop when it shuts down (see _close_on_loop_shutdown).
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._client is not None and self._client_closer.get_loop() is not loop:
+            self._detach_client()
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._client_closer = loop.create_task(_close_on_loop_shutdown(self._client))
+
+        return self._client
+
+    def _record_latency(self, endpoint: str, start_time: float) -> None:
+        """Record request latency for an endpoint."""
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        stats = self._latency_stats.setdefault(
+            endpoint, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-endpoint latency counters.
+
+        Returns:
+            Dict mapping endpoint name to count, total_ms, avg_ms and max_ms
+        """
+        return {
+            endpoint: {
+                **stats,
+                "avg_ms": stats["total_ms"] / stats["count"] if stats["count"] else 0.0,
+            }
+            for endpoint, stats in self._latency_stats.items()
+        }
+
+    async def _request(self, endpoint: str, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request ("get"/"post") over the pooled client and record its latency."""
+        send = getattr(await self._get_client(), method)
+        start_time = time.perf_counter()
+        try:
+            return await send(f"{self.base_url}{path}", **kwargs)
+        finally:
+            self._record_latency(endpoint, start_time)
 
     async def search(
-        self, query: str, limit: int = 5, source_filter: Optional[str] = None
+        self,
+        query: str,
+        limit: int = 5,
+        source_filter: Optional[str] = None,
+        context_window: int = 0,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_document_metadata: bool = False,
+        embedding_space: Optional[str] = None,
+        collection: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Perform a semantic search with automatic retry for transient errors."""
+        """
+        Perform a semantic search with automatic retry for transient errors.
+
+        With context_window > 0, each result is a passage merging the hit with its
+        neighboring chunks. metadata_filter restricts results by document metadata;
+        include_document_metadata returns it with each result. embedding_space
+        overrides the deployment's embedding space; collection restricts the
+        search to one collection.
+        """
         try:
-            return await self._search_with_retry(query, limit, source_filter)
+            return await self._search_with_retry(
+                query,
+                limit,
+                source_filter,
+                context_window,
+                metadata_filter,
+                include_document_metadata,
+                embedding_space,
+                collection,
+            )
         except RetryError as e:
             # All retries exhausted - convert to RuntimeError
             raise _convert_retry_exception(
@@ -55,32 +248,64 @@ class RAGClient:
                 f"API error ({e.response.status_code}): {e.response.text[:200]}"
             ) from e
 
+    async def search_batch(
+        self, queries: List[str], limit: int = 5, source_filter: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several searches concurrently over the shared connection pool.
+
+        Args:
+            queries: Search queries
+            limit: Maximum number of results per query
+            source_filter: Optional source filter applied to every query
+
+        Returns:
+            One search response per query, in input order
+        """
+        return await asyncio.gather(
+            *(self.search(query, limit, source_filter) for query in queries)
+        )
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=5),
         retry=retry_if_exception_type((httpx.TimeoutException, httpx.RequestError)),
     )
     async def _search_with_retry(
-        self, query: str, limit: int, source_filter: Optional[str]
+        self,
+        query: str,
+        limit: int,
+        source_filter: Optional[str],
+        context_window: int = 0,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_document_metadata: bool = False,
+        embedding_space: Optional[str] = None,
+        collection: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Internal search with retry - allows exceptions to propagate for retry."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/v1/search",
-                json={"query": query, "limit": limit, "source_filter": source_filter},
-            )
-            response.raise_for_status()
-            return response.json()
+        payload: Dict[str, Any] = {"query": query, "limit": limit, "source_filter": source_filter}
+        if context_window:
+            payload["context_window"] = context_window
+        if metadata_filter:
+            payload["metadata_filter"] = metadata_filter
+        if include_document_metadata:
+            payload["include_document_metadata"] = True
+        if embedding_space:
+            payload["embedding_space"] = embedding_space
+        if collection:
+            payload["collection"] = collection
+        response = await self._request("search", "post", "/v1/search", json=payload)
+        response.raise_for_status()
+        return response.json()
 
     async def get_health_status(self) -> Dict[str, Any]:
         """Check API health status."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return {
-                    "status": "healthy" if response.status_code == 200 else "unhealthy",
-                    "status_code": response.status_code,
-                }
+            response = await self._request("health", "get", "/health", timeout=5.0)
+            return {
+                "status": "healthy" if response.status_code == 200 else "unhealthy",
+                "status_code": response.status_code,
+            }
         except httpx.HTTPStatusError as e:
             logger.error(f"❌ Health check HTTP error {e.response.status_code}")
             return {"status": "unhealthy", "status_code": e.response.status_code}
@@ -95,22 +320,54 @@ class RAGClient:
         self, documents_folder: str = "documents", clean: bool = False, fast_mode: bool = False
     ) -> Dict[str, Any]:
         """Trigger background ingestion task."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/v1/ingest",
-                json={
-                    "documents_folder": documents_folder,
-                    "clean_before_ingest": clean,
-                    "fast_mode": fast_mode,
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._request(
+            "ingest",
+            "post",
+            "/v1/ingest",
+            json={
+                "documents_folder": documents_folder,
+                "clean_before_ingest": clean,
+                "fast_mode": fast_mode,
+            },
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_ingestion_status(self, task_id: str) -> Dict[str, Any]:
+        """Get ingestion job status and progress."""
+        response = await self._request("ingest", "get", f"/v1/ingest/{task_id}")
+        response.raise_for_status()
+        return response.json()
+
+    async def cancel_ingestion(self, task_id: str) -> Dict[str, Any]:
+        """Request cancellation of an ingestion job."""
+        response = await self._request("ingest", "post", f"/v1/ingest/{task_id}/cancel")
+        response.raise_for_status()
+        return response.json()
+
+    async def list_documents(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_metadata: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        List documents in the knowledge base with automatic retry for transient errors.
+
+        Pass the previous response's `next_cursor` as `cursor` to page through the
+        knowledge base; `offset` is only used when no cursor is given.
+        """
+        params: Dict[str, Any] = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        elif offset:
+            params["offset"] = offset
+        if not include_metadata:
+            params["include_metadata"] = "false"
 
-    async def list_documents(self, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
-        """List documents in the knowledge base with automatic retry for transient errors."""
         try:
-            return await self._list_documents_with_retry(limit, offset)
+            return await self._list_documents_with_retry(params)
         except RetryError as e:
             # All retries exhausted - convert to RuntimeError
             raise _convert_retry_exception(
@@ -127,22 +384,18 @@ class RAGClient:
         wait=wait_exponential(multiplier=1, min=1, max=5),
         retry=retry_if_exception_type((httpx.TimeoutException, httpx.RequestError)),
     )
-    async def _list_documents_with_retry(self, limit: int, offset: int) -> Dict[str, Any]:
+    async def _list_documents_with_retry(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Internal list_documents with retry - allows exceptions to propagate for retry."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
-                f"{self.base_url}/v1/documents", params={"limit": limit, "offset": offset}
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._request("documents", "get", "/v1/documents", params=params)
+        response.raise_for_status()
+        return response.json()
 
     async def get_document(self, document_id: str) -> Dict[str, Any]:
         """Get a specific document by ID."""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/v1/documents/{document_id}")
-                response.raise_for_status()
-                return response.json()
+            response = await self._request("document", "get", f"/v1/documents/{document_id}")
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             logger.error(f"❌ API HTTP error {e.response.status_code}: {e.response.text[:200]}")
             raise RuntimeError(
@@ -163,6 +416,53 @@ class RAGClient:
             logger.error(f"❌ Unexpected error in get_document: {e}", exc_info=True)
             raise RuntimeError(f"Unexpected error during get_document: {str(e)}") from e
 
+    async def get_document_chunks(
+        self, document_id: str, start: int = 0, end: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get a chunk_index range (inclusive) of a document instead of its full content."""
+        params: Dict[str, Any] = {"start": start}
+        if end is not None:
+            params["end"] = end
+        response = await self._request(
+            "document", "get", f"/v1/documents/{document_id}/chunks", params=params
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_document_text(
+        self, document_id: str, start: int = 0, end: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get a character range (end exclusive) of a document's content."""
+        params: Dict[str, Any] = {"start": start}
+        if end is not None:
+            params["end"] = end
+        response = await self._request(
+            "document", "get", f"/v1/documents/{document_id}/text", params=params
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_chunk_neighbors(self, chunk_id: str, window: int = 2) -> Dict[str, Any]:
+        """Get a search hit's chunk with `window` chunks before and after it."""
+        response = await self._request(
+            "document", "get", f"/v1/chunks/{chunk_id}/neighbors", params={"window": window}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_documents(
+        self, document_ids: List[str], include_content: bool = False
+    ) -> Dict[str, Any]:
+        """Get several documents in one request."""
+        response = await self._request(
+            "document",
+            "post",
+            "/v1/documents/batch",
+            json={"document_ids": document_ids, "include_content": include_content},
+        )
+        response.raise_for_status()
+        return response.json()
+
     async def get_overview(self) -> Dict[str, Any]:
         """Get a high-level overview of the knowledge base."""
         try:
@@ -185,16 +485,14 @@ class RAGClient:
     )
     async def _get_overview_with_retry(self) -> Dict[str, Any]:
         """Internal get_overview with retry - allows exceptions to propagate for retry."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(f"{self.base_url}/v1/overview")
-            response.raise_for_status()
-            return response.json()
+        response = await self._request("overview", "get", "/v1/overview")
+        response.raise_for_status()
+        return response.json()
 
     async def health_check(self) -> bool:
         """Check if API is available."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/health")
-                return response.status_code == 200
+            response = await self._request("health", "get", "/health", timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
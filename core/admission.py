@@ -0,0 +1,192 @@
+"""
+Admission control and load shedding for search traffic.
+
+A search holds an embedding call and a pooled DB connection (10 by default).
+Without a bound, bursts queue invisibly on both until command_timeout and every
+request turns slow. An AdmissionController runs at most `max_concurrency`
+requests at once, keeps a bounded FIFO queue and sheds the rest immediately:
+
+- queue full: 429 (reason "queue_full")
+- the expected queue wait plus the mean service time would miss the request
+  deadline: 503 (reason "deadline")
+- still queued when the deadline can no longer be met: 503 (reason "timeout")
+
+Rejections carry a Retry-After (seconds until a slot is expected to free up).
+Queue depth is exported as rag_admission_queue_depth{endpoint} and shed requests
+as rag_admission_shed_total{endpoint,reason}.
+
+Usage:
+    async with get_admission_controller("search").admit(deadline):
+        ...
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Concurrent searches per process (keep below the DB pool size)
+SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "8"))
+# Searches allowed to wait for a slot; beyond that: 429
+SEARCH_MAX_QUEUE = int(os.getenv("SEARCH_MAX_QUEUE", "32"))
+# Default request deadline (aligned with the <2s p95 SLO)
+SEARCH_DEADLINE_MS = int(os.getenv("SEARCH_DEADLINE_MS", "2000"))
+# Service time assumed before the first request completes
+_INITIAL_SERVICE_SECONDS = 0.3
+_SERVICE_TIME_ALPHA = 0.2
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str, retry_after: float):
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+        # 429: too many requests queued; 503: the deadline cannot be met
+        self.status_code = 429 if reason == "queue_full" else 503
+        super().__init__(f"Server overloaded ({reason}), retry after {self.retry_after}s")
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded, deadline-aware wait queue."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        max_concurrency: int = SEARCH_MAX_CONCURRENCY,
+        max_queue: int = SEARCH_MAX_QUEUE,
+        default_deadline_ms: int = SEARCH_DEADLINE_MS,
+    ):
+        """
+        Args:
+            endpoint: Metrics label of the guarded endpoint
+            max_concurrency: Requests running at once
+            max_queue: Requests allowed to wait for a slot
+            default_deadline_ms: Deadline of requests that do not bring their own
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.endpoint = endpoint
+        self.max_concurrency = max_concurrency
+        self.max_queue = max(0, max_queue)
+        self.default_deadline_ms = default_deadline_ms
+        self.in_flight = 0
+        # Moving average of admitted requests' duration (seconds)
+        self.service_time = _INITIAL_SERVICE_SECONDS
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot."""
+        return len(self._waiters)
+
+    def deadline_in(self, timeout_ms: Optional[float] = None) -> float:
+        """Absolute deadline (time.monotonic()) for a request timeout in ms."""
+        if timeout_ms is None or timeout_ms <= 0:
+            timeout_ms = self.default_deadline_ms
+        return time.monotonic() + timeout_ms / 1000
+
+    def _expected_wait(self, position: int) -> float:
+        """Expected queue wait of the request at `position` (1 = next)."""
+        return position * self.service_time / self.max_concurrency
+
+    def _shed(self, reason: str, retry_after: float) -> AdmissionRejectedError:
+        from docling_mcp.metrics import record_admission_shed
+
+        record_admission_shed(self.endpoint, reason)
+        logger.warning(f"Shed {self.endpoint} request: {reason} (queued={self.queued})")
+        return AdmissionRejectedError(reason, retry_after)
+
+    def _record_depth(self) -> None:
+        from docling_mcp.metrics import record_admission_queue_depth
+
+        record_admission_queue_depth(self.endpoint, len(self._waiters))
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next waiter (in_flight unchanged)
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                self._record_depth()
+                return
+        self.in_flight -= 1
+        self._record_depth()
+
+    async def _acquire(self, deadline: float) -> None:
+        now = time.monotonic()
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            # A free slot always admits: shedding on an estimate alone could stick
+            self.in_flight += 1
+            return
+
+        position = len(self._waiters) + 1
+        expected_wait = self._expected_wait(position)
+        if len(self._waiters) >= self.max_queue:
+            raise self._shed("queue_full", expected_wait)
+        # Latest start that still finishes in time
+        start_by = deadline - self.service_time
+        if now + expected_wait > start_by:
+            raise self._shed("deadline", expected_wait)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self._record_depth()
+        try:
+            await asyncio.wait_for(future, timeout=start_by - now)
+        except asyncio.TimeoutError:
+            if future in self._waiters:
+                self._waiters.remove(future)
+                self._record_depth()
+            elif future.done() and not future.cancelled():
+                # Granted in the same iteration the timeout fired: give the slot back
+                self._release()
+            raise self._shed("timeout", self._expected_wait(len(self._waiters) + 1))
+        except BaseException:
+            if future in self._waiters:
+                self._waiters.remove(future)
+                self._record_depth()
+            elif future.done() and not future.cancelled():
+                # Granted just before the cancellation: give the slot back
+                self._release()
+            raise
+
+    @asynccontextmanager
+    async def admit(self, deadline: Optional[float] = None):
+        """
+        Run the block once admitted.
+
+        Args:
+            deadline: Absolute deadline (time.monotonic(), see deadline_in);
+                default: now + default_deadline_ms
+
+        Raises:
+            AdmissionRejectedError: If the request is shed
+        """
+        if deadline is None:
+            deadline = self.deadline_in()
+        await self._acquire(deadline)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            self.service_time += _SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+            self._release()
+
+
+_controllers: Dict[str, AdmissionController] = {}
+
+
+def get_admission_controller(endpoint: str = "search") -> AdmissionController:
+    """Process-wide controller of an endpoint (created with the SEARCH_* settings)."""
+    controller = _controllers.get(endpoint)
+    if controller is None:
+        controller = _controllers[endpoint] = AdmissionController(endpoint)
+    return controller
@@ -5,16 +5,24 @@ Defines the agent and its tools, wrapping the core RAG service.
 """
 
 import logging
+import time
+from typing import Callable, Optional
 
 from pydantic_ai import Agent, RunContext
+from pydantic_ai.messages import ModelMessage
 
 from client.api_client import RAGClient
+from core.retrieval import create_retrieval_transport
 
 logger = logging.getLogger(__name__)
 
-# Initialize client
-# In a real app, base_url might come from env vars
-client = RAGClient()
+# Shared client: keeps pooled keep-alive connections to the API across tool calls
+# Configured via RAG_API_URL, RAG_API_MAX_CONNECTIONS, RAG_API_HTTP2, ...
+client = RAGClient.from_env()
+
+# Retrieval transport: "http" (via the API) or "inprocess" (direct service calls)
+# Selected with the RAG_TRANSPORT env var
+transport = create_retrieval_transport(client=client)
 
 
 async def search_knowledge_base(
@@ -34,8 +42,7 @@ async def search_knowledge_base(
         Formatted search results with source citations
     """
     try:
-        # Call API
-        response = await client.search(query, limit, source_filter)
+        response = await transport.search(query, limit, source_filter)
         results = response.get("results", [])
 
         if not results:
@@ -47,8 +54,6 @@ async def search_knowledge_base(
         # Format results for LLM consumption
         response_parts = []
         for row in results:
-            # Handle both dictionary access (API) and object access (if we were local)
-            # API returns dicts
             title = row.get("title", "Unknown")
             content = row.get("content", "")
 
@@ -86,3 +91,52 @@ Request additional details when user queries lack clarity or specificity.
 Upon discovering pertinent information, present it in a synthesized format and include proper source attribution.""",
     tools=[search_knowledge_base],
 )
+
+
+async def stream_agent_response(
+    user_input: str,
+    message_history: Optional[list[ModelMessage]] = None,
+    on_text: Optional[Callable[[str], None]] = None,
+) -> tuple[str, Optional[float]]:
+    """
+    Run the agent with streaming output.
+
+    Tool calls (knowledge base search) are resolved before the final answer starts
+    streaming; text deltas are then forwarded as soon as the model emits them.
+    Time-to-first-token covers the whole run up to the first delta (tool calls
+    included); generation time covers the streamed answer only, from its first
+    delta to the last.
+
+    Args:
+        user_input: User prompt
+        message_history: Optional PydanticAI message history
+        on_text: Optional callback invoked with the accumulated text after each delta
+
+    Returns:
+        Tuple of (response_text, time_to_first_token_seconds). TTFT is None when
+        the model produced no text.
+    """
+    from docling_mcp.metrics import (
+        record_llm_generation_time,
+        record_llm_time_to_first_token,
+    )
+
+    start_time = time.perf_counter()
+    first_token_time = None
+    ttft_seconds = None
+    response_text = ""
+
+    async with agent.run_stream(user_input, message_history=message_history) as result:
+        # debounce_by=None: forward the first token immediately instead of batching
+        async for delta in result.stream_text(delta=True, debounce_by=None):
+            if first_token_time is None:
+                first_token_time = time.perf_counter()
+                ttft_seconds = first_token_time - start_time
+                record_llm_time_to_first_token(ttft_seconds)
+            response_text += delta
+            if on_text is not None:
+                on_text(response_text)
+
+    if first_token_time is not None:
+        record_llm_generation_time(time.perf_counter() - first_token_time)
+    return response_text, ttft_seconds
@@ -0,0 +1,22 @@
+"""
+Search path errors.
+
+Kept free of provider SDK imports: core.rag_service (and so the API and the MCP
+server) catch these at import time, while openai is only loaded with the embedder.
+"""
+
+
+class SearchTimeoutError(TimeoutError):
+    """Raised when a search stage runs out of the request deadline."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(f"Search deadline exceeded during {stage}")
+
+
+class EmbeddingCircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit breaker is open."""
+
+    def __init__(self, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(f"Embedding provider circuit open, retry in {retry_in:.0f}s")
@@ -6,18 +6,34 @@ Decoupled from PydanticAI and Streamlit.
 
 Performance Optimizations:
 - Global embedder instance initialized at startup
-- Persistent LRU cache for embeddings (2000 entries)
+- Persistent LRU cache for embeddings (2000 entries), shared by the API workers
+  of a host on disk with EMBEDDING_CACHE_DIR (ingestion/embedding_cache.py)
 - Eliminates 300-500ms overhead per query
 """
 
 import asyncio
 import json
 import logging
+import os
+import re
 import time
-from typing import Any, Dict, List
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Coroutine, Dict, List, TypeVar
+
+from core.admission import SEARCH_DEADLINE_MS
+from core.errors import EmbeddingCircuitOpenError, SearchTimeoutError
 
 # Import database utilities
 from utils.db_utils import db_pool as global_db_pool
+from utils.embedding_spaces import (
+    PRIMARY_EMBEDDING_SPACE,
+    EmbeddingSpaceError,
+    space_predicate,
+    space_vector_expression,
+    space_vector_type,
+    validate_space_name,
+)
+from utils.metadata_filter import compile_metadata_filter
 
 logger = logging.getLogger(__name__)
 
@@ -33,11 +49,14 @@ _initialization_task = None
 
 
 def _create_embedder_sync():
-    """Sync function to import and create embedder (CPU bound/Blocking IO)."""
-    # Import here to avoid blocking module load
+    """Sync function to import and create embedder (blocking imports)."""
+    # Import here to avoid blocking module load. ingestion.embedder only pulls in
+    # openai/langfuse: Docling and transformers are never imported on the search path
     from ingestion.embedder import create_embedder
 
-    return create_embedder(use_cache=True, batch_size=100, max_retries=3, retry_delay=1.0)
+    return create_embedder(
+        use_cache=True, batch_size=100, max_retries=3, retry_delay=1.0, shared_cache=True
+    )
 
 
 async def initialize_global_embedder():
@@ -48,6 +67,8 @@ async def initialize_global_embedder():
     - Eliminates per-query embedder instantiation (300-500ms overhead)
     - Enables persistent caching across requests
     - Pre-warms OpenAI API connection
+    - Then warms the embedding cache, HNSW index buffers and pooled connections
+      (core/warmup.py); health reports ready once that finishes
 
     OPTIMIZED: Runs in background to prevent blocking server startup (MCP handshake timeout).
     """
@@ -67,8 +88,7 @@ async def initialize_global_embedder():
             start_time = time.time()
             logger.info("Starting background embedder initialization (loading heavy models)...")
 
-            # Offload heavy import and creation to thread to avoid blocking asyncio loop
-            # This is critical because importing transformers/docling takes ~40s
+            # Offload import and creation to a thread to avoid blocking the asyncio loop
             _global_embedder = await asyncio.to_thread(_create_embedder_sync)
 
             # Enhance cache size (default is 1000, we increase to 2000)
@@ -79,9 +99,17 @@ async def initialize_global_embedder():
             logger.info(f"✓ Global embedder initialized in {elapsed:.0f}ms")
             _embedder_ready.set()
 
+            # Searches are already served; readiness waits for warm-up
+            from core.warmup import warm_up
+
+            await warm_up(_global_embedder)
+
         except Exception as e:
             logger.error(f"❌ Failed to initialize embedder in background: {e}", exc_info=True)
             # Don't crash the server, subsequent queries will fail gracefully
+            from core.warmup import abandon_warmup
+
+            abandon_warmup(f"Embedder initialization failed: {e}")
 
     # Start initialization task
     _initialization_task = asyncio.create_task(_init_task())
@@ -102,7 +130,10 @@ async def close_global_embedder():
     if _global_embedder is None:
         return
 
+    from core.warmup import reset_warmup
+
     # Cleanup if needed (embedder doesn't require explicit cleanup currently)
+    reset_warmup()
     _global_embedder = None
     _embedder_ready.clear()
     _initialization_task = None
@@ -126,12 +157,11 @@ async def get_global_embedder():
         if not _embedder_ready.is_set():
             logger.info("Waiting for embedder initialization to complete (first request)...")
             try:
-                # Wait up to 60 seconds for initialization
-                await asyncio.wait_for(_embedder_ready.wait(), timeout=60.0)
+                # Wait on the task itself: a failed initialization returns immediately
+                # instead of waiting for the full timeout
+                await asyncio.wait_for(asyncio.shield(_initialization_task), timeout=30.0)
             except asyncio.TimeoutError:
-                raise RuntimeError(
-                    "Timeout waiting for embedder initialization (takes ~40s cold start)"
-                )
+                raise RuntimeError("Timeout waiting for embedder initialization")
 
     if _global_embedder is None:
         raise RuntimeError("Global embedder failed to initialize. Check server logs for errors.")
@@ -218,31 +248,365 @@ async def search_knowledge_base(
         return f"I encountered an error searching the knowledge base: {str(e)}"
 
 
-async def generate_query_embedding(query: str) -> tuple[List[float], float]:
+# ============================================================================
+# EMBEDDING SPACES (utils/embedding_spaces.py)
+# ============================================================================
+# Deployment default; requests may pick another ready space
+SEARCH_EMBEDDING_SPACE = os.getenv("SEARCH_EMBEDDING_SPACE", PRIMARY_EMBEDDING_SPACE)
+_EMBEDDING_SPACE_TTL = 60.0
+
+_embedding_spaces: Dict[str, tuple[float, Dict[str, Any] | None]] = {}
+_space_embedders: Dict[str, Any] = {}
+
+
+async def get_embedding_space(
+    name: str | None = None, deadline: float | None = None
+) -> Dict[str, Any] | None:
+    """
+    Resolve the embedding space a search uses.
+
+    Args:
+        name: Space name (default: SEARCH_EMBEDDING_SPACE)
+        deadline: Request deadline (time.monotonic()) bounding the lookup
+
+    Returns:
+        None for the primary space (chunks.embedding), else the space row
+        (name, model, dimensions, status), cached for a minute
+
+    Raises:
+        EmbeddingSpaceError: If the space is unknown or not ready
+        SearchTimeoutError: If the deadline runs out during the lookup (stage "db")
+    """
+    name = validate_space_name(name or SEARCH_EMBEDDING_SPACE)
+    if name == PRIMARY_EMBEDDING_SPACE:
+        return None
+
+    cached = _embedding_spaces.get(name)
+    if cached is not None and time.monotonic() - cached[0] < _EMBEDDING_SPACE_TTL:
+        space = cached[1]
+    else:
+        async with _acquire_within(deadline) as conn:
+            row = await _within(
+                conn.fetchrow(
+                    "SELECT name, model, dimensions, status FROM embedding_spaces WHERE name = $1",
+                    name,
+                ),
+                deadline,
+            )
+        space = dict(row) if row else None
+        _embedding_spaces[name] = (time.monotonic(), space)
+
+    if space is None:
+        raise EmbeddingSpaceError(f"Unknown embedding space '{name}'")
+    if space["status"] != "ready":
+        raise EmbeddingSpaceError(f"Embedding space '{name}' is {space['status']}, not ready")
+    return space
+
+
+async def _get_space_embedder(space: Dict[str, Any] | None):
+    """Query embedder of a space: the global embedder for the primary space."""
+    if space is None:
+        return await get_global_embedder()
+    model = space["model"]
+    if model not in _space_embedders:
+        # Same factory as the global embedder (cached, no Docling imports)
+        from ingestion.embedder import create_embedder
+
+        _space_embedders[model] = await asyncio.to_thread(
+            create_embedder, use_cache=True, batch_size=100, model_name=model, shared_cache=True
+        )
+    return _space_embedders[model]
+
+
+# ============================================================================
+# DEADLINES
+# ============================================================================
+# A search carries an absolute deadline (time.monotonic()) from the API request,
+# MCP tool arguments or X-Request-Timeout-Ms header (default SEARCH_DEADLINE_MS).
+# Each stage gets the part of the remaining time it may use and is cancelled
+# when it runs out, so retries (tenacity) or slow queries never outlive the request.
+
+# Upper bound of the embedding stage; capped at half the remaining time so the
+# DB stage (vector search or its lexical fallback) keeps a budget
+SEARCH_EMBEDDING_BUDGET_MS = int(os.getenv("SEARCH_EMBEDDING_BUDGET_MS", "800"))
+# Text search configuration of the lexical fallback; must match the
+# idx_chunks_content_fts expression (sql/chunks-fts-index.sql)
+SEARCH_LEXICAL_CONFIG = os.getenv("SEARCH_LEXICAL_CONFIG", "english")
+
+
+def search_deadline(timeout_ms: float | None = None) -> float:
+    """Absolute deadline (time.monotonic()) for a request timeout in ms."""
+    if timeout_ms is None or timeout_ms <= 0:
+        timeout_ms = SEARCH_DEADLINE_MS
+    return time.monotonic() + timeout_ms / 1000
+
+
+def _remaining(deadline: float | None, stage: str) -> float | None:
+    """Seconds left before the deadline (None: unbounded)."""
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise SearchTimeoutError(stage)
+    return remaining
+
+
+T = TypeVar("T")
+
+
+async def _within(call: Coroutine[Any, Any, T], deadline: float | None) -> T:
+    """Await a DB call, cancelled when the deadline runs out (not started after it)."""
+    try:
+        timeout = _remaining(deadline, "db")
+    except SearchTimeoutError:
+        call.close()
+        raise
+    try:
+        return await asyncio.wait_for(call, timeout)
+    except asyncio.TimeoutError:
+        raise SearchTimeoutError("db")
+
+
+@asynccontextmanager
+async def _acquire_within(deadline: float | None) -> AsyncIterator[Any]:
+    """Pool connection, waiting for a free one no longer than the deadline."""
+    async with AsyncExitStack() as stack:
+        yield await _within(stack.enter_async_context(global_db_pool.acquire()), deadline)
+
+
+async def generate_query_embedding(
+    query: str, embedding_space: str | None = None, deadline: float | None = None
+) -> tuple[List[float], float]:
     """
     Generate embedding for a query string.
 
     Args:
         query: The query text to embed
+        embedding_space: Space whose model embeds the query (default: SEARCH_EMBEDDING_SPACE)
+        deadline: Request deadline (time.monotonic()); the call is cancelled after
+            min(SEARCH_EMBEDDING_BUDGET_MS, half the remaining time). Cached
+            queries return from the embedder cache without an API call.
 
     Returns:
         Tuple of (embedding vector, duration_ms)
 
+    Raises:
+        SearchTimeoutError: If the embedding budget runs out (stage "embedding")
+
     Note:
         This function is separated from search to allow timing breakdown
         in LangFuse spans (AC #2: separate spans for embedding and DB search).
     """
-    embedder = await get_global_embedder()
+    space = await get_embedding_space(embedding_space, deadline)
+
+    async def embed() -> List[float]:
+        embedder = await _get_space_embedder(space)
+        return await embedder.embed_query(query)
+
+    budget = _remaining(deadline, "embedding")
+    if budget is not None:
+        budget = min(SEARCH_EMBEDDING_BUDGET_MS / 1000, budget / 2)
 
     embed_start = time.time()
-    query_embedding = await embedder.embed_query(query)
+    try:
+        query_embedding = await asyncio.wait_for(embed(), budget)
+    except asyncio.TimeoutError:
+        raise SearchTimeoutError("embedding")
     duration_ms = (time.time() - embed_start) * 1000
 
     return query_embedding, duration_ms
 
 
+# Chunks are cut with up to ChunkingConfig.chunk_overlap (200) shared characters
+_MAX_STITCH_OVERLAP = 1000
+_MIN_STITCH_OVERLAP = 20
+
+
+def _stitch(left: str, right: str) -> str:
+    """Join two consecutive chunks, dropping text repeated by the chunk overlap."""
+    probe = right[:_MIN_STITCH_OVERLAP]
+    if len(probe) == _MIN_STITCH_OVERLAP:
+        pos = left.find(probe, max(0, len(left) - _MAX_STITCH_OVERLAP))
+        while pos != -1:
+            if right.startswith(left[pos:]):
+                return left + right[len(left) - pos :]
+            pos = left.find(probe, pos + 1)
+    return f"{left}\n\n{right}"
+
+
+def merge_context_windows(hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge search hits with their context windows into stitched passages.
+
+    Hits from the same document whose windows overlap or touch become one
+    passage, so no chunk is returned twice.
+
+    Args:
+        hits: Search results, each with document_id, chunk_index, similarity and
+            context (list of {"chunk_index", "content"} around the hit)
+
+    Returns:
+        Passages sorted by similarity. Each keeps the fields of its best hit,
+        with content replaced by the stitched window and chunk_start, chunk_end
+        and hit_chunk_ids added.
+    """
+    by_document: Dict[str, List[Dict[str, Any]]] = {}
+    for hit in hits:
+        by_document.setdefault(hit["document_id"], []).append(hit)
+
+    passages = []
+    for doc_hits in by_document.values():
+        doc_hits.sort(key=lambda h: h["chunk_index"])
+        groups: List[List[Dict[str, Any]]] = []
+        group_end = None
+        for hit in doc_hits:
+            indices = [c["chunk_index"] for c in hit["context"]] or [hit["chunk_index"]]
+            if groups and group_end is not None and min(indices) <= group_end + 1:
+                groups[-1].append(hit)
+                group_end = max(group_end, max(indices))
+            else:
+                groups.append([hit])
+                group_end = max(indices)
+
+        for group in groups:
+            chunks = {c["chunk_index"]: c["content"] for hit in group for c in hit["context"]}
+            best = max(group, key=lambda h: h["similarity"])
+            if not chunks:
+                chunks = {best["chunk_index"]: best["content"]}
+
+            ordered = sorted(chunks)
+            content = chunks[ordered[0]]
+            for index in ordered[1:]:
+                content = _stitch(content, chunks[index])
+
+            passage = {k: v for k, v in best.items() if k != "context"}
+            passage.update(
+                {
+                    "content": content,
+                    "chunk_start": ordered[0],
+                    "chunk_end": ordered[-1],
+                    "hit_chunk_ids": [h["chunk_id"] for h in group],
+                }
+            )
+            passages.append(passage)
+
+    passages.sort(key=lambda p: p["similarity"], reverse=True)
+    return passages
+
+
+# Filtered searches whose candidate set has at most this many chunks are answered
+# by an exact scan of the pre-filtered chunks; broader filters walk the HNSW index.
+SEARCH_PREFILTER_MAX_CHUNKS = int(os.getenv("SEARCH_PREFILTER_MAX_CHUNKS", "20000"))
+# ef_search for filtered HNSW scans when iterative scans are unavailable (pgvector < 0.8)
+SEARCH_FILTERED_EF_SEARCH = int(os.getenv("SEARCH_FILTERED_EF_SEARCH", "200"))
+
+_iterative_scan_supported: bool | None = None
+_chunks_partitioned: bool | None = None
+
+_RESULT_COLUMNS = """
+            c.id::text AS chunk_id,
+            c.document_id::text,
+            c.collection,
+            c.chunk_index,
+            c.content,
+            c.metadata,
+            d.title AS document_title,
+            d.source AS document_source"""
+
+
+def _document_conditions(
+    source_filter: str | None,
+    metadata_filter: Dict[str, Any] | None,
+    params: List[Any],
+    collection: str | None = None,
+) -> List[str]:
+    """SQL conditions on documents (alias d) for the search filters; appends to params."""
+    conditions = []
+    if collection:
+        params.append(collection)
+        conditions.append(f"d.collection = ${len(params)}")
+    if source_filter:
+        params.append(f"%{source_filter}%")
+        conditions.append(f"d.source ILIKE ${len(params)}")
+    if metadata_filter:
+        conditions.extend(compile_metadata_filter(metadata_filter, params))
+    return conditions
+
+
+async def _supports_iterative_scan(conn) -> bool:
+    """Whether pgvector supports hnsw.iterative_scan (0.8+). Checked once per process."""
+    global _iterative_scan_supported
+    if _iterative_scan_supported is None:
+        version = await conn.fetchval(
+            "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+        )
+        try:
+            major, minor = (int(part) for part in (version or "0.0").split(".")[:2])
+        except ValueError:
+            major, minor = 0, 0
+        _iterative_scan_supported = (major, minor) >= (0, 8)
+    return _iterative_scan_supported
+
+
+async def _is_chunks_partitioned(conn) -> bool:
+    """
+    Whether chunks is partitioned by collection (sql/partition-chunks.sql).
+    Checked once per process: restart after converting the table.
+    """
+    global _chunks_partitioned
+    if _chunks_partitioned is None:
+        _chunks_partitioned = bool(
+            await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass('chunks'))"
+            )
+        )
+    return _chunks_partitioned
+
+
+async def _choose_search_plan(
+    conn,
+    source_filter: str | None,
+    metadata_filter: Dict[str, Any] | None,
+    collection: str | None = None,
+) -> str:
+    """
+    Pick the query plan for a vector search.
+
+    - hnsw: no metadata filter (source_filter/collection alone keep the plain index scan)
+    - exact_prefilter: selective filter; exact distance over matching chunks only
+    - hnsw_iterative: broad filter; HNSW keeps scanning until `limit` rows pass it
+    - hnsw_filtered: broad filter without iterative scans; HNSW with larger ef_search
+
+    Selectivity comes from documents.chunk_count of matching documents
+    (GIN index on documents.metadata), so the estimate never touches chunks.
+    """
+    if not metadata_filter:
+        return "hnsw"
+
+    params: List[Any] = []
+    conditions = _document_conditions(source_filter, metadata_filter, params, collection)
+    candidate_chunks = await conn.fetchval(
+        "SELECT COALESCE(SUM(d.chunk_count), 0) FROM documents d WHERE " + " AND ".join(conditions),
+        *params,
+    )
+    if candidate_chunks <= SEARCH_PREFILTER_MAX_CHUNKS:
+        return "exact_prefilter"
+    if await _supports_iterative_scan(conn):
+        return "hnsw_iterative"
+    return "hnsw_filtered"
+
+
 async def search_with_embedding(
-    embedding: List[float], limit: int = 5, source_filter: str | None = None
+    embedding: List[float],
+    limit: int = 5,
+    source_filter: str | None = None,
+    context_window: int = 0,
+    metadata_filter: Dict[str, Any] | None = None,
+    include_document_metadata: bool = False,
+    embedding_space: str | None = None,
+    collection: str | None = None,
+    deadline: float | None = None,
 ) -> tuple[List[Dict[str, Any]], float]:
     """
     Search the knowledge base using a pre-computed embedding.
@@ -251,77 +615,305 @@ async def search_with_embedding(
         embedding: Pre-computed query embedding vector
         limit: Maximum number of results to return
         source_filter: Optional filter for document sources
+        context_window: Also fetch this many chunks before and after each hit
+            (same query) and return merged passages (see merge_context_windows)
+        metadata_filter: Optional structured filter on document metadata
+            (see utils/metadata_filter.py); the plan is chosen per query
+            (see _choose_search_plan) and exported as rag_search_plan_total
+        include_document_metadata: Also return the document's metadata as
+            "document_metadata" (chunk rows only carry chunk-specific fields)
+        embedding_space: Space to search (default: SEARCH_EMBEDDING_SPACE); the
+            embedding must come from the same space (generate_query_embedding)
+        collection: Only search this collection (utils/db_utils.py::document_collection)
+        deadline: Request deadline (time.monotonic()); the query is cancelled
+            server-side when it runs out
+
+    With partitioned chunks (sql/partition-chunks.sql), collection prunes the
+    search to one partition and source_filter to the partitions of the
+    collections with matching documents; unfiltered searches scan every
+    partition's HNSW index and merge the per-partition top-k (Merge Append).
 
     Returns:
         Tuple of (results list, duration_ms)
 
+    Raises:
+        MetadataFilterError: If metadata_filter is malformed
+        EmbeddingSpaceError: If the space is unknown or not ready
+        SearchTimeoutError: If the deadline runs out (stage "db")
+
     Note:
         This function is separated from embedding generation to allow
         timing breakdown in LangFuse spans (AC #2: separate spans for embedding and DB search).
     """
+    from docling_mcp.metrics import record_search_plan
+
     # Convert to PostgreSQL vector format
     embedding_str = "[" + ",".join(map(str, embedding)) + "]"
 
+    space = await get_embedding_space(embedding_space, deadline)
+    if space is None:
+        # Primary space: chunks.embedding (idx_chunks_embedding_hnsw)
+        space_join = ""
+        distance = "c.embedding <=> $1::vector"
+        conditions = ["c.embedding IS NOT NULL"]
+    else:
+        # Expression and predicate match the space's partial HNSW index
+        space_join = f"JOIN chunk_embeddings ce ON ce.chunk_id = c.id AND {space_predicate(space)}"
+        distance = f"{space_vector_expression(space)} <=> $1::{space_vector_type(space)}"
+        conditions = []
+
+    # Compile filters before acquiring a connection: malformed filters fail fast
+    args: List[Any] = [embedding_str, limit]
+    collection_param = len(args) + 1  # first document condition (see _document_conditions)
+    conditions += _document_conditions(source_filter, metadata_filter, args, collection)
+    if collection:
+        # Same value on the chunk side: plan-time partition pruning
+        conditions.append(f"c.collection = ${collection_param}")
+    result_columns = _RESULT_COLUMNS
+    if include_document_metadata:
+        result_columns += ",\n            d.metadata AS document_metadata"
+
     db_start = time.time()
 
-    base_query = """
-        SELECT 
-            c.id AS chunk_id,
-            c.document_id,
-            c.content,
-            1 - (c.embedding <=> $1::vector) AS similarity,
-            c.metadata,
-            d.title AS document_title,
-            d.source AS document_source
-        FROM chunks c
-        JOIN documents d ON c.document_id = d.id
-        WHERE c.embedding IS NOT NULL
-    """
+    # Waiting for a connection and the planning queries count against the deadline too
+    async with _acquire_within(deadline) as conn:
+        if (
+            source_filter
+            and not collection
+            and await _within(_is_chunks_partitioned(conn), deadline)
+        ):
+            # InitPlan over documents: run-time pruning to the matching collections
+            args.append(f"%{source_filter}%")
+            conditions.append(
+                "c.collection = ANY(ARRAY(SELECT DISTINCT collection FROM documents "
+                f"WHERE source ILIKE ${len(args)}))"
+            )
+        where_clause = " AND ".join(conditions) or "TRUE"
 
-    if source_filter:
-        sql_query = (
-            base_query + " AND d.source ILIKE $3 ORDER BY c.embedding <=> $1::vector LIMIT $2"
+        plan = await _within(
+            _choose_search_plan(conn, source_filter, metadata_filter, collection), deadline
         )
-        source_pattern = f"%{source_filter}%"
-        args = [embedding_str, limit, source_pattern]
-    else:
-        sql_query = base_query + " ORDER BY c.embedding <=> $1::vector LIMIT $2"
-        args = [embedding_str, limit]
-
-    async with global_db_pool.acquire() as conn:
-        results = await conn.fetch(sql_query, *args)
 
+        if plan == "exact_prefilter":
+            # MATERIALIZED keeps the planner from using HNSW (and its post-filtering)
+            sql_query = f"""
+                WITH candidates AS MATERIALIZED (
+                    SELECT c.id, {distance} AS distance
+                    FROM chunks c
+                    {space_join}
+                    JOIN documents d ON c.document_id = d.id
+                    WHERE {where_clause}
+                ),
+                top AS (
+                    SELECT id, distance FROM candidates ORDER BY distance LIMIT $2
+                )
+                SELECT {result_columns},
+                    1 - t.distance AS similarity
+                FROM top t
+                JOIN chunks c ON c.id = t.id
+                JOIN documents d ON c.document_id = d.id
+                ORDER BY t.distance
+            """
+        else:
+            sql_query = f"""
+                SELECT {result_columns},
+                    1 - ({distance}) AS similarity
+                FROM chunks c
+                {space_join}
+                JOIN documents d ON c.document_id = d.id
+                WHERE {where_clause}
+                ORDER BY {distance}
+                LIMIT $2
+            """
+
+        sql_query = _with_context_window(sql_query, args, context_window)
+
+        if plan in ("hnsw_iterative", "hnsw_filtered"):
+            # SET LOCAL scopes the index settings to this query's transaction
+            async with conn.transaction():
+                if plan == "hnsw_iterative":
+                    await conn.execute("SET LOCAL hnsw.iterative_scan = strict_order")
+                else:
+                    await conn.execute(f"SET LOCAL hnsw.ef_search = {SEARCH_FILTERED_EF_SEARCH:d}")
+                results = await _fetch_within(conn, sql_query, args, deadline)
+        else:
+            results = await _fetch_within(conn, sql_query, args, deadline)
+
+    record_search_plan(plan)
     duration_ms = (time.time() - db_start) * 1000
 
-    # Format results
+    return _format_search_results(results, include_document_metadata, context_window), duration_ms
+
+
+def _with_context_window(sql_query: str, args: List[Any], context_window: int) -> str:
+    """Wrap a hit query to also fetch each hit's neighboring chunks; appends to args."""
+    if context_window <= 0:
+        return sql_query
+    # Neighbors by (document_id, chunk_index) via idx_chunks_chunk_index, same round trip
+    args.append(context_window)
+    return f"""
+                WITH hits AS MATERIALIZED ({sql_query})
+                SELECT h.*, w.context
+                FROM hits h
+                LEFT JOIN LATERAL (
+                    SELECT json_agg(
+                        json_build_object('chunk_index', n.chunk_index, 'content', n.content)
+                        ORDER BY n.chunk_index
+                    ) AS context
+                    FROM chunks n
+                    WHERE n.document_id = h.document_id::uuid
+                      AND n.collection = h.collection
+                      AND n.chunk_index BETWEEN h.chunk_index - ${len(args)}
+                                            AND h.chunk_index + ${len(args)}
+                ) w ON true
+                ORDER BY h.similarity DESC
+            """
+
+
+async def _fetch_within(conn, sql_query: str, args: List[Any], deadline: float | None):
+    """conn.fetch bounded by the deadline (asyncpg cancels the query on timeout)."""
+    try:
+        return await conn.fetch(sql_query, *args, timeout=_remaining(deadline, "db"))
+    except asyncio.TimeoutError:
+        raise SearchTimeoutError("db")
+
+
+def _format_search_results(
+    results, include_document_metadata: bool, context_window: int
+) -> List[Dict[str, Any]]:
+    """Search rows (see _RESULT_COLUMNS) as result dicts."""
     structured_results = []
     for row in results:
-        structured_results.append(
-            {
-                "content": row["content"],
-                "similarity": float(row["similarity"]),
-                "source": row["document_source"],
-                "title": row["document_title"],
-                "metadata": json.loads(row["metadata"])
-                if isinstance(row["metadata"], str)
-                else row["metadata"],
-            }
-        )
+        result = {
+            "content": row["content"],
+            "similarity": float(row["similarity"]),
+            "source": row["document_source"],
+            "title": row["document_title"],
+            "metadata": json.loads(row["metadata"])
+            if isinstance(row["metadata"], str)
+            else row["metadata"],
+            # Handles for follow-up partial reads (neighbors, chunk ranges)
+            "chunk_id": row["chunk_id"],
+            "document_id": row["document_id"],
+            "chunk_index": row["chunk_index"],
+            "collection": row["collection"],
+        }
+        if include_document_metadata:
+            document_metadata = row["document_metadata"]
+            result["document_metadata"] = (
+                json.loads(document_metadata)
+                if isinstance(document_metadata, str)
+                else document_metadata or {}
+            )
+        if context_window > 0:
+            context = row["context"]
+            result["context"] = json.loads(context) if isinstance(context, str) else context or []
+        structured_results.append(result)
+
+    if context_window > 0:
+        structured_results = merge_context_windows(structured_results)
+
+    return structured_results
+
+
+async def lexical_search(
+    query: str,
+    limit: int = 5,
+    source_filter: str | None = None,
+    context_window: int = 0,
+    metadata_filter: Dict[str, Any] | None = None,
+    include_document_metadata: bool = False,
+    collection: str | None = None,
+    deadline: float | None = None,
+) -> tuple[List[Dict[str, Any]], float]:
+    """
+    Full-text search over chunk content, without an embedding.
+
+    Fallback of search_knowledge_base_structured when the query cannot be
+    embedded within its budget. Chunks matching any query term are ranked by
+    ts_rank_cd (normalized to 0..1 and returned as "similarity"); the GIN index
+    idx_chunks_content_fts (sql/chunks-fts-index.sql) keeps the match cheap.
+    Takes the same filters as search_with_embedding.
 
-    return structured_results, duration_ms
+    Returns:
+        Tuple of (results list, duration_ms)
+
+    Raises:
+        MetadataFilterError: If metadata_filter is malformed
+        SearchTimeoutError: If the deadline runs out (stage "db")
+    """
+    if not re.fullmatch(r"[a-z_]+", SEARCH_LEXICAL_CONFIG):
+        raise ValueError(f"Invalid SEARCH_LEXICAL_CONFIG: {SEARCH_LEXICAL_CONFIG!r}")
+    document = f"to_tsvector('{SEARCH_LEXICAL_CONFIG}', c.content)"
+    # plainto_tsquery ANDs the terms; OR them so partial matches rank instead of vanishing
+    ts_query = (
+        f"to_tsquery('{SEARCH_LEXICAL_CONFIG}', "
+        f"replace(plainto_tsquery('{SEARCH_LEXICAL_CONFIG}', $1)::text, ' & ', ' | '))"
+    )
+
+    args: List[Any] = [query, limit]
+    collection_param = len(args) + 1
+    conditions = [f"{document} @@ {ts_query}"]
+    conditions += _document_conditions(source_filter, metadata_filter, args, collection)
+    if collection:
+        conditions.append(f"c.collection = ${collection_param}")
+    result_columns = _RESULT_COLUMNS
+    if include_document_metadata:
+        result_columns += ",\n            d.metadata AS document_metadata"
+
+    sql_query = f"""
+                SELECT {result_columns},
+                    ts_rank_cd({document}, {ts_query}, 32) AS similarity
+                FROM chunks c
+                JOIN documents d ON c.document_id = d.id
+                WHERE {" AND ".join(conditions)}
+                ORDER BY similarity DESC
+                LIMIT $2
+            """
+    sql_query = _with_context_window(sql_query, args, context_window)
+
+    db_start = time.time()
+    async with _acquire_within(deadline) as conn:
+        results = await _fetch_within(conn, sql_query, args, deadline)
+    duration_ms = (time.time() - db_start) * 1000
+
+    return _format_search_results(results, include_document_metadata, context_window), duration_ms
 
 
 async def search_knowledge_base_structured(
-    query: str, limit: int = 5, source_filter: str | None = None
+    query: str,
+    limit: int = 5,
+    source_filter: str | None = None,
+    context_window: int = 0,
+    metadata_filter: Dict[str, Any] | None = None,
+    include_document_metadata: bool = False,
+    embedding_space: str | None = None,
+    collection: str | None = None,
+    deadline: float | None = None,
 ) -> Dict[str, Any]:
     """
     Search the knowledge base and return structured results (for API usage).
 
+    With context_window > 0, results are merged passages of each hit and its
+    neighboring chunks. metadata_filter restricts results by document metadata
+    and include_document_metadata adds it to each result. embedding_space picks
+    the model/vectors used for both the query and the search (see search_with_embedding);
+    collection restricts the search to one collection (one partition when partitioned).
+
+    The search is bounded by deadline (time.monotonic(); default now +
+    SEARCH_DEADLINE_MS). If the query embedding misses its budget, the search
+    degrades to lexical_search instead of waiting: timing then reports
+    timed_out_stage="embedding" and fallback="lexical". The same fallback is used
+    while the embedding circuit breaker is open (timing circuit_open=True).
+
     Returns:
         Dict containing:
         - results: List of dicts (content, source, title, similarity, metadata)
         - timing: Dict of performance metrics
 
+    Raises:
+        SearchTimeoutError: If the DB stage runs out of time (stage "db")
+
     Note:
         This is a convenience wrapper that calls generate_query_embedding()
         and search_with_embedding() internally. For fine-grained timing control
@@ -329,14 +921,46 @@ async def search_knowledge_base_structured(
     """
     start_time = time.time()
     timing = {}
+    if deadline is None:
+        deadline = search_deadline()
 
     try:
-        # Generate embedding
-        query_embedding, embedding_ms = await generate_query_embedding(query)
-        timing["embedding_ms"] = embedding_ms
-
-        # Search with embedding
-        results, db_ms = await search_with_embedding(query_embedding, limit, source_filter)
+        try:
+            query_embedding, embedding_ms = await generate_query_embedding(
+                query, embedding_space, deadline
+            )
+        except (SearchTimeoutError, EmbeddingCircuitOpenError) as e:
+            # Degrade instead of hanging or failing: lexical match with the same filters
+            logger.warning(f"Query embedding unavailable ({e}), using lexical search")
+            timing["embedding_ms"] = (time.time() - start_time) * 1000
+            if isinstance(e, SearchTimeoutError):
+                timing["timed_out_stage"] = e.stage
+            else:
+                timing["circuit_open"] = True
+            timing["fallback"] = "lexical"
+            results, db_ms = await lexical_search(
+                query,
+                limit,
+                source_filter,
+                context_window=context_window,
+                metadata_filter=metadata_filter,
+                include_document_metadata=include_document_metadata,
+                collection=collection,
+                deadline=deadline,
+            )
+        else:
+            timing["embedding_ms"] = embedding_ms
+            results, db_ms = await search_with_embedding(
+                query_embedding,
+                limit,
+                source_filter,
+                context_window=context_window,
+                metadata_filter=metadata_filter,
+                include_document_metadata=include_document_metadata,
+                embedding_space=embedding_space,
+                collection=collection,
+                deadline=deadline,
+            )
         timing["db_ms"] = db_ms
         timing["total_ms"] = (time.time() - start_time) * 1000
 
@@ -0,0 +1,173 @@
+"""
+Retrieval Transports
+====================
+Pluggable transports used by the PydanticAI agent to reach the knowledge base.
+
+Modes (selected with the RAG_TRANSPORT env var):
+- "http" (default): calls the RAG API Service (/v1/search) through RAGClient
+- "inprocess": calls core.rag_service directly, skipping the HTTP hop, request
+  validation and JSON round trip. Intended for single-node deployments where the
+  agent and the knowledge base share a container.
+
+Both transports return the same shape: {"results": [{"title", "content", ...}]}.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from client.api_client import RAGClient
+
+logger = logging.getLogger(__name__)
+
+TRANSPORT_MODES = ("http", "inprocess")
+
+
+class RetrievalTransport(ABC):
+    """Abstract base class for knowledge base retrieval transports."""
+
+    @abstractmethod
+    async def search(
+        self, query: str, limit: int = 5, source_filter: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Search the knowledge base and return a dict with a "results" list."""
+        pass
+
+    async def close(self) -> None:
+        """Release transport resources."""
+        pass
+
+
+class HTTPTransport(RetrievalTransport):
+    """Retrieval over the RAG API Service using the pooled RAGClient."""
+
+    def __init__(self, client: Optional[RAGClient] = None):
+        self.client = client or RAGClient.from_env()
+
+    async def search(
+        self, query: str, limit: int = 5, source_filter: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return await self.client.search(query, limit, source_filter)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class InProcessTransport(RetrievalTransport):
+    """
+    Retrieval by calling core.rag_service directly.
+
+    The DB pool and the global embedder are bound to the event loop that created
+    them, while callers such as Streamlit spin up a new loop per interaction
+    (asyncio.run). All service calls are therefore executed on one shared,
+    long-lived loop running in a daemon thread; callers await the result from
+    their own loop. The pool, embedder and embedding cache persist across calls.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready: Optional[concurrent.futures.Future] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> concurrent.futures.Future:
+        """Start the shared loop and schedule service initialization (once)."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, daemon=True, name="rag-inprocess"
+                )
+                self._thread.start()
+                logger.info("In-process retrieval loop started")
+
+            if self._ready is None:
+                self._ready = asyncio.run_coroutine_threadsafe(self._initialize(), self._loop)
+
+            return self._ready
+
+    async def _initialize(self) -> None:
+        """Initialize DB pool and global embedder on the shared loop."""
+        from core.rag_service import initialize_global_embedder
+        from utils.db_utils import initialize_database
+
+        await initialize_database()
+        await initialize_global_embedder()
+        logger.info("✓ In-process retrieval initialized (shared pool and embedder)")
+
+    async def _run(self, coro) -> Any:
+        """Run a coroutine on the shared loop and await it from the caller's loop."""
+        ready = self._ensure_started()
+        try:
+            await asyncio.wrap_future(ready)
+        except Exception:
+            # Allow the next call to retry initialization (e.g. DB was briefly down)
+            with self._lock:
+                if self._ready is ready:
+                    self._ready = None
+            coro.close()
+            raise
+
+        assert self._loop is not None
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    async def search(
+        self, query: str, limit: int = 5, source_filter: Optional[str] = None
+    ) -> Dict[str, Any]:
+        from core.rag_service import search_knowledge_base_structured
+
+        return await self._run(search_knowledge_base_structured(query, limit, source_filter))
+
+    async def close(self) -> None:
+        """Close the embedder and pool on the shared loop, then stop it."""
+        if self._loop is None:
+            return
+
+        from core.rag_service import close_global_embedder
+        from utils.db_utils import close_database
+
+        async def _shutdown():
+            await close_global_embedder()
+            await close_database()
+
+        try:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_shutdown(), self._loop))
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread is not None:
+                self._thread.join(timeout=5)
+            self._loop = None
+            self._thread = None
+            self._ready = None
+
+
+def create_retrieval_transport(
+    mode: Optional[str] = None, client: Optional[RAGClient] = None
+) -> RetrievalTransport:
+    """
+    Create a retrieval transport.
+
+    Args:
+        mode: "http" or "inprocess" (default: RAG_TRANSPORT env var, or "http")
+        client: Optional RAGClient to reuse for the http transport
+
+    Returns:
+        RetrievalTransport instance
+
+    Raises:
+        ValueError: If mode is not a known transport
+    """
+    mode = (mode or os.getenv("RAG_TRANSPORT", "http")).strip().lower()
+
+    if mode == "http":
+        return HTTPTransport(client)
+    if mode == "inprocess":
+        return InProcessTransport()
+
+    raise ValueError(
+        f"Unknown RAG_TRANSPORT '{mode}'. Expected one of: {', '.join(TRANSPORT_MODES)}"
+    )
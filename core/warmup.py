@@ -0,0 +1,191 @@
+"""
+Startup warm-up for search.
+
+After a deploy the first searches pay for a cold embedding cache, cold DB buffers
+for the HNSW index and connections without prepared statements. warm_up() runs
+once the global embedder is ready (initialize_global_embedder, used by both the
+API and the MCP lifespan):
+
+1. Embeds the WARMUP_TOP_QUERIES most frequent queries of the last
+   WARMUP_LOOKBACK_DAYS from query_logs into the embedder cache (one batch call)
+2. Loads the HNSW indexes of chunks (every partition when partitioned) into
+   shared buffers with pg_prewarm (sql/pg-prewarm.sql; skipped if missing)
+3. Runs the most frequent queries as concurrent vector searches, one per
+   connection the pool keeps open (min_size), so each prepares the search statement
+
+Health reports not ready until warm-up finishes, from process start (pending)
+until it is done, fails or exceeds WARMUP_TIMEOUT seconds (a cold start is better
+than no start), or right away with WARMUP_ENABLED=false. If the embedder cannot
+be initialized, warm-up never starts and is marked failed (abandon_warmup).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_TOP_QUERIES = int(os.getenv("WARMUP_TOP_QUERIES", "100"))
+WARMUP_LOOKBACK_DAYS = int(os.getenv("WARMUP_LOOKBACK_DAYS", "7"))
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "60"))
+
+# pending -> running -> done | failed | timeout (disabled: WARMUP_ENABLED=false)
+_state = "pending"
+_details: Dict[str, Any] = {}
+
+_TOP_QUERIES_SQL = """
+    SELECT query_text
+    FROM query_logs
+    WHERE timestamp > NOW() - make_interval(days => $2)
+    GROUP BY query_text
+    ORDER BY COUNT(*) DESC
+    LIMIT $1
+"""
+
+# Leaf HNSW indexes of chunks and its partitions (partitioned indexes have no storage)
+_HNSW_INDEXES_SQL = """
+    SELECT c.oid::regclass::text
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    JOIN pg_am am ON am.oid = c.relam
+    WHERE am.amname = 'hnsw'
+      AND c.relkind = 'i'
+      AND (i.indrelid = to_regclass('chunks')
+           OR i.indrelid IN (SELECT inhrelid FROM pg_inherits
+                             WHERE inhparent = to_regclass('chunks')))
+"""
+
+
+def _current_state() -> str:
+    global _state
+    if _state == "pending" and not WARMUP_ENABLED:
+        _state = "disabled"
+    return _state
+
+
+def is_warming() -> bool:
+    """Whether warm-up has not finished yet: health reports not ready meanwhile."""
+    return _current_state() in ("pending", "running")
+
+
+def get_warmup_status() -> Dict[str, Any]:
+    """Warm-up state and per-phase details for health checks."""
+    return {"state": _current_state(), **_details}
+
+
+def abandon_warmup(reason: str) -> None:
+    """Give up a warm-up that cannot start (embedder unavailable): serve cold."""
+    if _current_state() == "pending":
+        _details["error"] = reason
+        _finish("failed")
+
+
+def reset_warmup() -> None:
+    """Forget a previous warm-up (server shutdown, tests)."""
+    global _state
+    _state = "pending"
+    _details.clear()
+
+
+def _finish(state: str) -> None:
+    global _state
+    _state = state
+
+
+async def _top_queries(conn, limit: int) -> List[str]:
+    rows = await conn.fetch(_TOP_QUERIES_SQL, limit, WARMUP_LOOKBACK_DAYS)
+    return [row["query_text"] for row in rows if row["query_text"]]
+
+
+async def _prewarm_indexes(conn) -> Dict[str, int]:
+    """pg_prewarm every HNSW index of chunks; returns blocks loaded per index."""
+    installed = await conn.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_prewarm')"
+    )
+    if not installed:
+        logger.info("pg_prewarm extension not installed (sql/pg-prewarm.sql), skipping")
+        return {}
+    blocks = {}
+    for index in [row[0] for row in await conn.fetch(_HNSW_INDEXES_SQL)]:
+        blocks[index] = await conn.fetchval("SELECT pg_prewarm($1::regclass)", index)
+    return blocks
+
+
+async def _prime_connections(queries: List[str], embedder, max_connections: int) -> int:
+    """Run concurrent vector searches so up to max_connections connections are primed."""
+    from core.rag_service import search_with_embedding
+
+    queries = queries[:max_connections]
+    embeddings = await embedder.embed_documents(queries)
+    results = await asyncio.gather(
+        *(search_with_embedding(embedding, 5) for embedding in embeddings),
+        return_exceptions=True,
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        logger.warning(f"Warm-up search failed on {len(failures)} connection(s): {failures[0]}")
+    return len(results) - len(failures)
+
+
+async def _run(embedder) -> None:
+    from utils.db_utils import db_pool
+
+    start = time.monotonic()
+    async with db_pool.acquire() as conn:
+        queries = await _top_queries(conn, WARMUP_TOP_QUERIES)
+    if queries:
+        # Fills the embedder cache (embed_query reads the same cache)
+        await embedder.embed_documents(queries)
+    _details["cached_queries"] = len(queries)
+    _details["embeddings_ms"] = round((time.monotonic() - start) * 1000)
+
+    start = time.monotonic()
+    async with db_pool.acquire() as conn:
+        blocks = await _prewarm_indexes(conn)
+    _details["prewarmed_blocks"] = sum(blocks.values())
+    _details["prewarm_ms"] = round((time.monotonic() - start) * 1000)
+
+    if queries and db_pool.pool is not None:
+        start = time.monotonic()
+        _details["primed_connections"] = await _prime_connections(
+            queries, embedder, db_pool.pool.get_min_size()
+        )
+        _details["prime_ms"] = round((time.monotonic() - start) * 1000)
+
+
+async def warm_up(embedder, timeout: Optional[float] = None) -> None:
+    """
+    Warm caches, index buffers and pooled connections; never raises.
+
+    Args:
+        embedder: The global query embedder
+        timeout: Seconds before giving up (default: WARMUP_TIMEOUT)
+    """
+    from docling_mcp.metrics import record_warmup
+
+    global _state
+    if not WARMUP_ENABLED:
+        _finish("disabled")
+        return
+
+    _state = "running"
+    start = time.monotonic()
+    try:
+        await asyncio.wait_for(_run(embedder), timeout or WARMUP_TIMEOUT)
+        _finish("done")
+        logger.info(f"✓ Search warm-up finished: {_details}")
+    except asyncio.TimeoutError:
+        _finish("timeout")
+        logger.warning(f"Search warm-up timed out after {timeout or WARMUP_TIMEOUT:.0f}s")
+    except asyncio.CancelledError:
+        _finish("failed")
+        raise
+    except Exception as e:
+        _finish("failed")
+        logger.warning(f"Search warm-up failed, serving cold: {e}")
+    finally:
+        _details["duration_ms"] = round((time.monotonic() - start) * 1000)
+        record_warmup(_state, time.monotonic() - start)
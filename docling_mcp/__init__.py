@@ -2,16 +2,10 @@
 Docling MCP Server Module
 =========================
 MCP server with direct service integration for RAG capabilities.
-"""
 
-from docling_mcp.server import (
-    ask_knowledge_base,
-    get_knowledge_base_document,
-    get_knowledge_base_overview,
-    list_knowledge_base_documents,
-    mcp,
-    query_knowledge_base,
-)
+Server attributes are resolved lazily so that importing a submodule
+(e.g. docling_mcp.metrics) does not load FastMCP and the server.
+"""
 
 __all__ = [
     "mcp",
@@ -21,3 +15,11 @@ __all__ = [
     "get_knowledge_base_document",
     "get_knowledge_base_overview",
 ]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        from docling_mcp import server
+
+        return getattr(server, name)
+    raise AttributeError(f"module 'docling_mcp' has no attribute {name!r}")
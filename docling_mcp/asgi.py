@@ -0,0 +1,101 @@
+"""
+Single-Loop ASGI App
+====================
+Serves the MCP streamable-HTTP transport, /metrics and /health from one ASGI app
+on one event loop.
+
+In STDIO mode (mcp_server.py default) the observability server runs its own
+event loop in a daemon thread: health checks cannot use the search pool (they
+keep a dedicated connection) and embedder state is read across loops. Here the
+MCP lifespan (database pool, embedder, warm-up, LangFuse) and the health monitor
+share one loop, so health checks go through the search pool and report its
+state and the embedder cache directly (rag_db_pool_connections,
+rag_embedding_cache_entries).
+
+This is also the shared multi-client mode: Cursor / Claude Desktop clients
+connect over the network to one warm process instead of each spawning a STDIO
+server. Authentication and per-client metrics: see docling_mcp/clients.py.
+
+Endpoints:
+- /mcp (MCP_HTTP_PATH): MCP streamable-HTTP transport (or /sse with --transport sse)
+- /metrics, /health, /health/live, /health/ready: see docling_mcp/http_server.py
+
+Settings:
+- MCP_HTTP_PATH: MCP endpoint path (default: /mcp, /sse for the SSE transport)
+- MCP_STATELESS_HTTP: one throwaway MCP session per request instead of one per
+  client (default: false); server memory then depends only on requests in flight
+
+Usage:
+    uv run python mcp_server.py --transport http
+    uvicorn docling_mcp.asgi:create_app --factory --port 8080
+"""
+
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI
+
+from docling_mcp import health
+from docling_mcp.clients import build_auth_provider
+from docling_mcp.http_server import router as observability_router
+from docling_mcp.server import mcp
+
+logger = logging.getLogger(__name__)
+
+MCP_HTTP_PATH = os.getenv("MCP_HTTP_PATH", "")
+MCP_STATELESS_HTTP = os.getenv("MCP_STATELESS_HTTP", "false").lower() == "true"
+
+
+def create_app(
+    path: Optional[str] = None,
+    transport: str = "http",
+    stateless: bool = MCP_STATELESS_HTTP,
+) -> FastAPI:
+    """
+    Build the single-loop app.
+
+    Args:
+        path: Path of the MCP endpoint (default: MCP_HTTP_PATH, else /mcp or /sse)
+        transport: "http" (streamable HTTP) or "sse" (legacy SSE clients)
+        stateless: Do not keep MCP sessions between requests (streamable HTTP only)
+
+    Returns:
+        FastAPI app with the observability routes and the MCP transport mounted at /
+    """
+    path = path or MCP_HTTP_PATH or ("/sse" if transport == "sse" else "/mcp")
+    # Must be set before the transport app is built; STDIO stays unauthenticated
+    mcp.auth = build_auth_provider()
+    if transport == "sse":
+        mcp_app = mcp.http_app(path=path, transport="sse")
+    else:
+        mcp_app = mcp.http_app(path=path, stateless_http=stateless)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # MCP lifespan (docling_mcp/lifespan.py) and session manager
+        async with mcp_app.lifespan(app):
+            health.use_shared_pool(True)
+            health.health_monitor.start()
+            logger.info(f"Single-loop MCP server ready (MCP endpoint: {path}, {transport})")
+            try:
+                yield
+            finally:
+                await health.health_monitor.stop()
+                health.use_shared_pool(False)
+
+    app = FastAPI(
+        title="Docling RAG Agent - MCP",
+        description="MCP streamable-HTTP transport with metrics and health endpoints",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url=None,
+        redirect_slashes=False,
+        lifespan=lifespan,
+    )
+    app.state.mcp_path = path
+    app.include_router(observability_router)
+    # Last: everything the observability routes do not match goes to the MCP app
+    app.mount("/", mcp_app)
+    return app
@@ -0,0 +1,200 @@
+"""
+MCP Clients
+===========
+Authentication, identity and per-client metrics for the networked MCP server
+(mcp_server.py --transport http|sse).
+
+Over STDIO every Cursor / Claude Desktop client spawns its own server process,
+with its own embedder, cache and database pool. Over HTTP many clients share
+one warm process: memory and connections follow the request load (the shared
+pool, embedder cache and admission control), not the number of clients. Each
+client keeps its own MCP session (Mcp-Session-Id), tracked here.
+
+Authentication (build_auth_provider, HTTP transports only):
+- MCP_AUTH_PROVIDER="package.module:factory": the factory returns any FastMCP
+  AuthProvider (JWT verifier, OAuth proxy, ...), the hook for identity providers
+- MCP_AUTH_TOKENS="cursor-alice:token1,desktop-bob:token2": static bearer
+  tokens, one per client
+- Neither: no authentication (bind to localhost or a private network)
+
+Client identity (client_id): the authenticated client id, else the clientInfo
+name sent at initialize (e.g. "cursor"), else "anonymous". It is the "client"
+label of mcp_client_requests_total; past MCP_METRICS_MAX_CLIENTS distinct
+clients the label becomes "other" to bound metric cardinality.
+"""
+
+import hashlib
+import importlib
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastmcp import Context
+from fastmcp.server.auth import AccessToken, AuthProvider, TokenVerifier
+from fastmcp.server.dependencies import get_access_token
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+from docling_mcp.metrics import record_client_request, record_client_sessions
+
+logger = logging.getLogger(__name__)
+
+MCP_AUTH_PROVIDER = os.getenv("MCP_AUTH_PROVIDER", "")
+MCP_AUTH_TOKENS = os.getenv("MCP_AUTH_TOKENS", "")
+MCP_METRICS_MAX_CLIENTS = int(os.getenv("MCP_METRICS_MAX_CLIENTS", "50"))
+MCP_SESSION_IDLE_TIMEOUT = float(os.getenv("MCP_SESSION_IDLE_TIMEOUT", "1800"))
+
+ANONYMOUS_CLIENT = "anonymous"
+OTHER_CLIENTS = "other"
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def parse_tokens(spec: str) -> Dict[str, str]:
+    """
+    Parse MCP_AUTH_TOKENS.
+
+    Args:
+        spec: Comma-separated "client:token" pairs
+
+    Returns:
+        Client id per token
+
+    Raises:
+        ValueError: If a pair has no client id or no token
+    """
+    tokens: Dict[str, str] = {}
+    for pair in spec.split(","):
+        pair = pair.strip()
+        if not pair:
+            continue
+        client, sep, token = pair.partition(":")
+        if not sep or not client.strip() or not token.strip():
+            raise ValueError("MCP_AUTH_TOKENS entries must be 'client:token'")
+        tokens[token.strip()] = client.strip()
+    return tokens
+
+
+class ClientTokenVerifier(TokenVerifier):
+    """Bearer tokens issued per client (MCP_AUTH_TOKENS)."""
+
+    def __init__(self, tokens: Dict[str, str]):
+        """
+        Args:
+            tokens: Client id per token
+        """
+        super().__init__()
+        # Keyed by digest: lookups do not compare the secret itself
+        self._clients = {_digest(token): client for token, client in tokens.items()}
+
+    async def verify_token(self, token: str) -> Optional[AccessToken]:
+        client = self._clients.get(_digest(token))
+        if client is None:
+            return None
+        return AccessToken(token=token, client_id=client, scopes=[])
+
+
+def build_auth_provider() -> Optional[AuthProvider]:
+    """
+    Auth provider for the HTTP transports, from MCP_AUTH_PROVIDER or MCP_AUTH_TOKENS.
+
+    Returns:
+        The provider, or None when authentication is not configured
+    """
+    if MCP_AUTH_PROVIDER:
+        module_name, _, factory_name = MCP_AUTH_PROVIDER.partition(":")
+        factory = getattr(importlib.import_module(module_name), factory_name)
+        logger.info(f"MCP authentication: {MCP_AUTH_PROVIDER}")
+        return factory()
+
+    if MCP_AUTH_TOKENS:
+        tokens = parse_tokens(MCP_AUTH_TOKENS)
+        logger.info(f"MCP authentication: bearer tokens for {len(set(tokens.values()))} clients")
+        return ClientTokenVerifier(tokens)
+
+    logger.warning("MCP authentication disabled: set MCP_AUTH_TOKENS or MCP_AUTH_PROVIDER")
+    return None
+
+
+def client_id(ctx: Optional[Context]) -> str:
+    """Identity of the client behind the current request (see module docstring)."""
+    token = get_access_token()
+    if token is not None and token.client_id:
+        return token.client_id
+
+    try:
+        name = ctx.session.client_params.clientInfo.name
+        if name:
+            return name
+    except Exception:
+        pass  # No session or no initialize params
+    return ANONYMOUS_CLIENT
+
+
+class ClientTrackingMiddleware(Middleware):
+    """Counts tool calls per client and tracks active MCP sessions."""
+
+    def __init__(
+        self,
+        max_clients: int = MCP_METRICS_MAX_CLIENTS,
+        idle_timeout: float = MCP_SESSION_IDLE_TIMEOUT,
+    ):
+        """
+        Args:
+            max_clients: Distinct client labels before falling back to "other"
+            idle_timeout: Seconds without calls after which a session stops counting as active
+        """
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self._labels: Set[str] = set()
+        # session id -> (client id, last call)
+        self._sessions: Dict[str, Tuple[str, float]] = {}
+
+    def _label(self, client: str) -> str:
+        if client in self._labels:
+            return client
+        if len(self._labels) >= self.max_clients:
+            return OTHER_CLIENTS
+        self._labels.add(client)
+        return client
+
+    def _touch_session(self, ctx: Optional[Context], client: str) -> None:
+        try:
+            session_id = ctx.session_id
+        except Exception:
+            return  # No MCP session (direct calls)
+
+        now = time.monotonic()
+        self._sessions[session_id] = (client, now)
+        expired = [
+            sid for sid, (_, seen) in self._sessions.items() if now - seen > self.idle_timeout
+        ]
+        for sid in expired:
+            del self._sessions[sid]
+        record_client_sessions(len(self._sessions))
+
+    def active_sessions(self) -> Dict[str, int]:
+        """Active sessions per client."""
+        counts: Dict[str, int] = {}
+        for client, _ in self._sessions.values():
+            counts[client] = counts.get(client, 0) + 1
+        return counts
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next) -> Any:
+        ctx = context.fastmcp_context
+        client = client_id(ctx)
+        self._touch_session(ctx, client)
+
+        status = "success"
+        try:
+            return await call_next(context)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            record_client_request(self._label(client), context.message.name, status)
+
+
+client_tracking = ClientTrackingMiddleware()
@@ -5,11 +5,19 @@ Provides health check functionality for the MCP server.
 
 Endpoints:
 - GET /health: Returns JSON with status (ok/degraded/down), timestamp, and services status
+- GET /health/live: Liveness (no dependency checks)
+- GET /health/ready: Readiness from the cached status
+
+Checks run in the background every HEALTH_CHECK_INTERVAL seconds (health_monitor,
+utils/health_monitor.py); probes return the cached result with its age.
+The database is checked on a dedicated connection, or through the search pool
+in single-loop mode (docling_mcp/asgi.py), which also reports the pool state.
 
 Status Logic:
 - "ok": All services (database, langfuse, embedder) are UP
 - "degraded": LangFuse unavailable but database and embedder UP
-- "down": Database unavailable (critical dependency)
+- "down": Database unavailable (critical dependency), or embedder not ready
+  or search warm-up still running (core/warmup.py)
 """
 
 import logging
@@ -17,8 +25,20 @@ import time
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, Literal
 
+from utils.health_monitor import HealthMonitor
+
 logger = logging.getLogger(__name__)
 
+# Check the database through the search pool: only when the checks run in the
+# pool's event loop (single-loop mode)
+_use_shared_pool = False
+
+
+def use_shared_pool(enabled: bool = True) -> None:
+    """Check the database through the search pool (single-loop mode only)."""
+    global _use_shared_pool
+    _use_shared_pool = enabled
+
 
 @dataclass
 class ServiceStatus:
@@ -52,15 +72,24 @@ async def check_database() -> ServiceStatus:
     start_time = time.time()
 
     try:
-        from utils.db_utils import test_connection
+        from utils.db_utils import db_pool, test_connection
+
+        if _use_shared_pool:
+            from docling_mcp.metrics import record_db_pool
 
-        is_connected = await test_connection()
+            is_connected = await db_pool.ping()
+            stats = db_pool.stats()
+            record_db_pool(stats["size"] - stats["idle"], stats["idle"])
+            detail = f"pool: {stats['size'] - stats['idle']}/{stats['max']} in use"
+        else:
+            is_connected = await test_connection()
+            detail = "Supabase/PostgreSQL"
         latency_ms = (time.time() - start_time) * 1000
 
         if is_connected:
             return ServiceStatus(
                 status="up",
-                message="Database connection successful (Supabase/PostgreSQL)",
+                message=f"Database connection successful ({detail})",
                 latency_ms=latency_ms,
             )
         else:
@@ -137,8 +166,15 @@ async def check_embedder() -> ServiceStatus:
             latency_ms = (time.time() - start_time) * 1000
 
             if embedder is not None:
+                from docling_mcp.metrics import record_embedding_cache_entries
+
+                cache = getattr(embedder, "cache", None)
+                entries = len(cache) if cache is not None else 0
+                record_embedding_cache_entries(entries)
                 return ServiceStatus(
-                    status="up", message="Embedder initialized and ready", latency_ms=latency_ms
+                    status="up",
+                    message=f"Embedder initialized and ready (cache: {entries} entries)",
+                    latency_ms=latency_ms,
                 )
             else:
                 return ServiceStatus(
@@ -160,6 +196,26 @@ async def check_embedder() -> ServiceStatus:
         )
 
 
+def check_warmup() -> ServiceStatus:
+    """
+    Check search warm-up (embedding cache, HNSW buffers, prepared statements).
+
+    Returns:
+        ServiceStatus "down" while warm-up runs, else "up" with its outcome
+    """
+    try:
+        from core.warmup import get_warmup_status, is_warming
+
+        status = get_warmup_status()
+        if is_warming():
+            return ServiceStatus(status="down", message="Search warm-up in progress")
+        return ServiceStatus(status="up", message=f"Search warm-up {status['state']}")
+
+    except Exception as e:
+        logger.error(f"Warm-up health check failed: {e}")
+        return ServiceStatus(status="down", message=f"Warm-up check error: {str(e)}")
+
+
 async def get_health_status() -> HealthResponse:
     """
     Get overall health status of the MCP server.
@@ -170,7 +226,7 @@ async def get_health_status() -> HealthResponse:
     Status Logic:
     - "ok": All services UP
     - "degraded": LangFuse DOWN but database and embedder UP
-    - "down": Database DOWN (critical dependency)
+    - "down": Database DOWN (critical dependency), embedder DOWN or warm-up running
     """
     timestamp = time.time()
 
@@ -178,12 +234,14 @@ async def get_health_status() -> HealthResponse:
     db_status = await check_database()
     langfuse_status = check_langfuse()
     embedder_status = await check_embedder()
+    warmup_status = check_warmup()
 
     # Convert to dict format
     services = {
         "database": asdict(db_status),
         "langfuse": asdict(langfuse_status),
         "embedder": asdict(embedder_status),
+        "warmup": asdict(warmup_status),
     }
 
     # Determine overall status
@@ -193,6 +251,9 @@ async def get_health_status() -> HealthResponse:
     # Embedder DOWN → overall DOWN (critical dependency)
     elif embedder_status.status == "down":
         overall_status = "down"
+    # Warm-up running → not ready yet (first searches would be cold)
+    elif warmup_status.status == "down":
+        overall_status = "down"
     # LangFuse DOWN → degraded (non-critical, graceful degradation)
     elif langfuse_status.status == "down":
         overall_status = "degraded"
@@ -210,6 +271,14 @@ async def get_health_status() -> HealthResponse:
     )
 
 
+async def _health_status_dict() -> Dict[str, Any]:
+    return (await get_health_status()).to_dict()
+
+
+# Started by the observability server lifespan, in the loop serving the endpoints
+health_monitor = HealthMonitor(_health_status_dict)
+
+
 def get_health_response_dict() -> Dict[str, Any]:
     """
     Synchronous wrapper for health check (for simple HTTP handlers).
@@ -5,22 +5,39 @@ Provides FastAPI HTTP endpoints for Prometheus metrics and health checks.
 
 Endpoints:
 - GET /metrics: Prometheus-format metrics
-- GET /health: JSON health status
+- GET /health: JSON health status (cached, see docling_mcp/health.py)
+- GET /health/live, /health/ready: Liveness and readiness probes
 
-This server runs alongside the MCP server to expose observability endpoints.
+This server runs alongside the MCP server to expose observability endpoints
+(STDIO mode, own event loop in a thread). The single-loop mode serves the same
+router next to the MCP HTTP transport (docling_mcp/asgi.py).
 """
 
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Response
+from fastapi import APIRouter, FastAPI, Response
 from fastapi.responses import JSONResponse
 
-from docling_mcp.health import get_health_status
+from docling_mcp.health import health_monitor
 from docling_mcp.metrics import generate_metrics_output, get_metrics_content_type
+from utils.db_utils import close_health_connection
+from utils.health_monitor import is_ready
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run health checks in the background of this server's event loop."""
+    health_monitor.start()
+    yield
+    await health_monitor.stop()
+    await close_health_connection()
+
+
 # Create FastAPI app for observability endpoints
 # Disable automatic redirects to prevent /metrics -> /metric issues
 app = FastAPI(
@@ -30,10 +47,14 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url=None,
     redirect_slashes=False,  # Disable automatic redirects to prevent routing issues
+    lifespan=lifespan,
 )
 
+# Endpoints, shared with the single-loop app (docling_mcp/asgi.py)
+router = APIRouter()
+
 
-@app.get("/metrics", tags=["Observability"])
+@router.get("/metrics", tags=["Observability"])
 async def metrics_endpoint():
     """
     Prometheus metrics endpoint.
@@ -53,7 +74,7 @@ async def metrics_endpoint():
     return Response(content=metrics_output, media_type=get_metrics_content_type())
 
 
-@app.get("/metrics/", tags=["Observability"])
+@router.get("/metrics/", tags=["Observability"])
 async def metrics_endpoint_with_slash():
     """
     Prometheus metrics endpoint (with trailing slash).
@@ -64,7 +85,7 @@ async def metrics_endpoint_with_slash():
     return Response(content=metrics_output, media_type=get_metrics_content_type())
 
 
-@app.get("/health", tags=["Observability"])
+@router.get("/health", tags=["Observability"])
 async def health_endpoint():
     """
     Health check endpoint.
@@ -72,26 +93,51 @@ async def health_endpoint():
     Returns JSON response with:
     - status: "ok" | "degraded" | "down"
     - timestamp: Unix timestamp of the check
-    - services: Status of each service (database, langfuse, embedder)
+    - checked_at / age_seconds / stale: age of the cached result
+    - services: Status of each service (database, langfuse, embedder, warmup)
+
+    Served from the background health monitor: probes never run the checks
+    themselves (a stale result counts as "down").
 
     Status Logic:
     - "ok": All services operational
     - "degraded": LangFuse unavailable (non-critical, graceful degradation)
     - "down": Database or embedder unavailable (critical dependencies)
     """
-    health_response = await get_health_status()
+    health_response = await health_monitor.get()
+
+    # "degraded" is still operational: 200; "down" (or stale): 503
+    status_code = 200 if is_ready(health_response) else 503
 
-    # Set appropriate HTTP status code
-    status_code = 200
-    if health_response.status == "degraded":
-        status_code = 200  # Still operational, just degraded
-    elif health_response.status == "down":
-        status_code = 503  # Service unavailable
+    return JSONResponse(content=health_response, status_code=status_code)
 
-    return JSONResponse(content=health_response.to_dict(), status_code=status_code)
 
+@router.get("/health/live", tags=["Observability"])
+async def liveness_endpoint():
+    """Liveness probe: the server answers (no dependency checks)."""
+    return {"status": "alive", "timestamp": time.time()}
 
-@app.get("/", tags=["Info"])
+
+@router.get("/health/ready", tags=["Observability"])
+async def readiness_endpoint():
+    """
+    Readiness probe from the cached health status.
+
+    Returns 200 when database and embedder are up and warm-up is done, else 503.
+    """
+    health_response = await health_monitor.get()
+    ready = is_ready(health_response)
+    return JSONResponse(
+        content={
+            "ready": ready,
+            "status": health_response["status"],
+            "age_seconds": health_response["age_seconds"],
+        },
+        status_code=200 if ready else 503,
+    )
+
+
+@router.get("/", tags=["Info"])
 async def root():
     """Root endpoint with service info."""
     return {
@@ -99,11 +145,16 @@ async def root():
         "endpoints": {
             "/metrics": "Prometheus metrics",
             "/health": "Health check",
+            "/health/live": "Liveness probe",
+            "/health/ready": "Readiness probe",
             "/docs": "API documentation",
         },
     }
 
 
+app.include_router(router)
+
+
 def run_http_server(host: str = "0.0.0.0", port: int = 8080):
     """
     Run the HTTP server for observability endpoints.
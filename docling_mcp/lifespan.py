@@ -101,7 +101,8 @@ async def lifespan(server: FastMCP):
         logger.info("Initializing database connection...")
         await initialize_database()
 
-        # Initialize global embedder (this might take a moment)
+        # Initialize global embedder (this might take a moment), then warm up
+        # caches and index buffers in the background (core/warmup.py)
         logger.info("Initializing global embedder...")
         await initialize_global_embedder()
 
@@ -9,6 +9,26 @@ Metrics:
 - rag_embedding_time_seconds: Histogram for embedding generation time
 - rag_db_search_time_seconds: Histogram for database search time
 - rag_llm_generation_time_seconds: Histogram for LLM generation time
+- rag_llm_time_to_first_token_seconds: Histogram for streamed time-to-first-token
+- rag_search_plan_total: Counter for vector search plans
+- rag_embedding_backfill_chunks: Gauge for chunks embedded per embedding space
+- rag_embedding_backfill_target_chunks: Gauge for chunks to embed per embedding space
+- rag_embedding_queue_seconds: Histogram for embedding request queue time per priority
+- rag_embedding_queued_requests: Gauge for embedding requests waiting per priority
+- rag_admission_queue_depth: Gauge for requests waiting for admission per endpoint
+- rag_admission_shed_total: Counter for requests shed by admission control
+- rag_embedding_hedges_total: Counter for hedged embedding requests by winning attempt
+- rag_embedding_hedge_delay_seconds: Gauge for the current hedge delay
+- rag_embedding_circuit_state: Gauge for the embedding circuit breaker state
+- rag_embedding_circuit_rejected_total: Counter for calls failed fast by the breaker
+- rag_embedding_fallback_total: Counter for query embeddings served by the fallback endpoint
+- rag_warmup_duration_seconds: Gauge for the startup warm-up duration by outcome
+- rag_db_pool_connections: Gauge for search pool connections by state (single-loop mode)
+- rag_embedding_cache_entries: Gauge for query embeddings in the embedder cache
+- mcp_client_requests_total: Counter for MCP tool calls per client
+- mcp_client_sessions: Gauge for active MCP client sessions
+- rag_tracing_overhead_seconds: Histogram for the time tracing adds to a request
+- rag_cost_backfill_total: Counter for query costs reconciled from LangFuse traces
 - mcp_active_requests: Gauge for concurrent requests
 
 Bucket Configuration:
@@ -16,9 +36,19 @@ Bucket Configuration:
 - Embedding time: [0.1, 0.2, 0.3, 0.4, 0.5, 1.0] aligned with <500ms SLO
 - DB search time: [0.01, 0.05, 0.1, 0.2, 0.5, 1.0] aligned with <100ms SLO
 - LLM generation: [0.5, 1.0, 1.5, 2.0, 3.0, 5.0] aligned with <1.5s SLO
+- LLM time-to-first-token: [0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0]
+- Embedding queue time: [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0]
+- Tracing overhead: [0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005] (<1ms budget)
+
+Multiple processes:
+With PROMETHEUS_MULTIPROC_DIR set (multi-worker API, api/serve.py) every process
+writes its samples to that directory and /metrics merges them: counters and
+histograms are summed, gauges follow their multiprocess_mode (queue depths and
+connections are summed over live workers, per-worker state gets a "pid" label).
 """
 
 import logging
+import os
 import time
 from contextlib import contextmanager
 
@@ -34,6 +64,26 @@ mcp_request_duration_seconds = None
 rag_embedding_time_seconds = None
 rag_db_search_time_seconds = None
 rag_llm_generation_time_seconds = None
+rag_llm_time_to_first_token_seconds = None
+rag_search_plan_total = None
+rag_embedding_backfill_chunks = None
+rag_embedding_backfill_target_chunks = None
+rag_embedding_queue_seconds = None
+rag_embedding_queued_requests = None
+rag_admission_queue_depth = None
+rag_admission_shed_total = None
+rag_embedding_hedges_total = None
+rag_embedding_hedge_delay_seconds = None
+rag_embedding_circuit_state = None
+rag_embedding_circuit_rejected_total = None
+rag_embedding_fallback_total = None
+rag_warmup_duration_seconds = None
+rag_db_pool_connections = None
+rag_embedding_cache_entries = None
+mcp_client_requests_total = None
+mcp_client_sessions = None
+rag_tracing_overhead_seconds = None
+rag_cost_backfill_total = None
 mcp_active_requests = None
 
 
@@ -42,7 +92,17 @@ def _initialize_metrics():
     global _metrics_initialized, _metrics_available
     global mcp_requests_total, mcp_request_duration_seconds
     global rag_embedding_time_seconds, rag_db_search_time_seconds
-    global rag_llm_generation_time_seconds, mcp_active_requests
+    global rag_llm_generation_time_seconds, rag_llm_time_to_first_token_seconds
+    global rag_search_plan_total, mcp_active_requests
+    global rag_embedding_backfill_chunks, rag_embedding_backfill_target_chunks
+    global rag_embedding_queue_seconds, rag_embedding_queued_requests
+    global rag_admission_queue_depth, rag_admission_shed_total
+    global rag_embedding_hedges_total, rag_embedding_hedge_delay_seconds
+    global rag_embedding_circuit_state, rag_embedding_circuit_rejected_total
+    global rag_embedding_fallback_total, rag_warmup_duration_seconds
+    global rag_db_pool_connections, rag_embedding_cache_entries
+    global mcp_client_requests_total, mcp_client_sessions
+    global rag_tracing_overhead_seconds, rag_cost_backfill_total
 
     if _metrics_initialized:
         return
@@ -86,9 +146,125 @@ def _initialize_metrics():
             buckets=[0.5, 1.0, 1.5, 2.0, 3.0, 5.0],
         )
 
+        # Time-to-first-token histogram for streamed responses (includes tool calls)
+        rag_llm_time_to_first_token_seconds = Histogram(
+            "rag_llm_time_to_first_token_seconds",
+            "Time from agent start to first streamed token in seconds",
+            buckets=[0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0],
+        )
+
+        # Plan chosen for filtered vector searches (see core/rag_service.py)
+        rag_search_plan_total = Counter(
+            "rag_search_plan_total", "Vector search executions by query plan", ["plan"]
+        )
+
+        # Embedding space backfill progress (see ingestion/embedding_backfill.py)
+        rag_embedding_backfill_chunks = Gauge(
+            "rag_embedding_backfill_chunks", "Chunks embedded in an embedding space", ["space"]
+        )
+        rag_embedding_backfill_target_chunks = Gauge(
+            "rag_embedding_backfill_target_chunks",
+            "Chunks an embedding space must cover",
+            ["space"],
+        )
+
+        # Embedding scheduler lanes (see ingestion/embedding_scheduler.py)
+        rag_embedding_queue_seconds = Histogram(
+            "rag_embedding_queue_seconds",
+            "Time embedding requests wait for a slot, by priority class",
+            ["priority"],
+            buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0],
+        )
+        rag_embedding_queued_requests = Gauge(
+            "rag_embedding_queued_requests",
+            "Embedding requests waiting for a slot, by priority class",
+            ["priority"],
+            multiprocess_mode="livesum",
+        )
+
+        # Admission control (see core/admission.py)
+        rag_admission_queue_depth = Gauge(
+            "rag_admission_queue_depth",
+            "Requests waiting for admission",
+            ["endpoint"],
+            multiprocess_mode="livesum",
+        )
+        rag_admission_shed_total = Counter(
+            "rag_admission_shed_total",
+            "Requests rejected by admission control",
+            ["endpoint", "reason"],
+        )
+
+        # Hedging and circuit breaker (see ingestion/embedding_resilience.py)
+        rag_embedding_hedges_total = Counter(
+            "rag_embedding_hedges_total",
+            "Query embeddings that sent a hedge request, by winning attempt",
+            ["winner"],
+        )
+        rag_embedding_hedge_delay_seconds = Gauge(
+            "rag_embedding_hedge_delay_seconds",
+            "Delay before a query embedding is hedged (recent p95 latency)",
+            multiprocess_mode="liveall",
+        )
+        rag_embedding_circuit_state = Gauge(
+            "rag_embedding_circuit_state",
+            "Embedding circuit breaker state (0 closed, 1 half-open, 2 open)",
+            multiprocess_mode="liveall",
+        )
+        rag_embedding_circuit_rejected_total = Counter(
+            "rag_embedding_circuit_rejected_total",
+            "Embedding calls failed fast by the open circuit breaker",
+        )
+        rag_embedding_fallback_total = Counter(
+            "rag_embedding_fallback_total",
+            "Query embeddings served by the fallback endpoint",
+        )
+        rag_warmup_duration_seconds = Gauge(
+            "rag_warmup_duration_seconds",
+            "Duration of the startup search warm-up",
+            ["outcome"],
+            multiprocess_mode="liveall",
+        )
+        rag_db_pool_connections = Gauge(
+            "rag_db_pool_connections",
+            "Search pool connections by state (in_use, idle)",
+            ["state"],
+            multiprocess_mode="livesum",
+        )
+        rag_embedding_cache_entries = Gauge(
+            "rag_embedding_cache_entries",
+            "Query embeddings held in the embedder cache",
+            multiprocess_mode="livemax",  # Shared cache: every worker sees the same entries
+        )
+        mcp_client_requests_total = Counter(
+            "mcp_client_requests_total",
+            "MCP tool calls per client",
+            ["client", "tool_name", "status"],
+        )
+        mcp_client_sessions = Gauge(
+            "mcp_client_sessions",
+            "MCP client sessions with a tool call within MCP_SESSION_IDLE_TIMEOUT",
+            multiprocess_mode="livesum",
+        )
+
+        # Tracing facade (see utils/tracing.py)
+        rag_tracing_overhead_seconds = Histogram(
+            "rag_tracing_overhead_seconds",
+            "Time tracing adds to a request, by source and head-sampling decision",
+            ["source", "sampled"],
+            buckets=[0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005],
+        )
+        rag_cost_backfill_total = Counter(
+            "rag_cost_backfill_total",
+            "Query costs reconciled from LangFuse traces, by outcome",
+            ["outcome"],
+        )
+
         # Active requests gauge
         mcp_active_requests = Gauge(
-            "mcp_active_requests", "Number of currently active MCP requests"
+            "mcp_active_requests",
+            "Number of currently active MCP requests",
+            multiprocess_mode="livesum",
         )
 
         _metrics_available = True
@@ -138,7 +314,7 @@ def record_request_end(tool_name: str, start_time: float, status: str = "success
     Args:
         tool_name: Name of the MCP tool
         start_time: Start timestamp from record_request_start
-        status: Request status ("success" or "error")
+        status: Request status ("success", "error" or "rejected")
     """
     if not is_metrics_available():
         return
@@ -191,7 +367,8 @@ def record_db_search_time(duration_seconds: float):
 
 def record_llm_generation_time(duration_seconds: float):
     """
-    Record LLM generation time.
+    Record LLM generation time (streamed answers: first to last token, tool calls
+    excluded).
 
     Args:
         duration_seconds: Duration in seconds
@@ -206,6 +383,315 @@ def record_llm_generation_time(duration_seconds: float):
         pass  # Graceful degradation
 
 
+def record_llm_time_to_first_token(duration_seconds: float):
+    """
+    Record time-to-first-token of a streamed LLM response.
+
+    Args:
+        duration_seconds: Duration in seconds
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_llm_time_to_first_token_seconds is not None:
+            rag_llm_time_to_first_token_seconds.observe(duration_seconds)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_search_plan(plan: str):
+    """
+    Record the plan chosen for a vector search.
+
+    Args:
+        plan: "hnsw", "exact_prefilter", "hnsw_iterative" or "hnsw_filtered"
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_search_plan_total is not None:
+            rag_search_plan_total.labels(plan=plan).inc()
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_embedding_backfill(space: str, embedded: int, target: int):
+    """
+    Record the backfill progress of an embedding space.
+
+    Args:
+        space: Embedding space name
+        embedded: Chunks with a vector in the space
+        target: Chunks in the knowledge base
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_embedding_backfill_chunks is not None:
+            rag_embedding_backfill_chunks.labels(space=space).set(embedded)
+        if rag_embedding_backfill_target_chunks is not None:
+            rag_embedding_backfill_target_chunks.labels(space=space).set(target)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_embedding_queue_time(priority: str, duration_seconds: float):
+    """
+    Record how long an embedding request waited for a slot.
+
+    Args:
+        priority: "interactive" or "bulk"
+        duration_seconds: Queue time in seconds
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_embedding_queue_seconds is not None:
+            rag_embedding_queue_seconds.labels(priority=priority).observe(duration_seconds)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_embedding_queue_depth(priority: str, depth: int):
+    """
+    Record the number of embedding requests waiting for a slot.
+
+    Args:
+        priority: "interactive" or "bulk"
+        depth: Requests waiting
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_embedding_queued_requests is not None:
+            rag_embedding_queued_requests.labels(priority=priority).set(depth)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_admission_queue_depth(endpoint: str, depth: int):
+    """
+    Record the number of requests waiting for admission.
+
+    Args:
+        endpoint: Guarded endpoint (e.g. "search")
+        depth: Requests waiting
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_admission_queue_depth is not None:
+            rag_admission_queue_depth.labels(endpoint=endpoint).set(depth)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_admission_shed(endpoint: str, reason: str):
+    """
+    Record a request rejected by admission control.
+
+    Args:
+        endpoint: Guarded endpoint (e.g. "search")
+        reason: "queue_full", "deadline" or "timeout"
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_admission_shed_total is not None:
+            rag_admission_shed_total.labels(endpoint=endpoint, reason=reason).inc()
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_embedding_hedge(winner: str, delay_seconds: float):
+    """
+    Record a query embedding that sent a hedge request.
+
+    Args:
+        winner: Attempt whose response was used ("primary" or "hedge")
+        delay_seconds: Hedge delay in effect
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_embedding_hedges_total is not None:
+            rag_embedding_hedges_total.labels(winner=winner).inc()
+        if rag_embedding_hedge_delay_seconds is not None:
+            rag_embedding_hedge_delay_seconds.set(delay_seconds)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_embedding_circuit_state(state: int):
+    """
+    Record the embedding circuit breaker state.
+
+    Args:
+        state: 0 closed, 1 half-open, 2 open
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_embedding_circuit_state is not None:
+            rag_embedding_circuit_state.set(state)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_embedding_circuit_rejected():
+    """Record an embedding call failed fast by the open circuit breaker."""
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_embedding_circuit_rejected_total is not None:
+            rag_embedding_circuit_rejected_total.inc()
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_embedding_fallback():
+    """Record a query embedding served by the fallback endpoint."""
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_embedding_fallback_total is not None:
+            rag_embedding_fallback_total.inc()
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_warmup(outcome: str, duration_seconds: float):
+    """
+    Record the startup search warm-up.
+
+    Args:
+        outcome: "done", "failed" or "timeout"
+        duration_seconds: Time spent warming up
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_warmup_duration_seconds is not None:
+            rag_warmup_duration_seconds.labels(outcome=outcome).set(duration_seconds)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_db_pool(in_use: int, idle: int):
+    """
+    Record the search pool state.
+
+    Args:
+        in_use: Connections acquired by requests
+        idle: Open connections waiting in the pool
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_db_pool_connections is not None:
+            rag_db_pool_connections.labels(state="in_use").set(in_use)
+            rag_db_pool_connections.labels(state="idle").set(idle)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_embedding_cache_entries(entries: int):
+    """Record the number of query embeddings in the embedder cache."""
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_embedding_cache_entries is not None:
+            rag_embedding_cache_entries.set(entries)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_client_request(client: str, tool_name: str, status: str):
+    """
+    Record an MCP tool call for a client.
+
+    Args:
+        client: Client label (bounded by MCP_METRICS_MAX_CLIENTS)
+        tool_name: Name of the MCP tool
+        status: "success" or "error"
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if mcp_client_requests_total is not None:
+            mcp_client_requests_total.labels(
+                client=client, tool_name=tool_name, status=status
+            ).inc()
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_client_sessions(sessions: int):
+    """Record the number of active MCP client sessions."""
+    if not is_metrics_available():
+        return
+
+    try:
+        if mcp_client_sessions is not None:
+            mcp_client_sessions.set(sessions)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_tracing_overhead(source: str, sampled: bool, duration_seconds: float):
+    """
+    Record the time tracing added to a request.
+
+    Args:
+        source: Traced entry point ("mcp", "api", "streamlit")
+        sampled: Whether the request was traced (head-sampling decision)
+        duration_seconds: Tracing time, excluding the traced function itself
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_tracing_overhead_seconds is not None:
+            rag_tracing_overhead_seconds.labels(
+                source=source, sampled="true" if sampled else "false"
+            ).observe(duration_seconds)
+    except Exception:
+        pass  # Graceful degradation
+
+
+def record_cost_backfill(outcome: str, count: int = 1):
+    """
+    Record query costs handled by the cost backfill job.
+
+    Args:
+        outcome: "reconciled" (cost read from the trace) or "expired" (trace never found)
+        count: Number of query logs
+    """
+    if not is_metrics_available():
+        return
+
+    try:
+        if rag_cost_backfill_total is not None and count:
+            rag_cost_backfill_total.labels(outcome=outcome).inc(count)
+    except Exception:
+        pass  # Graceful degradation
+
+
 @contextmanager
 def track_request(tool_name: str):
     """
@@ -243,8 +729,15 @@ def generate_metrics_output() -> str:
         return "# Prometheus metrics not available\n"
 
     try:
-        from prometheus_client import generate_latest
+        from prometheus_client import CollectorRegistry, generate_latest
+
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            # API workers (api/serve.py): merge the samples every process wrote
+            from prometheus_client import multiprocess
 
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return generate_latest(registry).decode("utf-8")
         return generate_latest().decode("utf-8")
     except Exception as e:
         logger.error(f"Failed to generate metrics: {e}")
@@ -7,25 +7,32 @@ Compatible with Cursor, Claude Desktop, and other MCP clients.
 Architecture:
 - Standalone server with direct service integration (no HTTP proxy)
 - Uses core/rag_service.py directly for RAG operations
-- LangFuse integration for observability tracing (graceful degradation if unavailable)
+- LangFuse integration for observability tracing (graceful degradation if unavailable),
+  head-sampled with export off the request path (utils/tracing.py)
 - Cost tracking via langfuse.openai wrapper in embedder (automatic token/cost calculation)
 - Prometheus metrics for performance monitoring (/metrics endpoint)
 - Health check endpoint (/health) for service status monitoring
+- Shared networked mode for many clients (docling_mcp/asgi.py, docling_mcp/clients.py)
 """
 
 import json
 import logging
 import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Callable, Dict, Optional, Set, TypeVar
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
 
+from core.admission import AdmissionRejectedError, get_admission_controller
+from core.errors import EmbeddingCircuitOpenError
 from core.rag_service import (
+    SearchTimeoutError,
     generate_query_embedding,
+    lexical_search,
     search_with_embedding,
 )
+from docling_mcp.clients import client_tracking
 from docling_mcp.lifespan import lifespan
 from docling_mcp.metrics import (
     record_db_search_time,
@@ -33,32 +40,31 @@ from docling_mcp.metrics import (
     record_request_end,
     record_request_start,
 )
-from utils.db_utils import get_document, list_documents
-
-F = TypeVar("F", bound=Callable[..., Any])
-
+from utils.db_utils import (
+    get_chunk_neighbors,
+    get_document,
+    get_document_chunks,
+    get_document_text_range,
+    get_documents_by_ids,
+    get_knowledge_base_stats,
+    list_documents,
+    list_documents_page,
+)
+from utils.metadata_filter import MetadataFilterError
+from utils.tracing import annotate, is_sampled, traced
+from utils.tracing import get_tracing_client as get_langfuse_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import LangFuse observe decorator with graceful fallback
+# Tracing goes through the facade: cached client, head sampling (utils/tracing.py)
 try:
-    from langfuse import get_client as get_langfuse_client
-    from langfuse import observe
+    import langfuse  # noqa: F401
 
     _langfuse_available = True
 except ImportError:
     _langfuse_available = False
-    get_langfuse_client = None
-
-    # Create no-op decorator as fallback
-    def observe(name=None, **kwargs):  # type: ignore[misc]
-        def decorator(func: F) -> F:
-            return func
-
-        return decorator
-
     logger.info("LangFuse SDK not installed, tracing disabled")
 
 
@@ -78,7 +84,8 @@ async def langfuse_span(
         A dict with 'span' (LangFuse span or None) and 'start_time' for timing.
 
     Note:
-        - Gracefully degrades to no-op if LangFuse unavailable
+        - Gracefully degrades to no-op if LangFuse unavailable or the request is
+          sampled out (utils/tracing.py)
         - Always records timing in span metadata (duration_ms)
         - Also records to Prometheus metrics for embedding and db_search spans
     """
@@ -86,7 +93,7 @@ async def langfuse_span(
     span = None
     span_context = {"span": None, "start_time": start_time}
 
-    if _langfuse_available and get_langfuse_client is not None:
+    if _langfuse_available and is_sampled():
         try:
             client = get_langfuse_client()
             if client is not None:
@@ -133,25 +140,45 @@ def _update_langfuse_metadata(metadata: dict) -> None:
     """
     if not _langfuse_available:
         return
-    try:
-        from langfuse import get_client
-
-        get_client().update_current_span(metadata=metadata)
-    except Exception:
-        pass  # Graceful degradation - don't fail if LangFuse unavailable
+    annotate(metadata)
 
 
 # Initialize FastMCP server
 mcp = FastMCP("Docling RAG Agent", lifespan=lifespan)
+mcp.add_middleware(client_tracking)
 
 # Import and register tools using decorator
 # Tools are defined in their respective modules with @mcp.tool() applied during import
 
 
+async def _embed_within(query: str, deadline: float) -> tuple[Optional[List[float]], float]:
+    """
+    Query embedding bounded by the request deadline.
+
+    Returns (None, elapsed_ms) when the embedding budget runs out or the embedding
+    circuit breaker is open: the tools then answer from lexical_search instead of failing.
+    """
+    start = time.time()
+    try:
+        return await generate_query_embedding(query, deadline=deadline)
+    except (SearchTimeoutError, EmbeddingCircuitOpenError) as e:
+        logger.warning(f"Query embedding unavailable ({e}), using lexical search")
+        return None, (time.time() - start) * 1000
+
+
+_LEXICAL_NOTE = "(Semantic search unavailable: results matched by keywords)\n\n"
+
+
 @mcp.tool()
-@observe(name="query_knowledge_base")
+@traced("query_knowledge_base", source="mcp")
 async def query_knowledge_base(
-    query: str, limit: int = 5, source_filter: Optional[str] = None, ctx: Context = None
+    query: str,
+    limit: int = 5,
+    source_filter: Optional[str] = None,
+    context_window: int = 0,
+    metadata_filter: Optional[Dict[str, Any]] = None,
+    timeout_ms: Optional[int] = None,
+    ctx: Context = None,
 ) -> str:
     """
     Search the knowledge base using semantic similarity.
@@ -163,6 +190,15 @@ async def query_knowledge_base(
         limit: Maximum number of results to return (default: 5)
         source_filter: Optional filter to search only in specific documentation sources.
                       Examples: "langfuse-docs", "docling", "langfuse-docs/deployment".
+        context_window: Include this many chunks before and after each hit (0-5, default: 0).
+                      Overlapping windows are merged into one passage. Use this instead
+                      of fetching the whole document when hits need surrounding context.
+        metadata_filter: Optional filter on document metadata, e.g.
+                      {"version": {"$gte": "2.0"}, "lang": "it"}. Supports equality,
+                      $ne, $in, $gt, $gte, $lt, $lte and dotted keys ("frontmatter.version").
+        timeout_ms: Optional deadline for the search in ms (default: SEARCH_DEADLINE_MS).
+                      If the query cannot be embedded in time, keyword-matched results
+                      are returned instead.
 
     Cost Tracking:
         Embedding generation cost is automatically tracked via langfuse.openai wrapper.
@@ -184,54 +220,91 @@ async def query_knowledge_base(
                 "query": query,
                 "limit": limit,
                 "source_filter": source_filter,
+                "context_window": context_window,
+                "metadata_filter": metadata_filter,
                 "source": "mcp",
             }
         )
 
+        if not 0 <= context_window <= 5:
+            raise ToolError("context_window must be between 0 and 5.")
+
         if ctx:
             await ctx.info(f"Searching knowledge base for: '{query}'")
 
-        # Create separate LangFuse spans for embedding and DB search (AC #2)
-        # This provides granular timing breakdown in LangFuse dashboard
-
-        # Span 1: Embedding generation
-        async with langfuse_span(
-            name="embedding-generation",
-            span_type="span",
-            metadata={"query_length": len(query), "model": "text-embedding-3-small"},
-        ) as embed_span:
-            query_embedding, embedding_ms = await generate_query_embedding(query)
-            if embed_span.get("span"):
-                try:
-                    embed_span["span"].update(
-                        metadata={
-                            "embedding_time_ms": embedding_ms,
-                            "embedding_dim": len(query_embedding),
-                        }
+        # Admission control: shed with Retry-After instead of queueing under overload
+        admission = get_admission_controller("search")
+        deadline = admission.deadline_in(timeout_ms)
+        async with admission.admit(deadline):
+            # Create separate LangFuse spans for embedding and DB search (AC #2)
+            # This provides granular timing breakdown in LangFuse dashboard
+
+            # Span 1: Embedding generation
+            async with langfuse_span(
+                name="embedding-generation",
+                span_type="span",
+                metadata={"query_length": len(query), "model": "text-embedding-3-small"},
+            ) as embed_span:
+                query_embedding, embedding_ms = await _embed_within(query, deadline)
+                if embed_span.get("span"):
+                    try:
+                        embed_span["span"].update(
+                            metadata={
+                                "embedding_time_ms": embedding_ms,
+                                "embedding_dim": len(query_embedding or []),
+                                "timed_out": query_embedding is None,
+                            }
+                        )
+                    except Exception:
+                        pass
+
+            # Span 2: Vector database search
+            async with langfuse_span(
+                name="vector-search",
+                span_type="span",
+                metadata={
+                    "limit": limit,
+                    "source_filter": source_filter,
+                    "context_window": context_window,
+                    "metadata_filter": metadata_filter,
+                },
+            ) as search_span:
+                if query_embedding is None:
+                    results_list, db_ms = await lexical_search(
+                        query,
+                        limit,
+                        source_filter,
+                        context_window=context_window,
+                        metadata_filter=metadata_filter,
+                        deadline=deadline,
                     )
-                except Exception:
-                    pass
-
-        # Span 2: Vector database search
-        async with langfuse_span(
-            name="vector-search",
-            span_type="span",
-            metadata={"limit": limit, "source_filter": source_filter},
-        ) as search_span:
-            results_list, db_ms = await search_with_embedding(query_embedding, limit, source_filter)
-            if search_span.get("span"):
-                try:
-                    search_span["span"].update(
-                        metadata={"db_search_time_ms": db_ms, "results_count": len(results_list)}
+                else:
+                    results_list, db_ms = await search_with_embedding(
+                        query_embedding,
+                        limit,
+                        source_filter,
+                        context_window=context_window,
+                        metadata_filter=metadata_filter,
+                        deadline=deadline,
                     )
-                except Exception:
-                    pass
+                if search_span.get("span"):
+                    try:
+                        search_span["span"].update(
+                            metadata={
+                                "db_search_time_ms": db_ms,
+                                "results_count": len(results_list),
+                            }
+                        )
+                    except Exception:
+                        pass
 
         # Build results dict for compatibility
         results = {
             "results": results_list,
             "timing": {"embedding_ms": embedding_ms, "db_ms": db_ms},
         }
+        if query_embedding is None:
+            results["timing"].update(timed_out_stage="embedding", fallback="lexical")
 
         if not results_list:
             filter_msg = f" in '{source_filter}'" if source_filter else ""
@@ -244,10 +317,23 @@ async def query_knowledge_base(
             row_dict: Dict[str, Any] = row  # type: ignore[assignment]
             title = row_dict.get("title", "Unknown")
             content = row_dict.get("content", "")
-            response_parts.append(f"[Source: {title}]\n{content}\n")
+            chunk_ref = f" (chunk_id: {row_dict['chunk_id']})" if row_dict.get("chunk_id") else ""
+            if row_dict.get("chunk_start") is not None:
+                chunk_ref += f" [chunks {row_dict['chunk_start']}-{row_dict['chunk_end']}]"
+            response_parts.append(f"[Source: {title}]{chunk_ref}\n{content}\n")
 
-        return "\n---\n".join(response_parts)
+        note = _LEXICAL_NOTE if query_embedding is None else ""
+        return note + "\n---\n".join(response_parts)
 
+    except ToolError:
+        status = "error"
+        raise
+    except AdmissionRejectedError as e:
+        status = "rejected"
+        raise ToolError(str(e))
+    except MetadataFilterError as e:
+        status = "error"
+        raise ToolError(f"Invalid metadata_filter: {e}")
     except Exception as e:
         status = "error"
         logger.error(f"Error in query_knowledge_base: {e}", exc_info=True)
@@ -257,8 +343,10 @@ async def query_knowledge_base(
 
 
 @mcp.tool()
-@observe(name="ask_knowledge_base")
-async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None) -> str:
+@traced("ask_knowledge_base", source="mcp")
+async def ask_knowledge_base(
+    question: str, limit: int = 5, timeout_ms: Optional[int] = None, ctx: Context = None
+) -> str:
     """
     Ask the knowledge base a question and get an answer.
 
@@ -268,6 +356,7 @@ async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None)
     Args:
         question: The question to ask the knowledge base.
         limit: Maximum number of results to return (default: 5).
+        timeout_ms: Optional deadline for the search in ms (default: SEARCH_DEADLINE_MS).
 
     Cost Tracking:
         Embedding generation cost is automatically tracked via langfuse.openai wrapper.
@@ -290,44 +379,59 @@ async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None)
         if ctx:
             await ctx.info(f"Asking knowledge base: '{question}'")
 
-        # Create separate LangFuse spans for embedding and DB search (AC #2)
-        # This provides granular timing breakdown in LangFuse dashboard
-
-        # Span 1: Embedding generation
-        async with langfuse_span(
-            name="embedding-generation",
-            span_type="span",
-            metadata={"question_length": len(question), "model": "text-embedding-3-small"},
-        ) as embed_span:
-            query_embedding, embedding_ms = await generate_query_embedding(question)
-            if embed_span.get("span"):
-                try:
-                    embed_span["span"].update(
-                        metadata={
-                            "embedding_time_ms": embedding_ms,
-                            "embedding_dim": len(query_embedding),
-                        }
-                    )
-                except Exception:
-                    pass
-
-        # Span 2: Vector database search
-        async with langfuse_span(
-            name="vector-search", span_type="span", metadata={"limit": limit}
-        ) as search_span:
-            results_list, db_ms = await search_with_embedding(query_embedding, limit)
-            if search_span.get("span"):
-                try:
-                    search_span["span"].update(
-                        metadata={"db_search_time_ms": db_ms, "results_count": len(results_list)}
+        # Admission control: shed with Retry-After instead of queueing under overload
+        admission = get_admission_controller("search")
+        deadline = admission.deadline_in(timeout_ms)
+        async with admission.admit(deadline):
+            # Create separate LangFuse spans for embedding and DB search (AC #2)
+            # This provides granular timing breakdown in LangFuse dashboard
+
+            # Span 1: Embedding generation
+            async with langfuse_span(
+                name="embedding-generation",
+                span_type="span",
+                metadata={"question_length": len(question), "model": "text-embedding-3-small"},
+            ) as embed_span:
+                query_embedding, embedding_ms = await _embed_within(question, deadline)
+                if embed_span.get("span"):
+                    try:
+                        embed_span["span"].update(
+                            metadata={
+                                "embedding_time_ms": embedding_ms,
+                                "embedding_dim": len(query_embedding or []),
+                                "timed_out": query_embedding is None,
+                            }
+                        )
+                    except Exception:
+                        pass
+
+            # Span 2: Vector database search
+            async with langfuse_span(
+                name="vector-search", span_type="span", metadata={"limit": limit}
+            ) as search_span:
+                if query_embedding is None:
+                    results_list, db_ms = await lexical_search(question, limit, deadline=deadline)
+                else:
+                    results_list, db_ms = await search_with_embedding(
+                        query_embedding, limit, deadline=deadline
                     )
-                except Exception:
-                    pass
+                if search_span.get("span"):
+                    try:
+                        search_span["span"].update(
+                            metadata={
+                                "db_search_time_ms": db_ms,
+                                "results_count": len(results_list),
+                            }
+                        )
+                    except Exception:
+                        pass
 
         if not results_list:
             return "I couldn't find any relevant information in the knowledge base to answer your question."
 
         response_parts = [f"Found {len(results_list)} relevant results for your question:\n"]
+        if query_embedding is None:
+            response_parts.insert(0, _LEXICAL_NOTE)
 
         for i, row in enumerate(results_list, 1):
             row_dict: Dict[str, Any] = row  # type: ignore[assignment]
@@ -335,15 +439,20 @@ async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None)
             source = row_dict.get("source", "Unknown")
             content = row_dict.get("content", "")
             similarity = row_dict.get("similarity", 0)
+            chunk_ref = f"Chunk ID: {row_dict['chunk_id']}\n" if row_dict.get("chunk_id") else ""
 
             response_parts.append(
                 f"--- Result {i} (relevance: {similarity:.2%}) ---\n"
                 f"Source: {title} ({source})\n"
+                f"{chunk_ref}"
                 f"Content:\n{content}\n"
             )
 
         return "\n".join(response_parts)
 
+    except AdmissionRejectedError as e:
+        status = "rejected"
+        raise ToolError(str(e))
     except Exception as e:
         status = "error"
         logger.error(f"Error in ask_knowledge_base: {e}", exc_info=True)
@@ -353,17 +462,19 @@ async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None)
 
 
 @mcp.tool()
-@observe(name="list_knowledge_base_documents")
+@traced("list_knowledge_base_documents", source="mcp")
 async def list_knowledge_base_documents(
-    limit: int = 50, offset: int = 0, ctx: Context = None
+    limit: int = 50, offset: int = 0, cursor: Optional[str] = None, ctx: Context = None
 ) -> str:
     """
     List all documents currently available in the RAG knowledge base.
     Returns a formatted list with titles, sources, and chunk counts.
+    When more documents exist, the output ends with a cursor for the next page.
 
     Args:
         limit: Maximum number of documents to return (default: 50)
-        offset: Offset for pagination (default: 0)
+        offset: Offset for pagination (default: 0). Prefer cursor for further pages.
+        cursor: Cursor from the previous page's output (default: None)
 
     Performance Metrics:
         Request duration tracked in Prometheus (mcp_request_duration_seconds)
@@ -374,13 +485,24 @@ async def list_knowledge_base_documents(
 
     try:
         _update_langfuse_metadata(
-            {"tool_name": tool_name, "limit": limit, "offset": offset, "source": "mcp"}
+            {
+                "tool_name": tool_name,
+                "limit": limit,
+                "offset": offset,
+                "has_cursor": bool(cursor),
+                "source": "mcp",
+            }
         )
 
         if ctx:
             await ctx.info(f"Listing documents (limit={limit}, offset={offset})")
 
-        docs = await list_documents(limit, offset)
+        if offset and not cursor:
+            docs = await list_documents(limit, offset, include_metadata=False)
+            next_cursor = None
+        else:
+            page = await list_documents_page(limit, cursor=cursor)
+            docs, next_cursor = page["documents"], page["next_cursor"]
 
         if not docs:
             return "No documents found in the knowledge base."
@@ -391,9 +513,14 @@ async def list_knowledge_base_documents(
                 f"- [{doc.get('source', 'Unknown')}] {doc.get('title', 'Unknown')} "
                 f"({doc.get('chunk_count', 0)} chunks, updated: {doc.get('updated_at', 'Unknown')})"
             )
+        if next_cursor:
+            result.append(f"\nMore documents available. Next page: cursor={next_cursor}")
 
         return "\n".join(result)
 
+    except ValueError as e:
+        status = "error"
+        raise ToolError(str(e))
     except Exception as e:
         status = "error"
         logger.error(f"Error in list_knowledge_base_documents: {e}", exc_info=True)
@@ -402,17 +529,46 @@ async def list_knowledge_base_documents(
         record_request_end(tool_name, request_start, status)
 
 
+def _format_chunks(doc: Dict[str, Any]) -> str:
+    """Format a document header followed by its chunks (partial reads)."""
+    chunks = doc.get("chunks", [])
+    result_parts = [
+        f"Document ID: {doc.get('id', 'Unknown')}",
+        f"Title: {doc.get('title', 'Unknown')}",
+        f"Source: {doc.get('source', 'Unknown')}",
+        f"Total Chunks: {doc.get('chunk_count', 0)}",
+    ]
+    if not chunks:
+        result_parts.append("\nNo chunks in the requested range.")
+    for chunk in chunks:
+        result_parts.append(f"\n--- Chunk {chunk['chunk_index']} ---\n{chunk['content']}")
+    return "\n".join(result_parts)
+
+
 @mcp.tool()
-@observe(name="get_knowledge_base_document")
-async def get_knowledge_base_document(document_id: str, ctx: Context = None) -> str:
+@traced("get_knowledge_base_document", source="mcp")
+async def get_knowledge_base_document(
+    document_id: str,
+    chunk_start: Optional[int] = None,
+    chunk_end: Optional[int] = None,
+    char_start: Optional[int] = None,
+    char_end: Optional[int] = None,
+    ctx: Context = None,
+) -> str:
     """
     Get a specific document from the knowledge base by its ID.
 
-    Use this when you need to retrieve the full content of a specific document.
+    Use this when you need to retrieve the content of a specific document.
     You can get document IDs from list_knowledge_base_documents or search results.
+    Prefer reading a range (chunk_start/chunk_end or char_start/char_end) over the
+    full document, or get_knowledge_base_chunk_context for the text around a search hit.
 
     Args:
         document_id: The UUID of the document to retrieve.
+        chunk_start: First chunk index to return (inclusive).
+        chunk_end: Last chunk index to return (inclusive).
+        char_start: First character offset to return (inclusive).
+        char_end: Last character offset to return (exclusive).
 
     Performance Metrics:
         Request duration tracked in Prometheus (mcp_request_duration_seconds)
@@ -422,16 +578,46 @@ async def get_knowledge_base_document(document_id: str, ctx: Context = None) ->
     status = "success"
 
     try:
+        chunk_mode = chunk_start is not None or chunk_end is not None
+        char_mode = char_start is not None or char_end is not None
         _update_langfuse_metadata(
-            {"tool_name": tool_name, "document_id": document_id, "source": "mcp"}
+            {
+                "tool_name": tool_name,
+                "document_id": document_id,
+                "read_mode": "chunks" if chunk_mode else "chars" if char_mode else "full",
+                "source": "mcp",
+            }
         )
 
         if not document_id or not document_id.strip():
             raise ToolError("Document ID cannot be empty.")
+        if chunk_mode and char_mode:
+            raise ToolError("Use either a chunk range or a character range, not both.")
 
         if ctx:
             await ctx.info(f"Getting document details for ID: {document_id}")
 
+        if chunk_mode:
+            start = chunk_start if chunk_start is not None else 0
+            doc = await get_document_chunks(document_id, start, chunk_end)
+            if not doc:
+                raise ToolError(f"Document with ID {document_id} not found")
+            return _format_chunks(doc)
+
+        if char_mode:
+            doc = await get_document_text_range(document_id, char_start or 0, char_end)
+            if not doc:
+                raise ToolError(f"Document with ID {document_id} not found")
+            return "\n".join(
+                [
+                    f"Document ID: {doc['id']}",
+                    f"Title: {doc['title']}",
+                    f"Source: {doc['source']}",
+                    f"Characters: {doc['start']}-{doc['end']} of {doc['total_length']}",
+                    f"\n---\nContent:\n{doc['content']}",
+                ]
+            )
+
         doc = await get_document(document_id)
 
         if not doc:
@@ -458,6 +644,9 @@ async def get_knowledge_base_document(document_id: str, ctx: Context = None) ->
     except ToolError:
         status = "error"
         raise
+    except ValueError as e:
+        status = "error"
+        raise ToolError(str(e))
     except Exception as e:
         status = "error"
         logger.error(f"Error in get_knowledge_base_document: {e}", exc_info=True)
@@ -467,7 +656,103 @@ async def get_knowledge_base_document(document_id: str, ctx: Context = None) ->
 
 
 @mcp.tool()
-@observe(name="get_knowledge_base_overview")
+@traced("get_knowledge_base_chunk_context", source="mcp")
+async def get_knowledge_base_chunk_context(
+    chunk_id: str, window: int = 2, ctx: Context = None
+) -> str:
+    """
+    Get the text around a search hit: the chunk plus `window` chunks before and after it.
+
+    Use this instead of fetching the whole document when a search result needs more
+    context. Chunk IDs are shown in query_knowledge_base and ask_knowledge_base results.
+
+    Args:
+        chunk_id: The chunk UUID from a search result.
+        window: Number of chunks to include on each side (default: 2, max: 10).
+
+    Performance Metrics:
+        Request duration tracked in Prometheus (mcp_request_duration_seconds)
+    """
+    tool_name = "get_knowledge_base_chunk_context"
+    request_start = record_request_start(tool_name)
+    status = "success"
+
+    try:
+        _update_langfuse_metadata(
+            {"tool_name": tool_name, "chunk_id": chunk_id, "window": window, "source": "mcp"}
+        )
+
+        if not chunk_id or not chunk_id.strip():
+            raise ToolError("Chunk ID cannot be empty.")
+
+        doc = await get_chunk_neighbors(chunk_id, window)
+        if not doc:
+            raise ToolError(f"Chunk with ID {chunk_id} not found")
+
+        return _format_chunks(doc)
+
+    except ToolError:
+        status = "error"
+        raise
+    except ValueError as e:
+        status = "error"
+        raise ToolError(str(e))
+    except Exception as e:
+        status = "error"
+        logger.error(f"Error in get_knowledge_base_chunk_context: {e}", exc_info=True)
+        raise ToolError(f"Failed to get chunk context: {str(e)}")
+    finally:
+        record_request_end(tool_name, request_start, status)
+
+
+@mcp.tool()
+@traced("get_knowledge_base_documents", source="mcp")
+async def get_knowledge_base_documents(document_ids: List[str], ctx: Context = None) -> str:
+    """
+    Get title, source, size and metadata of several documents in one call.
+
+    Args:
+        document_ids: Document UUIDs (max 100).
+
+    Performance Metrics:
+        Request duration tracked in Prometheus (mcp_request_duration_seconds)
+    """
+    tool_name = "get_knowledge_base_documents"
+    request_start = record_request_start(tool_name)
+    status = "success"
+
+    try:
+        _update_langfuse_metadata(
+            {"tool_name": tool_name, "document_count": len(document_ids), "source": "mcp"}
+        )
+
+        docs = await get_documents_by_ids(document_ids)
+        if not docs:
+            return "No documents found for the given IDs."
+
+        result = [f"Found {len(docs)} of {len(document_ids)} documents:"]
+        for doc in docs:
+            result.append(
+                f"- {doc['id']}: [{doc['source']}] {doc['title']} "
+                f"({doc['chunk_count']} chunks, {doc['token_count']} tokens)"
+            )
+            if doc["metadata"]:
+                result.append(f"  Metadata: {json.dumps(doc['metadata'])}")
+        return "\n".join(result)
+
+    except ValueError as e:
+        status = "error"
+        raise ToolError(str(e))
+    except Exception as e:
+        status = "error"
+        logger.error(f"Error in get_knowledge_base_documents: {e}", exc_info=True)
+        raise ToolError(f"Failed to get documents: {str(e)}")
+    finally:
+        record_request_end(tool_name, request_start, status)
+
+
+@mcp.tool()
+@traced("get_knowledge_base_overview", source="mcp")
 async def get_knowledge_base_overview(ctx: Context = None) -> str:
     """
     Get a high-level overview of the knowledge base.
@@ -489,42 +774,39 @@ async def get_knowledge_base_overview(ctx: Context = None) -> str:
         if ctx:
             await ctx.info("Getting knowledge base overview")
 
-        docs = await list_documents(limit=10000)
-
-        total_documents = len(docs)
-        total_chunks = sum(doc.get("chunk_count", 0) for doc in docs)
-
-        sources: Set[str] = set()
-        for doc in docs:
-            source = doc.get("source", "")
-            if source:
-                top_source = source.split("/")[0] if "/" in source else source
-                sources.add(top_source)
+        # Rollups maintained at ingestion time: no scan over documents/chunks
+        stats = await get_knowledge_base_stats(recent_limit=20)
+        sources = stats["sources"]
+        recent = stats["recent_documents"]
+        total_documents = stats["total_documents"]
 
         result_parts = [
             "Knowledge Base Overview",
             "=" * 50,
             f"Total Documents: {total_documents}",
-            f"Total Chunks: {total_chunks}",
+            f"Total Chunks: {stats['total_chunks']}",
             f"Unique Sources: {len(sources)}",
         ]
 
         if sources:
             result_parts.append(f"\nSources ({len(sources)}):")
-            for source in sorted(sources)[:10]:
-                result_parts.append(f"  - {source}")
+            for source in sources[:10]:
+                result_parts.append(
+                    f"  - {source['source']} ({source['document_count']} documents, "
+                    f"{source['chunk_count']} chunks)"
+                )
             if len(sources) > 10:
                 result_parts.append(f"  ... and {len(sources) - 10} more")
 
-        if docs:
-            result_parts.append(f"\nDocuments ({len(docs)}):")
-            for doc in docs[:20]:
+        if recent:
+            result_parts.append(f"\nDocuments ({total_documents}):")
+            for doc in recent:
                 title = doc.get("title", "Unknown")
                 source = doc.get("source", "Unknown")
                 chunks = doc.get("chunk_count", 0)
                 result_parts.append(f"  - [{source}] {title} ({chunks} chunks)")
-            if len(docs) > 20:
-                result_parts.append(f"  ... and {len(docs) - 20} more")
+            if total_documents > len(recent):
+                result_parts.append(f"  ... and {total_documents - len(recent)} more")
 
         return "\n".join(result_parts)
 
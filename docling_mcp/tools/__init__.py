@@ -1,4 +1,9 @@
-from .documents import get_knowledge_base_document, list_knowledge_base_documents
+from .documents import (
+    get_knowledge_base_chunk_context,
+    get_knowledge_base_document,
+    get_knowledge_base_documents,
+    list_knowledge_base_documents,
+)
 from .overview import get_knowledge_base_overview
 from .search import ask_knowledge_base, query_knowledge_base
 
@@ -7,5 +12,7 @@ __all__ = [
     "ask_knowledge_base",
     "list_knowledge_base_documents",
     "get_knowledge_base_document",
+    "get_knowledge_base_documents",
+    "get_knowledge_base_chunk_context",
     "get_knowledge_base_overview",
 ]
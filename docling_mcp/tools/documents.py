@@ -1,24 +1,35 @@
 import json
 import logging
+from typing import Any, Dict, List, Optional
 
 from fastmcp import Context
 from fastmcp.exceptions import ToolError
 
-from utils.db_utils import get_document, list_documents
+from utils.db_utils import (
+    get_chunk_neighbors,
+    get_document,
+    get_document_chunks,
+    get_document_text_range,
+    get_documents_by_ids,
+    list_documents,
+    list_documents_page,
+)
 
 logger = logging.getLogger(__name__)
 
 
 async def list_knowledge_base_documents(
-    limit: int = 50, offset: int = 0, ctx: Context = None
+    limit: int = 50, offset: int = 0, cursor: Optional[str] = None, ctx: Context = None
 ) -> str:
     """
     List all documents currently available in the RAG knowledge base.
     Returns a formatted list with titles, sources, and chunk counts.
+    When more documents exist, the output ends with a cursor for the next page.
 
     Args:
         limit: Maximum number of documents to return (default: 50)
-        offset: Offset for pagination (default: 0)
+        offset: Offset for pagination (default: 0). Prefer cursor for further pages.
+        cursor: Cursor from the previous page's output (default: None)
         ctx: MCP Context object (injected by FastMCP)
 
     Returns:
@@ -28,7 +39,12 @@ async def list_knowledge_base_documents(
         if ctx:
             ctx.info(f"Listing documents (limit={limit}, offset={offset})")
 
-        docs = await list_documents(limit, offset)
+        if offset and not cursor:
+            docs = await list_documents(limit, offset, include_metadata=False)
+            next_cursor = None
+        else:
+            page = await list_documents_page(limit, cursor=cursor)
+            docs, next_cursor = page["documents"], page["next_cursor"]
 
         if not docs:
             return "No documents found in the knowledge base."
@@ -39,35 +55,94 @@ async def list_knowledge_base_documents(
                 f"- [{doc.get('source', 'Unknown')}] {doc.get('title', 'Unknown')} "
                 f"({doc.get('chunk_count', 0)} chunks, updated: {doc.get('updated_at', 'Unknown')})"
             )
+        if next_cursor:
+            result.append(f"\nMore documents available. Next page: cursor={next_cursor}")
 
         return "\n".join(result)
 
+    except ValueError as e:
+        raise ToolError(str(e))
     except Exception as e:
         logger.error(f"Error in list_knowledge_base_documents: {e}", exc_info=True)
         raise ToolError(f"Failed to list documents: {str(e)}")
 
 
-async def get_knowledge_base_document(document_id: str, ctx: Context = None) -> str:
+def _format_chunks(doc: Dict[str, Any]) -> str:
+    """Format a document header followed by its chunks (partial reads)."""
+    chunks = doc.get("chunks", [])
+    result_parts = [
+        f"Document ID: {doc.get('id', 'Unknown')}",
+        f"Title: {doc.get('title', 'Unknown')}",
+        f"Source: {doc.get('source', 'Unknown')}",
+        f"Total Chunks: {doc.get('chunk_count', 0)}",
+    ]
+    if not chunks:
+        result_parts.append("\nNo chunks in the requested range.")
+    for chunk in chunks:
+        result_parts.append(f"\n--- Chunk {chunk['chunk_index']} ---\n{chunk['content']}")
+    return "\n".join(result_parts)
+
+
+async def get_knowledge_base_document(
+    document_id: str,
+    chunk_start: Optional[int] = None,
+    chunk_end: Optional[int] = None,
+    char_start: Optional[int] = None,
+    char_end: Optional[int] = None,
+    ctx: Context = None,
+) -> str:
     """
     Get a specific document from the knowledge base by its ID.
 
-    Use this when you need to retrieve the full content of a specific document.
+    Use this when you need to retrieve the content of a specific document.
     You can get document IDs from list_knowledge_base_documents or search results.
+    Prefer reading a range (chunk_start/chunk_end or char_start/char_end) over the
+    full document, or get_knowledge_base_chunk_context for the text around a search hit.
 
     Args:
         document_id: The UUID of the document to retrieve.
+        chunk_start: First chunk index to return (inclusive).
+        chunk_end: Last chunk index to return (inclusive).
+        char_start: First character offset to return (inclusive).
+        char_end: Last character offset to return (exclusive).
         ctx: MCP Context object (injected by FastMCP)
 
     Returns:
-        The full document content with metadata, or an error message if not found.
+        The document content (or the requested range) with metadata, or an error message if not found.
     """
     try:
         if not document_id or not document_id.strip():
             raise ToolError("Document ID cannot be empty.")
 
+        chunk_mode = chunk_start is not None or chunk_end is not None
+        char_mode = char_start is not None or char_end is not None
+        if chunk_mode and char_mode:
+            raise ToolError("Use either a chunk range or a character range, not both.")
+
         if ctx:
             ctx.info(f"Getting document details for ID: {document_id}")
 
+        if chunk_mode:
+            start = chunk_start if chunk_start is not None else 0
+            doc = await get_document_chunks(document_id, start, chunk_end)
+            if not doc:
+                raise ToolError(f"Document with ID {document_id} not found")
+            return _format_chunks(doc)
+
+        if char_mode:
+            doc = await get_document_text_range(document_id, char_start or 0, char_end)
+            if not doc:
+                raise ToolError(f"Document with ID {document_id} not found")
+            return "\n".join(
+                [
+                    f"Document ID: {doc['id']}",
+                    f"Title: {doc['title']}",
+                    f"Source: {doc['source']}",
+                    f"Characters: {doc['start']}-{doc['end']} of {doc['total_length']}",
+                    f"\n---\nContent:\n{doc['content']}",
+                ]
+            )
+
         doc = await get_document(document_id)
 
         if not doc:
@@ -94,6 +169,74 @@ async def get_knowledge_base_document(document_id: str, ctx: Context = None) ->
 
     except ToolError:
         raise
+    except ValueError as e:
+        raise ToolError(str(e))
     except Exception as e:
         logger.error(f"Error in get_knowledge_base_document: {e}", exc_info=True)
         raise ToolError(f"Failed to get document: {str(e)}")
+
+
+async def get_knowledge_base_chunk_context(
+    chunk_id: str, window: int = 2, ctx: Context = None
+) -> str:
+    """
+    Get the text around a search hit: the chunk plus `window` chunks before and after it.
+
+    Args:
+        chunk_id: The chunk UUID from a search result.
+        window: Number of chunks to include on each side (default: 2, max: 10).
+        ctx: MCP Context object (injected by FastMCP)
+
+    Returns:
+        The document header and the chunks in order
+    """
+    try:
+        if not chunk_id or not chunk_id.strip():
+            raise ToolError("Chunk ID cannot be empty.")
+
+        doc = await get_chunk_neighbors(chunk_id, window)
+        if not doc:
+            raise ToolError(f"Chunk with ID {chunk_id} not found")
+
+        return _format_chunks(doc)
+
+    except ToolError:
+        raise
+    except ValueError as e:
+        raise ToolError(str(e))
+    except Exception as e:
+        logger.error(f"Error in get_knowledge_base_chunk_context: {e}", exc_info=True)
+        raise ToolError(f"Failed to get chunk context: {str(e)}")
+
+
+async def get_knowledge_base_documents(document_ids: List[str], ctx: Context = None) -> str:
+    """
+    Get title, source, size and metadata of several documents in one call.
+
+    Args:
+        document_ids: Document UUIDs (max 100).
+        ctx: MCP Context object (injected by FastMCP)
+
+    Returns:
+        A formatted list of the documents found
+    """
+    try:
+        docs = await get_documents_by_ids(document_ids)
+        if not docs:
+            return "No documents found for the given IDs."
+
+        result = [f"Found {len(docs)} of {len(document_ids)} documents:"]
+        for doc in docs:
+            result.append(
+                f"- {doc['id']}: [{doc['source']}] {doc['title']} "
+                f"({doc['chunk_count']} chunks, {doc['token_count']} tokens)"
+            )
+            if doc["metadata"]:
+                result.append(f"  Metadata: {json.dumps(doc['metadata'])}")
+        return "\n".join(result)
+
+    except ValueError as e:
+        raise ToolError(str(e))
+    except Exception as e:
+        logger.error(f"Error in get_knowledge_base_documents: {e}", exc_info=True)
+        raise ToolError(f"Failed to get documents: {str(e)}")
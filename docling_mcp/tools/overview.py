@@ -1,10 +1,9 @@
 import logging
-from typing import Set
 
 from fastmcp import Context
 from fastmcp.exceptions import ToolError
 
-from utils.db_utils import list_documents
+from utils.db_utils import get_knowledge_base_stats
 
 logger = logging.getLogger(__name__)
 
@@ -27,46 +26,40 @@ async def get_knowledge_base_overview(ctx: Context = None) -> str:
         if ctx:
             ctx.info("Getting knowledge base overview")
 
-        # Fetch documents to calculate overview stats
-        docs = await list_documents(limit=10000)
-
-        total_documents = len(docs)
-        total_chunks = sum(doc.get("chunk_count", 0) for doc in docs)
-
-        # Collect unique sources
-        sources: Set[str] = set()
-        for doc in docs:
-            source = doc.get("source", "")
-            if source:
-                # Get top-level source (e.g., "langfuse-docs" from "langfuse-docs/deployment/guide.md")
-                top_source = source.split("/")[0] if "/" in source else source
-                sources.add(top_source)
+        # Rollups maintained at ingestion time: no scan over documents/chunks
+        stats = await get_knowledge_base_stats(recent_limit=20)
+        sources = stats["sources"]
+        recent = stats["recent_documents"]
+        total_documents = stats["total_documents"]
 
         # Format overview response
         result_parts = [
             "📊 Knowledge Base Overview",
             "=" * 50,
             f"Total Documents: {total_documents}",
-            f"Total Chunks: {total_chunks}",
+            f"Total Chunks: {stats['total_chunks']}",
             f"Unique Sources: {len(sources)}",
         ]
 
         if sources:
             result_parts.append(f"\nSources ({len(sources)}):")
-            for source in sorted(sources)[:10]:
-                result_parts.append(f"  - {source}")
+            for source in sources[:10]:
+                result_parts.append(
+                    f"  - {source['source']} ({source['document_count']} documents, "
+                    f"{source['chunk_count']} chunks)"
+                )
             if len(sources) > 10:
                 result_parts.append(f"  ... and {len(sources) - 10} more")
 
-        if docs:
-            result_parts.append(f"\nDocuments ({len(docs)}):")
-            for doc in docs[:20]:
+        if recent:
+            result_parts.append(f"\nDocuments ({total_documents}):")
+            for doc in recent:
                 title = doc.get("title", "Unknown")
                 source = doc.get("source", "Unknown")
                 chunks = doc.get("chunk_count", 0)
                 result_parts.append(f"  - [{source}] {title} ({chunks} chunks)")
-            if len(docs) > 20:
-                result_parts.append(f"  ... and {len(docs) - 20} more")
+            if total_documents > len(recent):
+                result_parts.append(f"  ... and {total_documents - len(recent)} more")
 
         return "\n".join(result_parts)
 
@@ -1,16 +1,26 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastmcp import Context
 from fastmcp.exceptions import ToolError
 
+from core.admission import AdmissionRejectedError, get_admission_controller
 from core.rag_service import search_knowledge_base_structured
+from utils.metadata_filter import MetadataFilterError
 
 logger = logging.getLogger(__name__)
 
+_LEXICAL_NOTE = "(Semantic search unavailable: results matched by keywords)\n\n"
+
 
 async def query_knowledge_base(
-    query: str, limit: int = 5, source_filter: Optional[str] = None, ctx: Context = None
+    query: str,
+    limit: int = 5,
+    source_filter: Optional[str] = None,
+    context_window: int = 0,
+    metadata_filter: Optional[Dict[str, Any]] = None,
+    timeout_ms: Optional[int] = None,
+    ctx: Context = None,
 ) -> str:
     """
     Search the knowledge base using semantic similarity.
@@ -23,6 +33,14 @@ async def query_knowledge_base(
         source_filter: Optional filter to search only in specific documentation sources.
                       Examples: "langfuse-docs", "docling", "langfuse-docs/deployment".
                       If provided, only documents whose source path contains this string will be searched.
+        context_window: Include this many chunks before and after each hit (0-5, default: 0).
+                      Overlapping windows are merged into one passage.
+        metadata_filter: Optional filter on document metadata, e.g.
+                      {"version": {"$gte": "2.0"}, "lang": "it"}. Supports equality,
+                      $ne, $in, $gt, $gte, $lt, $lte and dotted keys ("frontmatter.version").
+        timeout_ms: Optional deadline for the search in ms (default: SEARCH_DEADLINE_MS).
+                      If the query cannot be embedded in time, keyword-matched results
+                      are returned instead.
         ctx: MCP Context object (injected by FastMCP)
 
     Returns:
@@ -32,7 +50,20 @@ async def query_knowledge_base(
         if ctx:
             ctx.info(f"Searching knowledge base for: '{query}'")
 
-        results = await search_knowledge_base_structured(query, limit, source_filter)
+        if not 0 <= context_window <= 5:
+            raise ToolError("context_window must be between 0 and 5.")
+
+        admission = get_admission_controller("search")
+        deadline = admission.deadline_in(timeout_ms)
+        async with admission.admit(deadline):
+            results = await search_knowledge_base_structured(
+                query,
+                limit,
+                source_filter,
+                context_window=context_window,
+                metadata_filter=metadata_filter,
+                deadline=deadline,
+            )
 
         if not results or not results.get("results"):
             filter_msg = f" in '{source_filter}'" if source_filter else ""
@@ -44,16 +75,28 @@ async def query_knowledge_base(
         for row in results["results"]:
             title = row.get("title", "Unknown")
             content = row.get("content", "")
-            response_parts.append(f"[Source: {title}]\n{content}\n")
-
-        return "\n---\n".join(response_parts)
-
+            chunk_ref = f" (chunk_id: {row['chunk_id']})" if row.get("chunk_id") else ""
+            if row.get("chunk_start") is not None:
+                chunk_ref += f" [chunks {row['chunk_start']}-{row['chunk_end']}]"
+            response_parts.append(f"[Source: {title}]{chunk_ref}\n{content}\n")
+
+        note = _LEXICAL_NOTE if results["timing"].get("fallback") else ""
+        return note + "\n---\n".join(response_parts)
+
+    except ToolError:
+        raise
+    except AdmissionRejectedError as e:
+        raise ToolError(str(e))
+    except MetadataFilterError as e:
+        raise ToolError(f"Invalid metadata_filter: {e}")
     except Exception as e:
         logger.error(f"Error in query_knowledge_base: {e}", exc_info=True)
         raise ToolError(f"Failed to query knowledge base: {str(e)}")
 
 
-async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None) -> str:
+async def ask_knowledge_base(
+    question: str, limit: int = 5, timeout_ms: Optional[int] = None, ctx: Context = None
+) -> str:
     """
     Ask the knowledge base a question and get an answer.
 
@@ -63,6 +106,7 @@ async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None)
     Args:
         question: The question to ask the knowledge base.
         limit: Maximum number of results to return (default: 5).
+        timeout_ms: Optional deadline for the search in ms (default: SEARCH_DEADLINE_MS).
         ctx: MCP Context object (injected by FastMCP)
 
     Returns:
@@ -73,7 +117,12 @@ async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None)
             ctx.info(f"Asking knowledge base: '{question}'")
 
         # Search for relevant context
-        search_results = await search_knowledge_base_structured(question, limit=limit)
+        admission = get_admission_controller("search")
+        deadline = admission.deadline_in(timeout_ms)
+        async with admission.admit(deadline):
+            search_results = await search_knowledge_base_structured(
+                question, limit=limit, deadline=deadline
+            )
 
         if not search_results or not search_results.get("results"):
             return "I couldn't find any relevant information in the knowledge base to answer your question."
@@ -82,6 +131,8 @@ async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None)
         response_parts = [
             f"Found {len(search_results['results'])} relevant results for your question:\n"
         ]
+        if search_results["timing"].get("fallback"):
+            response_parts.insert(0, _LEXICAL_NOTE)
 
         for i, row in enumerate(search_results["results"], 1):
             title = row.get("title", "Unknown")
@@ -97,6 +148,8 @@ async def ask_knowledge_base(question: str, limit: int = 5, ctx: Context = None)
 
         return "\n".join(response_parts)
 
+    except AdmissionRejectedError as e:
+        raise ToolError(str(e))
     except Exception as e:
         logger.error(f"Error in ask_knowledge_base: {e}", exc_info=True)
         raise ToolError(f"Failed to search knowledge base: {str(e)}")
@@ -12,16 +12,21 @@ Benefits over custom chunking:
 - Token-precise (not character-based estimates)
 - Better for RAG (chunks include document context)
 - Battle-tested (maintained by Docling team)
+
+Docling and transformers are imported when a DoclingHybridChunker is created,
+not at module load, so importing this module (e.g. via ingestion.ingest) stays
+cheap for processes that never chunk.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from docling.chunking import HybridChunker
-from docling_core.types.doc import DoclingDocument
 from dotenv import load_dotenv
-from transformers import AutoTokenizer
+
+if TYPE_CHECKING:
+    from docling_core.types.doc import DoclingDocument
 
 # Load environment variables
 load_dotenv()
@@ -88,6 +93,10 @@ class DoclingHybridChunker:
         """
         self.config = config
 
+        # Heavy imports (~seconds): only paid by processes that actually chunk
+        from docling.chunking import HybridChunker
+        from transformers import AutoTokenizer
+
         # Initialize tokenizer for token-aware chunking
         model_id = "sentence-transformers/all-MiniLM-L6-v2"
         logger.info(f"Initializing tokenizer: {model_id}")
@@ -108,7 +117,7 @@ class DoclingHybridChunker:
         title: str,
         source: str,
         metadata: Optional[Dict[str, Any]] = None,
-        docling_doc: Optional[DoclingDocument] = None,
+        docling_doc: Optional["DoclingDocument"] = None,
     ) -> List[DocumentChunk]:
         """
         Chunk a document using Docling's HybridChunker.
@@ -117,7 +126,7 @@ class DoclingHybridChunker:
             content: Document content (markdown format)
             title: Document title
             source: Document source
-            metadata: Additional metadata
+            metadata: Document metadata (kept on the document, not copied into chunks)
             docling_doc: Optional pre-converted DoclingDocument (for efficiency)
 
         Returns:
@@ -126,12 +135,15 @@ class DoclingHybridChunker:
         if not content.strip():
             return []
 
-        base_metadata = {
-            "title": title,
-            "source": source,
-            "chunk_method": "hybrid",
-            **(metadata or {}),
-        }
+        # Chunking and tokenizing are CPU-bound: run them in a thread so the event
+        # loop (job heartbeats, embedding I/O of other tasks) keeps running
+        return await asyncio.to_thread(self._chunk, content, docling_doc)
+
+    def _chunk(self, content: str, docling_doc: Optional["DoclingDocument"]) -> List[DocumentChunk]:
+        """Chunk and tokenize a document (blocking; see chunk_document)."""
+        # Chunks keep only chunk-specific fields: title, source and document metadata
+        # live once on the documents row and are joined in when needed
+        base_metadata = {"chunk_method": "hybrid"}
 
         # If we don't have a DoclingDocument, we need to create one from markdown
         if docling_doc is None:
@@ -290,7 +302,7 @@ class SimpleChunker:
             content: Document content
             title: Document title
             source: Document source
-            metadata: Additional metadata
+            metadata: Document metadata (kept on the document, not copied into chunks)
 
         Returns:
             List of document chunks
@@ -298,12 +310,8 @@ class SimpleChunker:
         if not content.strip():
             return []
 
-        base_metadata = {
-            "title": title,
-            "source": source,
-            "chunk_method": "simple",
-            **(metadata or {}),
-        }
+        # Document-level metadata stays on the documents row (see DoclingHybridChunker)
+        base_metadata = {"chunk_method": "simple"}
 
         # Split on double newlines (paragraphs)
         import re
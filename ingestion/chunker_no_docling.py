@@ -93,7 +93,7 @@ class SemanticChunker:
             content: Document content
             title: Document title
             source: Document source
-            metadata: Additional metadata
+            metadata: Document metadata (kept on the document, not copied into chunks)
 
         Returns:
             List of document chunks
@@ -101,7 +101,8 @@ class SemanticChunker:
         if not content.strip():
             return []
 
-        base_metadata = {"title": title, "source": source, **(metadata or {})}
+        # Chunks keep only chunk-specific fields; document metadata lives on documents
+        base_metadata: Dict[str, Any] = {}
 
         # First, try semantic chunking if enabled
         if self.config.use_semantic_splitting and len(content) > self.config.chunk_size:
@@ -347,7 +348,7 @@ class SimpleChunker:
             content: Document content
             title: Document title
             source: Document source
-            metadata: Additional metadata
+            metadata: Document metadata (kept on the document, not copied into chunks)
 
         Returns:
             List of document chunks
@@ -355,12 +356,7 @@ class SimpleChunker:
         if not content.strip():
             return []
 
-        base_metadata = {
-            "title": title,
-            "source": source,
-            "chunk_method": "simple",
-            **(metadata or {}),
-        }
+        base_metadata = {"chunk_method": "simple"}
 
         # Split on paragraphs first
         paragraphs = re.split(r"\n\s*\n", content)
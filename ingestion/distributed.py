@@ -0,0 +1,395 @@
+"""
+Distributed ingestion: a Postgres work queue consumed by any number of workers.
+
+The coordinator enumerates files into ingestion_work_items
+(sql/ingestion-work-queue-schema.sql). Workers on any host claim items with
+FOR UPDATE SKIP LOCKED, run them through the regular pipeline stages
+(convert, chunk, embed, save) and record the result.
+
+- Leases: claimed items carry lease_expires_at; a heartbeat extends the leases of
+  the items a worker holds. Items of a crashed worker become claimable again once
+  their lease expires.
+- Retries: an item is retried up to --max-attempts times, then marked failed.
+- Documents folders must be reachable at the same path on every worker host
+  (shared volume), since the stored source is relative to that folder.
+
+Usage:
+    python -m ingestion.distributed enqueue --documents documents/ [--batch reindex-1]
+    python -m ingestion.distributed worker [--processes 4] [--exit-when-idle]
+    python -m ingestion.distributed status [--batch reindex-1]
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from utils.db_utils import close_database, db_pool, initialize_database
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 600
+DEFAULT_HEARTBEAT_INTERVAL = 30.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+async def enqueue_documents(
+    documents_folder: str, batch_id: Optional[str] = None, fast_mode: bool = False
+) -> Dict[str, Any]:
+    """
+    Enumerate supported files in a folder and enqueue them as work items.
+
+    Re-enqueueing the same batch is idempotent (unique on batch_id, file_path).
+
+    Returns:
+        Dict with batch_id, files_found and files_enqueued
+    """
+    from ingestion.ingest import find_document_files
+
+    batch_id = batch_id or f"batch-{datetime.now():%Y%m%d-%H%M%S}"
+    files = find_document_files(documents_folder)
+
+    async with db_pool.acquire() as conn:
+        inserted = await conn.fetch(
+            """
+            INSERT INTO ingestion_work_items (batch_id, documents_folder, file_path, fast_mode)
+            SELECT $1, $2, file_path, $4
+            FROM unnest($3::text[]) AS file_path
+            ON CONFLICT (batch_id, file_path) DO NOTHING
+            RETURNING id
+            """,
+            batch_id,
+            documents_folder,
+            files,
+            fast_mode,
+        )
+
+    logger.info(f"Enqueued {len(inserted)}/{len(files)} files into batch {batch_id}")
+    return {"batch_id": batch_id, "files_found": len(files), "files_enqueued": len(inserted)}
+
+
+async def get_batch_status(batch_id: Optional[str] = None) -> Dict[str, Any]:
+    """Return item counts by status and result totals (optionally for one batch)."""
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT status,
+                   COUNT(*) AS items,
+                   COALESCE(SUM(chunks_created), 0) AS chunks,
+                   COALESCE(SUM(tokens_processed), 0) AS tokens
+            FROM ingestion_work_items
+            WHERE $1::text IS NULL OR batch_id = $1
+            GROUP BY status
+            """,
+            batch_id,
+        )
+
+    counts = {status: 0 for status in ("pending", "processing", "done", "failed")}
+    chunks = tokens = 0
+    for row in rows:
+        counts[row["status"]] = row["items"]
+        chunks += row["chunks"]
+        tokens += row["tokens"]
+
+    return {"batch_id": batch_id, **counts, "chunks_created": chunks, "tokens_processed": tokens}
+
+
+class IngestionWorker:
+    """Claims work items with SKIP LOCKED and ingests them through the pipeline."""
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            worker_id: Unique worker id (default: host:pid:random)
+            lease_seconds: Lease duration of a claimed item
+            heartbeat_interval: Seconds between lease extensions
+            max_attempts: Attempts before an item is marked failed
+            poll_interval: Sleep when the queue is empty
+        """
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+
+        # One pipeline per (documents_folder, fast_mode): chunker/embedder/cache reused
+        self._pipelines: Dict[tuple, Any] = {}
+
+    def _get_pipeline(self, documents_folder: str, fast_mode: bool):
+        key = (documents_folder, fast_mode)
+        if key not in self._pipelines:
+            from ingestion.ingest import DocumentIngestionPipeline
+            from utils.models import IngestionConfig
+
+            self._pipelines[key] = DocumentIngestionPipeline(
+                config=IngestionConfig(),
+                documents_folder=documents_folder,
+                clean_before_ingest=False,
+                fast_mode=fast_mode,
+            )
+        return self._pipelines[key]
+
+    async def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next pending item, or an item whose lease expired.
+
+        Items of crashed workers that already used max_attempts are marked failed.
+        """
+        async with db_pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    UPDATE ingestion_work_items
+                    SET status = 'failed', finished_at = NOW(),
+                        error = COALESCE(error, 'Lease expired after max attempts')
+                    WHERE status = 'processing'
+                      AND lease_expires_at < NOW()
+                      AND attempts >= $1
+                    """,
+                    self.max_attempts,
+                )
+                row = await conn.fetchrow(
+                    """
+                    UPDATE ingestion_work_items
+                    SET status = 'processing',
+                        worker_id = $1,
+                        attempts = attempts + 1,
+                        claimed_at = NOW(),
+                        lease_expires_at = NOW() + make_interval(secs => $2)
+                    WHERE id = (
+                        SELECT id FROM ingestion_work_items
+                        WHERE status = 'pending'
+                           OR (status = 'processing' AND lease_expires_at < NOW())
+                        ORDER BY id
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING *
+                    """,
+                    self.worker_id,
+                    self.lease_seconds,
+                )
+        return dict(row) if row else None
+
+    async def heartbeat(self) -> int:
+        """Extend the leases of all items held by this worker."""
+        async with db_pool.acquire() as conn:
+            result = await conn.execute(
+                """
+                UPDATE ingestion_work_items
+                SET lease_expires_at = NOW() + make_interval(secs => $2)
+                WHERE worker_id = $1 AND status = 'processing'
+                """,
+                self.worker_id,
+                self.lease_seconds,
+            )
+        return int(result.split()[-1])
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                logger.warning(f"Worker {self.worker_id} heartbeat failed: {e}")
+
+    async def complete(self, item: Dict[str, Any], result) -> None:
+        """Record the result of an item. Failed items are retried until max_attempts."""
+        failed = bool(result.errors)
+        retry = failed and item["attempts"] < self.max_attempts
+
+        async with db_pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE ingestion_work_items
+                SET status = $3,
+                    worker_id = CASE WHEN $3 = 'pending' THEN NULL ELSE worker_id END,
+                    lease_expires_at = NULL,
+                    document_id = $4,
+                    chunks_created = $5,
+                    tokens_processed = $6,
+                    processing_ms = $7,
+                    error = $8,
+                    finished_at = CASE WHEN $3 = 'pending' THEN NULL ELSE NOW() END
+                WHERE id = $1 AND worker_id = $2
+                """,
+                item["id"],
+                self.worker_id,
+                "pending" if retry else ("failed" if failed else "done"),
+                result.document_id or None,
+                result.chunks_created,
+                result.tokens_processed,
+                result.processing_time_ms,
+                "; ".join(result.errors) or None,
+            )
+
+    async def process(self, item: Dict[str, Any]):
+        """Run one item through convert, chunk, embed and save."""
+        pipeline = self._get_pipeline(item["documents_folder"], item["fast_mode"])
+        result = await pipeline.ingest_file(item["file_path"])
+        await self.complete(item, result)
+        return result
+
+    async def run(self, exit_when_idle: bool = False, max_items: Optional[int] = None) -> int:
+        """
+        Claim and process items until stopped.
+
+        Args:
+            exit_when_idle: Return when no item can be claimed
+            max_items: Return after processing this many items
+
+        Returns:
+            Number of items processed
+        """
+        await initialize_database()
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        processed = 0
+
+        logger.info(f"Ingestion worker {self.worker_id} started")
+        try:
+            while max_items is None or processed < max_items:
+                item = await self.claim()
+                if item is None:
+                    if exit_when_idle:
+                        break
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                logger.info(
+                    f"Worker {self.worker_id} processing {item['file_path']} "
+                    f"(attempt {item['attempts']})"
+                )
+                result = await self.process(item)
+                processed += 1
+
+                status = "✗" if result.errors else "✓"
+                logger.info(f"{status} {item['file_path']}: {result.chunks_created} chunks")
+        finally:
+            heartbeat_task.cancel()
+            for pipeline in self._pipelines.values():
+                await pipeline.close()
+            await close_database()
+
+        logger.info(f"Ingestion worker {self.worker_id} stopped after {processed} items")
+        return processed
+
+
+def _run_worker_process(options: Dict[str, Any]) -> None:
+    """Entry point of a spawned worker process."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    worker = IngestionWorker(
+        lease_seconds=options["lease_seconds"],
+        heartbeat_interval=options["heartbeat_interval"],
+        max_attempts=options["max_attempts"],
+        poll_interval=options["poll_interval"],
+    )
+    asyncio.run(worker.run(exit_when_idle=options["exit_when_idle"]))
+
+
+def run_workers(processes: int, options: Dict[str, Any]) -> None:
+    """Run N worker processes on this host and wait for them."""
+    if processes <= 1:
+        _run_worker_process(options)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    workers: List[multiprocessing.Process] = [
+        ctx.Process(target=_run_worker_process, args=(options,), name=f"ingest-worker-{i}")
+        for i in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+
+
+async def _run_command(args) -> None:
+    try:
+        if args.command == "enqueue":
+            result = await enqueue_documents(args.documents, args.batch, args.fast)
+            print(
+                f"Batch {result['batch_id']}: {result['files_enqueued']} enqueued "
+                f"({result['files_found']} files found)"
+            )
+        else:
+            result = await get_batch_status(args.batch)
+            print(
+                f"pending={result['pending']} processing={result['processing']} "
+                f"done={result['done']} failed={result['failed']} "
+                f"chunks={result['chunks_created']} tokens={result['tokens_processed']}"
+            )
+    finally:
+        await close_database()
+
+
+def main():
+    """Main function for the distributed ingestion CLI."""
+    parser = argparse.ArgumentParser(description="Distributed document ingestion")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = subparsers.add_parser("enqueue", help="Enqueue files of a folder as work items")
+    enqueue.add_argument("--documents", "-d", default="documents", help="Documents folder path")
+    enqueue.add_argument("--batch", help="Batch id (default: timestamp)")
+    enqueue.add_argument("--fast", action="store_true", help="Fast mode (no OCR/table structure)")
+
+    worker = subparsers.add_parser("worker", help="Claim and process work items")
+    worker.add_argument("--processes", "-p", type=int, default=1, help="Worker processes")
+    worker.add_argument("--lease-seconds", type=int, default=DEFAULT_LEASE_SECONDS)
+    worker.add_argument("--heartbeat-interval", type=float, default=DEFAULT_HEARTBEAT_INTERVAL)
+    worker.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    worker.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    worker.add_argument("--exit-when-idle", action="store_true", help="Exit when queue is empty")
+
+    status = subparsers.add_parser("status", help="Show queue status")
+    status.add_argument("--batch", help="Batch id (default: all batches)")
+
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    if args.command == "worker":
+        run_workers(
+            args.processes,
+            {
+                "lease_seconds": args.lease_seconds,
+                "heartbeat_interval": args.heartbeat_interval,
+                "max_attempts": args.max_attempts,
+                "poll_interval": args.poll_interval,
+                "exit_when_idle": args.exit_when_idle,
+            },
+        )
+    else:
+        asyncio.run(_run_command(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,30 @@ import asyncio
 import logging
 import os
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from tenacity import retry, stop_after_attempt, wait_exponential
+from openai import RateLimitError
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+
+from ingestion.embedding_cache import EMBEDDING_CACHE_DIR, SharedEmbeddingCache
+from ingestion.embedding_resilience import (
+    PROVIDER_ERRORS,
+    EmbeddingCircuitOpenError,
+    EmbeddingHedger,
+    get_circuit_breaker,
+)
+from ingestion.embedding_scheduler import BULK, INTERACTIVE, get_embedding_scheduler
 
 # Import provider config
 from utils.providers import get_provider_config
 
 logger = logging.getLogger(__name__)
 
+# OpenAI-compatible endpoint serving the same embedding model (e.g. a self-hosted or
+# secondary deployment), used for queries while the provider circuit is open
+EMBEDDING_FALLBACK_BASE_URL = os.getenv("EMBEDDING_FALLBACK_BASE_URL")
+EMBEDDING_FALLBACK_API_KEY = os.getenv("EMBEDDING_FALLBACK_API_KEY")
+
 # LangFuse OpenAI wrapper for automatic cost tracking (graceful degradation)
 _langfuse_openai_available = False
 try:
@@ -59,11 +73,45 @@ class EmbeddingCache:
                 pass
         self.cache[text] = embedding
 
+    def __len__(self) -> int:
+        return len(self.cache)
+
+
+def _retry_after_seconds(error: RateLimitError) -> Optional[float]:
+    """Retry-After of a 429 response, in seconds (None if absent or unparsable)."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
 
 class EmbeddingGenerator(BaseEmbedder):
     """
     Generates embeddings using OpenAI compatible API.
 
+    Scheduling:
+        Every API call takes a slot from the process-wide EmbeddingScheduler
+        (ingestion/embedding_scheduler.py): embed_query runs in the interactive
+        lane, embed_documents in the bulk lane, so queries never queue behind
+        ingestion batches.
+
+    Tail latency and outages (ingestion/embedding_resilience.py):
+        Query embeddings slower than the recent p95 are hedged with a duplicate
+        request. Calls go through the process-wide circuit breaker; while it is
+        open, queries use EMBEDDING_FALLBACK_BASE_URL when configured and
+        otherwise fail fast with EmbeddingCircuitOpenError.
+
+    Caching:
+        In-process EmbeddingCache. Query embedders (shared_cache=True) use a
+        SharedEmbeddingCache instead when EMBEDDING_CACHE_DIR is set
+        (ingestion/embedding_cache.py), read and filled by every process of the host
+        from a worker thread, off the event loop.
+
     Cost Tracking:
         Uses langfuse.openai wrapper when available for automatic cost tracking.
         Falls back to direct OpenAI client if LangFuse unavailable.
@@ -76,6 +124,7 @@ class EmbeddingGenerator(BaseEmbedder):
         use_cache: bool = True,
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
+        shared_cache: bool = False,
     ):
         self.model_name = model_name
         self.batch_size = batch_size
@@ -89,8 +138,19 @@ class EmbeddingGenerator(BaseEmbedder):
 
         # Initialize OpenAI client (LangFuse wrapper if available for cost tracking)
         self.client = LangfuseAsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
-
-        if self.use_cache:
+        self.fallback_client = None
+        if EMBEDDING_FALLBACK_BASE_URL:
+            self.fallback_client = LangfuseAsyncOpenAI(
+                api_key=EMBEDDING_FALLBACK_API_KEY or self.api_key,
+                base_url=EMBEDDING_FALLBACK_BASE_URL,
+            )
+        # Per model: the hedge delay follows this model's recent latency
+        self.hedger = EmbeddingHedger()
+
+        if self.use_cache and shared_cache and EMBEDDING_CACHE_DIR:
+            # Shared by the API workers of this host (ingestion/embedding_cache.py)
+            self.cache = SharedEmbeddingCache(EMBEDDING_CACHE_DIR, self.model_name)
+        elif self.use_cache:
             self.cache = EmbeddingCache()
         else:
             self.cache = None
@@ -100,19 +160,37 @@ class EmbeddingGenerator(BaseEmbedder):
             f"Initialized EmbeddingGenerator with model={self.model_name}, cost_tracking={cost_status}"
         )
 
+    async def _cache_get(self, texts: List[str]) -> List[Optional[List[float]]]:
+        if isinstance(self.cache, SharedEmbeddingCache):
+            # SQLite calls block: one worker thread call per batch
+            return await asyncio.to_thread(self.cache.get_many, texts)
+        return [self.cache.get(text) for text in texts]
+
+    async def _cache_set(self, items: List[Tuple[str, List[float]]]) -> None:
+        if isinstance(self.cache, SharedEmbeddingCache):
+            await asyncio.to_thread(self.cache.set_many, items)
+            return
+        for text, embedding in items:
+            self.cache.set(text, embedding)
+
     async def embed_query(self, text: str) -> List[float]:
         """Embed a single query string."""
         # Check cache first
-        if self.use_cache and self.cache:
-            cached = self.cache.get(text)
+        if self.cache is not None:
+            cached = (await self._cache_get([text]))[0]
             if cached:
                 return cached
 
         try:
-            embedding = await self._generate_single_embedding(text)
+            try:
+                embedding = await self._generate_single_embedding(text)
+            except EmbeddingCircuitOpenError:
+                if self.fallback_client is None:
+                    raise
+                embedding = await self._generate_fallback_embedding(text)
 
-            if self.use_cache and self.cache:
-                self.cache.set(text, embedding)
+            if self.cache is not None:
+                await self._cache_set([(text, embedding)])
 
             return embedding
         except Exception as e:
@@ -132,9 +210,8 @@ class EmbeddingGenerator(BaseEmbedder):
             indices_to_fetch = []
             texts_to_fetch = []
 
-            if self.use_cache and self.cache:
-                for j, text in enumerate(batch):
-                    cached = self.cache.get(text)
+            if self.cache is not None:
+                for j, (text, cached) in enumerate(zip(batch, await self._cache_get(batch))):
                     if cached:
                         batch_embeddings[j] = cached
                     else:
@@ -152,8 +229,8 @@ class EmbeddingGenerator(BaseEmbedder):
                     # Fill back into batch_embeddings and update cache
                     for idx, embedding in zip(indices_to_fetch, fetched_embeddings):
                         batch_embeddings[idx] = embedding
-                        if self.use_cache and self.cache:
-                            self.cache.set(batch[idx], embedding)
+                    if self.cache is not None:
+                        await self._cache_set(list(zip(texts_to_fetch, fetched_embeddings)))
 
                 except Exception as e:
                     logger.error(f"Failed to embed batch: {e}")
@@ -187,20 +264,61 @@ class EmbeddingGenerator(BaseEmbedder):
         embeddings = await self.embed_documents(texts)
 
         # Assign back to chunks
+        # The embedding model is recorded once per document (see ingest.py), not per chunk
         for i, chunk in enumerate(chunks):
             chunk.embedding = embeddings[i]
-            if chunk.metadata:
-                chunk.metadata["embedding_model"] = self.model_name
-                chunk.metadata["embedding_generated_at"] = datetime.now().isoformat()
 
         return chunks
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    async def _create_embeddings(self, texts: str | List[str], priority: str) -> Any:
+        """
+        One embeddings API call, holding a scheduler slot of the given priority.
+
+        Raises:
+            EmbeddingCircuitOpenError: If the circuit breaker is open (no API call)
+        """
+        scheduler = get_embedding_scheduler()
+        breaker = get_circuit_breaker()
+        probe = breaker.before_call()
+        try:
+            async with scheduler.slot(priority):
+                response = await self.client.embeddings.create(
+                    model=self.model_name, input=texts, encoding_format="float"
+                )
+        except RateLimitError as e:
+            # Leave the remaining quota to queries while the account recovers
+            scheduler.pause_bulk(_retry_after_seconds(e))
+            breaker.record_cancelled(probe)  # Quota, not provider health
+            raise
+        except PROVIDER_ERRORS:
+            breaker.record_failure(probe)
+            raise
+        except BaseException:
+            # Client errors, hedge losers, deadlines: no verdict on the provider
+            breaker.record_cancelled(probe)
+            raise
+        breaker.record_success(probe)
+        return response
+
+    # Short backoff: a query waiting seconds between attempts misses its deadline anyway
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=0.25, min=0.25, max=2),
+        retry=retry_if_not_exception_type(EmbeddingCircuitOpenError),
+    )
     async def _generate_single_embedding(self, text: str) -> List[float]:
-        """Generate embedding for a single text with retry logic."""
-        response = await self.client.embeddings.create(
+        """Generate embedding for a single text, hedged, with retry logic."""
+        response = await self.hedger.run(lambda: self._create_embeddings(text, INTERACTIVE))
+        return response.data[0].embedding
+
+    async def _generate_fallback_embedding(self, text: str) -> List[float]:
+        """Embed a query on the fallback endpoint (same model) while the circuit is open."""
+        from docling_mcp.metrics import record_embedding_fallback
+
+        response = await self.fallback_client.embeddings.create(
             model=self.model_name, input=text, encoding_format="float"
         )
+        record_embedding_fallback()
         return response.data[0].embedding
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
@@ -209,9 +327,7 @@ class EmbeddingGenerator(BaseEmbedder):
         # Filter empty strings to avoid API errors
         processed_texts = [t if t.strip() else " " for t in texts]
 
-        response = await self.client.embeddings.create(
-            model=self.model_name, input=processed_texts, encoding_format="float"
-        )
+        response = await self._create_embeddings(processed_texts, BULK)
         return [item.embedding for item in response.data]
 
 
@@ -221,6 +337,7 @@ def create_embedder(
     max_retries: int = 3,
     retry_delay: float = 1.0,
     model_name: Optional[str] = None,
+    shared_cache: bool = False,
 ) -> BaseEmbedder:
     """Factory function to create an embedder instance."""
 
@@ -228,7 +345,12 @@ def create_embedder(
     if not model_name:
         model_name = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
 
-    return EmbeddingGenerator(model_name=model_name, batch_size=batch_size, use_cache=use_cache)
+    return EmbeddingGenerator(
+        model_name=model_name,
+        batch_size=batch_size,
+        use_cache=use_cache,
+        shared_cache=shared_cache,
+    )
 
 
 # Example usage
@@ -0,0 +1,383 @@
+"""
+Background backfill of embedding spaces (utils/embedding_spaces.py).
+
+Re-embeds the stored chunk text with a space's model in batches, so a model
+upgrade needs neither Docling re-conversion nor downtime: search keeps using the
+current space until the new one is ready and selected.
+
+- Resumable: chunks already embedded in the space are skipped, so the job can
+  be stopped and restarted at any time.
+- Throttled: --max-rate caps chunks per second (embedding API quota).
+- Progress: rag_embedding_backfill_chunks / rag_embedding_backfill_target_chunks
+  gauges (exported on --metrics-port) and the `status` command.
+- New documents ingested while a space is backfilling or ready are embedded into
+  it too (embed_document_into_spaces, called by the ingestion pipeline).
+
+Usage:
+    python -m ingestion.embedding_backfill register --space te3_large \\
+        --model text-embedding-3-large --dimensions 3072
+    python -m ingestion.embedding_backfill backfill --space te3_large [--max-rate 200]
+    python -m ingestion.embedding_backfill status [--space te3_large]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from utils.db_utils import close_database, db_pool
+from utils.embedding_spaces import (
+    PRIMARY_EMBEDDING_SPACE,
+    EmbeddingSpaceError,
+    space_index_name,
+    space_operator_class,
+    space_vector_expression,
+    validate_space_name,
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+# Embedders per model, shared by backfills and the ingestion hook
+_embedders: Dict[str, Any] = {}
+
+
+def _get_embedder(model: str):
+    if model not in _embedders:
+        from ingestion.embedder import create_embedder
+
+        _embedders[model] = create_embedder(use_cache=False, model_name=model)
+    return _embedders[model]
+
+
+def _vector_literal(embedding: List[float]) -> str:
+    return "[" + ",".join(map(str, embedding)) + "]"
+
+
+async def register_space(name: str, model: str, dimensions: int) -> Dict[str, Any]:
+    """
+    Register an embedding space (status "backfilling").
+
+    Re-registering the same name with the same model is a no-op.
+
+    Raises:
+        EmbeddingSpaceError: If the name is invalid or already used by another model
+    """
+    validate_space_name(name)
+    if name == PRIMARY_EMBEDDING_SPACE:
+        raise EmbeddingSpaceError(f"'{PRIMARY_EMBEDDING_SPACE}' is the chunks.embedding column")
+
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            """
+            INSERT INTO embedding_spaces (name, model, dimensions)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (name) DO NOTHING
+            """,
+            name,
+            model,
+            dimensions,
+        )
+        row = await conn.fetchrow(
+            "SELECT name, model, dimensions, status FROM embedding_spaces WHERE name = $1", name
+        )
+
+    if (row["model"], row["dimensions"]) != (model, dimensions):
+        raise EmbeddingSpaceError(
+            f"Space '{name}' already exists for {row['model']} ({row['dimensions']} dimensions)"
+        )
+    return dict(row)
+
+
+async def get_space_progress(name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Return status and embedded/target chunk counts of one or all spaces."""
+    async with db_pool.acquire() as conn:
+        target = await conn.fetchval("SELECT COALESCE(SUM(chunk_count), 0) FROM documents")
+        rows = await conn.fetch(
+            """
+            SELECT s.name, s.model, s.dimensions, s.status,
+                   (SELECT COUNT(*) FROM chunk_embeddings ce WHERE ce.space = s.name) AS embedded
+            FROM embedding_spaces s
+            WHERE $1::text IS NULL OR s.name = $1
+            ORDER BY s.created_at
+            """,
+            name,
+        )
+    return [{**dict(row), "target": target} for row in rows]
+
+
+async def store_space_vectors(
+    space: str, chunk_ids: List[str], embeddings: List[List[float]]
+) -> int:
+    """
+    Insert chunk vectors into a space (existing ones are kept).
+
+    Returns:
+        Number of vectors written
+    """
+    async with db_pool.acquire() as conn:
+        # Joining chunks skips chunks deleted (re-ingested) since they were read
+        result = await conn.execute(
+            """
+            INSERT INTO chunk_embeddings (space, chunk_id, embedding)
+            SELECT $1, u.chunk_id, u.embedding::vector
+            FROM unnest($2::uuid[], $3::text[]) AS u(chunk_id, embedding)
+            JOIN chunks c ON c.id = u.chunk_id
+            ON CONFLICT (space, chunk_id) DO NOTHING
+            """,
+            space,
+            chunk_ids,
+            [_vector_literal(e) for e in embeddings],
+        )
+    return int(result.split()[-1])
+
+
+class EmbeddingBackfill:
+    """Re-embeds stored chunk text into one embedding space."""
+
+    def __init__(
+        self,
+        space: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_rate: Optional[float] = None,
+        activate: bool = True,
+    ):
+        """
+        Initialize backfill.
+
+        Args:
+            space: Registered space name
+            batch_size: Chunks per embedding request and insert
+            max_rate: Maximum chunks per second (None: unthrottled)
+            activate: Build the space's HNSW index and mark it ready when done
+        """
+        self.space = validate_space_name(space)
+        self.batch_size = batch_size
+        self.max_rate = max_rate
+        self.activate = activate
+
+    async def _load_space(self) -> Dict[str, Any]:
+        async with db_pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT name, model, dimensions, status FROM embedding_spaces WHERE name = $1",
+                self.space,
+            )
+        if row is None:
+            raise EmbeddingSpaceError(f"Unknown embedding space '{self.space}'")
+        return dict(row)
+
+    async def _next_batch(self, last_id: Optional[str]) -> List[Dict[str, Any]]:
+        async with db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT c.id::text AS id, c.content
+                FROM chunks c
+                WHERE ($2::uuid IS NULL OR c.id > $2::uuid)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM chunk_embeddings ce
+                      WHERE ce.space = $1 AND ce.chunk_id = c.id
+                  )
+                ORDER BY c.id
+                LIMIT $3
+                """,
+                self.space,
+                last_id,
+                self.batch_size,
+            )
+        return [dict(row) for row in rows]
+
+    async def _activate(self, space: Dict[str, Any]) -> None:
+        """Build the space's partial HNSW index (without blocking writes) and mark it ready."""
+        async with db_pool.acquire() as conn:
+            await conn.execute(
+                f"""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS {space_index_name(self.space)}
+                ON chunk_embeddings
+                USING hnsw ({space_vector_expression(space, None)} {space_operator_class(space)})
+                WITH (m = 16, ef_construction = 64)
+                WHERE space = '{self.space}'
+                """
+            )
+            await conn.execute(
+                """
+                UPDATE embedding_spaces SET status = 'ready', updated_at = NOW()
+                WHERE name = $1 AND status = 'backfilling'
+                """,
+                self.space,
+            )
+        logger.info(f"Embedding space {self.space} is ready")
+
+    async def run(self) -> int:
+        """
+        Embed every chunk missing from the space.
+
+        Returns:
+            Number of chunk vectors written
+        """
+        from docling_mcp.metrics import record_embedding_backfill
+
+        space = await self._load_space()
+        if space["status"] == "retired":
+            raise EmbeddingSpaceError(f"Embedding space '{self.space}' is retired")
+        embedder = _get_embedder(space["model"])
+
+        progress = (await get_space_progress(self.space))[0]
+        embedded, target = progress["embedded"], progress["target"]
+        record_embedding_backfill(self.space, embedded, target)
+        logger.info(f"Backfilling {self.space} ({space['model']}): {embedded}/{target} chunks")
+
+        written = 0
+        last_id = None
+        while True:
+            batch_start = time.monotonic()
+            batch = await self._next_batch(last_id)
+            if not batch:
+                break
+            last_id = batch[-1]["id"]
+
+            embeddings = await embedder.embed_documents([row["content"] for row in batch])
+            if len(embeddings[0]) != space["dimensions"]:
+                raise EmbeddingSpaceError(
+                    f"{space['model']} returned {len(embeddings[0])} dimensions, "
+                    f"space '{self.space}' expects {space['dimensions']}"
+                )
+            stored = await store_space_vectors(self.space, [row["id"] for row in batch], embeddings)
+            written += stored
+            embedded += stored
+            record_embedding_backfill(self.space, embedded, target)
+            logger.info(f"{self.space}: {embedded}/{target} chunks embedded")
+
+            if self.max_rate:
+                # Throttle: each batch takes at least len(batch) / max_rate seconds
+                min_duration = len(batch) / self.max_rate
+                elapsed = time.monotonic() - batch_start
+                if elapsed < min_duration:
+                    await asyncio.sleep(min_duration - elapsed)
+
+        if self.activate:
+            await self._activate(space)
+        return written
+
+
+_active_spaces: Optional[tuple] = None
+_ACTIVE_SPACES_TTL = 60.0
+
+
+async def _get_active_spaces(conn) -> List[Dict[str, Any]]:
+    """Spaces new chunks must be embedded into (cached; [] without the schema)."""
+    global _active_spaces
+    if _active_spaces is None or time.monotonic() - _active_spaces[0] > _ACTIVE_SPACES_TTL:
+        if await conn.fetchval("SELECT to_regclass('embedding_spaces')") is None:
+            spaces = []
+        else:
+            rows = await conn.fetch(
+                """
+                SELECT name, model, dimensions FROM embedding_spaces
+                WHERE status IN ('backfilling', 'ready')
+                """
+            )
+            spaces = [dict(row) for row in rows]
+        _active_spaces = (time.monotonic(), spaces)
+    return _active_spaces[1]
+
+
+async def embed_document_into_spaces(document_id: str) -> int:
+    """
+    Embed a freshly ingested document's chunks into every active space.
+
+    Keeps ready spaces complete without waiting for the next backfill run.
+
+    Returns:
+        Number of chunk vectors written
+    """
+    async with db_pool.acquire() as conn:
+        spaces = await _get_active_spaces(conn)
+        if not spaces:
+            return 0
+        rows = await conn.fetch(
+            "SELECT id::text AS id, content FROM chunks WHERE document_id = $1::uuid "
+            "ORDER BY chunk_index",
+            document_id,
+        )
+    if not rows:
+        return 0
+
+    written = 0
+    for space in spaces:
+        embeddings = await _get_embedder(space["model"]).embed_documents(
+            [row["content"] for row in rows]
+        )
+        written += await store_space_vectors(space["name"], [row["id"] for row in rows], embeddings)
+    return written
+
+
+async def _run_command(args) -> None:
+    try:
+        if args.command == "register":
+            space = await register_space(args.space, args.model, args.dimensions)
+            print(
+                f"Space {space['name']}: {space['model']} ({space['dimensions']}d), {space['status']}"
+            )
+        elif args.command == "backfill":
+            if args.metrics_port:
+                from prometheus_client import start_http_server
+
+                start_http_server(args.metrics_port)
+            backfill = EmbeddingBackfill(
+                args.space,
+                batch_size=args.batch_size,
+                max_rate=args.max_rate,
+                activate=not args.no_activate,
+            )
+            written = await backfill.run()
+            print(f"Space {args.space}: {written} chunk vectors written")
+        else:
+            for space in await get_space_progress(args.space):
+                print(
+                    f"{space['name']}: {space['model']} ({space['dimensions']}d) {space['status']} "
+                    f"{space['embedded']}/{space['target']} chunks"
+                )
+    finally:
+        await close_database()
+
+
+def main():
+    """Main function for the embedding backfill CLI."""
+    parser = argparse.ArgumentParser(description="Embedding space backfill")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    register = subparsers.add_parser("register", help="Register an embedding space")
+    register.add_argument("--space", required=True, help="Space name (e.g. te3_large)")
+    register.add_argument("--model", required=True, help="Embedding model")
+    register.add_argument("--dimensions", type=int, required=True, help="Vector dimensions")
+
+    backfill = subparsers.add_parser("backfill", help="Embed existing chunks into a space")
+    backfill.add_argument("--space", required=True, help="Space name")
+    backfill.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    backfill.add_argument("--max-rate", type=float, help="Maximum chunks per second")
+    backfill.add_argument(
+        "--no-activate", action="store_true", help="Do not build the index / mark ready"
+    )
+    backfill.add_argument("--metrics-port", type=int, help="Expose Prometheus progress metrics")
+
+    status = subparsers.add_parser("status", help="Show space status and progress")
+    status.add_argument("--space", help="Space name (default: all spaces)")
+
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(_run_command(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Embedding cache shared by processes.
+
+EmbeddingCache (ingestion/embedder.py) lives in each process: with several API
+workers (api/serve.py) every worker embeds the same queries again and keeps its
+own copy of every vector (~50 KB per 1536-dim embedding as Python floats).
+
+With EMBEDDING_CACHE_DIR set, embedders use a SharedEmbeddingCache instead: a
+SQLite file in that directory (WAL mode: concurrent readers, one writer at a
+time) holding float32 vectors keyed by model and text. Every worker on the host
+reads the same entries, the OS page cache holds them once, and they survive
+restarts. Entries beyond EMBEDDING_CACHE_MAX_ENTRIES are evicted oldest first.
+
+Every call is a blocking SQLite call: embedders run them in a worker thread
+(asyncio.to_thread), one per batch with get_many / set_many, never on the event
+loop. Errors count as cache misses and the cache never fails an embedding call:
+a file locked by another writer for more than EMBEDDING_CACHE_BUSY_TIMEOUT_MS
+(a few ms) is a miss, or a skipped write, rather than a stalled search.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "")
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+EMBEDDING_CACHE_BUSY_TIMEOUT_MS = float(os.getenv("EMBEDDING_CACHE_BUSY_TIMEOUT_MS", "5"))
+
+_CACHE_FILE = "embeddings.sqlite3"
+# Evict in batches, not on every insert
+_EVICT_EVERY = 100
+
+
+class SharedEmbeddingCache:
+    """Embedding cache in a SQLite file shared by the processes of a host."""
+
+    def __init__(
+        self,
+        directory: str,
+        model_name: str,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Args:
+            directory: Directory of the cache file (created if missing)
+            model_name: Embedding model; entries of other models are never returned
+            max_entries: Entries kept for all models together
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, _CACHE_FILE)
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._inserts = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not cross fork(): reconnect in each process
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path,
+                timeout=EMBEDDING_CACHE_BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,
+            )
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    " key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+                )
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+
+    def get(self, text: str) -> Optional[List[float]]:
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached embeddings of `texts`, None for each miss (one query)."""
+        keys = [self._key(text) for text in texts]
+        if not keys:
+            return []
+        try:
+            with self._lock:
+                rows = (
+                    self._connection()
+                    .execute(
+                        "SELECT key, vector FROM embeddings"
+                        f" WHERE key IN ({', '.join('?' * len(keys))})",
+                        keys,
+                    )
+                    .fetchall()
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Shared embedding cache read failed: {e}")
+            return [None] * len(keys)
+        vectors = dict(rows)
+        return [array("f", vectors[key]).tolist() if key in vectors else None for key in keys]
+
+    def set(self, text: str, embedding: List[float]):
+        self.set_many([(text, embedding)])
+
+    def set_many(self, items: Sequence[Tuple[str, List[float]]]):
+        """Store (text, embedding) pairs in one transaction."""
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [
+                            (self._key(text), array("f", embedding).tobytes())
+                            for text, embedding in items
+                        ],
+                    )
+                    inserts = self._inserts + len(items)
+                    if inserts // _EVICT_EVERY > self._inserts // _EVICT_EVERY:
+                        self._evict(conn)
+                self._inserts = inserts
+        except sqlite3.Error as e:
+            logger.debug(f"Shared embedding cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # rowid grows with inserts: the lowest rowids are the oldest entries
+        conn.execute(
+            "DELETE FROM embeddings WHERE rowid <= (SELECT MAX(rowid) FROM embeddings) - ?",
+            (self.max_entries,),
+        )
+
+    def __len__(self) -> int:
+        try:
+            with self._lock:
+                return self._connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -0,0 +1,222 @@
+"""
+Tail-latency and failure handling for query embedding calls.
+
+Query embeddings dominate search latency and the provider has a long tail:
+
+- Hedging: if a query embedding has not answered after the recent p95 latency
+  (EMBEDDING_HEDGE_PERCENTILE of the last calls, clamped to
+  EMBEDDING_HEDGE_MIN_DELAY_MS..EMBEDDING_HEDGE_MAX_DELAY_MS), a duplicate request
+  is sent and the first response wins; the other is cancelled. Only the slowest
+  ~5% of queries pay for a second call. Batch (ingestion) calls are never hedged.
+- Circuit breaker: when EMBEDDING_BREAKER_ERROR_RATE of the last
+  EMBEDDING_BREAKER_WINDOW calls failed (server errors, timeouts, connection
+  errors), the breaker opens and calls fail fast with EmbeddingCircuitOpenError
+  for EMBEDDING_BREAKER_COOLDOWN seconds; then a single probe call decides
+  whether it closes again. Rate limits (429) do not count: the scheduler's bulk
+  pause handles them (ingestion/embedding_scheduler.py).
+
+Exported as rag_embedding_hedges_total{winner}, rag_embedding_hedge_delay_seconds,
+rag_embedding_circuit_state (0 closed, 1 half-open, 2 open) and
+rag_embedding_circuit_rejected_total.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Optional
+
+from openai import APIConnectionError, InternalServerError
+
+from core.errors import EmbeddingCircuitOpenError  # noqa: F401 - raised by the breaker
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_HEDGE_ENABLED = os.getenv("EMBEDDING_HEDGE_ENABLED", "true").lower() == "true"
+EMBEDDING_HEDGE_PERCENTILE = float(os.getenv("EMBEDDING_HEDGE_PERCENTILE", "95"))
+EMBEDDING_HEDGE_MIN_DELAY_MS = float(os.getenv("EMBEDDING_HEDGE_MIN_DELAY_MS", "50"))
+EMBEDDING_HEDGE_MAX_DELAY_MS = float(os.getenv("EMBEDDING_HEDGE_MAX_DELAY_MS", "1000"))
+EMBEDDING_BREAKER_WINDOW = int(os.getenv("EMBEDDING_BREAKER_WINDOW", "20"))
+EMBEDDING_BREAKER_ERROR_RATE = float(os.getenv("EMBEDDING_BREAKER_ERROR_RATE", "0.5"))
+EMBEDDING_BREAKER_COOLDOWN = float(os.getenv("EMBEDDING_BREAKER_COOLDOWN", "30"))
+
+# Latency samples kept for the hedge delay, and needed before it is trusted
+_LATENCY_SAMPLES = 200
+_MIN_LATENCY_SAMPLES = 20
+# Failures needed before the error rate can open the breaker
+_MIN_BREAKER_CALLS = 5
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Provider-side failures; client errors (400, 401, ...) are not the provider's health
+PROVIDER_ERRORS = (APIConnectionError, InternalServerError)
+
+
+class EmbeddingHedger:
+    """Duplicate slow calls after the recent p95 latency; first response wins."""
+
+    def __init__(
+        self,
+        percentile: float = EMBEDDING_HEDGE_PERCENTILE,
+        min_delay_ms: float = EMBEDDING_HEDGE_MIN_DELAY_MS,
+        max_delay_ms: float = EMBEDDING_HEDGE_MAX_DELAY_MS,
+        enabled: bool = EMBEDDING_HEDGE_ENABLED,
+    ):
+        self.percentile = percentile
+        self.min_delay = min_delay_ms / 1000
+        self.max_delay = max_delay_ms / 1000
+        self.enabled = enabled
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+
+    def observe(self, seconds: float) -> None:
+        """Record the latency of a completed call."""
+        self._latencies.append(seconds)
+
+    @property
+    def delay(self) -> float:
+        """Seconds to wait before sending the duplicate."""
+        if len(self._latencies) < _MIN_LATENCY_SAMPLES:
+            return self.max_delay
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return min(self.max_delay, max(self.min_delay, ordered[index]))
+
+    async def _timed(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.monotonic()
+        result = await call()
+        self.observe(time.monotonic() - start)
+        return result
+
+    async def run(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run call(), sending a duplicate if it is slower than the hedge delay.
+
+        A failed attempt does not fail the request while the other is still
+        running; the error is raised only if both fail.
+        """
+        from docling_mcp.metrics import record_embedding_hedge
+
+        if not self.enabled:
+            return await self._timed(call)
+
+        delay = self.delay
+        primary = asyncio.ensure_future(self._timed(call))
+        hedge = None
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                hedge = asyncio.ensure_future(self._timed(call))
+                pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    if hedge is not None:
+                        winner = "hedge" if succeeded[0] is hedge else "primary"
+                        record_embedding_hedge(winner, delay)
+                    return succeeded[0].result()
+                error = next(iter(done)).exception()
+            raise error  # type: ignore[misc]
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker over a sliding window of calls."""
+
+    def __init__(
+        self,
+        window: int = EMBEDDING_BREAKER_WINDOW,
+        error_rate: float = EMBEDDING_BREAKER_ERROR_RATE,
+        cooldown: float = EMBEDDING_BREAKER_COOLDOWN,
+    ):
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=max(1, window))  # True = failure
+        self._opened_at = 0.0
+        # Token of the half-open probe in flight; only that call's outcome releases it
+        self._probe: Optional[object] = None
+
+    def _set_state(self, state: str) -> None:
+        from docling_mcp.metrics import record_embedding_circuit_state
+
+        if state != self.state:
+            logger.warning(f"Embedding circuit breaker: {self.state} -> {state}")
+        self.state = state
+        record_embedding_circuit_state(_STATE_VALUES[state])
+
+    def before_call(self) -> Optional[object]:
+        """
+        Admit a call or fail fast.
+
+        Returns:
+            A probe token when the call is the half-open probe, else None; pass it
+            to record_success / record_failure / record_cancelled
+
+        Raises:
+            EmbeddingCircuitOpenError: While open, and for concurrent calls while
+                the half-open probe is running
+        """
+        from docling_mcp.metrics import record_embedding_circuit_rejected
+
+        if self.state == OPEN:
+            retry_in = self._opened_at + self.cooldown - time.monotonic()
+            if retry_in > 0:
+                record_embedding_circuit_rejected()
+                raise EmbeddingCircuitOpenError(retry_in)
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probe is not None:
+                record_embedding_circuit_rejected()
+                raise EmbeddingCircuitOpenError(self.cooldown)
+            self._probe = object()
+            return self._probe
+        return None
+
+    def _end_probe(self, probe: Optional[object]) -> None:
+        if probe is not None and probe is self._probe:
+            self._probe = None
+
+    def record_success(self, probe: Optional[object] = None) -> None:
+        self._end_probe(probe)
+        if self.state == HALF_OPEN:
+            self._outcomes.clear()
+            self._set_state(CLOSED)
+        self._outcomes.append(False)
+
+    def record_failure(self, probe: Optional[object] = None) -> None:
+        self._end_probe(probe)
+        self._outcomes.append(True)
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+        failures = sum(self._outcomes)
+        if failures >= _MIN_BREAKER_CALLS and failures / len(self._outcomes) >= self.error_rate:
+            self._open()
+
+    def record_cancelled(self, probe: Optional[object] = None) -> None:
+        """A call was abandoned (hedge loser, deadline): no verdict on the provider."""
+        self._end_probe(probe)
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._set_state(OPEN)
+
+
+_breaker: Optional[CircuitBreaker] = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Process-wide breaker shared by every embedder (one provider account)."""
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker()
+    return _breaker
@@ -0,0 +1,179 @@
+"""
+Priority lanes for embedding API calls.
+
+Query embeddings (interactive) and ingestion/backfill batches (bulk) share one
+provider account and its rate limits. Every embedding API call of the process
+takes a slot from the shared EmbeddingScheduler:
+
+- At most EMBEDDING_MAX_CONCURRENCY calls run at once, and
+  EMBEDDING_INTERACTIVE_RESERVED of those slots are never given to bulk calls:
+  a query finds a free slot even while ingestion saturates its share.
+- Waiting calls are served interactive first: an interactive call overtakes
+  (preempts) every queued bulk batch, which only starts when no interactive call
+  is waiting. Running calls are never interrupted.
+- A 429 on any call pauses the bulk lane for the Retry-After interval (or
+  EMBEDDING_RATE_LIMIT_PAUSE), so the remaining quota goes to queries while the
+  account recovers.
+
+Queue time per class is exported as rag_embedding_queue_seconds{priority}, the
+number of waiting calls as rag_embedding_queued_requests{priority}.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, BULK)  # Dispatch order
+
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "8"))
+EMBEDDING_INTERACTIVE_RESERVED = int(os.getenv("EMBEDDING_INTERACTIVE_RESERVED", "2"))
+# Bulk pause after a 429 without a Retry-After header (seconds)
+EMBEDDING_RATE_LIMIT_PAUSE = float(os.getenv("EMBEDDING_RATE_LIMIT_PAUSE", "5"))
+
+
+class EmbeddingScheduler:
+    """Concurrency slots for embedding calls, dispatched by priority class."""
+
+    def __init__(
+        self,
+        max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
+        interactive_reserved: int = EMBEDDING_INTERACTIVE_RESERVED,
+    ):
+        """
+        Args:
+            max_concurrency: Embedding calls running at once (all classes)
+            interactive_reserved: Slots bulk calls never use (bulk keeps at least one)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.bulk_limit = max(1, max_concurrency - max(0, interactive_reserved))
+        self._running: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {
+            priority: deque() for priority in PRIORITIES
+        }
+        self._bulk_paused_until = 0.0
+        self._resume_handle: Optional[asyncio.TimerHandle] = None
+
+    def running(self, priority: str) -> int:
+        """Calls of a class currently holding a slot."""
+        return self._running[priority]
+
+    def queued(self, priority: str) -> int:
+        """Calls of a class waiting for a slot."""
+        return len(self._waiters[priority])
+
+    def _has_capacity(self, priority: str) -> bool:
+        if sum(self._running.values()) >= self.max_concurrency:
+            return False
+        if priority == BULK:
+            return (
+                self._running[BULK] < self.bulk_limit
+                and time.monotonic() >= self._bulk_paused_until
+                and not self._waiters[INTERACTIVE]
+            )
+        return True
+
+    def _record_depth(self, priority: str) -> None:
+        from docling_mcp.metrics import record_embedding_queue_depth
+
+        record_embedding_queue_depth(priority, len(self._waiters[priority]))
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting calls, interactive first."""
+        for priority in PRIORITIES:
+            waiters = self._waiters[priority]
+            granted = False
+            while waiters and self._has_capacity(priority):
+                future = waiters.popleft()
+                granted = True
+                if future.done():  # Cancelled while waiting
+                    continue
+                self._running[priority] += 1
+                future.set_result(None)
+            if granted:
+                self._record_depth(priority)
+        self._schedule_resume()
+
+    def _schedule_resume(self) -> None:
+        """Wake queued bulk calls when a rate-limit pause ends."""
+        paused_for = self._bulk_paused_until - time.monotonic()
+        if self._waiters[BULK] and paused_for > 0 and self._resume_handle is None:
+            self._resume_handle = asyncio.get_running_loop().call_later(paused_for, self._resume)
+
+    def _resume(self) -> None:
+        self._resume_handle = None
+        self._dispatch()
+
+    def _release(self, priority: str) -> None:
+        self._running[priority] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str = BULK):
+        """
+        Hold an embedding slot for one API call.
+
+        Calls of the same class start in arrival order.
+
+        Raises:
+            ValueError: If priority is not "interactive" or "bulk"
+        """
+        from docling_mcp.metrics import record_embedding_queue_time
+
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown embedding priority: {priority!r}")
+
+        start = time.monotonic()
+        if self._waiters[priority] or not self._has_capacity(priority):
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[priority].append(future)
+            self._record_depth(priority)
+            self._schedule_resume()
+            try:
+                await future
+            except BaseException:
+                if future in self._waiters[priority]:
+                    self._waiters[priority].remove(future)
+                    self._record_depth(priority)
+                elif future.done() and not future.cancelled():
+                    # Granted just before the cancellation: give the slot back
+                    self._release(priority)
+                raise
+        else:
+            self._running[priority] += 1
+
+        record_embedding_queue_time(priority, time.monotonic() - start)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def pause_bulk(self, seconds: Optional[float] = None) -> None:
+        """Keep bulk calls from starting for a while (provider rate limit hit)."""
+        delay = EMBEDDING_RATE_LIMIT_PAUSE if seconds is None else max(0.0, seconds)
+        self._bulk_paused_until = max(self._bulk_paused_until, time.monotonic() + delay)
+        logger.warning(f"Embedding rate limited: bulk lane paused for {delay:.1f}s")
+        if self._resume_handle is not None:
+            self._resume_handle.cancel()
+            self._resume_handle = None
+        self._dispatch()
+
+
+_scheduler: Optional[EmbeddingScheduler] = None
+
+
+def get_embedding_scheduler() -> EmbeddingScheduler:
+    """Process-wide scheduler shared by every embedder (one provider account)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = EmbeddingScheduler()
+    return _scheduler
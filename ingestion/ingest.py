@@ -15,10 +15,26 @@ from dotenv import load_dotenv
 
 from ingestion.chunker import ChunkingConfig, DocumentChunk, create_chunker
 from ingestion.embedder import create_embedder
+from ingestion.embedding_backfill import embed_document_into_spaces
+from ingestion.reindex import (
+    build_shadow_indexes,
+    drop_shadow_tables,
+    prepare_shadow_tables,
+    shadow_name,
+    swap_shadow_tables,
+)
 
 # Import utilities
 try:
-    from utils.db_utils import close_database, db_pool, initialize_database
+    from utils.db_utils import (
+        close_database,
+        db_pool,
+        document_collection,
+        ensure_chunk_partition,
+        initialize_database,
+        source_root,
+        update_source_stats,
+    )
     from utils.models import IngestionConfig, IngestionResult
 except ImportError:
     # For direct execution or testing
@@ -26,7 +42,15 @@ except ImportError:
     import sys
 
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from utils.db_utils import close_database, db_pool, initialize_database
+    from utils.db_utils import (
+        close_database,
+        db_pool,
+        document_collection,
+        ensure_chunk_partition,
+        initialize_database,
+        source_root,
+        update_source_stats,
+    )
     from utils.models import IngestionConfig, IngestionResult
 
 # Load environment variables
@@ -34,6 +58,56 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Supported file patterns - Docling + text formats
+SUPPORTED_PATTERNS = [
+    "*.md",
+    "*.markdown",
+    "*.txt",  # Text formats
+    "*.pdf",  # PDF
+    "*.docx",
+    "*.doc",  # Word
+    "*.pptx",
+    "*.ppt",  # PowerPoint
+    "*.xlsx",
+    "*.xls",  # Excel
+    "*.html",
+    "*.htm",  # HTML
+]
+
+
+# Whether sql/chunk-collections.sql is applied (collection columns, partition helpers)
+_chunk_collections: Optional[bool] = None
+
+
+async def _has_chunk_collections(conn) -> bool:
+    """
+    Whether the chunk collections migration (sql/chunk-collections.sql) is applied.
+    Checked once per process: restart ingestion workers after migrating.
+    """
+    global _chunk_collections
+    if _chunk_collections is None:
+        _chunk_collections = bool(
+            await conn.fetchval("SELECT to_regproc('ensure_chunk_partition') IS NOT NULL")
+        )
+        if not _chunk_collections:
+            logger.warning(
+                "sql/chunk-collections.sql not applied: ingesting without chunk collections"
+            )
+    return _chunk_collections
+
+
+def find_document_files(documents_folder: str) -> List[str]:
+    """Find all supported document files in a folder (recursive, sorted)."""
+    if not os.path.exists(documents_folder):
+        logger.error(f"Documents folder not found: {documents_folder}")
+        return []
+
+    files = []
+    for pattern in SUPPORTED_PATTERNS:
+        files.extend(glob.glob(os.path.join(documents_folder, "**", pattern), recursive=True))
+
+    return sorted(files)
+
 
 class DocumentIngestionPipeline:
     """Pipeline for ingesting documents into vector DB and knowledge graph."""
@@ -44,6 +118,8 @@ class DocumentIngestionPipeline:
         documents_folder: str = "documents",
         clean_before_ingest: bool = False,
         fast_mode: bool = False,
+        rebuild: bool = False,
+        clean_collection: Optional[str] = None,
     ):
         """
         Initialize ingestion pipeline.
@@ -53,11 +129,22 @@ class DocumentIngestionPipeline:
             documents_folder: Folder containing markdown documents
             clean_before_ingest: Whether to clean existing data before ingestion (default: False)
             fast_mode: Whether to use fast mode (disable OCR and table structure)
+            rebuild: Full blue/green reindex: load into shadow tables, build indexes
+                once and swap them in (see ingestion/reindex.py); the live tables
+                keep serving searches until the swap
+            clean_collection: Delete one collection (see utils/db_utils.py::
+                document_collection) before ingestion instead of everything
         """
         self.config = config
         self.documents_folder = documents_folder
         self.clean_before_ingest = clean_before_ingest
         self.fast_mode = fast_mode
+        self.rebuild = rebuild
+        self.clean_collection = clean_collection
+
+        # Target tables for _save_to_postgres (shadow tables during a rebuild)
+        self._documents_table = shadow_name("documents") if rebuild else "documents"
+        self._chunks_table = shadow_name("chunks") if rebuild else "chunks"
 
         # Initialize components
         self.chunker_config = ChunkingConfig(
@@ -106,44 +193,34 @@ class DocumentIngestionPipeline:
         if not self._initialized:
             await self.initialize()
 
-        # Clean existing data if requested
-        if self.clean_before_ingest:
+        # Clean existing data if requested (a rebuild replaces it at the swap instead)
+        if self.clean_before_ingest and not self.rebuild:
             await self._clean_databases()
+        elif self.clean_collection and not self.rebuild:
+            await self._clean_collection(self.clean_collection)
 
         # Find all supported document files
-        document_files = self._find_document_files()
+        document_files = self.find_document_files()
 
         if not document_files:
             logger.warning(f"No supported document files found in {self.documents_folder}")
             return []
 
+        if self.rebuild:
+            async with db_pool.acquire() as conn:
+                await prepare_shadow_tables(conn)
+
         logger.info(f"Found {len(document_files)} document files to process")
 
         results = []
 
         for i, file_path in enumerate(document_files):
-            try:
-                logger.info(f"Processing file {i + 1}/{len(document_files)}: {file_path}")
-
-                result = await self._ingest_single_document(file_path)
-                results.append(result)
+            logger.info(f"Processing file {i + 1}/{len(document_files)}: {file_path}")
 
-                if progress_callback:
-                    progress_callback(i + 1, len(document_files))
+            results.append(await self.ingest_file(file_path))
 
-            except Exception as e:
-                logger.error(f"Failed to process {file_path}: {e}")
-                results.append(
-                    IngestionResult(
-                        document_id="",
-                        title=os.path.basename(file_path),
-                        chunks_created=0,
-                        entities_extracted=0,
-                        relationships_created=0,
-                        processing_time_ms=0,
-                        errors=[str(e)],
-                    )
-                )
+            if progress_callback:
+                progress_callback(i + 1, len(document_files))
 
         # Log summary
         total_chunks = sum(r.chunks_created for r in results)
@@ -153,8 +230,63 @@ class DocumentIngestionPipeline:
             f"Ingestion complete: {len(results)} documents, {total_chunks} chunks, {total_errors} errors"
         )
 
+        if self.rebuild:
+            await self._finish_rebuild(results)
+
         return results
 
+    async def _finish_rebuild(self, results: List[IngestionResult]) -> None:
+        """Build the shadow indexes and swap them in, unless a document failed."""
+        failed = [r.title for r in results if r.errors]
+        async with db_pool.acquire() as conn:
+            if failed:
+                # Swapping would drop the failed documents from the knowledge base
+                logger.error(
+                    f"Rebuild aborted: {len(failed)} documents failed; live tables unchanged"
+                )
+                await drop_shadow_tables(conn)
+                return
+
+            index_start = datetime.now()
+            index_names = await build_shadow_indexes(conn)
+            logger.info(
+                f"Built {len(index_names)} indexes in "
+                f"{(datetime.now() - index_start).total_seconds():.1f}s"
+            )
+            await swap_shadow_tables(conn, index_names)
+
+    def find_document_files(self) -> List[str]:
+        """Return the sorted list of supported document files in the documents folder."""
+        return find_document_files(self.documents_folder)
+
+    async def ingest_file(self, file_path: str) -> IngestionResult:
+        """
+        Ingest a single file, converting failures into an IngestionResult with errors.
+
+        Used by ingest_documents() and by external drivers (API job workers) that
+        schedule files themselves.
+
+        Args:
+            file_path: Path to the document file
+
+        Returns:
+            Ingestion result (never raises for per-file failures)
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        try:
+            return await self._ingest_single_document(file_path)
+        except Exception as e:
+            logger.error(f"Failed to process {file_path}: {e}")
+            return IngestionResult(
+                document_id="",
+                title=os.path.basename(file_path),
+                chunks_created=0,
+                processing_time_ms=0,
+                errors=[str(e)],
+            )
+
     async def _ingest_single_document(self, file_path: str) -> IngestionResult:
         """
         Ingest a single document.
@@ -168,7 +300,9 @@ class DocumentIngestionPipeline:
         start_time = datetime.now()
 
         # Read document (returns tuple: content, docling_doc)
-        document_content, docling_doc = self._read_document(file_path)
+        # Docling conversion is blocking: run it in a thread so the event loop (job
+        # heartbeats, embedding I/O of other tasks) keeps running
+        document_content, docling_doc = await asyncio.to_thread(self._read_document, file_path)
         document_title = self._extract_title(document_content, file_path)
         document_source = os.path.relpath(file_path, self.documents_folder)
 
@@ -207,6 +341,9 @@ class DocumentIngestionPipeline:
         embedded_chunks = await self.embedder.embed_chunks(chunks)
         logger.info(f"Generated embeddings for {len(embedded_chunks)} chunks")
 
+        # Stored once on the document instead of on every chunk
+        document_metadata["embedding_model"] = self.embedder.model_name
+
         # Save to PostgreSQL
         document_id = await self._save_to_postgres(
             document_title, document_source, document_content, embedded_chunks, document_metadata
@@ -214,6 +351,16 @@ class DocumentIngestionPipeline:
 
         logger.info(f"Saved document to PostgreSQL with ID: {document_id}")
 
+        # Keep secondary embedding spaces in step (rebuilds start them over, see reindex.py)
+        if not self.rebuild:
+            try:
+                await embed_document_into_spaces(document_id)
+            except Exception as e:
+                logger.warning(
+                    f"Embedding spaces not updated for {document_id} ({e}); "
+                    "re-run python -m ingestion.embedding_backfill backfill"
+                )
+
         # Knowledge graph functionality removed
         relationships_created = 0
         graph_errors = []
@@ -225,42 +372,13 @@ class DocumentIngestionPipeline:
             document_id=document_id,
             title=document_title,
             chunks_created=len(chunks),
+            tokens_processed=sum(chunk.token_count or 0 for chunk in chunks),
             entities_extracted=entities_extracted,
             relationships_created=relationships_created,
             processing_time_ms=processing_time,
             errors=graph_errors,
         )
 
-    def _find_document_files(self) -> List[str]:
-        """Find all supported document files in the documents folder."""
-        if not os.path.exists(self.documents_folder):
-            logger.error(f"Documents folder not found: {self.documents_folder}")
-            return []
-
-        # Supported file patterns - Docling + text formats
-        patterns = [
-            "*.md",
-            "*.markdown",
-            "*.txt",  # Text formats
-            "*.pdf",  # PDF
-            "*.docx",
-            "*.doc",  # Word
-            "*.pptx",
-            "*.ppt",  # PowerPoint
-            "*.xlsx",
-            "*.xls",  # Excel
-            "*.html",
-            "*.htm",  # HTML
-        ]
-        files = []
-
-        for pattern in patterns:
-            files.extend(
-                glob.glob(os.path.join(self.documents_folder, "**", pattern), recursive=True)
-            )
-
-        return sorted(files)
-
     def _read_document(self, file_path: str) -> tuple[str, Optional[Any]]:
         """
         Read document content from file - supports multiple formats via Docling.
@@ -402,16 +520,40 @@ class DocumentIngestionPipeline:
 
         Idempotent: If a document with the same source already exists, it will be updated
         instead of creating a duplicate. Old chunks are deleted and new ones inserted.
+
+        Also maintains the statistics layer in the same transaction: chunk_count and
+        token_count on documents, and the per-source rollup in source_stats.
+
+        During a rebuild, rows go to the (unindexed) shadow tables: every source is
+        new there, and source_stats is recomputed at the swap.
         """
+        chunk_count = len(chunks)
+        token_count = sum(chunk.token_count or 0 for chunk in chunks)
+
         async with db_pool.acquire() as conn:
+            # Without the migration, rows are written without their collection
+            collection = None
+            if await _has_chunk_collections(conn):
+                collection = document_collection(source, metadata)
+                # Own transaction: a new partition briefly locks the chunks table
+                await ensure_chunk_partition(conn, collection, self._chunks_table)
+            collection_column = ", collection" if collection else ""
+            collection_param = ", $7" if collection else ""
+            collection_set = ", collection = $7" if collection else ""
+            collection_value = [collection] if collection else []
+
             async with conn.transaction():
                 # Check if document with same source already exists
-                existing_doc = await conn.fetchrow(
-                    """
-                    SELECT id FROM documents WHERE source = $1
-                    """,
-                    source,
-                )
+                existing_doc = None
+                if not self.rebuild:
+                    existing_doc = await conn.fetchrow(
+                        f"""
+                        SELECT id, chunk_count, token_count{collection_column}
+                        FROM documents WHERE source = $1
+                        FOR UPDATE
+                        """,
+                        source,
+                    )
 
                 if existing_doc:
                     # Document exists: update it and replace chunks
@@ -422,39 +564,65 @@ class DocumentIngestionPipeline:
 
                     # Update document
                     await conn.execute(
-                        """
+                        f"""
                         UPDATE documents
-                        SET title = $1, content = $2, metadata = $3
+                        SET title = $1, content = $2, metadata = $3,
+                            chunk_count = $5, token_count = $6{collection_set}
                         WHERE id = $4
                         """,
                         title,
                         content,
                         json.dumps(metadata),
                         document_id,
+                        chunk_count,
+                        token_count,
+                        *collection_value,
                     )
-
-                    # Delete old chunks
-                    await conn.execute(
-                        """
-                        DELETE FROM chunks WHERE document_id = $1
-                        """,
-                        document_id,
+                    await update_source_stats(
+                        conn,
+                        source,
+                        document_delta=0,
+                        chunk_delta=chunk_count - existing_doc["chunk_count"],
+                        token_delta=token_count - existing_doc["token_count"],
                     )
+
+                    # Delete old chunks (collection: prunes to their partition)
+                    if collection:
+                        await conn.execute(
+                            "DELETE FROM chunks WHERE document_id = $1 AND collection = $2",
+                            document_id,
+                            existing_doc["collection"],
+                        )
+                    else:
+                        await conn.execute("DELETE FROM chunks WHERE document_id = $1", document_id)
                     logger.info(f"Deleted old chunks for document {document_id}")
                 else:
                     # Document doesn't exist: insert new one
                     document_result = await conn.fetchrow(
-                        """
-                        INSERT INTO documents (title, source, content, metadata)
-                        VALUES ($1, $2, $3, $4)
+                        f"""
+                        INSERT INTO {self._documents_table}
+                            (title, source, content, metadata, chunk_count, token_count
+                             {collection_column})
+                        VALUES ($1, $2, $3, $4, $5, $6{collection_param})
                         RETURNING id::text
                         """,
                         title,
                         source,
                         content,
                         json.dumps(metadata),
+                        chunk_count,
+                        token_count,
+                        *collection_value,
                     )
                     document_id = document_result["id"]
+                    if not self.rebuild:
+                        await update_source_stats(
+                            conn,
+                            source,
+                            document_delta=1,
+                            chunk_delta=chunk_count,
+                            token_delta=token_count,
+                        )
                     logger.info(f"Created new document with ID: {document_id}")
 
                 # Insert chunks (same for both update and insert cases)
@@ -466,9 +634,11 @@ class DocumentIngestionPipeline:
                         embedding_data = "[" + ",".join(map(str, chunk.embedding)) + "]"
 
                     await conn.execute(
-                        """
-                        INSERT INTO chunks (document_id, content, embedding, chunk_index, metadata, token_count)
-                        VALUES ($1::uuid, $2, $3::vector, $4, $5, $6)
+                        f"""
+                        INSERT INTO {self._chunks_table}
+                            (document_id, content, embedding, chunk_index, metadata, token_count
+                             {collection_column})
+                        VALUES ($1::uuid, $2, $3::vector, $4, $5, $6{collection_param})
                         """,
                         document_id,
                         chunk.content,
@@ -476,6 +646,7 @@ class DocumentIngestionPipeline:
                         chunk.index,
                         json.dumps(chunk.metadata),
                         chunk.token_count,
+                        *collection_value,
                     )
 
                 return document_id
@@ -489,9 +660,60 @@ class DocumentIngestionPipeline:
             async with conn.transaction():
                 await conn.execute("DELETE FROM chunks")
                 await conn.execute("DELETE FROM documents")
+                await conn.execute("DELETE FROM source_stats")
 
         logger.info("Cleaned PostgreSQL database")
 
+    async def _clean_collection(self, collection: str):
+        """
+        Delete one collection's documents and chunks.
+
+        With partitioned chunks (sql/partition-chunks.sql) the collection's
+        partition is truncated instead of deleted row by row.
+        """
+        logger.warning(f"Cleaning collection '{collection}'...")
+
+        async with db_pool.acquire() as conn:
+            async with conn.transaction():
+                partition = await conn.fetchval(
+                    "SELECT to_regclass(chunk_partition_name($1))::text", collection
+                )
+                if partition:
+                    # TRUNCATE skips the per-row cascade to secondary embedding spaces
+                    if await conn.fetchval("SELECT to_regclass('chunk_embeddings')"):
+                        await conn.execute(
+                            f"DELETE FROM chunk_embeddings ce USING {partition} c "
+                            "WHERE ce.chunk_id = c.id"
+                        )
+                    await conn.execute(f"TRUNCATE {partition}")
+                else:
+                    await conn.execute("DELETE FROM chunks WHERE collection = $1", collection)
+
+                deleted = await conn.fetch(
+                    """
+                    DELETE FROM documents WHERE collection = $1
+                    RETURNING source, chunk_count, token_count
+                    """,
+                    collection,
+                )
+                # One rollup update per top-level source
+                totals: Dict[str, List[int]] = {}
+                for doc in deleted:
+                    total = totals.setdefault(source_root(doc["source"]), [0, 0, 0])
+                    total[0] += 1
+                    total[1] += doc["chunk_count"]
+                    total[2] += doc["token_count"]
+                for root, (documents, chunk_total, token_total) in totals.items():
+                    await update_source_stats(
+                        conn,
+                        root,
+                        document_delta=-documents,
+                        chunk_delta=-chunk_total,
+                        token_delta=-token_total,
+                    )
+
+        logger.info(f"Cleaned collection '{collection}': {len(deleted)} documents")
+
 
 async def main():
     """Main function for running ingestion."""
@@ -502,6 +724,18 @@ async def main():
         action="store_true",
         help="Clean existing data before ingestion (default: incremental update, no clean)",
     )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Full reindex into shadow tables, swapped in atomically when done "
+        "(searches keep using the current data meanwhile)",
+    )
+    parser.add_argument(
+        "--clean-collection",
+        metavar="NAME",
+        help="Delete one collection (top-level source, or CHUNK_COLLECTION_KEY value) "
+        "before ingestion",
+    )
     parser.add_argument(
         "--chunk-size", type=int, default=1000, help="Chunk size for splitting documents"
     )
@@ -536,6 +770,8 @@ async def main():
         documents_folder=args.documents,
         clean_before_ingest=args.clean,  # Only clean if explicitly requested
         fast_mode=args.fast,
+        rebuild=args.rebuild,
+        clean_collection=args.clean_collection,
     )
 
     def progress_callback(current: int, total: int):
@@ -0,0 +1,282 @@
+"""
+Blue/green full reindex: load into shadow tables, build indexes once, swap atomically.
+
+A rebuild (`python -m ingestion.ingest --rebuild`) never touches the live tables
+while it loads:
+
+1. prepare_shadow_tables() creates documents_shadow/chunks_shadow with the live
+   column definitions and no indexes, keys or triggers, so inserts skip HNSW
+   maintenance entirely.
+2. The pipeline writes every document into the shadow tables.
+3. build_shadow_indexes() recreates every index, key and trigger of the live
+   tables on the shadow tables in one pass each, with parallel maintenance
+   workers and a larger maintenance_work_mem (HNSW built once, not per insert).
+4. swap_shadow_tables() renames the tables and their indexes in one transaction
+   and recomputes source_stats; searchers see either the old or the new corpus.
+
+Partitioned chunks (sql/partition-chunks.sql) get a partitioned shadow table:
+the pipeline creates its per-collection partitions while loading, the indexes are
+built on the parent (one HNSW per partition) and the swap renames the
+partitions along with the tables.
+
+Tables referencing documents/chunks from outside (chunk_embeddings) hold ids of
+the old generation: the swap empties them, re-creates their foreign keys on the
+new tables and sets secondary embedding spaces back to backfilling (re-run
+python -m ingestion.embedding_backfill backfill).
+
+Privileges on the new tables come from the schema defaults (re-GRANT if the live
+tables had explicit grants).
+"""
+
+import logging
+import os
+import re
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("documents", "chunks")
+SHADOW_SUFFIX = "_shadow"
+OLD_SUFFIX = "_old"
+
+# Index build settings (session-level, applied only on the rebuild connection)
+REINDEX_MAINTENANCE_WORK_MEM = os.getenv("REINDEX_MAINTENANCE_WORK_MEM", "1GB")
+REINDEX_PARALLEL_WORKERS = int(os.getenv("REINDEX_PARALLEL_WORKERS", "4"))
+# Upper bound on waiting for in-flight queries before the swap takes its locks
+REINDEX_SWAP_LOCK_TIMEOUT = os.getenv("REINDEX_SWAP_LOCK_TIMEOUT", "30s")
+
+
+def shadow_name(name: str) -> str:
+    """Name of the shadow copy of a table, index or constraint."""
+    return name + SHADOW_SUFFIX
+
+
+def _retarget(definition: str) -> str:
+    """Point an index/trigger/constraint definition at the shadow tables."""
+    for live in TABLES:
+        definition = re.sub(
+            rf"(\bON (?:ONLY )?|\bREFERENCES )((?:\w+\.)?){live}\b",
+            rf"\g<1>\g<2>{shadow_name(live)}",
+            definition,
+        )
+    return definition
+
+
+async def _is_partitioned(conn, table: str) -> bool:
+    """Whether a table is partitioned (sql/partition-chunks.sql)."""
+    partitioned = await conn.fetchval(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass($1)", table
+    )
+    return partitioned is not None
+
+
+async def _partitions(conn, table: str) -> List[str]:
+    """Names of the partitions of a partitioned table."""
+    rows = await conn.fetch(
+        """
+        SELECT c.relname AS name
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = $1::regclass
+        """,
+        table,
+    )
+    return [row["name"] for row in rows]
+
+
+async def prepare_shadow_tables(conn) -> None:
+    """(Re)create empty shadow tables with the live column definitions and no indexes."""
+    await conn.execute(
+        f"DROP TABLE IF EXISTS {shadow_name('chunks')}, {shadow_name('documents')} CASCADE"
+    )
+    for table in TABLES:
+        # Partitions per collection are added while loading (ensure_chunk_partition)
+        partitioning = ""
+        if await _is_partitioned(conn, table):
+            partitioning = " PARTITION BY LIST (collection)"
+        await conn.execute(
+            f"""
+            CREATE TABLE {shadow_name(table)} (
+                LIKE {table} INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS
+            ){partitioning}
+            """
+        )
+        if partitioning:
+            await conn.execute(
+                f"CREATE TABLE {shadow_name(table)}_default "
+                f"PARTITION OF {shadow_name(table)} DEFAULT"
+            )
+    logger.info("Prepared shadow tables for rebuild")
+
+
+async def build_shadow_indexes(conn) -> List[str]:
+    """
+    Recreate the live indexes, keys and triggers on the shadow tables.
+
+    Runs after the load, so each index (HNSW included) is built in one pass.
+
+    Returns:
+        Names of the indexes built
+    """
+    await conn.execute(f"SET maintenance_work_mem = '{REINDEX_MAINTENANCE_WORK_MEM}'")
+    await conn.execute(f"SET max_parallel_maintenance_workers = {REINDEX_PARALLEL_WORKERS:d}")
+
+    built = []
+    for table in TABLES:
+        partitioned = await _is_partitioned(conn, table)
+        indexes = await conn.fetch(
+            """
+            SELECT c.relname AS name, pg_get_indexdef(i.indexrelid) AS definition,
+                   con.contype AS constraint_type,
+                   pg_get_constraintdef(con.oid) AS constraint_definition
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            LEFT JOIN pg_constraint con ON con.conindid = i.indexrelid
+                AND con.conrelid = i.indrelid
+            WHERE i.indrelid = $1::regclass
+            ORDER BY i.indisprimary DESC, c.relname
+            """,
+            table,
+        )
+        for index in indexes:
+            name = shadow_name(index["name"])
+            if partitioned and index["constraint_type"] in ("p", "u"):
+                # No USING INDEX on partitioned tables: the constraint builds its index
+                await conn.execute(
+                    f"ALTER TABLE {shadow_name(table)} "
+                    f"ADD CONSTRAINT {name} {index['constraint_definition']}"
+                )
+                built.append(index["name"])
+                logger.info(f"Built {name} on {shadow_name(table)}")
+                continue
+
+            definition = _retarget(index["definition"]).replace(
+                f"INDEX {index['name']} ON", f"INDEX {name} ON", 1
+            )
+            if partitioned:
+                # Partitioned indexes are defined ON ONLY; build them on every partition
+                definition = definition.replace(" ON ONLY ", " ON ", 1)
+            await conn.execute(definition)
+            if index["constraint_type"] == "p":
+                await conn.execute(
+                    f"ALTER TABLE {shadow_name(table)} "
+                    f"ADD CONSTRAINT {name} PRIMARY KEY USING INDEX {name}"
+                )
+            elif index["constraint_type"] == "u":
+                await conn.execute(
+                    f"ALTER TABLE {shadow_name(table)} "
+                    f"ADD CONSTRAINT {name} UNIQUE USING INDEX {name}"
+                )
+            built.append(index["name"])
+            logger.info(f"Built {name} on {shadow_name(table)}")
+
+    # Foreign keys and check constraints (validated in one pass over the loaded rows)
+    for table in TABLES:
+        constraints = await conn.fetch(
+            """
+            SELECT conname AS name, pg_get_constraintdef(oid) AS definition
+            FROM pg_constraint
+            WHERE conrelid = $1::regclass AND contype IN ('f', 'c')
+            """,
+            table,
+        )
+        for constraint in constraints:
+            await conn.execute(
+                f"ALTER TABLE {shadow_name(table)} ADD CONSTRAINT {constraint['name']} "
+                f"{_retarget(constraint['definition'])}"
+            )
+
+    for table in TABLES:
+        triggers = await conn.fetch(
+            """
+            SELECT pg_get_triggerdef(oid) AS definition
+            FROM pg_trigger
+            WHERE tgrelid = $1::regclass AND NOT tgisinternal
+            """,
+            table,
+        )
+        for trigger in triggers:
+            await conn.execute(_retarget(trigger["definition"]))
+
+    for table in TABLES:
+        await conn.execute(f"ANALYZE {shadow_name(table)}")
+
+    await conn.execute("RESET maintenance_work_mem")
+    await conn.execute("RESET max_parallel_maintenance_workers")
+    return built
+
+
+async def swap_shadow_tables(conn, index_names: List[str]) -> None:
+    """
+    Swap the shadow tables in and drop the previous generation.
+
+    Renames happen in one transaction; readers block only for the catalog
+    update and then see the new tables under the usual names.
+    """
+    async with conn.transaction():
+        await conn.execute(f"SET LOCAL lock_timeout = '{REINDEX_SWAP_LOCK_TIMEOUT}'")
+        await conn.execute("LOCK TABLE documents, chunks IN ACCESS EXCLUSIVE MODE")
+
+        # Foreign keys of other tables into the live tables (e.g. chunk_embeddings)
+        references = await conn.fetch(
+            """
+            SELECT conrelid::regclass::text AS table_name, conname AS name,
+                   pg_get_constraintdef(oid) AS definition
+            FROM pg_constraint
+            WHERE contype = 'f'
+              AND confrelid IN ('documents'::regclass, 'chunks'::regclass)
+              AND conrelid NOT IN ('documents'::regclass, 'chunks'::regclass)
+            """
+        )
+        for ref in references:
+            await conn.execute(f"TRUNCATE {ref['table_name']}")
+            await conn.execute(f"ALTER TABLE {ref['table_name']} DROP CONSTRAINT {ref['name']}")
+
+        for name in index_names:
+            await conn.execute(f"ALTER INDEX {name} RENAME TO {name}{OLD_SUFFIX}")
+        for table in TABLES:
+            # Partition names follow their parent (chunk_partition_name)
+            if await _is_partitioned(conn, table):
+                for partition in await _partitions(conn, table):
+                    await conn.execute(f"ALTER TABLE {partition} RENAME TO {partition}{OLD_SUFFIX}")
+            if await _is_partitioned(conn, shadow_name(table)):
+                for partition in await _partitions(conn, shadow_name(table)):
+                    live_partition = table + partition[len(shadow_name(table)) :]
+                    await conn.execute(f"ALTER TABLE {partition} RENAME TO {live_partition}")
+            await conn.execute(f"ALTER TABLE {table} RENAME TO {table}{OLD_SUFFIX}")
+            await conn.execute(f"ALTER TABLE {shadow_name(table)} RENAME TO {table}")
+        for name in index_names:
+            await conn.execute(f"ALTER INDEX {shadow_name(name)} RENAME TO {name}")
+
+        for ref in references:
+            await conn.execute(
+                f"ALTER TABLE {ref['table_name']} ADD CONSTRAINT {ref['name']} {ref['definition']}"
+            )
+        if await conn.fetchval("SELECT to_regclass('embedding_spaces')") is not None:
+            # Partitioned chunks cascade by trigger, not foreign key: empty it here
+            await conn.execute("TRUNCATE chunk_embeddings")
+            await conn.execute(
+                "UPDATE embedding_spaces SET status = 'backfilling', updated_at = NOW() "
+                "WHERE status = 'ready'"
+            )
+
+        # Counters were written per document into the shadow rows; rebuild the rollup
+        await conn.execute("DELETE FROM source_stats")
+        await conn.execute(
+            """
+            INSERT INTO source_stats (source, document_count, chunk_count, token_count)
+            SELECT split_part(source, '/', 1), COUNT(*), SUM(chunk_count), SUM(token_count)
+            FROM documents
+            GROUP BY split_part(source, '/', 1)
+            """
+        )
+
+    await conn.execute(f"DROP TABLE chunks{OLD_SUFFIX}, documents{OLD_SUFFIX}")
+    logger.info("Swapped rebuilt tables in")
+
+
+async def drop_shadow_tables(conn) -> None:
+    """Discard an unfinished rebuild."""
+    await conn.execute(
+        f"DROP TABLE IF EXISTS {shadow_name('chunks')}, {shadow_name('documents')} CASCADE"
+    )
@@ -6,8 +6,19 @@ Unified entry point that runs:
 1. MCP server on STDIO (for Cursor/Claude Desktop integration)
 2. HTTP server on port 8080 (for /health and /metrics endpoints)
 
+Or, with --transport http (MCP_TRANSPORT=http), a single-loop server: MCP
+streamable-HTTP transport (/mcp), /metrics and /health from one ASGI app on one
+event loop (docling_mcp/asgi.py), no observability thread. Many clients share
+this one process (one embedder, cache and DB pool); see docling_mcp/clients.py
+for authentication (MCP_AUTH_TOKENS) and per-client metrics. --transport sse
+serves the legacy SSE transport (/sse) for clients without streamable HTTP.
+These bind to 127.0.0.1 by default; any other --host requires authentication.
+
 Usage:
     uv run python mcp_server.py
+    uv run python mcp_server.py --transport http [--port 8080]
+    MCP_AUTH_TOKENS=alice:secret uv run python mcp_server.py --transport http --host 0.0.0.0
+    uv run python mcp_server.py --transport sse
 
 Cursor MCP Configuration (mcp.json):
     {
@@ -23,13 +34,24 @@ Cursor MCP Configuration (mcp.json):
       }
     }
 
+Cursor MCP Configuration for the shared server (--transport http):
+    {
+      "docling-rag": {
+        "url": "http://rag-host:8080/mcp",
+        "headers": {"Authorization": "Bearer <token from MCP_AUTH_TOKENS>"}
+      }
+    }
+
 Endpoints (after server starts):
     - http://localhost:8080/health  - Health check
+    - http://localhost:8080/health/live, /health/ready - Liveness / readiness probes
     - http://localhost:8080/metrics - Prometheus metrics
     - http://localhost:8080/docs    - API documentation
 """
 
+import argparse
 import asyncio
+import ipaddress
 import logging
 import os
 import threading
@@ -88,14 +110,78 @@ def start_http_server_thread(host: str = "0.0.0.0", port: int = 8080) -> Optiona
     thread.start()
     logger.info(f"HTTP observability server started on http://{host}:{port}")
     logger.info(f"  - Health: http://localhost:{port}/health")
+    logger.info(f"  - Probes: http://localhost:{port}/health/live, /health/ready")
     logger.info(f"  - Metrics: http://localhost:{port}/metrics")
     return thread
 
 
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def run_single_loop(host: str = "127.0.0.1", port: int = 8080, transport: str = "http") -> None:
+    """
+    Serve MCP (streamable HTTP or SSE), /metrics and /health from one app on one event loop.
+
+    Args:
+        host: Host to bind to (default: 127.0.0.1; other hosts require MCP_AUTH_TOKENS
+            or MCP_AUTH_PROVIDER)
+        port: Port to listen on (default: 8080, or METRICS_PORT env var)
+        transport: "http" (streamable HTTP) or "sse"
+
+    Raises:
+        SystemExit: Authentication not configured for a non-loopback host
+    """
+    import uvicorn
+
+    from docling_mcp.asgi import create_app
+    from docling_mcp.server import mcp
+
+    app = create_app(transport=transport)
+    if mcp.auth is None and not _is_loopback(host):
+        raise SystemExit(
+            f"Refusing to serve MCP on {host} without authentication: "
+            "set MCP_AUTH_TOKENS or MCP_AUTH_PROVIDER, or bind to 127.0.0.1"
+        )
+
+    logger.info(f"Starting single-loop MCP server on http://{host}:{port}")
+    logger.info(f"  - MCP: http://localhost:{port}{app.state.mcp_path}")
+    logger.info(f"  - Health: http://localhost:{port}/health")
+    logger.info(f"  - Metrics: http://localhost:{port}/metrics")
+    uvicorn.run(app, host=host, port=port, log_level="info")
+
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Docling RAG MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http", "sse"],
+        default=os.getenv("MCP_TRANSPORT", "stdio"),
+        help=(
+            "stdio (default): MCP on STDIO + observability thread; "
+            "http / sse: shared single-loop app"
+        ),
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="http / sse bind address; other than loopback requires MCP_AUTH_TOKENS",
+    )
+    parser.add_argument("--port", type=int, default=int(os.getenv("METRICS_PORT", "8080")))
+    args = parser.parse_args()
+
+    if args.transport in ("http", "sse"):
+        run_single_loop(args.host, args.port, args.transport)
+        return
+
     # Start HTTP server for observability in background
-    http_thread = start_http_server_thread()
+    http_thread = start_http_server_thread(port=args.port)
 
     # Import and run MCP server (blocks on STDIO)
     from docling_mcp.server import mcp
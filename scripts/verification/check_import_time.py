@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Cold-start import budget check for the search-serving processes.
+
+Imports each target module in a fresh interpreter with `python -X importtime`,
+then fails if:
+- the cumulative import time exceeds the target's budget, or
+- a forbidden heavy module (Docling, transformers, torch) was imported.
+
+Search processes (API, MCP server) must only import Docling/transformers when
+ingestion actually runs in that process (see ingestion/chunker.py).
+
+Usage:
+    uv run python scripts/verification/check_import_time.py
+    uv run python scripts/verification/check_import_time.py --budget-ms 800 api.main
+    uv run python scripts/verification/check_import_time.py --top 15 docling_mcp.server=3000
+
+Targets are `module` or `module=budget_ms`. Default budget: IMPORT_TIME_BUDGET_MS or 1000.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Project root (scripts/verification/ -> scripts/ -> project_root)
+project_root = Path(__file__).parent.parent.parent
+
+DEFAULT_TARGETS = [
+    "api.main",
+    "core.rag_service",
+    # openai + LangFuse wrapper; loaded in a background thread after startup
+    "ingestion.embedder=3000",
+    # Job/queue coordinators import the pipeline module but must not load Docling
+    "ingestion.ingest=3000",
+    # FastMCP itself accounts for most of the MCP server import time
+    "docling_mcp.server=4000",
+]
+
+FORBIDDEN_MODULES = ("docling", "docling_core", "transformers", "torch")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        List of (module, self_us, cumulative_us) for every imported module
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def find_forbidden(modules: list[str]) -> list[str]:
+    """Return imported modules that belong to a forbidden top-level package."""
+    return sorted(m for m in set(modules) if m.split(".")[0] in FORBIDDEN_MODULES)
+
+
+def measure(module: str) -> tuple[int, list[tuple[str, int, int]], str]:
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple of (total_us, entries, error). error is empty on success.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(project_root)},
+    )
+    entries = parse_importtime(result.stderr)
+    total_us = next((cum for name, _, cum in entries if name == module), 0)
+
+    error = ""
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+    return total_us, entries, error
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check cold-start import time budget")
+    parser.add_argument("targets", nargs="*", help="module or module=budget_ms")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "1000")),
+        help="Default budget per target in ms",
+    )
+    parser.add_argument("--top", type=int, default=5, help="Show N slowest imports per target")
+    args = parser.parse_args()
+
+    failures = []
+    print("⏱️  Import time budget check")
+
+    for target in args.targets or DEFAULT_TARGETS:
+        module, _, budget = target.partition("=")
+        budget_ms = float(budget) if budget else args.budget_ms
+
+        total_us, entries, error = measure(module)
+        total_ms = total_us / 1000
+        forbidden = find_forbidden([name for name, _, _ in entries])
+
+        ok = not error and not forbidden and total_ms <= budget_ms
+        status = "✅" if ok else "❌"
+        print(f"\n{status} {module}: {total_ms:.0f}ms (budget {budget_ms:.0f}ms)")
+
+        if error:
+            print(f"  import failed: {error}")
+            failures.append(module)
+            continue
+        if forbidden:
+            print(f"  forbidden heavy modules imported: {', '.join(forbidden[:10])}")
+            failures.append(module)
+        elif total_ms > budget_ms:
+            failures.append(module)
+
+        top_level = sorted(
+            (e for e in entries if "." not in e[0] and e[0] != module),
+            key=lambda e: e[2],
+            reverse=True,
+        )
+        for name, _, cumulative_us in top_level[: args.top]:
+            print(f"  {cumulative_us / 1000:8.1f}ms  {name}")
+
+    if failures:
+        print(f"\n❌ Import budget check failed: {', '.join(failures)}")
+        return 1
+
+    print("\n✅ All targets within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
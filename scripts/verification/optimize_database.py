@@ -13,6 +13,10 @@ Performance Impact:
 - Upgrades IVFFlat (lists=1) to HNSW index: 50-80% faster searches
 - Optimizes connection pool: 20-30% reduced overhead
 - Adds source filtering indexes: 40-60% faster filtered queries
+
+Partitioned chunks (sql/partition-chunks.sql) are reported per partition
+(collection): sizes and index sizes are summed over the partitions, and every
+partition must carry its own HNSW index.
 """
 
 import argparse
@@ -46,16 +50,45 @@ async def check_database_status() -> Dict[str, Any]:
     conn = await asyncpg.connect(database_url)
 
     try:
-        # Check table sizes
+        # Check table sizes (summed over partitions: a partitioned parent has no storage)
         stats = await conn.fetchrow("""
             SELECT 
                 COUNT(*) as total_chunks,
                 COUNT(DISTINCT document_id) as total_documents,
-                pg_size_pretty(pg_total_relation_size('chunks')) as chunks_size,
+                (SELECT pg_size_pretty(SUM(pg_total_relation_size(relid)))
+                 FROM pg_partition_tree('chunks')) as chunks_size,
                 pg_size_pretty(pg_total_relation_size('documents')) as documents_size
             FROM chunks
         """)
 
+        partitioned = await conn.fetchval("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'chunks'::regclass
+            )
+        """)
+
+        # One row per collection partition, with its HNSW index (if any)
+        partitions = []
+        if partitioned:
+            partitions = await conn.fetch("""
+                SELECT
+                    c.relname AS partition,
+                    pg_get_expr(c.relpartbound, c.oid) AS bound,
+                    GREATEST(c.reltuples, 0)::bigint AS estimated_chunks,
+                    pg_size_pretty(pg_total_relation_size(c.oid)) AS total_size,
+                    (
+                        SELECT pg_size_pretty(SUM(pg_relation_size(ix.indexrelid)))
+                        FROM pg_index ix
+                        JOIN pg_class ic ON ic.oid = ix.indexrelid
+                        JOIN pg_am am ON am.oid = ic.relam
+                        WHERE ix.indrelid = c.oid AND am.amname = 'hnsw'
+                    ) AS hnsw_size
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'chunks'::regclass
+                ORDER BY c.reltuples DESC
+            """)
+
         # Check existing indexes
         indexes = await conn.fetch("""
             SELECT 
@@ -78,7 +111,8 @@ async def check_database_status() -> Dict[str, Any]:
             SELECT 
                 indexname,
                 indexdef,
-                pg_size_pretty(pg_relation_size(indexname::regclass)) as index_size
+                (SELECT pg_size_pretty(SUM(pg_relation_size(relid)))
+                 FROM pg_partition_tree(indexname::regclass)) as index_size
             FROM pg_indexes
             WHERE tablename = 'chunks' 
               AND indexname LIKE '%embedding%'
@@ -89,6 +123,8 @@ async def check_database_status() -> Dict[str, Any]:
             "indexes": [dict(idx) for idx in indexes],
             "hnsw_available": hnsw_available,
             "embedding_index": dict(embedding_index) if embedding_index else None,
+            "partitioned": partitioned,
+            "partitions": [dict(p) for p in partitions],
         }
 
     finally:
@@ -121,15 +157,30 @@ async def apply_optimizations():
         await conn.execute("DROP INDEX IF EXISTS idx_chunks_embedding CASCADE")
         logger.info("✓ Old index dropped")
 
+        partitioned = await conn.fetchval("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'chunks'::regclass
+            )
+        """)
+
         # Create optimized HNSW index
         logger.info("🏗️  Creating optimized HNSW index...")
         logger.info("   (This may take several minutes for large datasets)")
 
-        await conn.execute("""
-            CREATE INDEX idx_chunks_embedding_hnsw ON chunks 
-            USING hnsw (embedding vector_cosine_ops)
-            WITH (m = 16, ef_construction = 64)
-        """)
+        if partitioned:
+            # Index on the parent: one HNSW per partition (new partitions inherit it)
+            logger.info("   (partitioned chunks: one HNSW index per collection)")
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw ON chunks 
+                USING hnsw (embedding vector_cosine_ops)
+                WITH (m = 16, ef_construction = 64)
+            """)
+        else:
+            await conn.execute("""
+                CREATE INDEX idx_chunks_embedding_hnsw ON chunks 
+                USING hnsw (embedding vector_cosine_ops)
+                WITH (m = 16, ef_construction = 64)
+            """)
 
         logger.info("✓ HNSW index created successfully")
 
@@ -156,7 +207,8 @@ async def apply_optimizations():
         """)
         logger.info("✓ Composite index created")
 
-        # Analyze tables for query planner
+        # Analyze tables for query planner (autovacuum never analyzes a partitioned
+        # parent, only its partitions: the explicit ANALYZE covers both)
         logger.info("📈 Updating table statistics...")
         await conn.execute("ANALYZE chunks")
         await conn.execute("ANALYZE documents")
@@ -168,7 +220,8 @@ async def apply_optimizations():
         indexes = await conn.fetch("""
             SELECT 
                 indexname,
-                pg_size_pretty(pg_relation_size(indexname::regclass)) as size
+                (SELECT pg_size_pretty(SUM(pg_relation_size(relid)))
+                 FROM pg_partition_tree(indexname::regclass)) as size
             FROM pg_indexes
             WHERE tablename IN ('chunks', 'documents')
             ORDER BY tablename, indexname
@@ -352,6 +405,18 @@ async def main():
             else:
                 logger.warning("\n⚠️  WARNING: No embedding index found!")
 
+            if status["partitioned"]:
+                logger.info(f"\n🧩 Partitioned chunks: {len(status['partitions'])} partitions")
+                for part in status["partitions"]:
+                    logger.info(
+                        f"   - {part['partition']} {part['bound']}: "
+                        f"~{part['estimated_chunks']:,} chunks, {part['total_size']}, "
+                        f"HNSW {part['hnsw_size'] or 'MISSING'}"
+                    )
+                if any(part["hnsw_size"] is None for part in status["partitions"]):
+                    logger.warning("\n⚠️  WARNING: Partitions without HNSW index")
+                    logger.warning("   Run with --apply to build the missing indexes")
+
         if args.apply:
             await apply_optimizations()
 
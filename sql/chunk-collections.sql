@@ -0,0 +1,111 @@
+-- Chunk Collections (partition key for chunk storage)                     MIGRATION
+-- Execute after optimize_index.sql and kb-stats-schema.sql:
+--   psql $DATABASE_URL < sql/chunk-collections.sql
+--
+-- Run it in autocommit mode (psql's default): the chunks backfill COMMITs every
+-- batch, which fails with "invalid transaction termination" inside a transaction
+-- block (psql --single-transaction / -1, BEGIN ... COMMIT, a migration tool
+-- wrapping the file in a transaction).
+--
+-- Every document belongs to one collection: its top-level source
+-- ('langfuse-docs/api.md' -> 'langfuse-docs'), or the value of the document
+-- metadata key named by CHUNK_COLLECTION_KEY when set at ingestion.
+-- chunks.collection copies it so searches can filter (and, with
+-- sql/partition-chunks.sql, prune partitions) without joining documents first.
+--
+-- Also installs the partition helpers used by the ingestion pipeline. They are
+-- no-ops while chunks is a plain table, so this migration is safe on every layout.
+-- Ingestion checks for them once per process and, until this migration is
+-- applied, writes documents and chunks without a collection.
+
+-- documents.collection (backfill: top-level source)
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS collection TEXT;
+UPDATE documents SET collection = split_part(source, '/', 1) WHERE collection IS NULL;
+ALTER TABLE documents ALTER COLUMN collection SET NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_documents_collection ON documents (collection);
+
+-- chunks.collection (backfill in batches: one short transaction per 5000 documents)
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS collection TEXT;
+
+DO $$
+DECLARE
+    batch UUID[];
+BEGIN
+    LOOP
+        SELECT array_agg(id) INTO batch
+        FROM (
+            SELECT d.id FROM documents d
+            WHERE EXISTS (
+                SELECT 1 FROM chunks c WHERE c.document_id = d.id AND c.collection IS NULL
+            )
+            LIMIT 5000
+        ) pending;
+        EXIT WHEN batch IS NULL;
+
+        UPDATE chunks c SET collection = d.collection
+        FROM documents d
+        WHERE c.document_id = d.id AND d.id = ANY(batch) AND c.collection IS NULL;
+        COMMIT;
+    END LOOP;
+END $$;
+
+ALTER TABLE chunks ALTER COLUMN collection SET NOT NULL;
+
+-- Name of the partition holding a collection (hashed: collections are free text)
+CREATE OR REPLACE FUNCTION chunk_partition_name(p_collection TEXT, p_parent TEXT DEFAULT 'chunks')
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT p_parent || '_c_' || substr(md5(p_collection), 1, 12);
+$$;
+
+-- Create the partition of a collection if chunks (or a shadow copy, see
+-- ingestion/reindex.py) is partitioned. Rows of the collection already in the
+-- default partition move to the new partition. Returns the partition name, or
+-- NULL when the table is not partitioned.
+CREATE OR REPLACE FUNCTION ensure_chunk_partition(p_collection TEXT, p_parent TEXT DEFAULT 'chunks')
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_partition TEXT := chunk_partition_name(p_collection, p_parent);
+    v_default TEXT := p_parent || '_default';
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(p_parent)
+    ) THEN
+        RETURN NULL;
+    END IF;
+    IF to_regclass(v_partition) IS NOT NULL THEN
+        RETURN v_partition;
+    END IF;
+
+    -- Concurrent ingestion workers may meet the same new collection
+    PERFORM pg_advisory_xact_lock(hashtext(v_partition));
+    IF to_regclass(v_partition) IS NOT NULL THEN
+        RETURN v_partition;
+    END IF;
+
+    IF to_regclass(v_default) IS NOT NULL THEN
+        EXECUTE format(
+            'CREATE TEMP TABLE _chunk_partition_move ON COMMIT DROP AS '
+            'SELECT * FROM %I WHERE collection = %L',
+            v_default, p_collection
+        );
+        EXECUTE format('DELETE FROM %I WHERE collection = %L', v_default, p_collection);
+    END IF;
+
+    -- Indexes of the parent (HNSW included) are created on the new partition
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES IN (%L)',
+        v_partition, p_parent, p_collection
+    );
+
+    IF to_regclass(v_default) IS NOT NULL THEN
+        EXECUTE format('INSERT INTO %I SELECT * FROM _chunk_partition_move', p_parent);
+        DROP TABLE _chunk_partition_move;
+    END IF;
+    RETURN v_partition;
+END;
+$$;
@@ -0,0 +1,16 @@
+-- Chunk Full-Text Index (lexical search fallback)                        MIGRATION
+-- Execute after optimize_index.sql:
+--   psql $DATABASE_URL < sql/chunks-fts-index.sql
+--
+-- When a query cannot be embedded within its deadline budget, searches fall back
+-- to a full-text match over chunk content (core/rag_service.py::lexical_search).
+-- The expression must match SEARCH_LEXICAL_CONFIG (default 'english'): rebuild
+-- the index with the new configuration if you change it.
+-- On a partitioned chunks table (sql/partition-chunks.sql) the index is created
+-- on every partition. CREATE INDEX blocks writes to chunks while it builds:
+-- run it outside ingestion windows.
+
+CREATE INDEX IF NOT EXISTS idx_chunks_content_fts ON chunks
+USING gin (to_tsvector('english', content));
+
+ANALYZE chunks;
@@ -0,0 +1,60 @@
+-- Compact Chunk Metadata (chunk-specific fields only)                    MIGRATION
+-- Execute after optimize_index.sql (outside a transaction, batches commit):
+--   psql $DATABASE_URL < sql/compact-chunk-metadata.sql
+--
+-- Chunks used to carry a copy of the document metadata (title, source, file_path,
+-- frontmatter, word_count, ...) plus embedding_model/embedding_generated_at.
+-- The chunkers now store only chunk-specific fields; document metadata lives once
+-- on documents and search joins it only when include_document_metadata is set.
+-- This rewrites existing chunk rows in batches of 5000 and is safe to re-run.
+
+-- 1. Keep the embedding model on the document before dropping it from chunks
+UPDATE documents d
+SET metadata = d.metadata || jsonb_build_object('embedding_model', m.embedding_model)
+FROM (
+    SELECT DISTINCT ON (document_id) document_id, metadata->>'embedding_model' AS embedding_model
+    FROM chunks
+    WHERE metadata ? 'embedding_model'
+    ORDER BY document_id
+) m
+WHERE d.id = m.document_id
+  AND NOT d.metadata ? 'embedding_model';
+
+-- 2. Strip everything but chunk-specific keys, walking chunks by id
+DO $$
+DECLARE
+    last_id UUID := '00000000-0000-0000-0000-000000000000';
+    batch_last_id UUID;
+    compacted BIGINT := 0;
+    batch_rows INTEGER;
+BEGIN
+    LOOP
+        SELECT max(id) INTO batch_last_id
+        FROM (SELECT id FROM chunks WHERE id > last_id ORDER BY id LIMIT 5000) b;
+        EXIT WHEN batch_last_id IS NULL;
+
+        UPDATE chunks c
+        SET metadata = (
+            SELECT COALESCE(jsonb_object_agg(key, value), '{}'::jsonb)
+            FROM jsonb_each(c.metadata)
+            WHERE key IN ('chunk_method', 'total_chunks', 'token_count', 'has_context')
+        )
+        WHERE c.id > last_id
+          AND c.id <= batch_last_id
+          AND EXISTS (
+              SELECT 1 FROM jsonb_object_keys(c.metadata) k
+              WHERE k NOT IN ('chunk_method', 'total_chunks', 'token_count', 'has_context')
+          );
+        GET DIAGNOSTICS batch_rows = ROW_COUNT;
+        compacted := compacted + batch_rows;
+
+        last_id := batch_last_id;
+        COMMIT;
+    END LOOP;
+
+    RAISE NOTICE 'Compacted metadata of % chunks', compacted;
+END $$;
+
+-- 3. Reclaim space: idx_chunks_doc_embedding INCLUDEs metadata
+VACUUM (ANALYZE) chunks;
+REINDEX INDEX CONCURRENTLY idx_chunks_doc_embedding;
@@ -0,0 +1,14 @@
+-- Document Listing Keyset Pagination Index                               MIGRATION
+-- Execute after optimize_index.sql:
+--   psql $DATABASE_URL < sql/documents-keyset-index.sql
+--
+-- list_documents pages with a (created_at, id) cursor instead of OFFSET, so every
+-- page is an index range scan of `limit` rows regardless of depth.
+-- The composite index also serves plain ORDER BY created_at DESC, replacing
+-- idx_documents_created_at.
+
+CREATE INDEX IF NOT EXISTS idx_documents_created_at_id ON documents (created_at DESC, id DESC);
+
+DROP INDEX IF EXISTS idx_documents_created_at;
+
+ANALYZE documents;
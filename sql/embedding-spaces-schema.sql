@@ -0,0 +1,77 @@
+-- Versioned Embedding Spaces (utils/embedding_spaces.py)                 MIGRATION
+-- Execute after optimize_index.sql (and chunk-collections.sql):
+--   psql $DATABASE_URL < sql/embedding-spaces-schema.sql
+--
+-- chunks.embedding stays the primary space (EMBEDDING_MODEL). Other models get a
+-- named space whose vectors live in chunk_embeddings, filled in the background
+-- from the stored chunk text (no Docling re-conversion):
+--   python -m ingestion.embedding_backfill register --space te3_large --model text-embedding-3-large --dimensions 3072
+--   python -m ingestion.embedding_backfill backfill --space te3_large
+-- The backfill creates the space's partial HNSW index and marks it ready; then
+-- switch search with SEARCH_EMBEDDING_SPACE or the per-request embedding_space.
+
+CREATE TABLE IF NOT EXISTS embedding_spaces (
+    name TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    dimensions INTEGER NOT NULL CHECK (dimensions > 0),
+    status TEXT NOT NULL DEFAULT 'backfilling'
+        CHECK (status IN ('backfilling', 'ready', 'retired')),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Dimensionless column: each space is indexed with an expression cast to its
+-- dimensions, e.g.
+--   CREATE INDEX idx_chunk_embeddings_<space>_hnsw ON chunk_embeddings
+--   USING hnsw ((embedding::vector(N)) vector_cosine_ops) WHERE space = '<space>';
+CREATE TABLE IF NOT EXISTS chunk_embeddings (
+    space TEXT NOT NULL REFERENCES embedding_spaces(name) ON DELETE CASCADE,
+    chunk_id UUID NOT NULL,
+    embedding vector NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (space, chunk_id)
+);
+
+-- ON DELETE CASCADE from chunks (re-ingestion replaces chunks)
+CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_chunk_id ON chunk_embeddings (chunk_id);
+
+-- Plain chunks: foreign key. Partitioned chunks (partition-chunks.sql) are keyed
+-- by (id, collection), so the cascade is a trigger instead.
+CREATE OR REPLACE FUNCTION delete_chunk_embeddings()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM chunk_embeddings WHERE chunk_id = OLD.id;
+    RETURN OLD;
+END;
+$$;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'chunks'::regclass) THEN
+        DROP TRIGGER IF EXISTS delete_chunk_embeddings ON chunks;
+        CREATE TRIGGER delete_chunk_embeddings AFTER DELETE ON chunks
+            FOR EACH ROW EXECUTE FUNCTION delete_chunk_embeddings();
+    ELSIF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'chunk_embeddings_chunk_id_fkey'
+    ) THEN
+        ALTER TABLE chunk_embeddings ADD CONSTRAINT chunk_embeddings_chunk_id_fkey
+            FOREIGN KEY (chunk_id) REFERENCES chunks(id) ON DELETE CASCADE;
+    END IF;
+END $$;
+
+-- Enable Row Level Security (backend only, same policy as sessions/query_logs)
+ALTER TABLE embedding_spaces ENABLE ROW LEVEL SECURITY;
+ALTER TABLE chunk_embeddings ENABLE ROW LEVEL SECURITY;
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+        DROP POLICY IF EXISTS "Service role only - embedding_spaces" ON embedding_spaces;
+        CREATE POLICY "Service role only - embedding_spaces" ON embedding_spaces
+            FOR ALL TO service_role USING (true);
+        DROP POLICY IF EXISTS "Service role only - chunk_embeddings" ON chunk_embeddings;
+        CREATE POLICY "Service role only - chunk_embeddings" ON chunk_embeddings
+            FOR ALL TO service_role USING (true);
+    END IF;
+END $$;
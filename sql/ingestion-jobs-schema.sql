@@ -0,0 +1,43 @@
+-- Ingestion Jobs Schema (RAG API /v1/ingest job manager)     MIGRATION
+-- Execute after optimize_index.sql:
+--   psql $DATABASE_URL < sql/ingestion-jobs-schema.sql
+CREATE TABLE IF NOT EXISTS ingestion_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    status TEXT NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'completed', 'failed', 'cancelled')),
+    documents_folder TEXT NOT NULL,
+    clean_before_ingest BOOLEAN NOT NULL DEFAULT FALSE,
+    fast_mode BOOLEAN NOT NULL DEFAULT FALSE,
+    -- Progress counters (updated by the worker after each file)
+    files_total INTEGER NOT NULL DEFAULT 0,
+    files_done INTEGER NOT NULL DEFAULT 0,
+    files_failed INTEGER NOT NULL DEFAULT 0,
+    chunks_created INTEGER NOT NULL DEFAULT 0,
+    tokens_processed BIGINT NOT NULL DEFAULT 0,
+    processing_ms BIGINT NOT NULL DEFAULT 0,
+    -- Files already processed; skipped when a job is resumed
+    processed_files TEXT[] NOT NULL DEFAULT '{}',
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    error TEXT,
+    worker_pid INTEGER,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+-- Per-folder lock: at most one active job per documents folder
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ingestion_jobs_active_folder
+    ON ingestion_jobs (documents_folder)
+    WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_created_at ON ingestion_jobs (created_at DESC);
+-- Enable Row Level Security (backend only, same policy as sessions/query_logs)
+ALTER TABLE ingestion_jobs ENABLE ROW LEVEL SECURITY;
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+        DROP POLICY IF EXISTS "Service role only - ingestion_jobs" ON ingestion_jobs;
+        CREATE POLICY "Service role only - ingestion_jobs" ON ingestion_jobs
+            FOR ALL TO service_role USING (true);
+    END IF;
+END $$;
@@ -0,0 +1,44 @@
+-- Distributed Ingestion Work Queue (ingestion/distributed.py)     MIGRATION
+-- Execute after optimize_index.sql:
+--   psql $DATABASE_URL < sql/ingestion-work-queue-schema.sql
+CREATE TABLE IF NOT EXISTS ingestion_work_items (
+    id BIGSERIAL PRIMARY KEY,
+    batch_id TEXT NOT NULL,
+    documents_folder TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    fast_mode BOOLEAN NOT NULL DEFAULT FALSE,
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processing', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    -- Lease: a processing item whose lease expired is reclaimed by other workers
+    worker_id TEXT,
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    -- Result
+    document_id TEXT,
+    chunks_created INTEGER,
+    tokens_processed INTEGER,
+    processing_ms DOUBLE PRECISION,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    claimed_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    UNIQUE (batch_id, file_path)
+);
+-- Claim path: pending items and expired leases, oldest first
+CREATE INDEX IF NOT EXISTS idx_work_items_claimable
+    ON ingestion_work_items (id)
+    WHERE status IN ('pending', 'processing');
+CREATE INDEX IF NOT EXISTS idx_work_items_worker
+    ON ingestion_work_items (worker_id)
+    WHERE status = 'processing';
+CREATE INDEX IF NOT EXISTS idx_work_items_batch_status ON ingestion_work_items (batch_id, status);
+-- Enable Row Level Security (backend only, same policy as sessions/query_logs)
+ALTER TABLE ingestion_work_items ENABLE ROW LEVEL SECURITY;
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+        DROP POLICY IF EXISTS "Service role only - ingestion_work_items" ON ingestion_work_items;
+        CREATE POLICY "Service role only - ingestion_work_items" ON ingestion_work_items
+            FOR ALL TO service_role USING (true);
+    END IF;
+END $$;
@@ -0,0 +1,60 @@
+-- Knowledge Base Statistics (denormalized counts + per-source rollup)     MIGRATION
+-- Execute after optimize_index.sql:
+--   psql $DATABASE_URL < sql/kb-stats-schema.sql
+--
+-- The ingestion pipeline maintains these in the same transaction that writes
+-- documents and chunks (ingestion/ingest.py::_save_to_postgres), so overview and
+-- listing queries never aggregate over chunks.
+-- Re-run the backfill (SELECT refresh_kb_stats();) after deleting documents by hand.
+
+-- Per-document counts
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS chunk_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS token_count BIGINT NOT NULL DEFAULT 0;
+
+-- Per-source rollup, keyed by top-level source ('langfuse-docs/api.md' -> 'langfuse-docs')
+CREATE TABLE IF NOT EXISTS source_stats (
+    source TEXT PRIMARY KEY,
+    document_count INTEGER NOT NULL DEFAULT 0,
+    chunk_count BIGINT NOT NULL DEFAULT 0,
+    token_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Full recomputation (backfill / repair)
+CREATE OR REPLACE FUNCTION refresh_kb_stats()
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE documents d
+    SET chunk_count = c.chunk_count,
+        token_count = c.token_count
+    FROM (
+        SELECT d2.id, COUNT(ch.id) AS chunk_count, COALESCE(SUM(ch.token_count), 0) AS token_count
+        FROM documents d2
+        LEFT JOIN chunks ch ON ch.document_id = d2.id
+        GROUP BY d2.id
+    ) c
+    WHERE d.id = c.id
+      AND (d.chunk_count, d.token_count) IS DISTINCT FROM (c.chunk_count, c.token_count);
+
+    DELETE FROM source_stats;
+    INSERT INTO source_stats (source, document_count, chunk_count, token_count)
+    SELECT split_part(source, '/', 1), COUNT(*), SUM(chunk_count), SUM(token_count)
+    FROM documents
+    GROUP BY split_part(source, '/', 1);
+END;
+$$;
+
+SELECT refresh_kb_stats();
+
+-- Enable Row Level Security (backend only, same policy as sessions/query_logs)
+ALTER TABLE source_stats ENABLE ROW LEVEL SECURITY;
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+        DROP POLICY IF EXISTS "Service role only - source_stats" ON source_stats;
+        CREATE POLICY "Service role only - source_stats" ON source_stats
+            FOR ALL TO service_role USING (true);
+    END IF;
+END $$;
@@ -28,6 +28,7 @@
 CREATE EXTENSION IF NOT EXISTS vector;
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS pg_prewarm;  -- Startup warm-up of the HNSW index
 
 -- Create documents table
 CREATE TABLE IF NOT EXISTS documents (
@@ -36,6 +37,9 @@ CREATE TABLE IF NOT EXISTS documents (
     source TEXT NOT NULL,
     content TEXT NOT NULL,
     metadata JSONB DEFAULT '{}',
+    collection TEXT NOT NULL,                 -- set by ingestion (chunk-collections.sql)
+    chunk_count INTEGER NOT NULL DEFAULT 0,   -- maintained by ingestion (kb-stats-schema.sql)
+    token_count BIGINT NOT NULL DEFAULT 0,    -- maintained by ingestion (kb-stats-schema.sql)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -49,6 +53,7 @@ CREATE TABLE IF NOT EXISTS chunks (
     chunk_index INTEGER NOT NULL,
     metadata JSONB DEFAULT '{}',
     token_count INTEGER,
+    collection TEXT NOT NULL,                 -- copy of documents.collection (partition key)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -137,7 +142,8 @@ WITH (m = 16, ef_construction = 64);
 
 -- Standard indexes for document management
 CREATE INDEX IF NOT EXISTS idx_documents_metadata ON documents USING GIN (metadata);
-CREATE INDEX IF NOT EXISTS idx_documents_created_at ON documents (created_at DESC);
+-- Keyset pagination for document listing (utils/db_utils.py::list_documents)
+CREATE INDEX IF NOT EXISTS idx_documents_created_at_id ON documents (created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_chunks_document_id ON chunks (document_id);
 CREATE INDEX IF NOT EXISTS idx_chunks_chunk_index ON chunks (document_id, chunk_index);
 
@@ -145,6 +151,10 @@ CREATE INDEX IF NOT EXISTS idx_chunks_chunk_index ON chunks (document_id, chunk_
 CREATE INDEX IF NOT EXISTS idx_documents_source_trgm ON documents 
 USING gin (source gin_trgm_ops);
 
+-- Full-text fallback when query embedding misses its deadline (lexical_search)
+CREATE INDEX IF NOT EXISTS idx_chunks_content_fts ON chunks
+USING gin (to_tsvector('english', content));
+
 -- Composite index for filtered vector searches
 -- (Improves performance when source_filter is used)
 CREATE INDEX IF NOT EXISTS idx_chunks_doc_embedding ON chunks (document_id)
@@ -0,0 +1,104 @@
+-- Partitioned Chunk Storage (one partition per collection)       OPTIONAL MIGRATION
+-- Execute after chunk-collections.sql (and embedding-spaces-schema.sql, if used):
+--   psql $DATABASE_URL < sql/partition-chunks.sql
+--
+-- Converts chunks into a table partitioned by LIST (collection). Every index of
+-- chunks is re-created on the partitioned table, so each collection gets its
+-- own HNSW index: builds, vacuums and index memory scale with the collection,
+-- not the corpus. New collections get their partition at ingestion
+-- (ensure_chunk_partition); values without one land in chunks_default.
+--
+-- Search prunes to one partition with a collection filter (and to the
+-- collections of the matching documents with source_filter); unfiltered
+-- searches read every partition's HNSW index and merge the top-k (Merge Append).
+-- Clean a single collection with python -m ingestion.ingest --clean-collection NAME.
+--
+-- Runs in one transaction holding an ACCESS EXCLUSIVE lock on chunks (reads and
+-- ingestion wait until it commits): run it in a maintenance window.
+-- Check the result with: python scripts/verification/optimize_database.py --check
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+SET LOCAL maintenance_work_mem = '1GB';
+SET LOCAL max_parallel_maintenance_workers = 4;
+
+LOCK TABLE documents, chunks IN ACCESS EXCLUSIVE MODE;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'chunks'::regclass) THEN
+        RAISE EXCEPTION 'chunks is already partitioned';
+    END IF;
+END $$;
+
+-- Secondary indexes, re-created on the partitioned table once the rows are in
+CREATE TEMP TABLE _chunk_index_defs ON COMMIT DROP AS
+SELECT pg_get_indexdef(i.indexrelid) AS definition
+FROM pg_index i
+WHERE i.indrelid = 'chunks'::regclass AND NOT i.indisprimary;
+
+ALTER TABLE chunks RENAME TO chunks_unpartitioned;
+
+CREATE TABLE chunks (
+    LIKE chunks_unpartitioned INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS
+) PARTITION BY LIST (collection);
+CREATE TABLE chunks_default PARTITION OF chunks DEFAULT;
+
+SELECT ensure_chunk_partition(collection)
+FROM (SELECT DISTINCT collection FROM documents) collections;
+
+INSERT INTO chunks SELECT * FROM chunks_unpartitioned;
+
+-- CASCADE also drops the chunk_embeddings foreign key (replaced by a trigger below)
+DROP TABLE chunks_unpartitioned CASCADE;
+
+-- Unique constraints on a partitioned table must include the partition key
+ALTER TABLE chunks ADD CONSTRAINT chunks_pkey PRIMARY KEY (id, collection);
+ALTER TABLE chunks ADD CONSTRAINT chunks_document_id_fkey
+    FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE;
+
+-- Each index is built per partition (HNSW: one graph per collection)
+DO $$
+DECLARE
+    def TEXT;
+BEGIN
+    FOR def IN SELECT definition FROM _chunk_index_defs LOOP
+        EXECUTE def;
+    END LOOP;
+END $$;
+
+-- chunk_embeddings can no longer reference chunks(id) alone: cascade with a trigger
+DO $$
+BEGIN
+    IF to_regclass('chunk_embeddings') IS NOT NULL THEN
+        CREATE OR REPLACE FUNCTION delete_chunk_embeddings()
+        RETURNS TRIGGER
+        LANGUAGE plpgsql
+        AS $fn$
+        BEGIN
+            DELETE FROM chunk_embeddings WHERE chunk_id = OLD.id;
+            RETURN OLD;
+        END;
+        $fn$;
+
+        DROP TRIGGER IF EXISTS delete_chunk_embeddings ON chunks;
+        CREATE TRIGGER delete_chunk_embeddings AFTER DELETE ON chunks
+            FOR EACH ROW EXECUTE FUNCTION delete_chunk_embeddings();
+    END IF;
+END $$;
+
+COMMIT;
+
+ANALYZE chunks;
+
+-- Partitions and their HNSW indexes
+SELECT
+    c.relname AS partition,
+    pg_get_expr(c.relpartbound, c.oid) AS bound,
+    pg_size_pretty(pg_total_relation_size(c.oid)) AS total_size
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'chunks'::regclass
+ORDER BY c.relname;
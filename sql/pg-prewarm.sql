@@ -0,0 +1,26 @@
+-- pg_prewarm for Startup Warm-up                                          MIGRATION
+-- Execute after optimize_index.sql:
+--   psql $DATABASE_URL < sql/pg-prewarm.sql
+--
+-- At startup the servers load the HNSW indexes of chunks (every partition when
+-- partitioned) into shared buffers with pg_prewarm (core/warmup.py), so the
+-- first searches after a deploy or a DB restart do not read the graph from disk.
+-- Without the extension that warm-up phase is skipped.
+-- Keep shared_buffers above the index size (query below), else prewarmed
+-- blocks are evicted again.
+
+CREATE EXTENSION IF NOT EXISTS pg_prewarm;
+
+-- HNSW indexes prewarmed at startup and their size
+SELECT
+    c.oid::regclass AS index,
+    pg_size_pretty(pg_relation_size(c.oid)) AS size
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+JOIN pg_am am ON am.oid = c.relam
+WHERE am.amname = 'hnsw'
+  AND c.relkind = 'i'
+  AND (i.indrelid = 'chunks'::regclass
+       OR i.indrelid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = 'chunks'::regclass));
+
+SHOW shared_buffers;
@@ -0,0 +1,19 @@
+-- Deferred Query Cost Reconciliation                                     MIGRATION
+-- Execute after epic-3-sessions-schema.sql:
+--   psql $DATABASE_URL < sql/query-logs-cost-backfill.sql
+--
+-- Streamlit queries are logged with cost 0 and their LangFuse trace id, without
+-- waiting for the trace to be exported. The cost backfill job
+-- (utils/cost_backfill.py) reads each cost from its trace later, writes it to
+-- query_logs.cost, adds it to sessions.total_cost and sets cost_reconciled_at.
+-- Rows logged before this migration already carry their cost: marked reconciled.
+-- Apply it before deploying the job, or rows logged since with cost 0 are kept at 0.
+
+ALTER TABLE query_logs ADD COLUMN IF NOT EXISTS cost_reconciled_at TIMESTAMP WITH TIME ZONE;
+
+UPDATE query_logs SET cost_reconciled_at = timestamp
+WHERE cost_reconciled_at IS NULL;
+
+-- Rows waiting for reconciliation, in id order
+CREATE INDEX IF NOT EXISTS idx_query_logs_cost_pending ON query_logs(id)
+WHERE cost_reconciled_at IS NULL AND langfuse_trace_id IS NOT NULL;
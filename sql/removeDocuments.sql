@@ -13,6 +13,9 @@ DELETE FROM chunks;
 -- Delete all documents
 DELETE FROM documents;
 
+-- Reset knowledge base statistics (sql/kb-stats-schema.sql)
+DELETE FROM source_stats;
+
 -- ==============================================================================
 -- RESET SEQUENCES (Optional - ensures clean IDs if you were using sequences)
 -- ==============================================================================
@@ -42,7 +45,8 @@ SELECT 'Chunks remaining:' as status, COUNT(*) as count FROM chunks;
 -- This script has:
 -- 1. Deleted all chunks
 -- 2. Deleted all documents
--- 3. Verified tables are empty
+-- 3. Reset the source_stats rollup
+-- 4. Verified tables are empty
 --
 -- The schema (tables, indexes, functions) remains intact.
 -- You can now re-run the ingestion pipeline to add new documents.
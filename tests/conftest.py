@@ -3,7 +3,7 @@ Pytest configuration and shared fixtures
 """
 
 import asyncio
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -16,6 +16,13 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture
+def warmed_up():
+    """Search warm-up finished (health reports not ready before)."""
+    with patch("core.warmup._state", "done"):
+        yield
+
+
 @pytest.fixture
 def mock_httpx_response():
     """Create a mock httpx response."""
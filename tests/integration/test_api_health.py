@@ -14,7 +14,7 @@ from fastapi.testclient import TestClient
 
 
 @pytest.fixture
-def api_client():
+def api_client(warmed_up):
     """Create test client for API server."""
     from api.main import app
 
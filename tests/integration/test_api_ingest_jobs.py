@@ -0,0 +1,108 @@
+"""
+Integration tests for API ingestion job endpoints.
+
+Tests:
+- POST /v1/ingest returns a real task_id from the job manager
+- Admission errors map to 409 / 429
+- GET /v1/ingest/{task_id} returns progress, 404 for unknown jobs
+- Cancel on a finished job returns 409
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import jobs
+
+
+@pytest.fixture
+def api_client():
+    """Create test client for API server."""
+    from api.main import app
+
+    return TestClient(app)
+
+
+def _status(**overrides):
+    status = {
+        "task_id": "6f1c2a8e-1111-4222-8333-444455556666",
+        "status": "running",
+        "documents_folder": "documents",
+        "clean_before_ingest": False,
+        "fast_mode": False,
+        "files_total": 10,
+        "files_done": 5,
+        "files_failed": 0,
+        "chunks_created": 50,
+        "tokens_processed": 15000,
+        "progress_pct": 50.0,
+        "eta_seconds": 30.0,
+        "cancel_requested": False,
+        "error": None,
+        "created_at": None,
+        "started_at": None,
+        "finished_at": None,
+    }
+    status.update(overrides)
+    return status
+
+
+class TestIngestJobEndpoints:
+    """Test /v1/ingest job endpoints."""
+
+    def test_trigger_returns_job_task_id(self, api_client):
+        with patch("api.jobs.create_job", new_callable=AsyncMock) as mock_create:
+            mock_create.return_value = _status(status="queued")
+
+            response = api_client.post("/v1/ingest", json={"documents_folder": "documents/"})
+
+            assert response.status_code == 200
+            assert response.json()["task_id"] == _status()["task_id"]
+            mock_create.assert_awaited_once_with(
+                documents_folder="documents/", clean_before_ingest=False, fast_mode=False
+            )
+
+    def test_trigger_conflict_returns_409(self, api_client):
+        with patch(
+            "api.jobs.create_job",
+            new_callable=AsyncMock,
+            side_effect=jobs.JobConflictError("already active"),
+        ):
+            response = api_client.post("/v1/ingest", json={})
+
+            assert response.status_code == 409
+
+    def test_trigger_limit_returns_429(self, api_client):
+        with patch(
+            "api.jobs.create_job",
+            new_callable=AsyncMock,
+            side_effect=jobs.JobLimitError("limit reached"),
+        ):
+            response = api_client.post("/v1/ingest", json={})
+
+            assert response.status_code == 429
+
+    def test_status_returns_progress(self, api_client):
+        with patch("api.jobs.get_job", new_callable=AsyncMock, return_value=_status()):
+            response = api_client.get(f"/v1/ingest/{_status()['task_id']}")
+            data = response.json()
+
+            assert response.status_code == 200
+            assert data["files_done"] == 5
+            assert data["eta_seconds"] == 30.0
+
+    def test_status_unknown_job_returns_404(self, api_client):
+        response = api_client.get("/v1/ingest/not-a-uuid")
+
+        assert response.status_code == 404
+
+    def test_cancel_finished_job_returns_409(self, api_client):
+        with patch(
+            "api.jobs.cancel_job",
+            new_callable=AsyncMock,
+            side_effect=jobs.JobStateError("already completed"),
+        ):
+            response = api_client.post(f"/v1/ingest/{_status()['task_id']}/cancel")
+
+            assert response.status_code == 409
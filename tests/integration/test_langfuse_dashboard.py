@@ -292,9 +292,9 @@ class TestCustomChartsData:
 
             # All tools should have tool_name and source for chart grouping
             assert "tool_name" in captured_metadata, f"{tool_fn.__name__} missing tool_name"
-            assert captured_metadata.get("source") == "mcp", (
-                f"{tool_fn.__name__} missing source=mcp"
-            )
+            assert (
+                captured_metadata.get("source") == "mcp"
+            ), f"{tool_fn.__name__} missing source=mcp"
 
     @pytest.mark.asyncio
     async def test_document_tools_have_metadata_for_charts(self):
@@ -306,13 +306,13 @@ class TestCustomChartsData:
         def capture_metadata(metadata):
             captured_metadata.update(metadata)
 
-        async def mock_list_documents(limit=50, offset=0):
-            return []
+        async def mock_list_documents_page(limit=50, cursor=None):
+            return {"documents": [], "next_cursor": None}
 
         with (
             patch("docling_mcp.server._langfuse_available", True),
             patch("docling_mcp.server._update_langfuse_metadata", capture_metadata),
-            patch("docling_mcp.server.list_documents", mock_list_documents),
+            patch("docling_mcp.server.list_documents_page", mock_list_documents_page),
         ):
             await list_knowledge_base_documents.fn(limit=10, offset=0)
 
@@ -386,13 +386,19 @@ class TestDashboardFiltering:
         def capture_metadata(metadata):
             captured_metadata.update(metadata)
 
-        async def mock_list_documents(limit=50, offset=0):
-            return []
+        async def mock_get_knowledge_base_stats(recent_limit=20):
+            return {
+                "total_documents": 0,
+                "total_chunks": 0,
+                "total_tokens": 0,
+                "sources": [],
+                "recent_documents": [],
+            }
 
         with (
             patch("docling_mcp.server._langfuse_available", True),
             patch("docling_mcp.server._update_langfuse_metadata", capture_metadata),
-            patch("docling_mcp.server.list_documents", mock_list_documents),
+            patch("docling_mcp.server.get_knowledge_base_stats", mock_get_knowledge_base_stats),
         ):
             await get_knowledge_base_overview.fn()
 
@@ -7,7 +7,7 @@ Tests:
 - Tool registration and server initialization
 """
 
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 
@@ -66,8 +66,15 @@ class TestMCPServerIntegration:
                 assert "Content from document 2" in result
                 assert "---" in result  # Separator between results
 
-                mock_embed.assert_called_once_with("test query")
-                mock_search.assert_called_once_with([0.1] * 1536, 5, "test-source")
+                mock_embed.assert_called_once_with("test query", deadline=ANY)
+                mock_search.assert_called_once_with(
+                    [0.1] * 1536,
+                    5,
+                    "test-source",
+                    context_window=0,
+                    metadata_filter=None,
+                    deadline=ANY,
+                )
 
     @pytest.mark.asyncio
     async def test_query_knowledge_base_no_results(self):
@@ -107,14 +114,14 @@ class TestMCPServerIntegration:
                 assert "This is the answer content" in result
                 assert "92" in result  # similarity percentage
 
-                mock_embed.assert_called_once_with("What is the answer?")
-                mock_search.assert_called_once_with([0.1] * 1536, 3)
+                mock_embed.assert_called_once_with("What is the answer?", deadline=ANY)
+                mock_search.assert_called_once_with([0.1] * 1536, 3, deadline=ANY)
 
     @pytest.mark.asyncio
     async def test_list_knowledge_base_documents_full_flow(self):
         """Test complete flow of list_knowledge_base_documents."""
-        with patch("docling_mcp.server.list_documents") as mock_list:
-            mock_list.return_value = [
+        with patch("docling_mcp.server.list_documents_page") as mock_page:
+            docs = [
                 {
                     "id": "doc-1",
                     "title": "Doc 1",
@@ -130,6 +137,7 @@ class TestMCPServerIntegration:
                     "updated_at": "2025-01-02T00:00:00Z",
                 },
             ]
+            mock_page.return_value = {"documents": docs, "next_cursor": "abc"}
 
             result = await list_knowledge_base_documents_fn()
 
@@ -138,14 +146,15 @@ class TestMCPServerIntegration:
             assert "[source-2] Doc 2" in result
             assert "10 chunks" in result
             assert "5 chunks" in result
+            assert "cursor=abc" in result
 
-            mock_list.assert_called_once_with(50, 0)
+            mock_page.assert_called_once_with(50, cursor=None)
 
     @pytest.mark.asyncio
     async def test_list_knowledge_base_documents_empty(self):
         """Test list_knowledge_base_documents when no documents exist."""
-        with patch("docling_mcp.server.list_documents") as mock_list:
-            mock_list.return_value = []
+        with patch("docling_mcp.server.list_documents_page") as mock_page:
+            mock_page.return_value = {"documents": [], "next_cursor": None}
 
             result = await list_knowledge_base_documents_fn()
 
@@ -177,19 +186,39 @@ class TestMCPServerIntegration:
     @pytest.mark.asyncio
     async def test_get_knowledge_base_overview_full_flow(self):
         """Test complete flow of get_knowledge_base_overview."""
-        with patch("docling_mcp.server.list_documents") as mock_list:
-            mock_list.return_value = [
-                {"title": "Doc 1", "source": "langfuse-docs/guide.md", "chunk_count": 10},
-                {"title": "Doc 2", "source": "langfuse-docs/api.md", "chunk_count": 8},
-                {"title": "Doc 3", "source": "docling/readme.md", "chunk_count": 5},
-            ]
+        with patch("docling_mcp.server.get_knowledge_base_stats") as mock_stats:
+            mock_stats.return_value = {
+                "total_documents": 3,
+                "total_chunks": 23,
+                "total_tokens": 4600,
+                "sources": [
+                    {
+                        "source": "docling",
+                        "document_count": 1,
+                        "chunk_count": 5,
+                        "token_count": 1000,
+                    },
+                    {
+                        "source": "langfuse-docs",
+                        "document_count": 2,
+                        "chunk_count": 18,
+                        "token_count": 3600,
+                    },
+                ],
+                "recent_documents": [
+                    {"title": "Doc 1", "source": "langfuse-docs/guide.md", "chunk_count": 10},
+                    {"title": "Doc 2", "source": "langfuse-docs/api.md", "chunk_count": 8},
+                    {"title": "Doc 3", "source": "docling/readme.md", "chunk_count": 5},
+                ],
+            }
 
             result = await get_knowledge_base_overview_fn()
 
+            mock_stats.assert_called_once_with(recent_limit=20)
             assert "Total Documents: 3" in result
             assert "Total Chunks: 23" in result
             assert "Unique Sources: 2" in result  # langfuse-docs, docling
-            assert "langfuse-docs" in result
+            assert "langfuse-docs (2 documents, 18 chunks)" in result
             assert "docling" in result
 
 
@@ -206,6 +235,8 @@ class TestMCPServerToolRegistration:
             "query_knowledge_base",
             "list_knowledge_base_documents",
             "get_knowledge_base_document",
+            "get_knowledge_base_documents",
+            "get_knowledge_base_chunk_context",
             "get_knowledge_base_overview",
             "ask_knowledge_base",
         ]
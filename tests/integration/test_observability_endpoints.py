@@ -16,7 +16,7 @@ from fastapi.testclient import TestClient
 
 
 @pytest.fixture
-def test_client():
+def test_client(warmed_up):
     """Create test client for HTTP server."""
     from docling_mcp.http_server import app
 
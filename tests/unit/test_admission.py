@@ -0,0 +1,177 @@
+"""
+Unit tests for search admission control (core/admission.py)
+
+Tests:
+- Free slots admit immediately
+- A full queue sheds with 429, an unreachable deadline with 503
+- Queued requests time out before their deadline passes
+- Released slots go to the next waiter in arrival order
+- /v1/search maps rejections to 429/503 with Retry-After
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.admission import AdmissionController, AdmissionRejectedError
+
+
+@pytest.fixture(autouse=True)
+def no_metrics():
+    with (
+        patch("docling_mcp.metrics.record_admission_shed") as mock_shed,
+        patch("docling_mcp.metrics.record_admission_queue_depth"),
+    ):
+        yield mock_shed
+
+
+async def _hold(controller, started, release, deadline=None):
+    async with controller.admit(deadline):
+        started.append(len(started))
+        await release.wait()
+
+
+class TestAdmissionController:
+    """Test admission decisions."""
+
+    @pytest.mark.asyncio
+    async def test_free_slot_admits(self):
+        controller = AdmissionController("search", max_concurrency=2, max_queue=0)
+
+        async with controller.admit():
+            assert controller.in_flight == 1
+
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_full_sheds_with_429(self, no_metrics):
+        controller = AdmissionController("search", max_concurrency=1, max_queue=0)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, [], release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            async with controller.admit():
+                pass
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after >= 1
+        no_metrics.assert_called_once_with("search", "queue_full")
+        release.set()
+        await holder
+
+    @pytest.mark.asyncio
+    async def test_unreachable_deadline_sheds_with_503(self, no_metrics):
+        controller = AdmissionController("search", max_concurrency=1, max_queue=4)
+        controller.service_time = 1.0
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, [], release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            async with controller.admit(controller.deadline_in(500)):
+                pass
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.reason == "deadline"
+        assert controller.queued == 0
+        release.set()
+        await holder
+
+    @pytest.mark.asyncio
+    async def test_queued_request_times_out(self, no_metrics):
+        controller = AdmissionController("search", max_concurrency=1, max_queue=4)
+        controller.service_time = 0.01
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, [], release))
+        await asyncio.sleep(0)
+
+        start = time.monotonic()
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            async with controller.admit(controller.deadline_in(50)):
+                pass
+
+        assert exc_info.value.reason == "timeout"
+        assert time.monotonic() - start < 0.05
+        assert controller.queued == 0
+        release.set()
+        await holder
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_granted_as_timeout_fires_is_returned(self, no_metrics):
+        controller = AdmissionController("search", max_concurrency=1, max_queue=4)
+        controller.service_time = 0.01
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, [], release))
+        await asyncio.sleep(0)
+
+        async def granted_then_timed_out(future, timeout):
+            release.set()  # The holder leaves and hands its slot over...
+            while not future.done():
+                await asyncio.sleep(0)
+            raise asyncio.TimeoutError  # ...and the timeout fires before the waiter resumes
+
+        with (
+            patch("core.admission.asyncio.wait_for", granted_then_timed_out),
+            pytest.raises(AdmissionRejectedError) as exc_info,
+        ):
+            async with controller.admit(controller.deadline_in(1000)):
+                pass
+        await holder
+
+        assert exc_info.value.reason == "timeout"
+        assert controller.in_flight == 0  # Handed-over slot given back
+
+    @pytest.mark.asyncio
+    async def test_slot_handed_to_waiters_in_order(self):
+        controller = AdmissionController("search", max_concurrency=1, max_queue=4)
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(controller, started, release)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert controller.in_flight == 1
+        assert controller.queued == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert started == [0, 1, 2]
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        controller = AdmissionController("search", max_concurrency=1, max_queue=4)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, [], release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_hold(controller, [], release))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert controller.queued == 0
+        release.set()
+        await holder
+        assert controller.in_flight == 0
+
+
+class TestSearchEndpointShedding:
+    """Test rejection mapping on /v1/search."""
+
+    @pytest.mark.parametrize("reason, status_code", [("queue_full", 429), ("deadline", 503)])
+    def test_rejection_returns_retry_after(self, reason, status_code):
+        from api.main import app
+
+        async def rejected(**kwargs):
+            raise AdmissionRejectedError(reason, 2.4)
+
+        with patch("api.main.search_knowledge_base_structured", side_effect=rejected):
+            response = TestClient(app).post("/v1/search", json={"query": "test"})
+
+        assert response.status_code == status_code
+        assert response.headers["Retry-After"] == "3"
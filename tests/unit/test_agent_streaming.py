@@ -0,0 +1,59 @@
+"""
+Unit tests for streamed agent responses (core/agent.py)
+
+Tests:
+- Tool calls resolve before text streams
+- on_text receives accumulated text
+- Time-to-first-token is measured and recorded
+- Generation time excludes tool calls
+"""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+from pydantic_ai.models.test import TestModel
+
+# The agent builds its OpenAI model at import time; the model is overridden in tests
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from core import agent as agent_module  # noqa: E402
+
+
+class TestStreamAgentResponse:
+    """Test stream_agent_response helper."""
+
+    @pytest.mark.asyncio
+    async def test_streams_text_after_tool_call(self):
+        """Test that the search tool runs first and text is streamed incrementally."""
+        partials = []
+
+        async def fake_search(query, limit=5, source_filter=None):
+            await asyncio.sleep(0.2)
+            return {"results": [{"title": "doc.md", "content": "Docling parses PDFs"}]}
+
+        with (
+            patch.object(agent_module.transport, "search", side_effect=fake_search) as mock_search,
+            patch("docling_mcp.metrics.record_llm_time_to_first_token") as mock_ttft,
+            patch("docling_mcp.metrics.record_llm_generation_time") as mock_total,
+            agent_module.agent.override(
+                model=TestModel(custom_output_text="Docling parses PDFs and more")
+            ),
+        ):
+            text, ttft = await agent_module.stream_agent_response(
+                "What does Docling do?", on_text=partials.append
+            )
+
+        mock_search.assert_called_once()
+        assert text == "Docling parses PDFs and more"
+        assert len(partials) > 1
+        assert partials[-1] == text
+        assert all(text.startswith(p) for p in partials)
+
+        assert ttft is not None and ttft >= 0
+        mock_ttft.assert_called_once_with(ttft)
+        # The search ran before the first token: it counts towards TTFT only
+        assert ttft >= 0.2
+        mock_total.assert_called_once()
+        assert 0 <= mock_total.call_args[0][0] < 0.2
@@ -5,8 +5,10 @@ Tests:
 - Error handling improvements
 - Retry logic for transient errors
 - Input validation
+- Pooled client lifecycle, including event loop changes
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -25,7 +27,7 @@ class TestRAGClientErrorHandling:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             # Simulate HTTP 500 error
             error_response = MagicMock()
@@ -50,7 +52,7 @@ class TestRAGClientErrorHandling:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             timeout_error = httpx.TimeoutException("Request timed out", request=MagicMock())
             mock_client.post.side_effect = timeout_error
@@ -68,7 +70,7 @@ class TestRAGClientErrorHandling:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             network_error = httpx.RequestError("Connection refused", request=MagicMock())
             mock_client.post.side_effect = network_error
@@ -86,7 +88,7 @@ class TestRAGClientErrorHandling:
 
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             error_response = MagicMock()
             error_response.status_code = 404
@@ -127,7 +129,7 @@ class TestRAGClientRetryLogic:
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
             mock_client.post = AsyncMock(side_effect=mock_post)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             result = await client.search("test query")
 
@@ -151,7 +153,7 @@ class TestRAGClientRetryLogic:
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
             mock_client.post = AsyncMock(side_effect=mock_post)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             with pytest.raises(RuntimeError) as exc_info:
                 await client.search("test query")
@@ -178,7 +180,7 @@ class TestRAGClientRetryLogic:
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
             mock_client.post = AsyncMock(side_effect=mock_post)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             with pytest.raises(RuntimeError):
                 await client.search("test query")
@@ -206,7 +208,7 @@ class TestRAGClientRetryLogic:
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(side_effect=mock_get)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             result = await client.list_documents()
 
@@ -230,7 +232,7 @@ class TestRAGClientRetryLogic:
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(side_effect=mock_get)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             with pytest.raises(RuntimeError) as exc_info:
                 await client.list_documents()
@@ -256,7 +258,7 @@ class TestRAGClientSuccess:
             mock_response.json.return_value = mock_search_response
             mock_response.raise_for_status = MagicMock()
             mock_client.post = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             result = await client.search("test query", limit=5)
 
@@ -275,12 +277,17 @@ class TestRAGClientSuccess:
             mock_response.json.return_value = mock_list_documents_response
             mock_response.raise_for_status = MagicMock()
             mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             result = await client.list_documents(limit=50)
 
             assert result == mock_list_documents_response
             mock_client.get.assert_called_once()
+            # The API includes metadata by default: only the opt-out is sent
+            assert mock_client.get.call_args.kwargs["params"] == {"limit": 50}
+
+            await client.list_documents(limit=50, include_metadata=False)
+            assert mock_client.get.call_args.kwargs["params"]["include_metadata"] == "false"
 
     @pytest.mark.asyncio
     async def test_health_check_success(self):
@@ -292,7 +299,7 @@ class TestRAGClientSuccess:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_client.get = AsyncMock(return_value=mock_response)
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             result = await client.health_check()
 
@@ -308,8 +315,137 @@ class TestRAGClientSuccess:
             mock_client.get.side_effect = httpx.RequestError(
                 "Connection refused", request=MagicMock()
             )
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             result = await client.health_check()
 
             assert result is False
+
+
+class TestRAGClientConnectionPooling:
+    """Test long-lived pooled client lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_across_calls(self, mock_search_response):
+        """Test that consecutive calls share one pooled httpx client."""
+        client = RAGClient()
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_response = MagicMock()
+            mock_response.json.return_value = mock_search_response
+            mock_response.raise_for_status = MagicMock()
+            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_client_class.return_value = mock_client
+
+            await client.search("first")
+            await client.search("second")
+
+            assert mock_client_class.call_count == 1
+            assert mock_client.post.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_connection_limits_configured(self):
+        """Test that pool limits are passed to httpx."""
+        client = RAGClient(max_connections=7, max_keepalive_connections=3)
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client_class.return_value = AsyncMock()
+            async with client:
+                pass
+
+            limits = mock_client_class.call_args.kwargs["limits"]
+            assert limits.max_connections == 7
+            assert limits.max_keepalive_connections == 3
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_pool(self):
+        """Test that leaving the context manager closes pooled connections."""
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value = mock_client
+
+            async with RAGClient() as client:
+                assert client._client is mock_client
+
+            mock_client.aclose.assert_awaited_once()
+            assert client._client is None
+
+    def test_loop_change_closes_previous_pool_on_its_loop(self):
+        """Test that a new event loop gets a new pool and the previous loop closes its own."""
+        client = RAGClient()
+        first_loop = asyncio.new_event_loop()
+        second_loop = asyncio.new_event_loop()
+        try:
+            with patch("httpx.AsyncClient", side_effect=lambda **_: AsyncMock()):
+                first = first_loop.run_until_complete(client._get_client())
+                second = second_loop.run_until_complete(client._get_client())
+
+            assert second is not first
+            first.aclose.assert_not_awaited()
+
+            # The close was handed to the first loop: it runs there on its next turn
+            first_loop.run_until_complete(asyncio.sleep(0.01))
+            first.aclose.assert_awaited_once()
+            second.aclose.assert_not_awaited()
+        finally:
+            second_loop.run_until_complete(client.aclose())
+            first_loop.close()
+            second_loop.close()
+
+    def test_pool_closed_when_asyncio_run_ends(self):
+        """Test that each asyncio.run() scope (Streamlit interaction) closes its pool."""
+        client = RAGClient()
+        first, second = AsyncMock(), AsyncMock()
+
+        with patch("httpx.AsyncClient", side_effect=[first, second]):
+            assert asyncio.run(client._get_client()) is first
+            first.aclose.assert_awaited_once()
+
+            assert asyncio.run(client._get_client()) is second
+            second.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_search_batch_preserves_order(self):
+        """Test that search_batch returns one response per query in order."""
+        client = RAGClient()
+
+        async def mock_post(url, json=None, **kwargs):
+            response = MagicMock()
+            response.json.return_value = {"query": json["query"]}
+            response.raise_for_status = MagicMock()
+            return response
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(side_effect=mock_post)
+            mock_client_class.return_value = mock_client
+
+            results = await client.search_batch(["a", "b", "c"])
+
+            assert [r["query"] for r in results] == ["a", "b", "c"]
+            assert mock_client_class.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_stats_recorded_per_endpoint(self, mock_search_response):
+        """Test that per-endpoint latency counters are tracked."""
+        client = RAGClient()
+
+        with patch("httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = mock_search_response
+            mock_response.raise_for_status = MagicMock()
+            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_client.get = AsyncMock(return_value=mock_response)
+            mock_client_class.return_value = mock_client
+
+            await client.search("query")
+            await client.search("query")
+            await client.health_check()
+
+            stats = client.get_latency_stats()
+            assert stats["search"]["count"] == 2
+            assert stats["health"]["count"] == 1
+            assert stats["search"]["avg_ms"] >= 0.0
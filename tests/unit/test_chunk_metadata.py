@@ -0,0 +1,81 @@
+"""
+Unit tests for slim chunk metadata (ingestion/chunker.py, core/rag_service.py)
+
+Tests:
+- Chunkers store only chunk-specific fields, not a copy of the document metadata
+- Search joins document metadata only when include_document_metadata is set
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from core.rag_service import search_with_embedding
+from ingestion.chunker import ChunkingConfig, SimpleChunker
+
+
+class TestChunkMetadata:
+    """Test chunker output."""
+
+    @pytest.mark.asyncio
+    async def test_document_metadata_not_copied_into_chunks(self):
+        chunker = SimpleChunker(ChunkingConfig(chunk_size=200, chunk_overlap=0))
+        content = "\n\n".join(f"Paragraph {i} " + "word " * 30 for i in range(4))
+
+        chunks = await chunker.chunk_document(
+            content,
+            title="Doc",
+            source="docs/a.md",
+            metadata={"file_path": "/data/docs/a.md", "word_count": 124, "author": "a"},
+        )
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert chunk.metadata == {"chunk_method": "simple", "total_chunks": len(chunks)}
+
+
+class TestSearchDocumentMetadata:
+    """Test the include_document_metadata join."""
+
+    @pytest.fixture
+    def conn(self):
+        conn = MagicMock()
+        conn.fetch = AsyncMock(
+            return_value=[
+                {
+                    "chunk_id": "c1",
+                    "document_id": "d1",
+                    "chunk_index": 0,
+                    "content": "text",
+                    "similarity": 0.9,
+                    "metadata": '{"chunk_method": "hybrid"}',
+                    "document_title": "Doc",
+                    "document_source": "docs/a.md",
+                    "collection": "docs",
+                    "document_metadata": '{"author": "a"}',
+                }
+            ]
+        )
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        with patch("core.rag_service.global_db_pool.acquire", acquire):
+            yield conn
+
+    @pytest.mark.asyncio
+    async def test_document_metadata_not_selected_by_default(self, conn):
+        results, _ = await search_with_embedding([0.1], 5)
+
+        assert "d.metadata" not in conn.fetch.await_args.args[0]
+        assert results[0]["metadata"] == {"chunk_method": "hybrid"}
+        assert "document_metadata" not in results[0]
+
+    @pytest.mark.asyncio
+    async def test_document_metadata_joined_on_request(self, conn):
+        results, _ = await search_with_embedding([0.1], 5, include_document_metadata=True)
+
+        assert "d.metadata AS document_metadata" in conn.fetch.await_args.args[0]
+        assert results[0]["document_metadata"] == {"author": "a"}
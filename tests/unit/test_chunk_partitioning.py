@@ -0,0 +1,248 @@
+"""
+Unit tests for collection-partitioned chunk storage (sql/partition-chunks.sql)
+
+Tests:
+- Documents are assigned to their top-level source or CHUNK_COLLECTION_KEY collection
+- A collection filter prunes the search on the chunk side; source_filter prunes
+  to the matching collections only when chunks is partitioned
+- Rebuilds of partitioned chunks keep the partitioned layout and rename partitions
+- Ingestion writes collections only once sql/chunk-collections.sql is applied
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import core.rag_service as rag_service
+import ingestion.ingest as ingest
+from ingestion.chunker import DocumentChunk
+from ingestion.reindex import build_shadow_indexes, swap_shadow_tables
+from utils.db_utils import document_collection
+
+
+class TestDocumentCollection:
+    """Test collection assignment."""
+
+    def test_defaults_to_top_level_source(self):
+        assert document_collection("langfuse-docs/api/intro.md", {"team": "x"}) == "langfuse-docs"
+        assert document_collection("readme.md") == "readme.md"
+
+    def test_metadata_key_overrides_source(self):
+        with patch("utils.db_utils.CHUNK_COLLECTION_KEY", "team"):
+            assert document_collection("docs/a.md", {"team": "billing"}) == "billing"
+            assert document_collection("docs/a.md", {}) == "docs"
+
+
+@pytest.fixture
+def conn():
+    """Patch the search pool to yield a mock connection."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    with (
+        patch("core.rag_service.global_db_pool.acquire", acquire),
+        patch("docling_mcp.metrics.record_search_plan"),
+    ):
+        yield conn
+
+
+class TestSearchPruning:
+    """Test partition pruning conditions in search_with_embedding."""
+
+    @pytest.mark.asyncio
+    async def test_collection_filters_chunks_and_documents(self, conn):
+        with patch.object(rag_service, "_chunks_partitioned", True):
+            await rag_service.search_with_embedding([0.1], 5, collection="langfuse-docs")
+
+        query, *args = conn.fetch.await_args.args
+        assert "d.collection = $3" in query
+        assert "c.collection = $3" in query
+        assert args[2] == "langfuse-docs"
+
+    @pytest.mark.asyncio
+    async def test_source_filter_prunes_partitioned_chunks(self, conn):
+        with patch.object(rag_service, "_chunks_partitioned", True):
+            await rag_service.search_with_embedding([0.1], 5, source_filter="deployment")
+
+        query, *args = conn.fetch.await_args.args
+        assert (
+            "c.collection = ANY(ARRAY(SELECT DISTINCT collection FROM documents "
+            "WHERE source ILIKE $4))" in query
+        )
+        assert args[3] == "%deployment%"
+
+    @pytest.mark.asyncio
+    async def test_source_filter_on_plain_chunks_adds_no_pruning(self, conn):
+        with patch.object(rag_service, "_chunks_partitioned", False):
+            await rag_service.search_with_embedding([0.1], 5, source_filter="deployment")
+
+        assert "c.collection = " not in conn.fetch.await_args.args[0]
+
+
+def _conn(fetch_results, partitioned_tables):
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.fetch = AsyncMock(side_effect=fetch_results)
+
+    async def fetchval(query, *args):
+        if "pg_partitioned_table" in query:
+            return 1 if args[0] in partitioned_tables else None
+        return None
+
+    conn.fetchval = fetchval
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    conn.transaction = transaction
+    return conn
+
+
+def _statements(conn):
+    return [call.args[0].strip() for call in conn.execute.await_args_list]
+
+
+class TestPartitionedRebuild:
+    """Test blue/green rebuilds of partitioned chunks."""
+
+    @pytest.mark.asyncio
+    async def test_partitioned_indexes_built_on_every_partition(self):
+        conn = _conn(
+            [
+                [],
+                [
+                    {
+                        "name": "chunks_pkey",
+                        "definition": "CREATE UNIQUE INDEX chunks_pkey "
+                        "ON ONLY public.chunks USING btree (id, collection)",
+                        "constraint_type": "p",
+                        "constraint_definition": "PRIMARY KEY (id, collection)",
+                    },
+                    {
+                        "name": "idx_chunks_embedding_hnsw",
+                        "definition": "CREATE INDEX idx_chunks_embedding_hnsw "
+                        "ON ONLY public.chunks USING hnsw (embedding vector_cosine_ops)",
+                        "constraint_type": None,
+                        "constraint_definition": None,
+                    },
+                ],
+                [],
+                [],
+                [],
+                [],
+            ],
+            partitioned_tables={"chunks"},
+        )
+
+        built = await build_shadow_indexes(conn)
+
+        statements = _statements(conn)
+        assert built == ["chunks_pkey", "idx_chunks_embedding_hnsw"]
+        assert (
+            "ALTER TABLE chunks_shadow ADD CONSTRAINT chunks_pkey_shadow "
+            "PRIMARY KEY (id, collection)" in statements
+        )
+        assert (
+            "CREATE INDEX idx_chunks_embedding_hnsw_shadow ON public.chunks_shadow "
+            "USING hnsw (embedding vector_cosine_ops)" in statements
+        )
+
+    @pytest.mark.asyncio
+    async def test_swap_renames_partitions(self):
+        conn = _conn(
+            [
+                [],
+                [{"name": "chunks_c_0a1b2c3d4e5f"}, {"name": "chunks_default"}],
+                [{"name": "chunks_shadow_c_0a1b2c3d4e5f"}, {"name": "chunks_shadow_default"}],
+            ],
+            partitioned_tables={"chunks", "chunks_shadow"},
+        )
+
+        await swap_shadow_tables(conn, [])
+
+        statements = _statements(conn)
+        old = statements.index(
+            "ALTER TABLE chunks_c_0a1b2c3d4e5f RENAME TO chunks_c_0a1b2c3d4e5f_old"
+        )
+        new = statements.index(
+            "ALTER TABLE chunks_shadow_c_0a1b2c3d4e5f RENAME TO chunks_c_0a1b2c3d4e5f"
+        )
+        assert old < new
+        assert "ALTER TABLE chunks_shadow_default RENAME TO chunks_default" in statements
+        assert statements[-1] == "DROP TABLE chunks_old, documents_old"
+
+
+def _ingest_conn(migrated):
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.fetchrow = AsyncMock(side_effect=[None, {"id": "doc-1"}])
+
+    async def fetchval(query, *args):
+        if "to_regproc('ensure_chunk_partition')" in query:
+            return migrated
+        if "ensure_chunk_partition(" in query:
+            return None
+        raise AssertionError(f"unexpected query: {query}")
+
+    conn.fetchval = AsyncMock(side_effect=fetchval)
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    conn.transaction = transaction
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    return conn, acquire
+
+
+async def _save(acquire):
+    pipeline = ingest.DocumentIngestionPipeline.__new__(ingest.DocumentIngestionPipeline)
+    pipeline.rebuild = False
+    pipeline._documents_table = "documents"
+    pipeline._chunks_table = "chunks"
+    chunk = DocumentChunk("text", 0, 0, 4, {}, token_count=1)
+    with (
+        patch.object(ingest, "_chunk_collections", None),
+        patch("ingestion.ingest.db_pool.acquire", acquire),
+    ):
+        return await pipeline._save_to_postgres("API", "docs/api.md", "text", [chunk], {})
+
+
+class TestIngestionCollections:
+    """Test collection writes with and without sql/chunk-collections.sql."""
+
+    @pytest.mark.asyncio
+    async def test_writes_collection_and_ensures_partition(self):
+        conn, acquire = _ingest_conn(migrated=True)
+
+        assert await _save(acquire) == "doc-1"
+
+        queries = [call.args[0] for call in conn.fetchval.await_args_list]
+        assert "SELECT ensure_chunk_partition($1, $2)" in queries
+        insert_document = conn.fetchrow.await_args_list[1].args
+        assert "collection" in insert_document[0]
+        assert insert_document[-1] == "docs"
+        insert_chunk = conn.execute.await_args_list[-1].args
+        assert "collection" in insert_chunk[0]
+        assert insert_chunk[-1] == "docs"
+
+    @pytest.mark.asyncio
+    async def test_skips_collection_before_migration(self):
+        conn, acquire = _ingest_conn(migrated=False)
+
+        assert await _save(acquire) == "doc-1"
+
+        assert conn.fetchval.await_count == 1  # detection only, no ensure_chunk_partition
+        statements = [call.args[0] for call in conn.fetchrow.await_args_list]
+        statements += [call.args[0] for call in conn.execute.await_args_list]
+        assert not any("collection" in statement for statement in statements)
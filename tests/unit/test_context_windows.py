@@ -0,0 +1,115 @@
+"""
+Unit tests for search context expansion (core/rag_service.py)
+
+Tests:
+- Overlapping/adjacent windows from the same document merge into one passage
+- Windows from different documents stay separate, ordered by similarity
+- Chunk overlap text is not duplicated when stitching
+- The neighbor fetch happens in the same query as the vector search
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from core.rag_service import merge_context_windows, search_with_embedding
+
+
+def _hit(doc, index, similarity, window=1, total=10):
+    context = [
+        {"chunk_index": i, "content": f"{doc}-{i}"}
+        for i in range(max(0, index - window), min(total, index + window + 1))
+    ]
+    return {
+        "content": f"{doc}-{index}",
+        "similarity": similarity,
+        "title": doc,
+        "source": f"{doc}.md",
+        "metadata": {},
+        "chunk_id": f"{doc}-c{index}",
+        "document_id": doc,
+        "chunk_index": index,
+        "context": context,
+    }
+
+
+class TestMergeContextWindows:
+    """Test merge_context_windows."""
+
+    def test_overlapping_windows_merge(self):
+        passages = merge_context_windows([_hit("a", 2, 0.9), _hit("a", 3, 0.8)])
+
+        assert len(passages) == 1
+        passage = passages[0]
+        assert (passage["chunk_start"], passage["chunk_end"]) == (1, 4)
+        assert passage["content"] == "a-1\n\na-2\n\na-3\n\na-4"
+        assert passage["chunk_id"] == "a-c2"  # best hit
+        assert passage["hit_chunk_ids"] == ["a-c2", "a-c3"]
+        assert "context" not in passage
+
+    def test_adjacent_windows_merge(self):
+        passages = merge_context_windows([_hit("a", 1, 0.9), _hit("a", 4, 0.7)])
+
+        assert len(passages) == 1
+        assert (passages[0]["chunk_start"], passages[0]["chunk_end"]) == (0, 5)
+
+    def test_distant_and_other_document_windows_stay_separate(self):
+        passages = merge_context_windows([_hit("a", 1, 0.6), _hit("b", 5, 0.9), _hit("a", 8, 0.8)])
+
+        assert [(p["document_id"], p["chunk_start"]) for p in passages] == [
+            ("b", 4),
+            ("a", 7),
+            ("a", 0),
+        ]
+
+    def test_stitch_drops_chunk_overlap(self):
+        shared = "shared overlap text between chunks"
+        hit = _hit("a", 0, 0.9, window=0)
+        hit["context"] = [
+            {"chunk_index": 0, "content": "Start of the section. " + shared},
+            {"chunk_index": 1, "content": shared + " and the rest."},
+        ]
+
+        passage = merge_context_windows([hit])[0]
+
+        assert passage["content"] == "Start of the section. " + shared + " and the rest."
+
+
+class TestSearchWithContextWindow:
+    """Test the SQL round trip."""
+
+    @pytest.mark.asyncio
+    async def test_neighbors_fetched_in_same_query(self):
+        conn = MagicMock()
+        conn.fetch = AsyncMock(
+            return_value=[
+                {
+                    "chunk_id": "a-c2",
+                    "document_id": "a",
+                    "chunk_index": 2,
+                    "content": "a-2",
+                    "similarity": 0.9,
+                    "metadata": "{}",
+                    "document_title": "A",
+                    "document_source": "a.md",
+                    "collection": "a",
+                    "context": '[{"chunk_index": 1, "content": "a-1"}, '
+                    '{"chunk_index": 2, "content": "a-2"}]',
+                }
+            ]
+        )
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        with patch("core.rag_service.global_db_pool.acquire", acquire):
+            results, _ = await search_with_embedding([0.1, 0.2], limit=3, context_window=1)
+
+        conn.fetch.assert_awaited_once()
+        query, *args = conn.fetch.await_args.args
+        assert "LEFT JOIN LATERAL" in query
+        assert args[1:] == [3, 1]
+        assert results[0]["content"] == "a-1\n\na-2"
+        assert results[0]["chunk_start"] == 1
@@ -0,0 +1,126 @@
+"""
+Unit tests for distributed ingestion workers (ingestion/distributed.py)
+
+Tests:
+- Worker loop processes claimed items and exits when idle
+- Results map to done / pending (retry) / failed
+- Claim uses FOR UPDATE SKIP LOCKED with lease expiry
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ingestion.distributed import IngestionWorker
+from utils.models import IngestionResult
+
+
+def _result(errors=None):
+    return IngestionResult(
+        document_id="" if errors else "doc-1",
+        title="t",
+        chunks_created=0 if errors else 3,
+        tokens_processed=0 if errors else 900,
+        processing_time_ms=12.5,
+        errors=errors or [],
+    )
+
+
+def _item(item_id=1, attempts=1):
+    return {
+        "id": item_id,
+        "documents_folder": "documents",
+        "file_path": f"documents/{item_id}.md",
+        "fast_mode": False,
+        "attempts": attempts,
+    }
+
+
+@pytest.fixture
+def mock_conn():
+    """Patch db_pool.acquire() to yield a mock connection."""
+    conn = MagicMock()
+    conn.execute = AsyncMock(return_value="UPDATE 1")
+    conn.fetchrow = AsyncMock(return_value=None)
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    conn.transaction = transaction
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    with patch("ingestion.distributed.db_pool.acquire", acquire):
+        yield conn
+
+
+class TestWorkerLoop:
+    """Test IngestionWorker.run."""
+
+    @pytest.mark.asyncio
+    async def test_processes_items_until_idle(self):
+        worker = IngestionWorker(worker_id="w1", heartbeat_interval=60)
+        pipeline = MagicMock()
+        pipeline.ingest_file = AsyncMock(return_value=_result())
+        pipeline.close = AsyncMock()
+
+        with (
+            patch("ingestion.distributed.initialize_database", new_callable=AsyncMock),
+            patch("ingestion.distributed.close_database", new_callable=AsyncMock),
+            patch.object(
+                worker, "claim", new_callable=AsyncMock, side_effect=[_item(1), _item(2), None]
+            ),
+            patch.object(worker, "complete", new_callable=AsyncMock) as mock_complete,
+            patch.object(worker, "_get_pipeline", return_value=pipeline),
+        ):
+            processed = await worker.run(exit_when_idle=True)
+
+        assert processed == 2
+        assert [c.args[0]["id"] for c in mock_complete.await_args_list] == [1, 2]
+        pipeline.ingest_file.assert_any_await("documents/1.md")
+
+
+class TestComplete:
+    """Test result recording."""
+
+    @pytest.mark.asyncio
+    async def test_success_marks_done(self, mock_conn):
+        worker = IngestionWorker(worker_id="w1")
+
+        await worker.complete(_item(), _result())
+
+        args = mock_conn.execute.await_args.args
+        assert args[1:4] == (1, "w1", "done")
+        assert args[5:7] == (3, 900)
+
+    @pytest.mark.asyncio
+    async def test_failure_is_retried_until_max_attempts(self, mock_conn):
+        worker = IngestionWorker(worker_id="w1", max_attempts=3)
+
+        await worker.complete(_item(attempts=1), _result(errors=["boom"]))
+        assert mock_conn.execute.await_args.args[3] == "pending"
+
+        await worker.complete(_item(attempts=3), _result(errors=["boom"]))
+        assert mock_conn.execute.await_args.args[3] == "failed"
+        assert mock_conn.execute.await_args.args[8] == "boom"
+
+
+class TestClaim:
+    """Test claim query."""
+
+    @pytest.mark.asyncio
+    async def test_claim_uses_skip_locked_and_lease(self, mock_conn):
+        worker = IngestionWorker(worker_id="w1", lease_seconds=120)
+        mock_conn.fetchrow.return_value = _item()
+
+        item = await worker.claim()
+
+        query, worker_id, lease = mock_conn.fetchrow.await_args.args
+        assert "FOR UPDATE SKIP LOCKED" in query
+        assert "lease_expires_at < NOW()" in query
+        assert (worker_id, lease) == ("w1", 120)
+        assert item["id"] == 1
@@ -0,0 +1,144 @@
+"""
+Unit tests for document listing (utils/db_utils.py)
+
+Tests:
+- Keyset cursor encode/decode round trip and validation
+- Cursor pages use a (created_at, id) keyset predicate instead of OFFSET
+- next_cursor is only returned when another page exists
+- metadata is only selected when requested; /v1/documents includes it by default
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from utils.db_utils import (
+    decode_document_cursor,
+    encode_document_cursor,
+    list_documents,
+    list_documents_page,
+)
+
+DOC_ID = "0b6c7f4e-6d1a-4f43-9a39-6c1f0b7c2a11"
+
+
+def _row(index: int, with_metadata: bool = False) -> dict:
+    row = {
+        "id": f"0b6c7f4e-6d1a-4f43-9a39-6c1f0b7c2a{index:02d}",
+        "title": f"Doc {index}",
+        "source": "docs/a.md",
+        "created_at": datetime(2025, 1, 1, 12, 0, index, 123456, tzinfo=timezone.utc),
+        "updated_at": datetime(2025, 1, 2, tzinfo=timezone.utc),
+        "chunk_count": 3,
+        "token_count": 900,
+    }
+    if with_metadata:
+        row["metadata"] = '{"author": "a"}'
+    return row
+
+
+@pytest.fixture
+def mock_conn():
+    """Patch db_pool.acquire() to yield a mock connection."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    with patch("utils.db_utils.db_pool.acquire", acquire):
+        yield conn
+
+
+class TestDocumentCursor:
+    """Test cursor encoding."""
+
+    def test_round_trip(self):
+        created_at = "2025-01-01T12:00:05.123456+00:00"
+
+        cursor = encode_document_cursor(created_at, DOC_ID)
+
+        assert decode_document_cursor(cursor) == (datetime.fromisoformat(created_at), DOC_ID)
+        assert "=" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_document_cursor("x", DOC_ID)])
+    def test_invalid_cursor_raises_value_error(self, cursor):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_document_cursor(cursor)
+
+
+class TestListDocuments:
+    """Test query shape."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_uses_keyset_predicate(self, mock_conn):
+        cursor = encode_document_cursor("2025-01-01T12:00:05+00:00", DOC_ID)
+
+        await list_documents(limit=10, offset=500, cursor=cursor)
+
+        query, *params = mock_conn.fetch.await_args.args
+        assert "(d.created_at, d.id) < ($1, $2::uuid)" in query
+        assert "ORDER BY d.created_at DESC, d.id DESC" in query
+        assert params[1:] == [DOC_ID, 10, 0]
+
+    @pytest.mark.asyncio
+    async def test_metadata_only_selected_when_requested(self, mock_conn):
+        mock_conn.fetch.return_value = [_row(1)]
+
+        docs = await list_documents(limit=10, include_metadata=False)
+
+        assert "d.metadata" not in mock_conn.fetch.await_args.args[0]
+        assert "metadata" not in docs[0]
+
+        mock_conn.fetch.return_value = [_row(1, with_metadata=True)]
+        docs = await list_documents(limit=10)
+
+        assert docs[0]["metadata"] == {"author": "a"}
+
+
+class TestListDocumentsPage:
+    """Test page assembly."""
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_points_at_last_returned_document(self, mock_conn):
+        mock_conn.fetch.return_value = [_row(3), _row(2), _row(1)]
+
+        page = await list_documents_page(limit=2)
+
+        assert [d["title"] for d in page["documents"]] == ["Doc 3", "Doc 2"]
+        assert mock_conn.fetch.await_args.args[-2] == 3  # limit + 1
+        created_at, document_id = decode_document_cursor(page["next_cursor"])
+        assert created_at == _row(2)["created_at"]
+        assert document_id == _row(2)["id"]
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, mock_conn):
+        mock_conn.fetch.return_value = [_row(1)]
+
+        page = await list_documents_page(limit=2)
+
+        assert page["next_cursor"] is None
+
+
+class TestDocumentsEndpoint:
+    """Test the /v1/documents response shape."""
+
+    def _get(self, url):
+        from fastapi.testclient import TestClient
+
+        from api.main import app
+
+        page = {"documents": [], "next_cursor": None}
+        with patch("api.main.list_documents_page", AsyncMock(return_value=page)) as mock_page:
+            response = TestClient(app).get(url)
+        assert response.status_code == 200
+        return mock_page.await_args.kwargs["include_metadata"]
+
+    def test_metadata_included_by_default(self):
+        assert self._get("/v1/documents") is True
+
+    def test_metadata_omitted_on_request(self):
+        assert self._get("/v1/documents?include_metadata=false") is False
@@ -0,0 +1,224 @@
+"""
+Unit tests for hedged and circuit-broken embedding calls (ingestion/embedding_resilience.py)
+
+Tests:
+- Fast calls are not hedged; slow calls are duplicated and the first response wins
+- The hedge delay follows the recent p95 latency within its bounds
+- The breaker opens on the error rate, fails fast, and closes after a good probe
+- Open circuits use the fallback endpoint for queries when configured
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from openai import APIConnectionError
+
+from ingestion.embedding_resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    EmbeddingCircuitOpenError,
+    EmbeddingHedger,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_metrics():
+    with (
+        patch("docling_mcp.metrics.record_embedding_hedge") as mock_hedge,
+        patch("docling_mcp.metrics.record_embedding_circuit_state"),
+        patch("docling_mcp.metrics.record_embedding_circuit_rejected"),
+        patch("docling_mcp.metrics.record_embedding_fallback"),
+    ):
+        yield mock_hedge
+
+
+def _connection_error():
+    return APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+
+
+class TestEmbeddingHedger:
+    """Test hedged calls."""
+
+    @pytest.mark.asyncio
+    async def test_fast_call_not_hedged(self, no_metrics):
+        hedger = EmbeddingHedger(min_delay_ms=50, max_delay_ms=50)
+        call = AsyncMock(return_value="ok")
+
+        assert await hedger.run(call) == "ok"
+        assert call.await_count == 1
+        no_metrics.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slow_call_hedged_and_first_response_wins(self, no_metrics):
+        hedger = EmbeddingHedger(min_delay_ms=10, max_delay_ms=10)
+        delays = [1.0, 0.0]
+        cancelled = []
+
+        async def call():
+            delay = delays.pop(0)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(delay)
+                raise
+            return delay
+
+        assert await hedger.run(call) == 0.0
+        await asyncio.sleep(0)
+        assert cancelled == [1.0]
+        no_metrics.assert_called_once_with("hedge", 0.01)
+
+    @pytest.mark.asyncio
+    async def test_failed_attempt_waits_for_the_other(self):
+        hedger = EmbeddingHedger(min_delay_ms=10, max_delay_ms=10)
+        attempts = []
+
+        async def call():
+            attempts.append(len(attempts))
+            if len(attempts) == 1:
+                await asyncio.sleep(0.05)
+                raise _connection_error()
+            await asyncio.sleep(0.1)
+            return "hedge"
+
+        assert await hedger.run(call) == "hedge"
+
+    @pytest.mark.asyncio
+    async def test_both_attempts_failing_raises(self):
+        hedger = EmbeddingHedger(min_delay_ms=10, max_delay_ms=10)
+
+        async def call():
+            await asyncio.sleep(0.02)
+            raise _connection_error()
+
+        with pytest.raises(APIConnectionError):
+            await hedger.run(call)
+
+    def test_delay_follows_recent_p95(self):
+        hedger = EmbeddingHedger(percentile=95, min_delay_ms=50, max_delay_ms=1000)
+        assert hedger.delay == 1.0  # Not enough samples yet
+
+        for i in range(100):
+            hedger.observe(0.1 if i < 95 else 0.8)
+        assert hedger.delay == 0.8
+
+        for _ in range(200):
+            hedger.observe(0.001)
+        assert hedger.delay == 0.05
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_on_error_rate_and_fails_fast(self):
+        breaker = CircuitBreaker(window=10, error_rate=0.5, cooldown=30)
+        for _ in range(5):
+            breaker.record_success()
+        for _ in range(5):
+            breaker.before_call()
+            breaker.record_failure()
+
+        assert breaker.state == OPEN
+        with pytest.raises(EmbeddingCircuitOpenError) as exc_info:
+            breaker.before_call()
+        assert 0 < exc_info.value.retry_in <= 30
+
+    def test_few_failures_keep_it_closed(self):
+        breaker = CircuitBreaker(window=10, error_rate=0.5)
+        for _ in range(4):
+            breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_probe_success_closes_and_failure_reopens(self):
+        breaker = CircuitBreaker(window=10, error_rate=0.5, cooldown=0)
+        for _ in range(5):
+            breaker.record_failure()
+        assert breaker.state == OPEN
+
+        probe = breaker.before_call()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(EmbeddingCircuitOpenError):
+            breaker.before_call()  # One probe at a time
+        breaker.record_failure(probe)
+        assert breaker.state == OPEN
+
+        breaker.record_success(breaker.before_call())
+        assert breaker.state == CLOSED
+
+    def test_abandoned_call_does_not_release_probe(self):
+        breaker = CircuitBreaker(window=10, error_rate=0.5, cooldown=0)
+        assert breaker.before_call() is None  # Closed: admitted, no probe
+        for _ in range(5):
+            breaker.record_failure()
+
+        probe = breaker.before_call()
+        assert probe is not None
+        breaker.record_cancelled()  # The call admitted while closed is abandoned
+        with pytest.raises(EmbeddingCircuitOpenError):
+            breaker.before_call()  # Probe still in flight
+
+        breaker.record_cancelled(probe)
+        assert breaker.before_call() is not None  # Next call probes
+
+
+class TestEmbedderIntegration:
+    """Test the breaker and fallback in EmbeddingGenerator."""
+
+    def _embedder(self, fallback_url=None):
+        from ingestion.embedder import EmbeddingGenerator
+
+        with (
+            patch("ingestion.embedder.LangfuseAsyncOpenAI", side_effect=lambda **_: MagicMock()),
+            patch("ingestion.embedder.EMBEDDING_FALLBACK_BASE_URL", fallback_url),
+        ):
+            embedder = EmbeddingGenerator(use_cache=False)
+        embedder.hedger.enabled = False
+        return embedder
+
+    @pytest.mark.asyncio
+    async def test_provider_errors_open_breaker(self):
+        breaker = CircuitBreaker(window=10, error_rate=0.5, cooldown=30)
+        embedder = self._embedder()
+        embedder.client.embeddings.create = AsyncMock(side_effect=_connection_error())
+
+        with patch("ingestion.embedder.get_circuit_breaker", return_value=breaker):
+            for _ in range(5):
+                with pytest.raises(APIConnectionError):
+                    await embedder._create_embeddings("q", "interactive")
+            with pytest.raises(EmbeddingCircuitOpenError):
+                await embedder._create_embeddings("q", "interactive")
+
+        assert embedder.client.embeddings.create.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_uses_fallback_endpoint(self):
+        breaker = CircuitBreaker(window=10, error_rate=0.5, cooldown=30)
+        for _ in range(5):
+            breaker.record_failure()
+        embedder = self._embedder(fallback_url="http://embeddings.internal/v1")
+        response = SimpleNamespace(data=[SimpleNamespace(embedding=[0.3])])
+        embedder.fallback_client.embeddings.create = AsyncMock(return_value=response)
+
+        with patch("ingestion.embedder.get_circuit_breaker", return_value=breaker):
+            assert await embedder.embed_query("q") == [0.3]
+
+        embedder.client.embeddings.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_without_fallback_fails_fast(self):
+        breaker = CircuitBreaker(window=10, error_rate=0.5, cooldown=30)
+        for _ in range(5):
+            breaker.record_failure()
+        embedder = self._embedder()
+
+        with (
+            patch("ingestion.embedder.get_circuit_breaker", return_value=breaker),
+            pytest.raises(EmbeddingCircuitOpenError),
+        ):
+            await embedder.embed_query("q")
@@ -0,0 +1,128 @@
+"""
+Unit tests for embedding priority lanes (ingestion/embedding_scheduler.py)
+
+Tests:
+- Interactive calls use reserved slots bulk calls cannot take
+- Queued interactive calls start before queued bulk batches
+- A rate-limit pause holds bulk calls only
+- Cancelled waiters leave the queue
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from ingestion.embedder import _retry_after_seconds
+from ingestion.embedding_scheduler import BULK, INTERACTIVE, EmbeddingScheduler
+
+
+@pytest.fixture(autouse=True)
+def no_metrics():
+    with (
+        patch("docling_mcp.metrics.record_embedding_queue_time") as mock_time,
+        patch("docling_mcp.metrics.record_embedding_queue_depth"),
+    ):
+        yield mock_time
+
+
+async def _hold(scheduler, priority, started, release):
+    async with scheduler.slot(priority):
+        started.append(priority)
+        await release.wait()
+
+
+class TestEmbeddingScheduler:
+    """Test slot dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_reserved_slot_only_for_interactive(self):
+        scheduler = EmbeddingScheduler(max_concurrency=3, interactive_reserved=1)
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(scheduler, BULK, started, release)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert scheduler.running(BULK) == 2
+        assert scheduler.queued(BULK) == 1
+
+        tasks.append(asyncio.create_task(_hold(scheduler, INTERACTIVE, started, release)))
+        await asyncio.sleep(0)
+        assert scheduler.running(INTERACTIVE) == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert started.count(BULK) == 3
+
+    @pytest.mark.asyncio
+    async def test_interactive_overtakes_queued_bulk(self, no_metrics):
+        scheduler = EmbeddingScheduler(max_concurrency=1, interactive_reserved=0)
+        order, first_release = [], asyncio.Event()
+
+        first = asyncio.create_task(_hold(scheduler, BULK, order, first_release))
+        await asyncio.sleep(0)
+        done = asyncio.Event()
+        done.set()
+        bulk = asyncio.create_task(_hold(scheduler, BULK, order, done))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(_hold(scheduler, INTERACTIVE, order, done))
+        await asyncio.sleep(0)
+
+        first_release.set()
+        await asyncio.gather(first, bulk, interactive)
+
+        assert order == [BULK, INTERACTIVE, BULK]
+        priorities = [call.args[0] for call in no_metrics.call_args_list]
+        assert sorted(priorities) == [BULK, BULK, INTERACTIVE]
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_pause_holds_bulk_only(self):
+        scheduler = EmbeddingScheduler(max_concurrency=4, interactive_reserved=1)
+        scheduler.pause_bulk(0.05)
+        started, release = [], asyncio.Event()
+        release.set()
+
+        bulk = asyncio.create_task(_hold(scheduler, BULK, started, release))
+        interactive = asyncio.create_task(_hold(scheduler, INTERACTIVE, started, release))
+        await asyncio.sleep(0.01)
+        assert started == [INTERACTIVE]
+
+        await asyncio.wait_for(bulk, timeout=1)
+        await interactive
+        assert started == [INTERACTIVE, BULK]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = EmbeddingScheduler(max_concurrency=1, interactive_reserved=0)
+        started, release = [], asyncio.Event()
+
+        holder = asyncio.create_task(_hold(scheduler, BULK, started, release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_hold(scheduler, BULK, started, release))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert scheduler.queued(BULK) == 0
+        release.set()
+        await holder
+        assert scheduler.running(BULK) == 0
+
+    def test_unknown_priority_rejected(self):
+        scheduler = EmbeddingScheduler()
+
+        with pytest.raises(ValueError):
+            asyncio.run(scheduler.slot("urgent").__aenter__())
+
+
+class TestRetryAfter:
+    """Test Retry-After parsing of 429 errors."""
+
+    @pytest.mark.parametrize(
+        "headers, expected",
+        [({"retry-after": "2"}, 2.0), ({"retry-after-ms": "250"}, 0.25), ({}, None)],
+    )
+    def test_parses_headers(self, headers, expected):
+        error = SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+        assert _retry_after_seconds(error) == expected
@@ -0,0 +1,156 @@
+"""
+Unit tests for embedding spaces (utils/embedding_spaces.py, core/rag_service.py,
+ingestion/embedding_backfill.py)
+
+Tests:
+- Space names are validated; large spaces are indexed as halfvec
+- Search resolves the space, rejects spaces that are not ready and queries the
+  space's vectors with the expression of its partial index
+- The backfill embeds missing chunks batch by batch, reports progress and
+  activates the space when done
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import core.rag_service as rag_service
+from ingestion.embedding_backfill import EmbeddingBackfill
+from utils.embedding_spaces import (
+    EmbeddingSpaceError,
+    space_operator_class,
+    space_vector_expression,
+    validate_space_name,
+)
+
+SPACE = {"name": "te3_large", "model": "text-embedding-3-large", "dimensions": 3, "status": "ready"}
+
+
+class TestSpaceHelpers:
+    """Test naming and SQL helpers."""
+
+    @pytest.mark.parametrize("name", ["TE3", "te3-large", "1abc", "x; DROP TABLE chunks", ""])
+    def test_invalid_names_rejected(self, name):
+        with pytest.raises(EmbeddingSpaceError):
+            validate_space_name(name)
+
+    def test_large_spaces_use_halfvec(self):
+        space = {**SPACE, "dimensions": 3072}
+
+        assert space_vector_expression(space) == "(ce.embedding::halfvec(3072))"
+        assert space_vector_expression(space, None) == "(embedding::halfvec(3072))"
+        assert space_operator_class(space) == "halfvec_cosine_ops"
+        assert space_operator_class({**SPACE, "dimensions": 1536}) == "vector_cosine_ops"
+
+
+@pytest.fixture
+def conn():
+    """Patch the search pool and clear the space cache."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.fetchrow = AsyncMock(return_value=SPACE)
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    with (
+        patch("core.rag_service.global_db_pool.acquire", acquire),
+        patch.dict(rag_service._embedding_spaces, clear=True),
+    ):
+        yield conn
+
+
+class TestSearchSpaces:
+    """Test space selection in search."""
+
+    @pytest.mark.asyncio
+    async def test_primary_space_needs_no_lookup(self, conn):
+        assert await rag_service.get_embedding_space("primary") is None
+        conn.fetchrow.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_space_is_cached(self, conn):
+        await rag_service.get_embedding_space("te3_large")
+        await rag_service.get_embedding_space("te3_large")
+
+        conn.fetchrow.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("row", [None, {**SPACE, "status": "backfilling"}])
+    async def test_unknown_or_unready_space_rejected(self, conn, row):
+        conn.fetchrow.return_value = row
+
+        with pytest.raises(EmbeddingSpaceError):
+            await rag_service.get_embedding_space("te3_large")
+
+    @pytest.mark.asyncio
+    async def test_search_uses_space_vectors(self, conn):
+        await rag_service.search_with_embedding([0.1, 0.2, 0.3], 5, embedding_space="te3_large")
+
+        query = conn.fetch.await_args.args[0]
+        assert "JOIN chunk_embeddings ce ON ce.chunk_id = c.id AND ce.space = 'te3_large'" in query
+        assert "ORDER BY (ce.embedding::vector(3)) <=> $1::vector(3)" in query
+        assert "c.embedding" not in query
+
+
+class TestEmbeddingBackfill:
+    """Test the backfill loop with DB helpers patched."""
+
+    @pytest.mark.asyncio
+    async def test_embeds_missing_chunks_and_activates(self):
+        backfill = EmbeddingBackfill("te3_large", batch_size=2)
+        embedder = MagicMock()
+        embedder.embed_documents = AsyncMock(
+            side_effect=lambda texts: [[0.1, 0.2, 0.3]] * len(texts)
+        )
+        batches = [
+            [{"id": "c1", "content": "one"}, {"id": "c2", "content": "two"}],
+            [{"id": "c3", "content": "three"}],
+            [],
+        ]
+
+        with (
+            patch.object(backfill, "_load_space", AsyncMock(return_value=SPACE)),
+            patch.object(backfill, "_next_batch", AsyncMock(side_effect=batches)) as mock_next,
+            patch.object(backfill, "_activate", AsyncMock()) as mock_activate,
+            patch(
+                "ingestion.embedding_backfill.get_space_progress",
+                AsyncMock(return_value=[{**SPACE, "embedded": 0, "target": 3}]),
+            ),
+            patch(
+                "ingestion.embedding_backfill.store_space_vectors",
+                AsyncMock(side_effect=lambda space, ids, vectors: len(ids)),
+            ) as mock_store,
+            patch("ingestion.embedding_backfill._get_embedder", return_value=embedder),
+            patch("docling_mcp.metrics.record_embedding_backfill") as mock_record,
+        ):
+            written = await backfill.run()
+
+        assert written == 3
+        assert mock_store.await_args_list[1].args[:2] == ("te3_large", ["c3"])
+        assert mock_next.await_args_list[1].args == ("c2",)
+        mock_record.assert_called_with("te3_large", 3, 3)
+        mock_activate.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_dimension_mismatch_stops_backfill(self):
+        backfill = EmbeddingBackfill("te3_large")
+        embedder = MagicMock()
+        embedder.embed_documents = AsyncMock(return_value=[[0.1, 0.2]])
+
+        with (
+            patch.object(backfill, "_load_space", AsyncMock(return_value=SPACE)),
+            patch.object(
+                backfill, "_next_batch", AsyncMock(return_value=[{"id": "c1", "content": "x"}])
+            ),
+            patch(
+                "ingestion.embedding_backfill.get_space_progress",
+                AsyncMock(return_value=[{**SPACE, "embedded": 0, "target": 1}]),
+            ),
+            patch("ingestion.embedding_backfill._get_embedder", return_value=embedder),
+            patch("docling_mcp.metrics.record_embedding_backfill"),
+        ):
+            with pytest.raises(EmbeddingSpaceError, match="dimensions"):
+                await backfill.run()
@@ -0,0 +1,170 @@
+"""
+Unit tests for cached health checks (utils/health_monitor.py, utils/db_utils.test_connection)
+
+Tests:
+- Probes read the cached result while the monitor runs; stale results are "down"
+- Failed or hanging checks report "down" instead of raising
+- test_connection keeps one connection and replaces it once when it goes stale
+- Liveness and readiness endpoints of the API and the observability server
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from utils.db_utils import close_health_connection, test_connection
+from utils.health_monitor import HealthMonitor, is_ready
+
+
+class TestHealthMonitor:
+    """Test caching and staleness."""
+
+    @pytest.mark.asyncio
+    async def test_running_monitor_serves_cached_result(self):
+        check = AsyncMock(return_value={"status": "ok"})
+        monitor = HealthMonitor(check, interval=60)
+        monitor.start()
+        try:
+            results = [await monitor.get() for _ in range(5)]
+        finally:
+            await monitor.stop()
+
+        assert check.await_count == 1
+        assert all(is_ready(result) for result in results)
+        assert results[-1]["age_seconds"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_stale_result_is_down(self):
+        monitor = HealthMonitor(
+            AsyncMock(return_value={"status": "ok"}), interval=60, stale_after=5
+        )
+        monitor.start()
+        try:
+            await monitor.get()
+            monitor._checked_at = time.time() - 10
+
+            result = await monitor.get()
+        finally:
+            await monitor.stop()
+
+        assert result["stale"] is True
+        assert result["status"] == "down"
+        assert not is_ready(result)
+
+    @pytest.mark.asyncio
+    async def test_not_running_checks_inline(self):
+        check = AsyncMock(return_value={"status": "degraded"})
+        monitor = HealthMonitor(check)
+
+        await monitor.get()
+        result = await monitor.get()
+
+        assert check.await_count == 2
+        assert result["stale"] is False
+        assert is_ready(result)
+
+    @pytest.mark.asyncio
+    async def test_failing_or_hanging_check_is_down(self):
+        async def hang():
+            await asyncio.sleep(5)
+
+        failing = HealthMonitor(AsyncMock(side_effect=RuntimeError("boom")))
+        hanging = HealthMonitor(hang, timeout=0.05)
+
+        assert (await failing.get())["status"] == "down"
+        assert (await hanging.get())["status"] == "down"
+
+
+class TestTestConnection:
+    """Test the long-lived health connection."""
+
+    @pytest.fixture(autouse=True)
+    def database_url(self, monkeypatch):
+        monkeypatch.setenv("DATABASE_URL", "postgresql://localhost/test")
+
+    def _conn(self, **kwargs):
+        conn = MagicMock()
+        conn.is_closed.return_value = False
+        conn.fetchval = AsyncMock(**kwargs)
+        conn.close = AsyncMock()
+        return conn
+
+    @pytest.mark.asyncio
+    async def test_connection_is_reused(self):
+        conn = self._conn(return_value=1)
+        with patch("utils.db_utils.asyncpg.connect", AsyncMock(return_value=conn)) as connect:
+            assert await test_connection()
+            assert await test_connection()
+            await close_health_connection()
+
+        assert connect.await_count == 1
+        assert conn.fetchval.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_new_connection_not_retried(self):
+        broken = self._conn(side_effect=ConnectionError("server closed the connection"))
+        connect = AsyncMock(return_value=broken)
+        with patch("utils.db_utils.asyncpg.connect", connect):
+            assert not await test_connection()
+
+        assert connect.await_count == 1
+        broken.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_kept_connection_reconnects(self):
+        kept = self._conn(return_value=1)
+        fresh = self._conn(return_value=1)
+        with patch("utils.db_utils.asyncpg.connect", AsyncMock(side_effect=[kept, fresh])):
+            assert await test_connection()
+            kept.fetchval.side_effect = ConnectionError("server closed the connection")
+
+            assert await test_connection()
+            await close_health_connection()
+
+        kept.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_database_fails_without_retry(self):
+        connect = AsyncMock(side_effect=OSError("Connection refused"))
+        with patch("utils.db_utils.asyncpg.connect", connect):
+            assert not await test_connection()
+
+        assert connect.await_count == 1
+
+
+class TestProbeEndpoints:
+    """Test liveness and readiness endpoints."""
+
+    def test_api_liveness_does_not_touch_database(self):
+        from api.main import app
+
+        with patch("utils.db_utils.test_connection", AsyncMock()) as probe:
+            response = TestClient(app).get("/health/live")
+
+        assert response.status_code == 200
+        probe.assert_not_awaited()
+
+    @pytest.mark.parametrize("connected, status_code", [(True, 200), (False, 503)])
+    def test_api_readiness(self, connected, status_code, warmed_up):
+        from api.main import app
+
+        with patch("utils.db_utils.test_connection", AsyncMock(return_value=connected)):
+            response = TestClient(app).get("/health/ready")
+
+        assert response.status_code == status_code
+        assert response.json()["ready"] is connected
+
+    def test_observability_readiness_follows_status(self):
+        from docling_mcp.http_server import app
+
+        with patch(
+            "docling_mcp.health.get_health_status",
+            AsyncMock(return_value=MagicMock(to_dict=lambda: {"status": "down"})),
+        ):
+            response = TestClient(app).get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
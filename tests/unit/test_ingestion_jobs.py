@@ -0,0 +1,258 @@
+"""
+Unit tests for the ingestion job manager (api/jobs.py)
+
+Tests:
+- Admission: per-folder lock, clean exclusivity, concurrency limit
+- Progress and ETA computation
+- Worker loop: progress recording, cancellation, resume skipping processed files
+- Worker writes are guarded by job ownership; a worker that lost its job stops
+"""
+
+import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from api import jobs
+from utils.models import IngestionResult
+
+
+def _active(folder, clean=False):
+    return {"id": uuid.uuid4(), "documents_folder": folder, "clean_before_ingest": clean}
+
+
+class TestCheckAdmission:
+    """Test admission rules."""
+
+    def test_admits_when_idle(self):
+        jobs.check_admission([], "documents", clean_before_ingest=True, max_jobs=1)
+
+    def test_same_folder_conflicts(self):
+        with pytest.raises(jobs.JobConflictError, match="already active"):
+            jobs.check_admission([_active("documents")], "documents", False, max_jobs=5)
+
+    def test_clean_job_requires_exclusive_access(self):
+        with pytest.raises(jobs.JobConflictError, match="exclusive"):
+            jobs.check_admission([_active("other")], "documents", True, max_jobs=5)
+
+        with pytest.raises(jobs.JobConflictError, match="exclusive"):
+            jobs.check_admission([_active("other", clean=True)], "documents", False, max_jobs=5)
+
+    def test_concurrency_limit(self):
+        with pytest.raises(jobs.JobLimitError):
+            jobs.check_admission([_active("a")], "b", False, max_jobs=1)
+
+        jobs.check_admission([_active("a")], "b", False, max_jobs=2)
+
+    def test_folder_normalization(self):
+        assert jobs.normalize_folder("documents/") == jobs.normalize_folder("documents")
+
+
+class TestJobToStatus:
+    """Test status view and ETA."""
+
+    def _row(self, **overrides):
+        row = {
+            "id": uuid.uuid4(),
+            "status": "running",
+            "documents_folder": "documents",
+            "clean_before_ingest": False,
+            "fast_mode": False,
+            "files_total": 10,
+            "files_done": 4,
+            "files_failed": 1,
+            "chunks_created": 40,
+            "tokens_processed": 12000,
+            "processing_ms": 8000,
+            "cancel_requested": False,
+        }
+        row.update(overrides)
+        return row
+
+    def test_progress_and_eta(self):
+        status = jobs.job_to_status(self._row())
+
+        assert status["progress_pct"] == 40.0
+        # 2s per file on average, 6 files remaining
+        assert status["eta_seconds"] == 12.0
+        assert status["tokens_processed"] == 12000
+
+    def test_no_eta_when_not_running(self):
+        assert jobs.job_to_status(self._row(status="completed"))["eta_seconds"] is None
+        assert jobs.job_to_status(self._row(files_done=0))["eta_seconds"] is None
+
+
+class TestRunJob:
+    """Test the worker loop with DB helpers and pipeline patched."""
+
+    def _pipeline(self, files):
+        pipeline = MagicMock()
+        pipeline.initialize = AsyncMock()
+        pipeline.close = AsyncMock()
+        pipeline._clean_databases = AsyncMock()
+        pipeline.find_document_files = MagicMock(return_value=files)
+        pipeline.ingest_file = AsyncMock(
+            side_effect=lambda path: IngestionResult(
+                document_id="d", title=path, chunks_created=2, processing_time_ms=5
+            )
+        )
+        return pipeline
+
+    async def _run(self, job, pipeline, cancel_after=None, lost_after=None):
+        job_id = str(job["id"])
+        recorded = []
+        finished = []
+        checks = {"n": 0}
+
+        async def is_cancel_requested(_):
+            checks["n"] += 1
+            return cancel_after is not None and checks["n"] > cancel_after
+
+        async def record_file(job_uuid, path, result):
+            if lost_after is not None and len(recorded) >= lost_after:
+                raise jobs.JobLostError(f"Ingestion job {job_uuid} is no longer running")
+            recorded.append(path)
+
+        async def finish_job(_, status, error=None):
+            finished.append(status)
+
+        with (
+            patch.object(jobs, "initialize_database", new_callable=AsyncMock),
+            patch.object(jobs, "close_database", new_callable=AsyncMock),
+            patch.object(jobs, "_claim_job", new_callable=AsyncMock, return_value=job),
+            patch.object(jobs, "_heartbeat", new_callable=AsyncMock),
+            patch.object(jobs, "_set_files_total", new_callable=AsyncMock),
+            patch.object(jobs, "_is_cancel_requested", side_effect=is_cancel_requested),
+            patch.object(jobs, "_record_file", side_effect=record_file),
+            patch.object(jobs, "_finish_job", side_effect=finish_job),
+            patch.object(jobs, "_create_pipeline", return_value=pipeline),
+        ):
+            result = await jobs.run_job(job_id)
+
+        return result, recorded, finished
+
+    def _job(self, processed=None, clean=False):
+        return {
+            "id": uuid.uuid4(),
+            "documents_folder": "documents",
+            "clean_before_ingest": clean,
+            "fast_mode": False,
+            "processed_files": processed or [],
+        }
+
+    @pytest.mark.asyncio
+    async def test_processes_all_files(self):
+        pipeline = self._pipeline(["a.md", "b.md", "c.md"])
+
+        result, recorded, finished = await self._run(self._job(clean=True), pipeline)
+
+        assert result == "completed"
+        assert recorded == ["a.md", "b.md", "c.md"]
+        assert finished == ["completed"]
+        pipeline._clean_databases.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cancellation_stops_between_files(self):
+        pipeline = self._pipeline(["a.md", "b.md", "c.md"])
+
+        result, recorded, finished = await self._run(self._job(), pipeline, cancel_after=1)
+
+        assert result == "cancelled"
+        assert recorded == ["a.md"]
+        assert finished == ["cancelled"]
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_processed_files_and_does_not_clean_again(self):
+        pipeline = self._pipeline(["a.md", "b.md", "c.md"])
+        job = self._job(processed=["a.md", "b.md"], clean=True)
+
+        result, recorded, _ = await self._run(job, pipeline)
+
+        assert result == "completed"
+        assert recorded == ["c.md"]
+        pipeline._clean_databases.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_pipeline_failure_marks_job_failed(self):
+        pipeline = self._pipeline(["a.md"])
+        pipeline.initialize.side_effect = RuntimeError("db down")
+
+        result, _, finished = await self._run(self._job(), pipeline)
+
+        assert result == "failed"
+        assert finished == ["failed"]
+
+    @pytest.mark.asyncio
+    async def test_lost_job_stops_without_finishing(self):
+        pipeline = self._pipeline(["a.md", "b.md", "c.md"])
+
+        result, recorded, finished = await self._run(self._job(), pipeline, lost_after=1)
+
+        assert result == "lost"
+        assert recorded == ["a.md"]
+        assert pipeline.ingest_file.await_count == 2
+        assert finished == []
+
+
+def _pool(conn):
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    return patch.object(jobs.db_pool, "acquire", acquire)
+
+
+class TestJobOwnership:
+    """Test that worker writes only touch a job the worker still owns."""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_guarded_by_worker_pid(self):
+        conn = MagicMock()
+        conn.execute = AsyncMock(return_value="UPDATE 0")
+        job_uuid = uuid.uuid4()
+        result = IngestionResult(document_id="d", title="a", chunks_created=1, processing_time_ms=1)
+
+        with _pool(conn):
+            with pytest.raises(jobs.JobLostError):
+                await jobs._record_file(job_uuid, "a.md", result)
+            with pytest.raises(jobs.JobLostError):
+                await jobs._finish_job(job_uuid, "completed")
+            with pytest.raises(jobs.JobLostError):
+                await jobs._set_files_total(job_uuid, 3)
+
+        for call in conn.execute.await_args_list:
+            query, *args = call.args
+            assert "status = 'running' AND worker_pid = $" in query
+            assert args[-1] == os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_lost_heartbeat_cancels_the_worker(self):
+        conn = MagicMock()
+        conn.execute = AsyncMock(return_value="UPDATE 0")
+        pipeline = TestRunJob()._pipeline(["a.md"])
+
+        async def ingest_forever(path):
+            await asyncio.Event().wait()
+
+        pipeline.ingest_file = AsyncMock(side_effect=ingest_forever)
+        job = TestRunJob()._job()
+
+        with (
+            _pool(conn),
+            patch.object(jobs, "HEARTBEAT_INTERVAL_SECONDS", 0),
+            patch.object(jobs, "initialize_database", new_callable=AsyncMock),
+            patch.object(jobs, "close_database", new_callable=AsyncMock),
+            patch.object(jobs, "_claim_job", new_callable=AsyncMock, return_value=job),
+            patch.object(jobs, "_set_files_total", new_callable=AsyncMock),
+            patch.object(jobs, "_is_cancel_requested", new_callable=AsyncMock, return_value=False),
+            patch.object(jobs, "_finish_job", new_callable=AsyncMock) as finish_job,
+            patch.object(jobs, "_create_pipeline", return_value=pipeline),
+        ):
+            result = await asyncio.wait_for(jobs.run_job(str(job["id"])), timeout=5)
+
+        assert result == "lost"
+        finish_job.assert_not_awaited()
+        pipeline.close.assert_awaited_once()
@@ -0,0 +1,88 @@
+"""
+Unit tests for lazy heavy imports (cold start of search-serving processes)
+
+Tests:
+- API, MCP server and ingestion modules import without Docling/transformers
+- docling_mcp submodules import without loading the FastMCP server
+- The API imports without the OpenAI and LangFuse SDKs
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Fails any import of a forbidden package, so the check is meaningful even where
+# Docling/transformers are installed
+_BLOCKER = """
+import sys
+
+FORBIDDEN = ("docling", "docling_core", "transformers", "torch")
+
+
+class _Blocker:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in FORBIDDEN:
+            raise ImportError(f"forbidden heavy import: {name}")
+        return None
+
+
+sys.meta_path.insert(0, _Blocker())
+"""
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", _BLOCKER + code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+class TestLazyHeavyImports:
+    """Search paths must not import Docling or transformers."""
+
+    @pytest.mark.parametrize(
+        "module",
+        ["api.main", "docling_mcp.server", "ingestion.ingest", "ingestion.distributed"],
+    )
+    def test_module_imports_without_docling(self, module):
+        result = _run(f"import {module}")
+
+        assert result.returncode == 0, result.stderr[-2000:]
+
+    def test_simple_chunker_works_without_docling(self):
+        code = """
+import asyncio
+from ingestion.chunker import ChunkingConfig, create_chunker
+
+chunker = create_chunker(ChunkingConfig(use_semantic_splitting=False))
+chunks = asyncio.run(chunker.chunk_document("Hello world. " * 50, "t", "s"))
+assert chunks
+"""
+        result = _run(code)
+
+        assert result.returncode == 0, result.stderr[-2000:]
+
+    def test_metrics_import_does_not_load_server(self):
+        result = _run(
+            "import sys, docling_mcp.metrics\n"
+            "assert 'docling_mcp.server' not in sys.modules\n"
+            "assert 'fastmcp' not in sys.modules\n"
+        )
+
+        assert result.returncode == 0, result.stderr[-2000:]
+
+    def test_api_import_does_not_load_provider_sdks(self):
+        result = _run(
+            "import sys, api.main\n"
+            "assert 'openai' not in sys.modules\n"
+            "assert 'langfuse' not in sys.modules\n"
+        )
+
+        assert result.returncode == 0, result.stderr[-2000:]
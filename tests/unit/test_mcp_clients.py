@@ -0,0 +1,182 @@
+"""
+Unit tests for the shared multi-client MCP server (docling_mcp/clients.py)
+
+Tests:
+- MCP_AUTH_TOKENS parsing and per-client bearer token verification
+- MCP_AUTH_PROVIDER factory hook
+- Tool calls are counted per client; client labels are bounded
+- Sessions are tracked per client and expire when idle
+- The HTTP transport rejects requests without a valid token
+- The shared server refuses non-loopback hosts without authentication
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from fastmcp import Client, FastMCP
+from mcp.types import Implementation
+
+from docling_mcp.clients import (
+    OTHER_CLIENTS,
+    ClientTokenVerifier,
+    ClientTrackingMiddleware,
+    build_auth_provider,
+    parse_tokens,
+)
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "1.0"},
+    },
+}
+
+
+def _server(middleware: ClientTrackingMiddleware) -> FastMCP:
+    server = FastMCP("test")
+    server.add_middleware(middleware)
+
+    @server.tool()
+    def ping() -> str:
+        return "pong"
+
+    @server.tool()
+    def fail() -> str:
+        raise ValueError("boom")
+
+    return server
+
+
+def _client(server: FastMCP, name: str) -> Client:
+    return Client(server, client_info=Implementation(name=name, version="1.0"))
+
+
+class TestAuth:
+    """Test token parsing, verification and the provider hook."""
+
+    def test_parse_tokens(self):
+        assert parse_tokens("alice:t1, bob:t2,") == {"t1": "alice", "t2": "bob"}
+
+        with pytest.raises(ValueError):
+            parse_tokens("alice")
+
+    @pytest.mark.asyncio
+    async def test_token_verifier_maps_token_to_client(self):
+        verifier = ClientTokenVerifier({"t1": "alice"})
+
+        assert (await verifier.verify_token("t1")).client_id == "alice"
+        assert await verifier.verify_token("wrong") is None
+
+    def test_provider_hook_takes_precedence(self):
+        with (
+            patch("docling_mcp.clients.MCP_AUTH_PROVIDER", "unittest.mock:MagicMock"),
+            patch("docling_mcp.clients.MCP_AUTH_TOKENS", "alice:t1"),
+        ):
+            provider = build_auth_provider()
+
+        assert isinstance(provider, MagicMock)
+
+    def test_no_auth_configured(self):
+        with patch("docling_mcp.clients.MCP_AUTH_TOKENS", ""):
+            assert build_auth_provider() is None
+
+
+class TestClientTracking:
+    """Test per-client metrics and sessions."""
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_counted_per_client(self):
+        tracking = ClientTrackingMiddleware()
+        server = _server(tracking)
+
+        with patch("docling_mcp.clients.record_client_request") as record:
+            async with _client(server, "cursor") as cursor:
+                await cursor.call_tool("ping")
+                with pytest.raises(Exception):
+                    await cursor.call_tool("fail")
+            async with _client(server, "claude-desktop") as desktop:
+                await desktop.call_tool("ping")
+
+        assert [c.args for c in record.call_args_list] == [
+            ("cursor", "ping", "success"),
+            ("cursor", "fail", "error"),
+            ("claude-desktop", "ping", "success"),
+        ]
+        assert tracking.active_sessions() == {"cursor": 1, "claude-desktop": 1}
+
+    @pytest.mark.asyncio
+    async def test_client_labels_bounded(self):
+        server = _server(ClientTrackingMiddleware(max_clients=1))
+
+        with patch("docling_mcp.clients.record_client_request") as record:
+            for name in ("a", "b", "a"):
+                async with _client(server, name) as client:
+                    await client.call_tool("ping")
+
+        assert [c.args[0] for c in record.call_args_list] == ["a", OTHER_CLIENTS, "a"]
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_expire(self):
+        tracking = ClientTrackingMiddleware(idle_timeout=0)
+        server = _server(tracking)
+
+        for name in ("a", "b"):
+            async with _client(server, name) as client:
+                await client.call_tool("ping")
+
+        assert tracking.active_sessions() == {"b": 1}
+
+
+class TestHttpAuth:
+    """Test authentication on the streamable-HTTP transport."""
+
+    def test_requests_need_a_valid_token(self):
+        from docling_mcp.asgi import create_app
+        from docling_mcp.server import mcp
+
+        headers = {"Accept": "application/json, text/event-stream"}
+        with (
+            patch.object(mcp, "auth", None),
+            patch("docling_mcp.clients.MCP_AUTH_TOKENS", "alice:secret"),
+            patch("docling_mcp.lifespan.initialize_database", AsyncMock()),
+            patch("docling_mcp.lifespan.close_database", AsyncMock()),
+            patch("docling_mcp.lifespan.initialize_global_embedder", AsyncMock()),
+            patch("docling_mcp.lifespan.close_global_embedder", AsyncMock()),
+            TestClient(create_app()) as client,
+        ):
+            anonymous = client.post("/mcp", json=INITIALIZE, headers=headers)
+            wrong = client.post(
+                "/mcp", json=INITIALIZE, headers={**headers, "Authorization": "Bearer nope"}
+            )
+            alice = client.post(
+                "/mcp", json=INITIALIZE, headers={**headers, "Authorization": "Bearer secret"}
+            )
+
+        assert anonymous.status_code == 401
+        assert wrong.status_code == 401
+        assert alice.status_code == 200
+
+    @pytest.mark.parametrize("transport", ["http", "sse"])
+    def test_no_auth_only_on_loopback(self, transport):
+        import mcp_server
+        from docling_mcp.server import mcp
+
+        with (
+            patch.object(mcp, "auth", None),
+            patch("docling_mcp.clients.MCP_AUTH_TOKENS", ""),
+            patch("docling_mcp.clients.MCP_AUTH_PROVIDER", ""),
+            patch("uvicorn.run") as run,
+        ):
+            with pytest.raises(SystemExit, match="without authentication"):
+                mcp_server.run_single_loop("0.0.0.0", transport=transport)
+            run.assert_not_called()
+
+            mcp_server.run_single_loop("127.0.0.1", transport=transport)
+
+        run.assert_called_once()
+        assert run.call_args.kwargs["host"] == "127.0.0.1"
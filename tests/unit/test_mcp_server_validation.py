@@ -7,7 +7,7 @@ Tests:
 - Input validation for all tools
 """
 
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 from fastmcp.exceptions import ToolError
@@ -66,8 +66,10 @@ class TestQueryKnowledgeBaseValidation:
 
                 assert "[Source: Test Doc]" in result
                 assert "Test content" in result
-                mock_embed.assert_called_once_with("test query")
-                mock_search.assert_called_once_with([0.1] * 1536, 5, None)
+                mock_embed.assert_called_once_with("test query", deadline=ANY)
+                mock_search.assert_called_once_with(
+                    [0.1] * 1536, 5, None, context_window=0, metadata_filter=None, deadline=ANY
+                )
 
     @pytest.mark.asyncio
     async def test_source_filter_passed_to_search(self):
@@ -79,7 +81,14 @@ class TestQueryKnowledgeBaseValidation:
 
                 await query_knowledge_base_fn("test", limit=5, source_filter="langfuse-docs")
 
-                mock_search.assert_called_once_with([0.1] * 1536, 5, "langfuse-docs")
+                mock_search.assert_called_once_with(
+                    [0.1] * 1536,
+                    5,
+                    "langfuse-docs",
+                    context_window=0,
+                    metadata_filter=None,
+                    deadline=ANY,
+                )
 
     @pytest.mark.asyncio
     async def test_error_raises_tool_error(self):
@@ -132,8 +141,8 @@ class TestAskKnowledgeBaseValidation:
                 assert "Test Doc" in result
                 assert "Answer content" in result
                 assert "85" in result  # similarity percentage
-                mock_embed.assert_called_once_with("What is test?")
-                mock_search.assert_called_once_with([0.1] * 1536, 3)
+                mock_embed.assert_called_once_with("What is test?", deadline=ANY)
+                mock_search.assert_called_once_with([0.1] * 1536, 3, deadline=ANY)
 
 
 class TestListKnowledgeBaseDocumentsValidation:
@@ -142,8 +151,8 @@ class TestListKnowledgeBaseDocumentsValidation:
     @pytest.mark.asyncio
     async def test_empty_list_returns_message(self):
         """Test that empty document list returns appropriate message."""
-        with patch("docling_mcp.server.list_documents") as mock_list:
-            mock_list.return_value = []
+        with patch("docling_mcp.server.list_documents_page") as mock_page:
+            mock_page.return_value = {"documents": [], "next_cursor": None}
 
             result = await list_knowledge_base_documents_fn()
 
@@ -152,23 +161,43 @@ class TestListKnowledgeBaseDocumentsValidation:
     @pytest.mark.asyncio
     async def test_documents_formatted_correctly(self):
         """Test that documents are formatted correctly."""
-        with patch("docling_mcp.server.list_documents") as mock_list:
-            mock_list.return_value = [
-                {
-                    "id": "123",
-                    "title": "Doc 1",
-                    "source": "source-1",
-                    "chunk_count": 10,
-                    "updated_at": "2025-01-01",
-                }
-            ]
+        with patch("docling_mcp.server.list_documents_page") as mock_page:
+            mock_page.return_value = {
+                "documents": [
+                    {
+                        "id": "123",
+                        "title": "Doc 1",
+                        "source": "source-1",
+                        "chunk_count": 10,
+                        "updated_at": "2025-01-01",
+                    }
+                ],
+                "next_cursor": None,
+            }
 
             result = await list_knowledge_base_documents_fn(limit=50)
 
             assert "Found 1 documents" in result
             assert "[source-1] Doc 1" in result
             assert "10 chunks" in result
-            mock_list.assert_called_once_with(50, 0)
+            assert "cursor=" not in result
+            mock_page.assert_called_once_with(50, cursor=None)
+
+    @pytest.mark.asyncio
+    async def test_offset_without_cursor_uses_offset_listing(self):
+        """Test that an explicit offset keeps the offset listing, without metadata."""
+        with patch("docling_mcp.server.list_documents") as mock_list:
+            mock_list.return_value = []
+
+            await list_knowledge_base_documents_fn(limit=10, offset=20)
+
+            mock_list.assert_called_once_with(10, 20, include_metadata=False)
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_raises_tool_error(self):
+        """Test that a malformed cursor is reported as a tool error."""
+        with pytest.raises(ToolError, match="Invalid cursor"):
+            await list_knowledge_base_documents_fn(cursor="not-a-cursor")
 
 
 class TestGetKnowledgeBaseDocumentValidation:
@@ -228,8 +257,14 @@ class TestGetKnowledgeBaseOverviewValidation:
     @pytest.mark.asyncio
     async def test_empty_overview(self):
         """Test overview when no documents exist."""
-        with patch("docling_mcp.server.list_documents") as mock_list:
-            mock_list.return_value = []
+        with patch("docling_mcp.server.get_knowledge_base_stats") as mock_stats:
+            mock_stats.return_value = {
+                "total_documents": 0,
+                "total_chunks": 0,
+                "total_tokens": 0,
+                "sources": [],
+                "recent_documents": [],
+            }
 
             result = await get_knowledge_base_overview_fn()
 
@@ -239,14 +274,24 @@ class TestGetKnowledgeBaseOverviewValidation:
     @pytest.mark.asyncio
     async def test_overview_with_documents(self):
         """Test overview with documents."""
-        with patch("docling_mcp.server.list_documents") as mock_list:
-            mock_list.return_value = [
-                {"title": "Doc 1", "source": "source-a/path", "chunk_count": 10},
-                {"title": "Doc 2", "source": "source-b/path", "chunk_count": 5},
-            ]
+        with patch("docling_mcp.server.get_knowledge_base_stats") as mock_stats:
+            mock_stats.return_value = {
+                "total_documents": 25,
+                "total_chunks": 150,
+                "total_tokens": 30000,
+                "sources": [
+                    {"source": "source-a", "document_count": 20, "chunk_count": 100},
+                    {"source": "source-b", "document_count": 5, "chunk_count": 50},
+                ],
+                "recent_documents": [
+                    {"title": f"Doc {i}", "source": "source-a/path", "chunk_count": 5}
+                    for i in range(20)
+                ],
+            }
 
             result = await get_knowledge_base_overview_fn()
 
-            assert "Total Documents: 2" in result
-            assert "Total Chunks: 15" in result
+            assert "Total Documents: 25" in result
+            assert "Total Chunks: 150" in result
             assert "Unique Sources: 2" in result
+            assert "... and 5 more" in result
@@ -0,0 +1,158 @@
+"""
+Unit tests for metadata-filtered search (utils/metadata_filter.py, core/rag_service.py)
+
+Tests:
+- Equality filters compile to a single GIN-indexable containment
+- Ranges, $in and $ne compile to parameterized JSONB path conditions
+- Malformed filters raise MetadataFilterError
+- The planner picks an exact pre-filter scan for selective filters and HNSW for broad ones
+"""
+
+import json
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import core.rag_service as rag_service
+from utils.metadata_filter import MetadataFilterError, compile_metadata_filter
+
+
+class TestCompileMetadataFilter:
+    """Test compile_metadata_filter."""
+
+    def test_equalities_merge_into_one_containment(self):
+        params = ["embedding", 5]
+
+        conditions = compile_metadata_filter(
+            {"lang": "it", "frontmatter.version": "2.1", "tags": ["rag"]}, params
+        )
+
+        assert conditions == ["d.metadata @> $3::jsonb"]
+        assert json.loads(params[2]) == {
+            "lang": "it",
+            "frontmatter": {"version": "2.1"},
+            "tags": ["rag"],
+        }
+
+    def test_string_and_numeric_ranges(self):
+        params = []
+
+        conditions = compile_metadata_filter(
+            {"version": {"$gte": "2.0", "$lt": "3.0"}, "pages": {"$gt": 10}}, params
+        )
+
+        assert conditions[0] == "(d.metadata #>> $1::text[]) >= $2"
+        assert conditions[1] == "(d.metadata #>> $3::text[]) < $4"
+        assert "jsonb_typeof(d.metadata #> $5::text[]) = 'number'" in conditions[2]
+        assert conditions[2].endswith("> $6::numeric")
+        assert params == [["version"], "2.0", ["version"], "3.0", ["pages"], Decimal("10")]
+
+    def test_in_and_ne(self):
+        params = []
+
+        conditions = compile_metadata_filter(
+            {"lang": {"$in": ["it", "en"]}, "draft": {"$ne": True}}, params
+        )
+
+        assert conditions == [
+            "(d.metadata #> $1::text[]) = ANY($2::jsonb[])",
+            "(d.metadata #> $3::text[]) IS DISTINCT FROM $4::jsonb",
+        ]
+        assert params[1] == ['"it"', '"en"']
+        assert params[3] == "true"
+
+    @pytest.mark.parametrize(
+        "metadata_filter",
+        [
+            {"bad key; DROP": 1},
+            {"version": {"$regex": "2.*"}},
+            {"lang": {"$in": []}},
+            {"draft": {"$gt": True}},
+            {"a": 1, "a.b": 2},
+            ["not", "a", "dict"],
+        ],
+    )
+    def test_malformed_filters_raise(self, metadata_filter):
+        with pytest.raises(MetadataFilterError):
+            compile_metadata_filter(metadata_filter, [])
+
+
+@pytest.fixture
+def mock_conn():
+    """Patch the search pool to yield a mock connection."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.fetchval = AsyncMock()
+    conn.execute = AsyncMock()
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    conn.transaction = transaction
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    with (
+        patch("core.rag_service.global_db_pool.acquire", acquire),
+        patch("docling_mcp.metrics.record_search_plan") as mock_record,
+        patch.object(rag_service, "_chunks_partitioned", False),
+    ):
+        conn.record_search_plan = mock_record
+        yield conn
+
+
+class TestSearchPlanner:
+    """Test plan choice in search_with_embedding."""
+
+    @pytest.mark.asyncio
+    async def test_selective_filter_uses_exact_prefilter(self, mock_conn):
+        mock_conn.fetchval.return_value = 120
+
+        await rag_service.search_with_embedding([0.1], 5, metadata_filter={"lang": "it"})
+
+        estimate_query = mock_conn.fetchval.await_args.args[0]
+        assert "SUM(d.chunk_count)" in estimate_query
+        query = mock_conn.fetch.await_args.args[0]
+        assert "WITH candidates AS MATERIALIZED" in query
+        assert "d.metadata @> $3::jsonb" in query
+        mock_conn.record_search_plan.assert_called_once_with("exact_prefilter")
+
+    @pytest.mark.asyncio
+    async def test_broad_filter_uses_hnsw_iterative_scan(self, mock_conn):
+        mock_conn.fetchval.side_effect = [10_000_000, "0.8.0"]
+
+        with patch.object(rag_service, "_iterative_scan_supported", None):
+            await rag_service.search_with_embedding([0.1], 5, metadata_filter={"lang": "it"})
+
+        mock_conn.execute.assert_awaited_once_with("SET LOCAL hnsw.iterative_scan = strict_order")
+        assert "ORDER BY c.embedding <=> $1::vector" in mock_conn.fetch.await_args.args[0]
+        mock_conn.record_search_plan.assert_called_once_with("hnsw_iterative")
+
+    @pytest.mark.asyncio
+    async def test_broad_filter_on_old_pgvector_raises_ef_search(self, mock_conn):
+        mock_conn.fetchval.side_effect = [10_000_000, "0.7.4"]
+
+        with patch.object(rag_service, "_iterative_scan_supported", None):
+            await rag_service.search_with_embedding([0.1], 5, metadata_filter={"lang": "it"})
+
+        assert "hnsw.ef_search" in mock_conn.execute.await_args.args[0]
+        mock_conn.record_search_plan.assert_called_once_with("hnsw_filtered")
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_search_skips_estimate(self, mock_conn):
+        await rag_service.search_with_embedding([0.1], 5, source_filter="docs")
+
+        mock_conn.fetchval.assert_not_awaited()
+        mock_conn.record_search_plan.assert_called_once_with("hnsw")
+
+    @pytest.mark.asyncio
+    async def test_malformed_filter_fails_before_query(self, mock_conn):
+        with pytest.raises(MetadataFilterError):
+            await rag_service.search_with_embedding([0.1], 5, metadata_filter={"a": {"$x": 1}})
+
+        mock_conn.fetch.assert_not_awaited()
@@ -0,0 +1,228 @@
+"""
+Unit tests for multi-worker API serving (api/serve.py, ingestion/embedding_cache.py)
+
+Tests:
+- The shared embedding cache is read across processes, per model, and bounded
+- A locked cache file is a fast miss, and embedders read it off the event loop
+- Query embedders use the shared cache only when EMBEDDING_CACHE_DIR is set
+- prepare_shared_state empties the metrics directory of a previous run
+- The API exposes /metrics
+- Forked workers serve one socket and /metrics merges their samples
+"""
+
+import multiprocessing
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from ingestion.embedding_cache import SharedEmbeddingCache
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def _store_in_child(directory: str) -> None:
+    SharedEmbeddingCache(directory, "model-a").set("shared query", [0.5, 0.25])
+
+
+class TestSharedEmbeddingCache:
+    """Test the on-disk embedding cache."""
+
+    def test_roundtrip_per_model(self, tmp_path):
+        cache = SharedEmbeddingCache(str(tmp_path), "model-a")
+        cache.set("query", [0.5, -1.0, 0.25])
+
+        assert cache.get("query") == [0.5, -1.0, 0.25]
+        assert cache.get("other") is None
+        assert SharedEmbeddingCache(str(tmp_path), "model-b").get("query") is None
+        assert len(cache) == 1
+
+    def test_entries_shared_across_processes(self, tmp_path):
+        cache = SharedEmbeddingCache(str(tmp_path), "model-a")
+        cache.get("warm the connection before fork")
+
+        child = multiprocessing.get_context("fork").Process(
+            target=_store_in_child, args=(str(tmp_path),)
+        )
+        child.start()
+        child.join()
+
+        assert child.exitcode == 0
+        assert cache.get("shared query") == [0.5, 0.25]
+
+    def test_oldest_entries_evicted(self, tmp_path):
+        cache = SharedEmbeddingCache(str(tmp_path), "model-a", max_entries=50)
+        for i in range(100):
+            cache.set(f"query {i}", [float(i)])
+
+        assert len(cache) == 50
+        assert cache.get("query 0") is None
+        assert cache.get("query 99") == [99.0]
+
+    def test_unreadable_file_is_a_miss(self, tmp_path):
+        cache = SharedEmbeddingCache(str(tmp_path), "model-a")
+        (tmp_path / "embeddings.sqlite3").write_bytes(b"not a database" * 100)
+
+        assert cache.get("query") is None
+        cache.set("query", [1.0])  # Must not raise
+
+    def test_locked_file_is_a_fast_miss(self, tmp_path):
+        cache = SharedEmbeddingCache(str(tmp_path), "model-a")
+        cache.set("query", [1.0])
+        writer = sqlite3.connect(tmp_path / "embeddings.sqlite3", isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")  # Another worker holds the write lock
+
+        start = time.monotonic()
+        cache.set("other", [2.0])  # Must not raise
+        elapsed = time.monotonic() - start
+        writer.rollback()
+        writer.close()
+
+        assert elapsed < 0.5
+        assert cache.get("query") == [1.0]  # WAL: readers are not blocked
+        assert cache.get("other") is None
+
+    @pytest.mark.asyncio
+    async def test_embedder_uses_cache_off_the_event_loop(self, tmp_path):
+        from ingestion.embedder import create_embedder
+
+        with (
+            patch("ingestion.embedder.LangfuseAsyncOpenAI", side_effect=lambda **_: MagicMock()),
+            patch("ingestion.embedder.EMBEDDING_CACHE_DIR", str(tmp_path)),
+        ):
+            embedder = create_embedder(shared_cache=True)
+        embedder.cache.set_many([("cached", [0.5]), ("also cached", [0.25])])
+        threads = []
+        get_many = embedder.cache.get_many
+
+        def recording_get_many(texts):
+            threads.append(threading.get_ident())
+            return get_many(texts)
+
+        with patch.object(embedder.cache, "get_many", side_effect=recording_get_many):
+            assert await embedder.embed_query("cached") == [0.5]
+            assert await embedder.embed_documents(["cached", "also cached"]) == [[0.5], [0.25]]
+
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+
+    def test_only_query_embedders_share(self, tmp_path):
+        from ingestion.embedder import EmbeddingCache, create_embedder
+
+        with (
+            patch("ingestion.embedder.LangfuseAsyncOpenAI", side_effect=lambda **_: MagicMock()),
+            patch("ingestion.embedder.EMBEDDING_CACHE_DIR", str(tmp_path)),
+        ):
+            query_embedder = create_embedder(shared_cache=True)
+            ingest_embedder = create_embedder()
+
+        assert isinstance(query_embedder.cache, SharedEmbeddingCache)
+        assert isinstance(ingest_embedder.cache, EmbeddingCache)
+
+
+class TestSharedState:
+    """Test the directories shared by the workers."""
+
+    def test_prepare_shared_state(self, tmp_path, monkeypatch):
+        from api.serve import prepare_shared_state
+
+        metrics_dir = tmp_path / "metrics"
+        metrics_dir.mkdir()
+        (metrics_dir / "counter_123.db").write_bytes(b"stale")
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(metrics_dir))
+        monkeypatch.setenv("EMBEDDING_CACHE_DIR", str(tmp_path / "cache"))
+
+        shared = prepare_shared_state()
+
+        assert list(metrics_dir.iterdir()) == []
+        assert Path(shared["embedding_cache"]).is_dir()
+
+    def test_api_serves_metrics(self):
+        from fastapi.testclient import TestClient
+
+        from api.main import app
+
+        assert TestClient(app).get("/metrics").status_code == 200
+
+
+_WORKERS_APP = """
+import sys
+
+from api.serve import prepare_shared_state, run_workers
+
+prepare_shared_state()
+
+from fastapi import FastAPI, Response
+
+from docling_mcp.metrics import generate_metrics_output, record_search_plan
+
+app = FastAPI()
+
+
+@app.get("/search")
+async def search():
+    record_search_plan("hnsw")
+    return {}
+
+
+@app.get("/metrics")
+async def metrics():
+    return Response(generate_metrics_output())
+
+
+run_workers(app, 2, "127.0.0.1", int(sys.argv[1]))
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork() is POSIX-only")
+class TestWorkers:
+    """Test forked workers end to end."""
+
+    def test_workers_share_socket_and_metrics(self, tmp_path):
+        port = _free_port()
+        env = {
+            "PATH": "",
+            "PYTHONPATH": str(PROJECT_ROOT),
+            "PROMETHEUS_MULTIPROC_DIR": str(tmp_path / "metrics"),
+            "EMBEDDING_CACHE_DIR": str(tmp_path / "cache"),
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-c", _WORKERS_APP, str(port)],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            url = f"http://127.0.0.1:{port}"
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    httpx.get(f"{url}/metrics")
+                    break
+                except httpx.TransportError:
+                    assert time.monotonic() < deadline, "workers did not start"
+                    time.sleep(0.2)
+
+            for _ in range(20):
+                httpx.get(f"{url}/search")  # New connection each time: any worker
+            metrics = httpx.get(f"{url}/metrics").text
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        assert 'rag_search_plan_total{plan="hnsw"} 20.0' in metrics
+        assert server.returncode == 0
@@ -0,0 +1,170 @@
+"""
+Unit tests for partial document reads (utils/db_utils.py, MCP document tool)
+
+Tests:
+- Chunk range and neighbor reads validate bounds and query by chunk_index
+- Batch fetch preserves the requested order and rejects invalid IDs
+- get_knowledge_base_document dispatches to chunk/character range reads
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastmcp.exceptions import ToolError
+
+from docling_mcp.server import get_knowledge_base_document
+from utils.db_utils import (
+    MAX_CHUNK_RANGE,
+    get_chunk_neighbors,
+    get_document_chunks,
+    get_documents_by_ids,
+)
+
+get_knowledge_base_document_fn = get_knowledge_base_document.fn
+
+DOC_A = "0b6c7f4e-6d1a-4f43-9a39-6c1f0b7c2a01"
+DOC_B = "0b6c7f4e-6d1a-4f43-9a39-6c1f0b7c2a02"
+
+
+@pytest.fixture
+def mock_conn():
+    """Patch db_pool.acquire() to yield a mock connection."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    conn.fetchrow = AsyncMock(return_value=None)
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    with patch("utils.db_utils.db_pool.acquire", acquire):
+        yield conn
+
+
+def _doc_row(doc_id: str) -> dict:
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return {
+        "id": doc_id,
+        "title": f"Doc {doc_id[-1]}",
+        "source": "docs/a.md",
+        "metadata": "{}",
+        "chunk_count": 4,
+        "token_count": 1200,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+class TestChunkRange:
+    """Test get_document_chunks."""
+
+    @pytest.mark.asyncio
+    async def test_range_query_uses_chunk_index(self, mock_conn):
+        mock_conn.fetchrow.return_value = {
+            "id": DOC_A,
+            "title": "Doc",
+            "source": "docs/a.md",
+            "chunk_count": 40,
+        }
+        mock_conn.fetch.return_value = [
+            {"chunk_id": "c3", "chunk_index": 3, "content": "three", "token_count": 10}
+        ]
+
+        doc = await get_document_chunks(DOC_A, 3, 5)
+
+        query, *params = mock_conn.fetch.await_args.args
+        assert "chunk_index BETWEEN $2 AND $3" in query
+        assert params == [DOC_A, 3, 5]
+        assert doc["chunk_count"] == 40
+        assert doc["chunks"][0]["chunk_index"] == 3
+
+    @pytest.mark.asyncio
+    async def test_missing_document_returns_none(self, mock_conn):
+        assert await get_document_chunks(DOC_A, 0, 1) is None
+        mock_conn.fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("start, end", [(-1, 2), (5, 4), (0, MAX_CHUNK_RANGE)])
+    async def test_invalid_or_too_wide_range_raises(self, mock_conn, start, end):
+        with pytest.raises(ValueError):
+            await get_document_chunks(DOC_A, start, end)
+
+
+class TestChunkNeighbors:
+    """Test get_chunk_neighbors."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_chunk_returns_none(self, mock_conn):
+        assert await get_chunk_neighbors("c1", window=1) is None
+
+    @pytest.mark.asyncio
+    async def test_window_is_bounded(self, mock_conn):
+        with pytest.raises(ValueError):
+            await get_chunk_neighbors("c1", window=100)
+
+
+class TestBatchFetch:
+    """Test get_documents_by_ids."""
+
+    @pytest.mark.asyncio
+    async def test_preserves_requested_order(self, mock_conn):
+        mock_conn.fetch.return_value = [_doc_row(DOC_A), _doc_row(DOC_B)]
+
+        docs = await get_documents_by_ids([DOC_B.upper(), DOC_A, DOC_B])
+
+        assert [d["id"] for d in docs] == [DOC_B, DOC_A]
+        assert mock_conn.fetch.await_args.args[1] == [DOC_B, DOC_A]
+        assert "content" not in docs[0]
+
+    @pytest.mark.asyncio
+    async def test_invalid_id_raises(self, mock_conn):
+        with pytest.raises(ValueError, match="Invalid document ID"):
+            await get_documents_by_ids(["not-a-uuid"])
+
+
+class TestDocumentToolRanges:
+    """Test get_knowledge_base_document read modes."""
+
+    @pytest.mark.asyncio
+    async def test_chunk_range_does_not_fetch_full_document(self):
+        chunk_doc = {
+            "id": DOC_A,
+            "title": "Doc",
+            "source": "docs/a.md",
+            "chunk_count": 40,
+            "chunks": [{"chunk_id": "c2", "chunk_index": 2, "content": "two", "token_count": 1}],
+        }
+        with (
+            patch("docling_mcp.server.get_document_chunks", return_value=chunk_doc) as mock_chunks,
+            patch("docling_mcp.server.get_document") as mock_get,
+        ):
+            result = await get_knowledge_base_document_fn(DOC_A, chunk_start=2, chunk_end=3)
+
+        mock_chunks.assert_called_once_with(DOC_A, 2, 3)
+        mock_get.assert_not_called()
+        assert "--- Chunk 2 ---\ntwo" in result
+        assert "Total Chunks: 40" in result
+
+    @pytest.mark.asyncio
+    async def test_char_range(self):
+        text_doc = {
+            "id": DOC_A,
+            "title": "Doc",
+            "source": "docs/a.md",
+            "content": "llo",
+            "start": 2,
+            "end": 5,
+            "total_length": 5000,
+        }
+        with patch("docling_mcp.server.get_document_text_range", return_value=text_doc) as m:
+            result = await get_knowledge_base_document_fn(DOC_A, char_start=2, char_end=5)
+
+        m.assert_called_once_with(DOC_A, 2, 5)
+        assert "Characters: 2-5 of 5000" in result
+
+    @pytest.mark.asyncio
+    async def test_mixed_modes_rejected(self):
+        with pytest.raises(ToolError, match="not both"):
+            await get_knowledge_base_document_fn(DOC_A, chunk_start=0, char_start=0)
@@ -157,6 +157,7 @@ class TestPrometheusHistogramBuckets:
                 assert bucket in actual_buckets, f"Missing bucket: {bucket}"
 
 
+@pytest.mark.usefixtures("warmed_up")
 class TestHealthCheckStatusLogic:
     """Test health check status determination logic."""
 
@@ -0,0 +1,158 @@
+"""
+Unit tests for blue/green reindex (ingestion/reindex.py)
+
+Tests:
+- Live index, key and trigger definitions are retargeted at the shadow tables
+- Index builds use the tuned maintenance settings
+- The swap renames tables and indexes inside one transaction, then drops the old tables
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ingestion.reindex import _retarget, build_shadow_indexes, swap_shadow_tables
+
+
+def _conn(fetch_results=None):
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.fetch = AsyncMock(side_effect=fetch_results) if fetch_results else AsyncMock()
+    conn.fetchval = AsyncMock(return_value=None)
+    conn.in_transaction = []
+
+    @asynccontextmanager
+    async def transaction():
+        conn.in_transaction.append(True)
+        yield
+        conn.in_transaction.append(False)
+
+    conn.transaction = transaction
+    return conn
+
+
+def _statements(conn):
+    return [call.args[0].strip() for call in conn.execute.await_args_list]
+
+
+class TestRetarget:
+    """Test definition rewriting."""
+
+    def test_index_definition(self):
+        definition = (
+            "CREATE INDEX idx_chunks_embedding_hnsw ON public.chunks "
+            "USING hnsw (embedding vector_cosine_ops) WITH (m='16', ef_construction='64')"
+        )
+
+        assert "ON public.chunks_shadow USING hnsw" in _retarget(definition)
+
+    def test_foreign_key_and_trigger(self):
+        assert _retarget("FOREIGN KEY (document_id) REFERENCES documents(id)") == (
+            "FOREIGN KEY (document_id) REFERENCES documents_shadow(id)"
+        )
+        assert "ON public.documents_shadow FOR EACH ROW" in _retarget(
+            "CREATE TRIGGER t BEFORE UPDATE ON public.documents FOR EACH ROW EXECUTE FUNCTION f()"
+        )
+
+    def test_shadow_name_is_not_retargeted_twice(self):
+        assert _retarget("ON public.documents_shadow") == "ON public.documents_shadow"
+
+
+class TestBuildShadowIndexes:
+    """Test the deferred index build."""
+
+    @pytest.mark.asyncio
+    async def test_builds_live_indexes_on_shadow_tables(self):
+        conn = _conn(
+            [
+                [
+                    {
+                        "name": "documents_pkey",
+                        "definition": "CREATE UNIQUE INDEX documents_pkey "
+                        "ON public.documents USING btree (id)",
+                        "constraint_type": "p",
+                    }
+                ],
+                [
+                    {
+                        "name": "idx_chunks_embedding_hnsw",
+                        "definition": "CREATE INDEX idx_chunks_embedding_hnsw "
+                        "ON public.chunks USING hnsw (embedding vector_cosine_ops)",
+                        "constraint_type": None,
+                    }
+                ],
+                [],
+                [
+                    {
+                        "name": "chunks_document_id_fkey",
+                        "definition": "FOREIGN KEY (document_id) REFERENCES documents(id)",
+                    }
+                ],
+                [],
+                [],
+            ]
+        )
+
+        built = await build_shadow_indexes(conn)
+
+        statements = _statements(conn)
+        assert built == ["documents_pkey", "idx_chunks_embedding_hnsw"]
+        assert statements[0].startswith("SET maintenance_work_mem")
+        assert statements[1].startswith("SET max_parallel_maintenance_workers")
+        assert (
+            "CREATE INDEX idx_chunks_embedding_hnsw_shadow ON public.chunks_shadow "
+            "USING hnsw (embedding vector_cosine_ops)" in statements
+        )
+        assert (
+            "ALTER TABLE documents_shadow ADD CONSTRAINT documents_pkey_shadow "
+            "PRIMARY KEY USING INDEX documents_pkey_shadow" in statements
+        )
+        assert (
+            "ALTER TABLE chunks_shadow ADD CONSTRAINT chunks_document_id_fkey "
+            "FOREIGN KEY (document_id) REFERENCES documents_shadow(id)" in statements
+        )
+
+
+class TestSwap:
+    """Test the atomic swap."""
+
+    @pytest.mark.asyncio
+    async def test_renames_then_drops_old_generation(self):
+        conn = _conn([[]])
+
+        await swap_shadow_tables(conn, ["documents_pkey"])
+
+        statements = _statements(conn)
+        assert conn.in_transaction == [True, False]
+        assert statements.index("ALTER INDEX documents_pkey RENAME TO documents_pkey_old") < (
+            statements.index("ALTER TABLE documents_shadow RENAME TO documents")
+        )
+        assert "ALTER INDEX documents_pkey_shadow RENAME TO documents_pkey" in statements
+        assert statements[-1] == "DROP TABLE chunks_old, documents_old"
+
+    @pytest.mark.asyncio
+    async def test_external_references_are_emptied_and_repointed(self):
+        conn = _conn(
+            [
+                [
+                    {
+                        "table_name": "chunk_embeddings",
+                        "name": "chunk_embeddings_chunk_id_fkey",
+                        "definition": "FOREIGN KEY (chunk_id) REFERENCES chunks(id)",
+                    }
+                ]
+            ]
+        )
+
+        await swap_shadow_tables(conn, [])
+
+        statements = _statements(conn)
+        drop = statements.index(
+            "ALTER TABLE chunk_embeddings DROP CONSTRAINT chunk_embeddings_chunk_id_fkey"
+        )
+        assert statements[drop - 1] == "TRUNCATE chunk_embeddings"
+        assert statements.index("ALTER TABLE chunks_shadow RENAME TO chunks") < statements.index(
+            "ALTER TABLE chunk_embeddings ADD CONSTRAINT chunk_embeddings_chunk_id_fkey "
+            "FOREIGN KEY (chunk_id) REFERENCES chunks(id)"
+        )
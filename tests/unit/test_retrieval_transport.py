@@ -0,0 +1,123 @@
+"""
+Unit tests for retrieval transports (core/retrieval.py)
+
+Tests:
+- Transport selection from config
+- HTTP transport delegates to RAGClient
+- In-process transport runs service calls on one shared loop
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from core.retrieval import (
+    HTTPTransport,
+    InProcessTransport,
+    create_retrieval_transport,
+)
+
+
+class TestTransportSelection:
+    """Test create_retrieval_transport mode selection."""
+
+    def test_default_mode_is_http(self, monkeypatch):
+        """Test that HTTP is used when RAG_TRANSPORT is unset."""
+        monkeypatch.delenv("RAG_TRANSPORT", raising=False)
+
+        assert isinstance(create_retrieval_transport(), HTTPTransport)
+
+    def test_inprocess_mode_from_env(self, monkeypatch):
+        """Test that RAG_TRANSPORT=inprocess selects the in-process transport."""
+        monkeypatch.setenv("RAG_TRANSPORT", "inprocess")
+
+        assert isinstance(create_retrieval_transport(), InProcessTransport)
+
+    def test_explicit_mode_overrides_env(self, monkeypatch):
+        """Test that an explicit mode wins over the env var."""
+        monkeypatch.setenv("RAG_TRANSPORT", "inprocess")
+
+        assert isinstance(create_retrieval_transport("http"), HTTPTransport)
+
+    def test_unknown_mode_raises(self):
+        """Test that an unknown mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown RAG_TRANSPORT"):
+            create_retrieval_transport("grpc")
+
+
+class TestHTTPTransport:
+    """Test HTTP transport."""
+
+    @pytest.mark.asyncio
+    async def test_search_delegates_to_client(self):
+        """Test that search calls RAGClient.search with the same arguments."""
+        client = MagicMock()
+        client.search = AsyncMock(return_value={"results": []})
+        transport = HTTPTransport(client)
+
+        result = await transport.search("query", 3, "docling")
+
+        client.search.assert_awaited_once_with("query", 3, "docling")
+        assert result == {"results": []}
+
+
+class TestInProcessTransport:
+    """Test in-process transport."""
+
+    def test_calls_share_one_loop_across_caller_loops(self):
+        """Test that searches from separate asyncio.run() loops use one service loop."""
+        service_threads = []
+
+        async def fake_search(query, limit, source_filter):
+            service_threads.append(threading.current_thread().name)
+            return {"results": [{"title": query, "content": "c"}], "timing": {}}
+
+        transport = InProcessTransport()
+
+        with (
+            patch("utils.db_utils.initialize_database", new_callable=AsyncMock) as mock_db,
+            patch(
+                "core.rag_service.initialize_global_embedder", new_callable=AsyncMock
+            ) as mock_embedder,
+            patch("core.rag_service.search_knowledge_base_structured", side_effect=fake_search),
+            patch("core.rag_service.close_global_embedder", new_callable=AsyncMock),
+            patch("utils.db_utils.close_database", new_callable=AsyncMock),
+        ):
+            first = asyncio.run(transport.search("one"))
+            second = asyncio.run(transport.search("two"))
+            asyncio.run(transport.close())
+
+        assert first["results"][0]["title"] == "one"
+        assert second["results"][0]["title"] == "two"
+        assert service_threads == ["rag-inprocess", "rag-inprocess"]
+        mock_db.assert_awaited_once()
+        mock_embedder.assert_awaited_once()
+
+    def test_failed_initialization_is_retried(self):
+        """Test that a failed initialization does not poison later calls."""
+        transport = InProcessTransport()
+
+        with (
+            patch(
+                "utils.db_utils.initialize_database",
+                new_callable=AsyncMock,
+                side_effect=[RuntimeError("db down"), None],
+            ),
+            patch("core.rag_service.initialize_global_embedder", new_callable=AsyncMock),
+            patch(
+                "core.rag_service.search_knowledge_base_structured",
+                new_callable=AsyncMock,
+                return_value={"results": []},
+            ),
+            patch("core.rag_service.close_global_embedder", new_callable=AsyncMock),
+            patch("utils.db_utils.close_database", new_callable=AsyncMock),
+        ):
+            with pytest.raises(RuntimeError, match="db down"):
+                asyncio.run(transport.search("query"))
+
+            result = asyncio.run(transport.search("query"))
+            asyncio.run(transport.close())
+
+        assert result == {"results": []}
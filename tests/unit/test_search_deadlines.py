@@ -0,0 +1,291 @@
+"""
+Unit tests for search deadlines and per-stage budgets (core/rag_service.py)
+
+Tests:
+- A slow query embedding is cancelled after its budget
+- search_knowledge_base_structured degrades to lexical search and reports the stage
+  (also while the embedding circuit breaker is open)
+- DB queries carry the remaining time and map timeouts to the "db" stage
+- Waiting for a pool connection and the planning queries are bounded too
+- /v1/search returns the timing breakdown, 504 when the DB stage runs out
+- MCP search tools answer from lexical search when embedding times out
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.rag_service as rag_service
+from core.errors import EmbeddingCircuitOpenError
+from core.rag_service import (
+    SearchTimeoutError,
+    generate_query_embedding,
+    lexical_search,
+    search_knowledge_base_structured,
+    search_with_embedding,
+)
+
+
+class _SlowEmbedder:
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def embed_query(self, query):
+        await asyncio.sleep(self.delay)
+        return [0.1]
+
+
+@pytest.fixture
+def embedder():
+    """Patch the query embedder (primary space)."""
+    slow = _SlowEmbedder(0)
+    with (
+        patch("core.rag_service.get_embedding_space", AsyncMock(return_value=None)),
+        patch("core.rag_service._get_space_embedder", AsyncMock(return_value=slow)),
+    ):
+        yield slow
+
+
+@pytest.fixture
+def conn():
+    """Patch the search pool to yield a mock connection."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    with (
+        patch("core.rag_service.global_db_pool.acquire", acquire),
+        patch("docling_mcp.metrics.record_search_plan"),
+        patch.object(rag_service, "_chunks_partitioned", False),
+    ):
+        yield conn
+
+
+class TestEmbeddingBudget:
+    """Test the embedding stage budget."""
+
+    @pytest.mark.asyncio
+    async def test_slow_embedding_cancelled_after_budget(self, embedder):
+        embedder.delay = 5
+
+        start = time.monotonic()
+        with (
+            patch("core.rag_service.SEARCH_EMBEDDING_BUDGET_MS", 50),
+            pytest.raises(SearchTimeoutError) as exc_info,
+        ):
+            await generate_query_embedding("q", deadline=time.monotonic() + 10)
+
+        assert exc_info.value.stage == "embedding"
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_budget_leaves_half_for_db(self, embedder):
+        embedder.delay = 0.2
+
+        with pytest.raises(SearchTimeoutError):
+            await generate_query_embedding("q", deadline=time.monotonic() + 0.3)
+
+    @pytest.mark.asyncio
+    async def test_no_deadline_is_unbounded(self, embedder):
+        embedding, _ = await generate_query_embedding("q")
+
+        assert embedding == [0.1]
+
+
+class TestDegradation:
+    """Test the lexical fallback of search_knowledge_base_structured."""
+
+    @pytest.mark.asyncio
+    async def test_embedding_timeout_falls_back_to_lexical(self, embedder):
+        embedder.delay = 5
+        hit = {"content": "x", "similarity": 0.4}
+
+        with (
+            patch("core.rag_service.SEARCH_EMBEDDING_BUDGET_MS", 20),
+            patch("core.rag_service.lexical_search", AsyncMock(return_value=([hit], 3.0))) as lex,
+            patch("core.rag_service.search_with_embedding", AsyncMock()) as vector,
+        ):
+            result = await search_knowledge_base_structured("how to deploy", source_filter="docs")
+
+        assert result["results"] == [hit]
+        assert result["timing"]["timed_out_stage"] == "embedding"
+        assert result["timing"]["fallback"] == "lexical"
+        assert lex.await_args.args[:3] == ("how to deploy", 5, "docs")
+        vector.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_falls_back_to_lexical(self):
+        with (
+            patch(
+                "core.rag_service.generate_query_embedding",
+                AsyncMock(side_effect=EmbeddingCircuitOpenError(30)),
+            ),
+            patch("core.rag_service.lexical_search", AsyncMock(return_value=([], 1.0))) as lex,
+        ):
+            result = await search_knowledge_base_structured("q")
+
+        assert result["timing"]["circuit_open"] is True
+        assert result["timing"]["fallback"] == "lexical"
+        lex.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_db_timeout_propagates(self, embedder):
+        with (
+            patch(
+                "core.rag_service.search_with_embedding",
+                AsyncMock(side_effect=SearchTimeoutError("db")),
+            ),
+            pytest.raises(SearchTimeoutError) as exc_info,
+        ):
+            await search_knowledge_base_structured("q")
+
+        assert exc_info.value.stage == "db"
+
+
+class TestDbBudget:
+    """Test deadlines of the DB stage."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_gets_remaining_time(self, conn):
+        await search_with_embedding([0.1], 5, deadline=time.monotonic() + 1)
+
+        timeout = conn.fetch.await_args.kwargs["timeout"]
+        assert 0 < timeout <= 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_timeout_maps_to_db_stage(self, conn):
+        conn.fetch.side_effect = asyncio.TimeoutError
+
+        with pytest.raises(SearchTimeoutError) as exc_info:
+            await search_with_embedding([0.1], 5, deadline=time.monotonic() + 1)
+
+        assert exc_info.value.stage == "db"
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_query(self, conn):
+        with pytest.raises(SearchTimeoutError):
+            await search_with_embedding([0.1], 5, deadline=time.monotonic() - 1)
+
+        conn.fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_pool_wait_bounded_by_deadline(self, conn):
+        @asynccontextmanager
+        async def exhausted_pool():
+            await asyncio.sleep(5)
+            yield conn
+
+        start = time.monotonic()
+        with (
+            patch("core.rag_service.global_db_pool.acquire", exhausted_pool),
+            pytest.raises(SearchTimeoutError) as exc_info,
+        ):
+            await search_with_embedding([0.1], 5, deadline=time.monotonic() + 0.05)
+
+        assert exc_info.value.stage == "db"
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_planning_query_bounded_by_deadline(self, conn):
+        async def slow_fetchval(*args):
+            await asyncio.sleep(5)
+
+        conn.fetchval = slow_fetchval
+        start = time.monotonic()
+        with (
+            patch.object(rag_service, "_chunks_partitioned", None),
+            pytest.raises(SearchTimeoutError) as exc_info,
+        ):
+            await search_with_embedding(
+                [0.1], 5, source_filter="docs", deadline=time.monotonic() + 0.05
+            )
+
+        assert exc_info.value.stage == "db"
+        assert time.monotonic() - start < 1
+        conn.fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_space_lookup_bounded_by_deadline(self, conn):
+        async def slow_fetchrow(*args):
+            await asyncio.sleep(5)
+
+        conn.fetchrow = slow_fetchrow
+        with (
+            patch.dict(rag_service._embedding_spaces, clear=True),
+            pytest.raises(SearchTimeoutError) as exc_info,
+        ):
+            await rag_service.get_embedding_space("te3_large", time.monotonic() + 0.05)
+
+        assert exc_info.value.stage == "db"
+
+    @pytest.mark.asyncio
+    async def test_lexical_search_uses_fts_expression_and_filters(self, conn):
+        await lexical_search("deploy helm", 3, source_filter="docs", collection="langfuse-docs")
+
+        query, *args = conn.fetch.await_args.args
+        assert "to_tsvector('english', c.content) @@" in query
+        assert "c.collection = $3" in query
+        assert args[:4] == ["deploy helm", 3, "langfuse-docs", "%docs%"]
+
+
+class TestSearchEndpointDeadline:
+    """Test deadline handling on /v1/search."""
+
+    def test_timing_breakdown_in_response(self):
+        from api.main import app
+
+        result = {
+            "results": [],
+            "timing": {"embedding_ms": 40.0, "timed_out_stage": "embedding", "fallback": "lexical"},
+        }
+        with patch(
+            "api.main.search_knowledge_base_structured", AsyncMock(return_value=result)
+        ) as search:
+            response = TestClient(app).post("/v1/search", json={"query": "q", "timeout_ms": 500})
+
+        assert response.status_code == 200
+        assert response.json()["timing"]["timed_out_stage"] == "embedding"
+        assert search.await_args.kwargs["deadline"] <= time.monotonic() + 0.5
+
+    def test_db_timeout_returns_504(self):
+        from api.main import app
+
+        with patch(
+            "api.main.search_knowledge_base_structured",
+            AsyncMock(side_effect=SearchTimeoutError("db")),
+        ):
+            response = TestClient(app).post("/v1/search", json={"query": "q"})
+
+        assert response.status_code == 504
+        assert "db" in response.json()["detail"]
+
+
+class TestMcpToolDeadline:
+    """Test the lexical fallback of the MCP search tools."""
+
+    @pytest.mark.asyncio
+    async def test_query_tool_falls_back_to_lexical(self):
+        from docling_mcp.server import query_knowledge_base
+
+        hit = {"title": "Deploy", "content": "helm install", "similarity": 0.3}
+        with (
+            patch(
+                "docling_mcp.server.generate_query_embedding",
+                AsyncMock(side_effect=SearchTimeoutError("embedding")),
+            ),
+            patch("docling_mcp.server.lexical_search", AsyncMock(return_value=([hit], 2.0))) as lex,
+            patch("docling_mcp.server.search_with_embedding", AsyncMock()) as vector,
+        ):
+            result = await query_knowledge_base.fn("deploy", timeout_ms=500)
+
+        assert "Semantic search unavailable" in result
+        assert "helm install" in result
+        assert lex.await_args.args[0] == "deploy"
+        vector.assert_not_awaited()
@@ -0,0 +1,84 @@
+"""
+Unit tests for the single-loop MCP app (docling_mcp/asgi.py)
+
+Tests:
+- MCP streamable-HTTP transport and observability endpoints share one app
+- Health checks use the search pool and report its state in single-loop mode
+- Shared-pool mode ends with the app
+"""
+
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from docling_mcp import health
+from docling_mcp.asgi import create_app
+
+
+@contextmanager
+def _mocked_resources():
+    """Mock the MCP lifespan resources and the search pool."""
+    with (
+        patch("docling_mcp.lifespan.initialize_database", AsyncMock()),
+        patch("docling_mcp.lifespan.close_database", AsyncMock()),
+        patch("docling_mcp.lifespan.initialize_global_embedder", AsyncMock()),
+        patch("docling_mcp.lifespan.close_global_embedder", AsyncMock()),
+        patch("utils.db_utils.db_pool.ping", AsyncMock(return_value=True)) as ping,
+        patch(
+            "utils.db_utils.db_pool.stats",
+            return_value={"size": 4, "idle": 1, "max": 10},
+        ),
+        patch("utils.db_utils.test_connection", AsyncMock()) as dedicated,
+    ):
+        yield ping, dedicated
+
+
+@pytest.fixture
+def client():
+    """Running single-loop app."""
+    with _mocked_resources() as (ping, dedicated), TestClient(create_app()) as client:
+        client.ping = ping
+        client.dedicated = dedicated
+        yield client
+
+
+class TestSingleLoopApp:
+    """Test the combined app."""
+
+    def test_observability_endpoints_served(self, client):
+        assert client.get("/metrics").status_code == 200
+        assert client.get("/health/live").json()["status"] == "alive"
+
+    def test_health_uses_search_pool(self, client):
+        data = client.get("/health").json()
+
+        assert "pool: 3/10 in use" in data["services"]["database"]["message"]
+        client.ping.assert_awaited()
+        client.dedicated.assert_not_awaited()
+
+    def test_mcp_transport_mounted(self, client):
+        response = client.post(
+            "/mcp",
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2025-03-26",
+                    "capabilities": {},
+                    "clientInfo": {"name": "test", "version": "1.0"},
+                },
+            },
+            headers={"Accept": "application/json, text/event-stream"},
+        )
+
+        assert response.status_code == 200
+        assert "Docling RAG Agent" in response.text
+
+    def test_shared_pool_mode_ends_with_app(self):
+        with _mocked_resources(), TestClient(create_app()):
+            assert health._use_shared_pool is True
+
+        assert health._use_shared_pool is False
@@ -0,0 +1,254 @@
+"""
+Unit tests for the tracing facade (utils/tracing.py) and deferred cost
+reconciliation (utils/cost_backfill.py, utils/session_manager.py)
+
+Tests:
+- Traced functions keep their signature and run undecorated without LangFuse
+- Head sampling: requests sampled out are not annotated and start no recorded spans
+- Tracing overhead per request is recorded and stays below 1ms
+- Query costs are backfilled from traces, once, and given up after the max age
+"""
+
+import inspect
+import json
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from opentelemetry import trace as otel_trace
+
+from utils import tracing
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+@tracing.traced("test_tool", source="mcp")
+async def _tool(query: str, limit: int = 5) -> dict:
+    """Docstring read by FastMCP."""
+    tracing.annotate({"query": query})
+    span_context = otel_trace.get_current_span().get_span_context()
+    return {"sampled": tracing.is_sampled(), "otel_sampled": span_context.trace_flags.sampled}
+
+
+class TestTraced:
+    """Test the tracing decorator."""
+
+    def test_keeps_signature(self):
+        assert list(inspect.signature(_tool).parameters) == ["query", "limit"]
+        assert _tool.__doc__ == "Docstring read by FastMCP."
+
+    @pytest.mark.asyncio
+    async def test_runs_undecorated_without_client(self):
+        with patch("utils.tracing.get_tracing_client", return_value=None):
+            assert (await _tool("q"))["sampled"] is True
+
+    @pytest.mark.asyncio
+    async def test_sampled_request_is_annotated(self):
+        client = MagicMock()
+        with (
+            patch("utils.tracing.get_tracing_client", return_value=client),
+            patch.dict(tracing.sample_rates, {"mcp": 1.0}),
+        ):
+            result = await _tool("q")
+
+        assert result["sampled"] is True
+        client.update_current_span.assert_called_once_with(metadata={"query": "q"})
+
+    @pytest.mark.asyncio
+    async def test_unsampled_request_records_no_spans(self):
+        client = MagicMock()
+        with (
+            patch("utils.tracing.get_tracing_client", return_value=client),
+            patch.dict(tracing.sample_rates, {"mcp": 0.0}),
+        ):
+            result = await _tool("q")
+
+        assert result == {"sampled": False, "otel_sampled": False}
+        client.update_current_span.assert_not_called()
+        assert tracing.is_sampled() is True  # Decision reset after the request
+
+    def test_streamlit_traced_by_default(self):
+        assert tracing.sample_rates["streamlit"] == 1.0
+
+
+_OVERHEAD_BENCH = """
+import asyncio
+import json
+
+from docling_mcp import metrics
+from utils import tracing
+
+metrics._initialize_metrics()
+
+
+@tracing.traced("bench", source="mcp")
+async def tool(query: str, limit: int = 5):
+    tracing.annotate({"tool_name": "bench", "query": query, "limit": limit})
+    return "result " * 100
+
+
+async def main():
+    for rate in (1.0, 0.0):
+        tracing.sample_rates["mcp"] = rate
+        for _ in range(300):
+            await tool("query")
+
+
+asyncio.run(main())
+means = {}
+for metric in metrics.rag_tracing_overhead_seconds.collect():
+    samples = {(s.name, s.labels["sampled"]): s.value for s in metric.samples}
+    for sampled in ("true", "false"):
+        count = samples[("rag_tracing_overhead_seconds_count", sampled)]
+        means[sampled] = samples[("rag_tracing_overhead_seconds_sum", sampled)] / count
+print(json.dumps(means))
+"""
+
+
+class TestOverhead:
+    """Test the tracing overhead budget with a real LangFuse client."""
+
+    def test_overhead_below_1ms(self):
+        env = {
+            "PATH": "",
+            "PYTHONPATH": str(PROJECT_ROOT),
+            "LANGFUSE_PUBLIC_KEY": "pk-lf-test",
+            "LANGFUSE_SECRET_KEY": "sk-lf-test",
+            # Nothing listens: export fails in the background, never in requests
+            "LANGFUSE_HOST": "http://127.0.0.1:9",
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", _OVERHEAD_BENCH],
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+
+        means = json.loads(result.stdout.strip().splitlines()[-1])
+        assert means["true"] < 0.001
+        assert means["false"] < 0.0001
+
+
+def _trace(*costs):
+    return SimpleNamespace(
+        observations=[SimpleNamespace(type="GENERATION", calculated_total_cost=c) for c in costs]
+        + [SimpleNamespace(type="SPAN", calculated_total_cost=None)]
+    )
+
+
+def _connection(rows):
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=rows)
+    conn.execute = AsyncMock(return_value="UPDATE 1")
+    conn.close = AsyncMock()
+    return conn
+
+
+class TestCostBackfill:
+    """Test the reconciliation of query costs with their traces."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_trace_cost(self):
+        from utils.session_manager import fetch_trace_cost
+
+        client = MagicMock()
+        client.async_api.trace.get = AsyncMock(return_value=_trace(0.001, 0.0005))
+        with patch("utils.session_manager.get_tracing_client", return_value=client):
+            assert await fetch_trace_cost("trace-1") == Decimal("0.0015")
+
+            client.async_api.trace.get.side_effect = RuntimeError("404 Not Found")
+            assert await fetch_trace_cost("trace-1") is None
+
+    @pytest.mark.asyncio
+    async def test_cost_written_to_log_and_session(self):
+        from utils.session_manager import reconcile_query_costs
+
+        session_id = uuid4()
+        conn = _connection(
+            [
+                {
+                    "id": 7,
+                    "session_id": session_id,
+                    "langfuse_trace_id": "t",
+                    "cost": 0,
+                    "expired": False,
+                }
+            ]
+        )
+        with (
+            patch("utils.session_manager._get_connection", AsyncMock(return_value=conn)),
+            patch(
+                "utils.session_manager.fetch_trace_cost", AsyncMock(return_value=Decimal("0.002"))
+            ),
+        ):
+            counts = await reconcile_query_costs(60, 3600)
+
+        assert counts == {"reconciled": 1, "expired": 0}
+        log_update, session_update = conn.execute.await_args_list
+        assert log_update.args[1:] == (7, 0.002)
+        assert "UPDATE sessions" in session_update.args[0]
+        assert session_update.args[1:] == (session_id, 0.002)
+        conn.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_row_reconciled_elsewhere_not_counted_twice(self):
+        from utils.session_manager import reconcile_query_costs
+
+        row = {
+            "id": 7,
+            "session_id": uuid4(),
+            "langfuse_trace_id": "t",
+            "cost": 0,
+            "expired": False,
+        }
+        conn = _connection([row])
+        conn.execute.return_value = "UPDATE 0"
+        with (
+            patch("utils.session_manager._get_connection", AsyncMock(return_value=conn)),
+            patch(
+                "utils.session_manager.fetch_trace_cost", AsyncMock(return_value=Decimal("0.002"))
+            ),
+        ):
+            counts = await reconcile_query_costs(60, 3600)
+
+        assert counts == {"reconciled": 0, "expired": 0}
+        assert conn.execute.await_count == 1  # No session update
+
+    @pytest.mark.asyncio
+    async def test_missing_trace_waits_then_expires(self):
+        from utils.session_manager import reconcile_query_costs
+
+        rows = [
+            {"id": 1, "session_id": uuid4(), "langfuse_trace_id": "a", "cost": 0, "expired": True},
+            {"id": 2, "session_id": uuid4(), "langfuse_trace_id": "b", "cost": 0, "expired": False},
+        ]
+        conn = _connection(rows)
+        with (
+            patch("utils.session_manager._get_connection", AsyncMock(return_value=conn)),
+            patch("utils.session_manager.fetch_trace_cost", AsyncMock(return_value=None)),
+        ):
+            counts = await reconcile_query_costs(60, 3600)
+
+        assert counts == {"reconciled": 0, "expired": 1}
+        conn.execute.assert_awaited_once()
+        assert conn.execute.await_args.args[1] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_backfill_without_langfuse(self):
+        from utils import cost_backfill
+
+        with (
+            patch("utils.cost_backfill.get_tracing_client", return_value=None),
+            patch("utils.cost_backfill.reconcile_query_costs") as reconcile,
+        ):
+            assert await cost_backfill.run_once() == {"reconciled": 0, "expired": 0}
+            assert cost_backfill.start_cost_backfill() is False
+
+        reconcile.assert_not_called()
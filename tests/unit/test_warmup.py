@@ -0,0 +1,185 @@
+"""
+Unit tests for the startup search warm-up (core/warmup.py)
+
+Tests:
+- Top queries from query_logs are embedded into the embedder cache
+- HNSW indexes are prewarmed (skipped without pg_prewarm)
+- Pooled connections are primed with concurrent searches
+- Failures and timeouts end warm-up without raising
+- Health reports not ready until warm-up has run, ready when it cannot run
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.warmup as warmup
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    warmup.reset_warmup()
+    with patch("docling_mcp.metrics.record_warmup"):
+        yield
+    warmup.reset_warmup()
+
+
+@pytest.fixture
+def conn():
+    """Patch the DB pool to yield a mock connection (pool min_size=2)."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(
+        side_effect=lambda sql, *args: (
+            [{"query_text": "deploy"}, {"query_text": "tracing"}, {"query_text": "costs"}]
+            if "query_logs" in sql
+            else [("idx_chunks_embedding_hnsw",)]
+        )
+    )
+    conn.fetchval = AsyncMock(side_effect=lambda sql, *args: True if "EXISTS" in sql else 42)
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    pool = MagicMock()
+    pool.get_min_size.return_value = 2
+    with (
+        patch("utils.db_utils.db_pool.acquire", acquire),
+        patch("utils.db_utils.db_pool.pool", pool),
+    ):
+        yield conn
+
+
+@pytest.fixture
+def embedder():
+    embedder = MagicMock()
+    embedder.embed_documents = AsyncMock(side_effect=lambda texts: [[0.1]] * len(texts))
+    return embedder
+
+
+class TestWarmUp:
+    """Test warm-up phases."""
+
+    @pytest.mark.asyncio
+    async def test_warms_cache_indexes_and_connections(self, conn, embedder):
+        search = AsyncMock(return_value=([], 1.0))
+        with patch("core.rag_service.search_with_embedding", search):
+            await warmup.warm_up(embedder)
+
+        assert embedder.embed_documents.await_args_list[0].args[0] == [
+            "deploy",
+            "tracing",
+            "costs",
+        ]
+        conn.fetchval.assert_any_await(
+            "SELECT pg_prewarm($1::regclass)", "idx_chunks_embedding_hnsw"
+        )
+        assert search.await_count == 2  # One search per pooled connection
+        status = warmup.get_warmup_status()
+        assert status["state"] == "done"
+        assert status["cached_queries"] == 3
+        assert status["prewarmed_blocks"] == 42
+        assert status["primed_connections"] == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_pg_prewarm_is_skipped(self, conn, embedder):
+        conn.fetchval.side_effect = lambda sql, *args: False
+
+        with patch("core.rag_service.search_with_embedding", AsyncMock(return_value=([], 1.0))):
+            await warmup.warm_up(embedder)
+
+        assert warmup.get_warmup_status()["state"] == "done"
+        assert warmup.get_warmup_status()["prewarmed_blocks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_ends_warmup_without_raising(self, conn, embedder):
+        embedder.embed_documents.side_effect = RuntimeError("provider down")
+
+        await warmup.warm_up(embedder)
+
+        assert warmup.get_warmup_status()["state"] == "failed"
+        assert not warmup.is_warming()
+
+    @pytest.mark.asyncio
+    async def test_timeout_ends_warmup(self, conn, embedder):
+        async def slow(texts):
+            await asyncio.sleep(5)
+
+        embedder.embed_documents.side_effect = slow
+
+        await warmup.warm_up(embedder, timeout=0.05)
+
+        assert warmup.get_warmup_status()["state"] == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, embedder):
+        with patch("core.warmup.WARMUP_ENABLED", False):
+            await warmup.warm_up(embedder)
+
+        assert warmup.get_warmup_status()["state"] == "disabled"
+        embedder.embed_documents.assert_not_called()
+
+
+class TestReadiness:
+    """Test health while warm-up runs."""
+
+    def test_check_warmup_down_while_running(self):
+        from docling_mcp.health import check_warmup
+
+        with patch("core.warmup._state", "running"):
+            assert check_warmup().status == "down"
+        with patch("core.warmup._state", "done"):
+            assert check_warmup().status == "up"
+
+    def test_not_ready_before_warm_up_starts(self):
+        from docling_mcp.health import check_warmup
+
+        assert warmup.get_warmup_status()["state"] == "pending"
+        assert warmup.is_warming()
+        assert check_warmup().status == "down"
+
+    def test_api_health_not_ready_while_warming(self):
+        from api.main import app
+
+        with (
+            patch("utils.db_utils.test_connection", AsyncMock(return_value=True)),
+            patch("core.warmup._state", "running"),
+        ):
+            response = TestClient(app).get("/health")
+
+        assert response.status_code == 503
+        assert response.json()["services"]["warmup"]["state"] == "running"
+
+    def test_disabled_warm_up_is_ready_without_running(self):
+        from docling_mcp.health import check_warmup
+
+        with patch("core.warmup.WARMUP_ENABLED", False):
+            assert not warmup.is_warming()
+            assert warmup.get_warmup_status()["state"] == "disabled"
+            assert check_warmup().status == "up"
+
+    @pytest.mark.asyncio
+    async def test_api_ready_when_embedder_fails_to_initialize(self):
+        import core.rag_service as rag_service
+        from api.main import app
+
+        with (
+            patch.object(rag_service, "_global_embedder", None),
+            patch.object(rag_service, "_initialization_task", None),
+            patch(
+                "core.rag_service._create_embedder_sync",
+                side_effect=RuntimeError("no API key"),
+            ),
+        ):
+            await rag_service.initialize_global_embedder()
+            await rag_service._initialization_task
+
+        assert warmup.get_warmup_status()["state"] == "failed"
+        with patch("utils.db_utils.test_connection", AsyncMock(return_value=True)):
+            response = TestClient(app).get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
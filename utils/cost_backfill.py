@@ -0,0 +1,131 @@
+"""
+Deferred query cost reconciliation.
+
+The cost of a Streamlit query is the cost of the LLM and embedding generations in
+its LangFuse trace. Reading it before logging the query meant flushing the trace
+and fetching it back from the LangFuse API on the request path, and LangFuse
+computes costs only after ingesting the trace, so the cost could still come back 0.
+
+Queries are logged with cost 0 and their trace id instead, and this job fills in
+the costs later (utils/session_manager.py::reconcile_query_costs): every
+COST_BACKFILL_INTERVAL seconds it reads the traces of queries older than
+COST_BACKFILL_DELAY seconds, writes query_logs.cost and adds it to the session's
+total_cost. Traces still missing after COST_BACKFILL_MAX_AGE seconds are given up.
+Reconciled rows are counted in rag_cost_backfill_total{outcome}.
+
+Runs in a daemon thread of the Streamlit server (start_cost_backfill, called once
+per process by app.py) or as a command, e.g. from cron:
+
+    uv run python -m utils.cost_backfill [--once]
+
+Requires sql/query-logs-cost-backfill.sql.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+import asyncpg
+from dotenv import load_dotenv
+
+from docling_mcp.metrics import record_cost_backfill
+from utils.session_manager import reconcile_query_costs
+from utils.tracing import get_tracing_client
+
+logger = logging.getLogger(__name__)
+
+COST_BACKFILL_INTERVAL = float(os.getenv("COST_BACKFILL_INTERVAL", "60"))
+COST_BACKFILL_DELAY = float(os.getenv("COST_BACKFILL_DELAY", "60"))
+COST_BACKFILL_MAX_AGE = float(os.getenv("COST_BACKFILL_MAX_AGE", "86400"))
+COST_BACKFILL_BATCH_SIZE = int(os.getenv("COST_BACKFILL_BATCH_SIZE", "100"))
+
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+
+
+async def run_once() -> Dict[str, int]:
+    """Reconcile every query cost that is due; returns the counts per outcome."""
+    if get_tracing_client() is None:
+        # Every trace would look missing and expire with cost 0
+        logger.warning("LangFuse not configured: query costs cannot be backfilled")
+        return {"reconciled": 0, "expired": 0}
+    counts = await reconcile_query_costs(
+        COST_BACKFILL_DELAY, COST_BACKFILL_MAX_AGE, COST_BACKFILL_BATCH_SIZE
+    )
+    for outcome, count in counts.items():
+        record_cost_backfill(outcome, count)
+    if any(counts.values()):
+        logger.info(f"Query costs backfilled: {counts}")
+    return counts
+
+
+async def run_forever(interval: float = COST_BACKFILL_INTERVAL) -> None:
+    """Reconcile query costs every `interval` seconds (stops if the schema is missing)."""
+    while True:
+        try:
+            await run_once()
+        except asyncpg.UndefinedColumnError:
+            logger.warning(
+                "query_logs.cost_reconciled_at missing: apply sql/query-logs-cost-backfill.sql. "
+                "Query costs will not be backfilled."
+            )
+            return
+        except Exception as e:
+            logger.warning(f"Query cost backfill failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def _run_in_thread(interval: float) -> None:
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run_forever(interval))
+    finally:
+        loop.close()
+
+
+def start_cost_backfill(interval: float = COST_BACKFILL_INTERVAL) -> bool:
+    """
+    Start the backfill in a daemon thread with its own event loop (once per process).
+
+    Returns:
+        True if the job runs, False without DATABASE_URL or a LangFuse client.
+    """
+    global _thread
+
+    if not os.getenv("DATABASE_URL") or get_tracing_client() is None:
+        logger.info("Query cost backfill disabled (needs DATABASE_URL and LangFuse)")
+        return False
+
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(
+                target=_run_in_thread, args=(interval,), name="cost-backfill", daemon=True
+            )
+            _thread.start()
+    return True
+
+
+def main():
+    """Main entry point."""
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Backfill query costs from LangFuse traces")
+    parser.add_argument("--once", action="store_true", help="Reconcile due costs and exit")
+    parser.add_argument("--interval", type=float, default=COST_BACKFILL_INTERVAL)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    if args.once:
+        counts = asyncio.run(run_once())
+        print(f"Reconciled: {counts['reconciled']}, expired: {counts['expired']}")
+    else:
+        asyncio.run(run_forever(args.interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,31 @@
 Database utilities for PostgreSQL connection and operations.
 """
 
+import asyncio
+import base64
 import json
 import logging
 import os
+import uuid
+import weakref
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 import asyncpg
 from asyncpg.pool import Pool
 from dotenv import load_dotenv
 
+from utils.metadata_filter import compile_metadata_filter
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+
 
 class DatabasePool:
     """Manages PostgreSQL connection pool."""
@@ -46,10 +56,11 @@ class DatabasePool:
             # - max_queries=50000: Connection recycling threshold
             # - statement_cache_size=100: Enable prepared statements (was 0)
             #   Note: Set to 0 only if using PgBouncer in transaction mode
+            # Per process: API workers (api/serve.py) each open their own pool
             self.pool = await asyncpg.create_pool(
                 self.database_url,
-                min_size=2,  # Reduced from 5 (lower idle overhead)
-                max_size=10,  # Reduced from 20 (sufficient for MCP workload)
+                min_size=DB_POOL_MIN_SIZE,  # Reduced from 5 (lower idle overhead)
+                max_size=DB_POOL_MAX_SIZE,  # Reduced from 20 (sufficient for MCP workload)
                 max_inactive_connection_lifetime=300,
                 command_timeout=60,
                 max_queries=50000,  # Recycle connections periodically
@@ -57,7 +68,8 @@ class DatabasePool:
                 # Set to 0 if using PgBouncer in transaction pooling mode
             )
             logger.info(
-                "✓ Database connection pool initialized (min=2, max=10, statement_cache=100)"
+                f"✓ Database connection pool initialized (min={DB_POOL_MIN_SIZE}, "
+                f"max={DB_POOL_MAX_SIZE}, statement_cache=100)"
             )
 
     async def close(self):
@@ -67,6 +79,33 @@ class DatabasePool:
             self.pool = None
             logger.info("Database connection pool closed")
 
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """
+        Check the database through the pool (same event loop only).
+
+        Returns:
+            True if a pooled connection answered within timeout
+        """
+        if not self.pool:
+            return False
+        try:
+            async with self.pool.acquire(timeout=timeout) as conn:
+                await conn.fetchval("SELECT 1", timeout=timeout)
+            return True
+        except Exception as e:
+            logger.error(f"Database pool check failed: {e}")
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        """Open, idle and maximum connections of the pool."""
+        if not self.pool:
+            return {"size": 0, "idle": 0, "max": 0}
+        return {
+            "size": self.pool.get_size(),
+            "idle": self.pool.get_idle_size(),
+            "max": self.pool.get_max_size(),
+        }
+
     @asynccontextmanager
     async def acquire(self):
         """Acquire a connection from the pool."""
@@ -133,66 +172,497 @@ async def get_document(document_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+# Upper bounds for partial reads: keep follow-up fetches bounded
+MAX_CHUNK_RANGE = 50
+MAX_CHUNK_WINDOW = 10
+MAX_BATCH_DOCUMENTS = 100
+
+
+def _chunk_to_dict(row) -> Dict[str, Any]:
+    return {
+        "chunk_id": row["chunk_id"],
+        "chunk_index": row["chunk_index"],
+        "content": row["content"],
+        "token_count": row["token_count"],
+    }
+
+
+async def get_document_chunks(
+    document_id: str, start_index: int = 0, end_index: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Get a range of a document's chunks instead of its full content.
+
+    Args:
+        document_id: Document UUID
+        start_index: First chunk_index (inclusive)
+        end_index: Last chunk_index (inclusive). Defaults to start_index + MAX_CHUNK_RANGE - 1
+
+    Returns:
+        Document header (id, title, source, chunk_count) with the chunks in
+        order, or None if the document does not exist
+
+    Raises:
+        ValueError: If the range is invalid or wider than MAX_CHUNK_RANGE
+    """
+    if end_index is None:
+        end_index = start_index + MAX_CHUNK_RANGE - 1
+    if start_index < 0 or end_index < start_index:
+        raise ValueError(f"Invalid chunk range: {start_index}..{end_index}")
+    if end_index - start_index + 1 > MAX_CHUNK_RANGE:
+        raise ValueError(f"Chunk range too wide (max {MAX_CHUNK_RANGE} chunks)")
+
+    async with db_pool.acquire() as conn:
+        doc = await conn.fetchrow(
+            "SELECT id::text, title, source, chunk_count FROM documents WHERE id = $1::uuid",
+            document_id,
+        )
+        if doc is None:
+            return None
+
+        # Served by idx_chunks_chunk_index (document_id, chunk_index)
+        rows = await conn.fetch(
+            """
+            SELECT id::text AS chunk_id, chunk_index, content, token_count
+            FROM chunks
+            WHERE document_id = $1::uuid AND chunk_index BETWEEN $2 AND $3
+            ORDER BY chunk_index
+            """,
+            document_id,
+            start_index,
+            end_index,
+        )
+
+    return {**dict(doc), "chunks": [_chunk_to_dict(row) for row in rows]}
+
+
+async def get_document_text_range(
+    document_id: str, start: int = 0, end: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Get a character range of a document's content.
+
+    Args:
+        document_id: Document UUID
+        start: First character offset (inclusive, 0-based)
+        end: Last character offset (exclusive). Defaults to the end of the document
+
+    Returns:
+        Document header with content (the slice), start, end and total_length,
+        or None if the document does not exist
+
+    Raises:
+        ValueError: If the range is invalid
+    """
+    if start < 0 or (end is not None and end < start):
+        raise ValueError(f"Invalid character range: {start}..{end}")
+
+    async with db_pool.acquire() as conn:
+        # substr() runs in the database: only the slice crosses the wire
+        row = await conn.fetchrow(
+            """
+            SELECT
+                id::text,
+                title,
+                source,
+                length(content) AS total_length,
+                CASE WHEN $3::int IS NULL THEN substr(content, $2 + 1)
+                     ELSE substr(content, $2 + 1, $3 - $2) END AS content
+            FROM documents
+            WHERE id = $1::uuid
+            """,
+            document_id,
+            start,
+            end,
+        )
+
+    if row is None:
+        return None
+
+    total_length = row["total_length"]
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "source": row["source"],
+        "content": row["content"],
+        "start": min(start, total_length),
+        "end": min(end if end is not None else total_length, total_length),
+        "total_length": total_length,
+    }
+
+
+async def get_chunk_neighbors(chunk_id: str, window: int = 2) -> Optional[Dict[str, Any]]:
+    """
+    Get a chunk with its `window` previous and next chunks from the same document.
+
+    Args:
+        chunk_id: Chunk UUID (as returned by search results)
+        window: Number of chunks on each side
+
+    Returns:
+        Document header with center_index and the chunks in order,
+        or None if the chunk does not exist
+
+    Raises:
+        ValueError: If window is negative or larger than MAX_CHUNK_WINDOW
+    """
+    if window < 0 or window > MAX_CHUNK_WINDOW:
+        raise ValueError(f"window must be between 0 and {MAX_CHUNK_WINDOW}")
+
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            WITH target AS (
+                SELECT document_id, chunk_index FROM chunks WHERE id = $1::uuid
+            )
+            SELECT
+                c.id::text AS chunk_id,
+                c.chunk_index,
+                c.content,
+                c.token_count,
+                t.chunk_index AS center_index,
+                d.id::text AS document_id,
+                d.title,
+                d.source,
+                d.chunk_count
+            FROM target t
+            JOIN chunks c
+              ON c.document_id = t.document_id
+             AND c.chunk_index BETWEEN t.chunk_index - $2 AND t.chunk_index + $2
+            JOIN documents d ON d.id = t.document_id
+            ORDER BY c.chunk_index
+            """,
+            chunk_id,
+            window,
+        )
+
+    if not rows:
+        return None
+
+    first = rows[0]
+    return {
+        "id": first["document_id"],
+        "title": first["title"],
+        "source": first["source"],
+        "chunk_count": first["chunk_count"],
+        "center_index": first["center_index"],
+        "chunks": [_chunk_to_dict(row) for row in rows],
+    }
+
+
+async def get_documents_by_ids(
+    document_ids: List[str], include_content: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Get several documents in one query.
+
+    Args:
+        document_ids: Document UUIDs (at most MAX_BATCH_DOCUMENTS)
+        include_content: Also return the full content of each document
+
+    Returns:
+        Found documents, in the order requested (missing IDs are skipped)
+
+    Raises:
+        ValueError: If an ID is not a UUID or more than MAX_BATCH_DOCUMENTS are requested
+    """
+    if len(document_ids) > MAX_BATCH_DOCUMENTS:
+        raise ValueError(f"Too many document IDs (max {MAX_BATCH_DOCUMENTS})")
+    if not document_ids:
+        return []
+    try:
+        # Canonical form, to match id::text and drop duplicates
+        document_ids = list(dict.fromkeys(str(uuid.UUID(doc_id)) for doc_id in document_ids))
+    except ValueError as e:
+        raise ValueError(f"Invalid document ID in {document_ids!r}") from e
+
+    content_column = ", content" if include_content else ""
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch(
+            f"""
+            SELECT id::text, title, source, metadata, chunk_count, token_count,
+                   created_at, updated_at{content_column}
+            FROM documents
+            WHERE id = ANY($1::uuid[])
+            """,
+            document_ids,
+        )
+
+    by_id = {}
+    for row in rows:
+        doc = {
+            "id": row["id"],
+            "title": row["title"],
+            "source": row["source"],
+            "metadata": json.loads(row["metadata"]),
+            "chunk_count": row["chunk_count"],
+            "token_count": row["token_count"],
+            "created_at": row["created_at"].isoformat(),
+            "updated_at": row["updated_at"].isoformat(),
+        }
+        if include_content:
+            doc["content"] = row["content"]
+        by_id[doc["id"]] = doc
+    return [by_id[doc_id] for doc_id in document_ids if doc_id in by_id]
+
+
+def encode_document_cursor(created_at: str, document_id: str) -> str:
+    """
+    Encode a keyset pagination cursor for list_documents.
+
+    Args:
+        created_at: ISO timestamp of the last document on the page
+        document_id: ID of the last document on the page
+
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    payload = json.dumps({"created_at": created_at, "id": document_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_document_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_document_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload["created_at"])
+        document_id = str(uuid.UUID(payload["id"]))
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return created_at, document_id
+
+
 async def list_documents(
-    limit: int = 100, offset: int = 0, metadata_filter: Optional[Dict[str, Any]] = None
+    limit: int = 100,
+    offset: int = 0,
+    metadata_filter: Optional[Dict[str, Any]] = None,
+    cursor: Optional[str] = None,
+    include_metadata: bool = True,
 ) -> List[Dict[str, Any]]:
     """
-    List documents with optional filtering.
+    List documents with optional filtering, newest first.
 
     Args:
         limit: Maximum number of documents to return
-        offset: Number of documents to skip
-        metadata_filter: Optional metadata filter
+        offset: Number of documents to skip (ignored when cursor is given).
+            Cost grows with the offset; prefer cursor for deep pages.
+        metadata_filter: Optional metadata filter (see utils/metadata_filter.py)
+        cursor: Keyset cursor from a previous page (see list_documents_page)
+        include_metadata: Fetch and parse the metadata JSON for each document
 
     Returns:
         List of documents
+
+    Raises:
+        ValueError: If the cursor or the metadata filter is malformed
     """
+    # chunk_count is maintained on documents by the ingestion pipeline (no join)
+    columns = [
+        "d.id::text",
+        "d.title",
+        "d.source",
+        "d.created_at",
+        "d.updated_at",
+        "d.chunk_count",
+        "d.token_count",
+    ]
+    if include_metadata:
+        columns.append("d.metadata")
+
+    params: list[Any] = []
+    conditions = []
+
+    if metadata_filter:
+        conditions.extend(compile_metadata_filter(metadata_filter, params))
+
+    if cursor:
+        # Keyset on (created_at, id): served by idx_documents_created_at_id at any depth
+        created_at, document_id = decode_document_cursor(cursor)
+        params.extend([created_at, document_id])
+        conditions.append(f"(d.created_at, d.id) < (${len(params) - 1}, ${len(params)}::uuid)")
+        offset = 0
+
+    query = f"SELECT {', '.join(columns)} FROM documents d"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+
+    params.extend([limit, offset])
+    query += (
+        f" ORDER BY d.created_at DESC, d.id DESC LIMIT ${len(params) - 1} OFFSET ${len(params)}"
+    )
+
     async with db_pool.acquire() as conn:
-        query = """
-            SELECT 
-                d.id::text,
-                d.title,
-                d.source,
-                d.metadata,
-                d.created_at,
-                d.updated_at,
-                COUNT(c.id) AS chunk_count
-            FROM documents d
-            LEFT JOIN chunks c ON d.id = c.document_id
-        """
+        results = await conn.fetch(query, *params)
 
-        params: list[str | int] = []
-        conditions = []
+    documents = []
+    for row in results:
+        doc = {
+            "id": row["id"],
+            "title": row["title"],
+            "source": row["source"],
+            "created_at": row["created_at"].isoformat(),
+            "updated_at": row["updated_at"].isoformat(),
+            "chunk_count": row["chunk_count"],
+            "token_count": row["token_count"],
+        }
+        if include_metadata:
+            doc["metadata"] = json.loads(row["metadata"])
+        documents.append(doc)
+    return documents
+
+
+async def list_documents_page(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    metadata_filter: Optional[Dict[str, Any]] = None,
+    include_metadata: bool = False,
+) -> Dict[str, Any]:
+    """
+    List one page of documents with keyset pagination.
 
-        if metadata_filter:
-            conditions.append(f"d.metadata @> ${len(params) + 1}::jsonb")
-            params.append(json.dumps(metadata_filter))
+    Every page costs the same regardless of depth: pass the returned
+    next_cursor back to fetch the following page.
 
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
+    Returns:
+        Dict with documents and next_cursor (None on the last page)
 
-        query += """
-            GROUP BY d.id, d.title, d.source, d.metadata, d.created_at, d.updated_at
-            ORDER BY d.created_at DESC
-            LIMIT $%d OFFSET $%d
-        """ % (len(params) + 1, len(params) + 2)
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    # One extra row tells whether another page exists
+    docs = await list_documents(
+        limit=limit + 1,
+        metadata_filter=metadata_filter,
+        cursor=cursor,
+        include_metadata=include_metadata,
+    )
 
-        params.extend([limit, offset])
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_document_cursor(docs[-1]["created_at"], docs[-1]["id"])
+    return {"documents": docs, "next_cursor": next_cursor}
 
-        results = await conn.fetch(query, *params)
 
-        return [
+def source_root(source: str) -> str:
+    """Top-level source of a document path (e.g. 'langfuse-docs/api.md' -> 'langfuse-docs')."""
+    return source.split("/")[0] if "/" in source else source
+
+
+# Document metadata key (e.g. from frontmatter) naming a document's collection;
+# unset, or missing on a document: the collection is the top-level source
+CHUNK_COLLECTION_KEY = os.getenv("CHUNK_COLLECTION_KEY", "")
+
+
+def document_collection(source: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Collection of a document: the partition key of its chunks (sql/chunk-collections.sql).
+    """
+    if CHUNK_COLLECTION_KEY and metadata:
+        value = metadata.get(CHUNK_COLLECTION_KEY)
+        if value not in (None, ""):
+            return str(value)
+    return source_root(source)
+
+
+async def ensure_chunk_partition(conn, collection: str, table: str = "chunks") -> Optional[str]:
+    """
+    Create the chunk partition of a collection if the table is partitioned
+    (sql/partition-chunks.sql); no-op on a plain table. The function is installed
+    by sql/chunk-collections.sql.
+
+    Run outside the transaction that writes the chunks: creating a partition
+    briefly locks the parent table.
+
+    Returns:
+        Partition name, or None if the table is not partitioned
+    """
+    return await conn.fetchval("SELECT ensure_chunk_partition($1, $2)", collection, table)
+
+
+async def update_source_stats(
+    conn, source: str, document_delta: int, chunk_delta: int, token_delta: int
+) -> None:
+    """
+    Apply deltas to the per-source rollup (source_stats).
+
+    Must be called on the connection/transaction that modifies the documents,
+    so the rollup stays consistent with documents.chunk_count/token_count.
+    """
+    await conn.execute(
+        """
+        INSERT INTO source_stats (source, document_count, chunk_count, token_count)
+        VALUES ($1, $2, $3, $4)
+        ON CONFLICT (source) DO UPDATE SET
+            document_count = source_stats.document_count + EXCLUDED.document_count,
+            chunk_count = source_stats.chunk_count + EXCLUDED.chunk_count,
+            token_count = source_stats.token_count + EXCLUDED.token_count,
+            updated_at = NOW()
+        """,
+        source_root(source),
+        document_delta,
+        chunk_delta,
+        token_delta,
+    )
+
+
+async def get_knowledge_base_stats(recent_limit: int = 20) -> Dict[str, Any]:
+    """
+    Get knowledge base statistics from the maintained rollups.
+
+    Reads the per-source rollup and the most recent documents only: cost does not
+    grow with the number of documents or chunks.
+
+    Args:
+        recent_limit: Number of most recent documents to include
+
+    Returns:
+        Dict with total_documents, total_chunks, total_tokens, sources
+        (per-source counts) and recent_documents
+    """
+    async with db_pool.acquire() as conn:
+        source_rows = await conn.fetch(
+            """
+            SELECT source, document_count, chunk_count, token_count
+            FROM source_stats
+            WHERE document_count > 0
+            ORDER BY source
+            """
+        )
+        recent_rows = await conn.fetch(
+            """
+            SELECT id::text, title, source, chunk_count, token_count, updated_at
+            FROM documents
+            ORDER BY created_at DESC
+            LIMIT $1
+            """,
+            recent_limit,
+        )
+
+    sources = [dict(row) for row in source_rows]
+    return {
+        "total_documents": sum(s["document_count"] for s in sources),
+        "total_chunks": sum(s["chunk_count"] for s in sources),
+        "total_tokens": sum(s["token_count"] for s in sources),
+        "sources": sources,
+        "recent_documents": [
             {
                 "id": row["id"],
                 "title": row["title"],
                 "source": row["source"],
-                "metadata": json.loads(row["metadata"]),
-                "created_at": row["created_at"].isoformat(),
-                "updated_at": row["updated_at"].isoformat(),
                 "chunk_count": row["chunk_count"],
+                "token_count": row["token_count"],
+                "updated_at": row["updated_at"].isoformat(),
             }
-            for row in results
-        ]
+            for row in recent_rows
+        ],
+    }
 
 
 # Utility Functions
@@ -212,29 +682,59 @@ async def execute_query(query: str, *params) -> List[Dict[str, Any]]:
         return [dict(row) for row in results]
 
 
+# Health check connections, one per event loop (the MCP observability server runs
+# its own loop in a thread and must not share the search pool)
+_health_connections: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncpg.Connection]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _health_connection(database_url: str) -> asyncpg.Connection:
+    loop = asyncio.get_running_loop()
+    conn = _health_connections.get(loop)
+    if conn is None or conn.is_closed():
+        conn = await asyncpg.connect(database_url, timeout=5)
+        _health_connections[loop] = conn
+    return conn
+
+
 async def test_connection() -> bool:
     """
     Test database connection using a dedicated connection (not the shared pool).
 
-    This avoids race conditions when health check runs from a different thread
-    than the MCP server.
+    The connection is long-lived (one per event loop) so frequent probes do not
+    pay a connect + TLS handshake each time; a broken connection is replaced
+    once before reporting failure. Not sharing the pool avoids race conditions
+    when the health check runs from a different thread than the MCP server, and
+    keeps probes answering while searches hold every pooled connection.
 
     Returns:
         True if connection successful, False otherwise
     """
-    try:
-        database_url = os.getenv("DATABASE_URL")
-        if not database_url:
-            logger.debug("DATABASE_URL not set")
-            return False
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        logger.debug("DATABASE_URL not set")
+        return False
 
-        # Create a dedicated connection for health check (thread-safe)
-        conn = await asyncpg.connect(database_url, timeout=5)
+    while True:
+        reused = asyncio.get_running_loop() in _health_connections
         try:
-            await conn.fetchval("SELECT 1")
+            conn = await _health_connection(database_url)
+            await conn.fetchval("SELECT 1", timeout=5)
             return True
-        finally:
-            await conn.close()
-    except Exception as e:
-        logger.error(f"Database connection test failed: {e}")
-        return False
+        except Exception as e:
+            await close_health_connection()
+            if not reused:
+                logger.error(f"Database connection test failed: {e}")
+                return False
+            # The kept connection went stale (server restart, idle timeout): reconnect
+
+
+async def close_health_connection() -> None:
+    """Close the health check connection of the running event loop."""
+    conn = _health_connections.pop(asyncio.get_running_loop(), None)
+    if conn is not None and not conn.is_closed():
+        try:
+            await asyncio.wait_for(conn.close(), timeout=2)
+        except Exception:
+            conn.terminate()
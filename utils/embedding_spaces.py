@@ -0,0 +1,72 @@
+"""
+Versioned embedding spaces (sql/embedding-spaces-schema.sql).
+
+The primary space is chunks.embedding, produced by EMBEDDING_MODEL at ingestion.
+Additional spaces (e.g. a newer model) live in chunk_embeddings, one row per
+(space, chunk), and are filled by the background backfill
+(python -m ingestion.embedding_backfill). Search picks a space per request or
+per deployment (SEARCH_EMBEDDING_SPACE); a space is searchable once "ready".
+
+Each space has a partial HNSW index on its rows. pgvector indexes need a fixed
+dimension, so the index (and the search) use an expression cast to the space's
+dimensions; spaces above 2000 dimensions (the HNSW limit for vector) are indexed
+as halfvec.
+"""
+
+import re
+from typing import Any, Dict
+
+PRIMARY_EMBEDDING_SPACE = "primary"
+SPACE_STATUSES = ("backfilling", "ready", "retired")
+
+# pgvector HNSW limit for vector; larger spaces are indexed as halfvec (up to 4000)
+MAX_VECTOR_INDEX_DIMENSIONS = 2000
+
+_SPACE_NAME = re.compile(r"^[a-z][a-z0-9_]{0,39}$")
+
+
+class EmbeddingSpaceError(ValueError):
+    """Raised for unknown, invalid or not yet searchable embedding spaces."""
+
+
+def validate_space_name(name: str) -> str:
+    """
+    Validate a space name. Names are inlined in SQL (partial index predicates
+    must match literally), so only lowercase identifiers are allowed.
+
+    Raises:
+        EmbeddingSpaceError: If the name is invalid
+    """
+    if not isinstance(name, str) or not _SPACE_NAME.match(name):
+        raise EmbeddingSpaceError(
+            f"Invalid embedding space name: {name!r} (lowercase letters, digits, underscores)"
+        )
+    return name
+
+
+def space_index_name(name: str) -> str:
+    """Name of the partial HNSW index of a space."""
+    return f"idx_chunk_embeddings_{validate_space_name(name)}_hnsw"
+
+
+def space_vector_type(space: Dict[str, Any]) -> str:
+    """Fixed-dimension pgvector type a space is indexed and searched as."""
+    dimensions = int(space["dimensions"])
+    base = "halfvec" if dimensions > MAX_VECTOR_INDEX_DIMENSIONS else "vector"
+    return f"{base}({dimensions})"
+
+
+def space_operator_class(space: Dict[str, Any]) -> str:
+    """HNSW operator class (cosine distance) of a space's index."""
+    return space_vector_type(space).split("(")[0] + "_cosine_ops"
+
+
+def space_vector_expression(space: Dict[str, Any], alias: str | None = "ce") -> str:
+    """SQL expression of a space's vectors, matching its partial index (alias=None)."""
+    column = f"{alias}.embedding" if alias else "embedding"
+    return f"({column}::{space_vector_type(space)})"
+
+
+def space_predicate(space: Dict[str, Any], alias: str = "ce") -> str:
+    """SQL predicate selecting a space's rows, matching its partial index."""
+    return f"{alias}.space = '{validate_space_name(space['name'])}'"
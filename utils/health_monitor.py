@@ -0,0 +1,112 @@
+"""
+Background health monitor.
+
+Kubernetes and Prometheus probe /health every few seconds; running dependency
+checks on each probe adds DB round-trips and latency to every call. A
+HealthMonitor runs the check every HEALTH_CHECK_INTERVAL seconds in the event
+loop that serves the endpoints (a task started by the app lifespan) and probes
+read the cached result:
+
+- "checked_at" / "age_seconds": when the cached result was computed
+- "stale": the result is older than HEALTH_STALE_AFTER seconds (the monitor is
+  stuck or dead); a stale result counts as "down"
+
+Liveness (is the process serving requests) and readiness (are dependencies up,
+is warm-up done) are answered separately: see is_ready().
+
+When the monitor is not running (no lifespan: tests, scripts), get() checks inline.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "10"))
+HEALTH_STALE_AFTER = float(os.getenv("HEALTH_STALE_AFTER", "30"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "8"))
+
+
+class HealthMonitor:
+    """Runs a health check on an interval and serves the cached result."""
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[Dict[str, Any]]],
+        interval: float = HEALTH_CHECK_INTERVAL,
+        stale_after: float = HEALTH_STALE_AFTER,
+        timeout: float = HEALTH_CHECK_TIMEOUT,
+    ):
+        """
+        Args:
+            check: Coroutine function returning the health dict ("status" key:
+                "ok", "degraded" or "down")
+            interval: Seconds between checks
+            stale_after: Age after which the cached result counts as "down"
+            timeout: Seconds before a check counts as "down"
+        """
+        self.check = check
+        self.interval = interval
+        self.stale_after = stale_after
+        self.timeout = timeout
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Run the check now and cache its result."""
+        try:
+            result = await asyncio.wait_for(self.check(), self.timeout)
+        except Exception as e:
+            logger.error(f"Health check failed: {e}")
+            result = {"status": "down", "timestamp": time.time(), "error": str(e)}
+        self._result = result
+        self._checked_at = time.time()
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start checking in the background (call from the serving event loop)."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get(self) -> Dict[str, Any]:
+        """Cached result with its age; checks inline when the monitor is not running."""
+        if not self.running or self._result is None:
+            await self.refresh()
+        age = time.time() - self._checked_at
+        stale = self.running and age > self.stale_after
+        result = {
+            **self._result,
+            "checked_at": self._checked_at,
+            "age_seconds": round(age, 3),
+            "stale": stale,
+        }
+        if stale:
+            result["status"] = "down"
+        return result
+
+
+def is_ready(result: Dict[str, Any]) -> bool:
+    """Whether a health result means the service can take traffic."""
+    return result.get("status") in ("ok", "degraded") and not result.get("stale", False)
@@ -16,6 +16,8 @@ from contextlib import contextmanager
 from typing import Generator, Optional
 from uuid import UUID
 
+from utils.tracing import head_sample
+
 logger = logging.getLogger(__name__)
 
 # Module-level state for LangFuse availability
@@ -96,7 +98,8 @@ def with_streamlit_context(
     to all nested spans (embedding-generation, vector-search, llm-generation).
 
     Implements graceful degradation: if LangFuse is unavailable, the context
-    manager yields an empty context and continues without tracing.
+    manager yields an empty context and continues without tracing. So does a
+    query sampled out by TRACE_SAMPLE_RATE_STREAMLIT (utils/tracing.py).
 
     Args:
         session_id: UUID v4 session identifier from Streamlit session state.
@@ -109,8 +112,8 @@ def with_streamlit_context(
     Example:
         with with_streamlit_context(session_id, query) as ctx:
             response = await run_agent(query)
-            if ctx.trace_id:
-                cost = await extract_cost_from_langfuse(ctx.trace_id)
+        # ctx.trace_id is logged with the query; utils/cost_backfill.py reads
+        # the cost from the trace once LangFuse has ingested it
 
     AC3.2.1: Creates trace with name `streamlit_query` and metadata
     AC3.2.2: Propagates session_id to all nested spans
@@ -128,6 +131,20 @@ def with_streamlit_context(
         yield ctx
         return
 
+    # Head sampling (TRACE_SAMPLE_RATE_STREAMLIT): queries sampled out get no trace
+    with head_sample("streamlit") as sampled:
+        if not sampled:
+            yield ctx
+            return
+        with _streamlit_trace(ctx, session_id, query):
+            yield ctx
+
+
+@contextmanager
+def _streamlit_trace(
+    ctx: StreamlitTraceContext, session_id: UUID, query: str
+) -> Generator[StreamlitTraceContext, None, None]:
+    """Root span `streamlit_query` of a sampled query (see with_streamlit_context)."""
     # Try to initialize LangFuse tracing
     try:
         from langfuse import get_client, propagate_attributes
@@ -178,8 +195,8 @@ def flush_langfuse() -> None:
     """
     Flush pending LangFuse observations.
 
-    Should be called after query execution to ensure trace data is sent
-    before cost extraction.
+    Blocks until the batch is exported: for scripts and shutdown only. Queries
+    leave export to the background thread of the SDK (utils/tracing.py).
     """
     if not is_langfuse_available():
         return
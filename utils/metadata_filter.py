@@ -0,0 +1,124 @@
+"""
+Structured metadata filters compiled to SQL over documents.metadata (JSONB).
+
+Filter syntax (all conditions are ANDed):
+
+    {"version": "2.1"}                          equality (containment, GIN index)
+    {"tags": ["rag"]}                           array contains all values (GIN index)
+    {"frontmatter.version": "2.1"}              dotted keys address nested objects
+    {"version": {"$gte": "2.0", "$lt": "3.0"}}  ranges: $gt, $gte, $lt, $lte
+    {"lang": {"$in": ["it", "en"]}}             any of
+    {"draft": {"$ne": True}}                    not equal (also matches missing keys)
+
+Numeric bounds compare numerically (non-numeric values never match), string
+bounds compare as text (ISO dates and zero-padded versions sort correctly).
+"""
+
+import json
+import re
+from decimal import Decimal
+from typing import Any, Dict, List
+
+_KEY = re.compile(r"^[A-Za-z0-9_\-]+(\.[A-Za-z0-9_\-]+)*$")
+_RANGE_OPERATORS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+_OPERATORS = {"$eq", "$ne", "$in", *_RANGE_OPERATORS}
+
+
+class MetadataFilterError(ValueError):
+    """Raised when a metadata filter is malformed."""
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _set_path(target: Dict[str, Any], path: List[str], value: Any) -> None:
+    for part in path[:-1]:
+        node = target.setdefault(part, {})
+        if not isinstance(node, dict):
+            raise MetadataFilterError(f"Conflicting filters on '{'.'.join(path)}'")
+        target = node
+    if path[-1] in target:
+        raise MetadataFilterError(f"Conflicting filters on '{'.'.join(path)}'")
+    target[path[-1]] = value
+
+
+def compile_metadata_filter(
+    metadata_filter: Dict[str, Any], params: List[Any], column: str = "d.metadata"
+) -> List[str]:
+    """
+    Compile a metadata filter into SQL conditions.
+
+    Args:
+        metadata_filter: Filter (see module docstring)
+        params: Query parameters; values are appended, placeholders continue from its length
+        column: JSONB column to filter
+
+    Returns:
+        List of SQL conditions to AND into the WHERE clause
+
+    Raises:
+        MetadataFilterError: If the filter is malformed
+    """
+    if not isinstance(metadata_filter, dict):
+        raise MetadataFilterError("Metadata filter must be an object")
+
+    containment: Dict[str, Any] = {}
+    conditions: List[str] = []
+
+    def placeholder(value: Any, cast: str = "") -> str:
+        params.append(value)
+        return f"${len(params)}{cast}"
+
+    for key, value in metadata_filter.items():
+        if not isinstance(key, str) or not _KEY.match(key):
+            raise MetadataFilterError(f"Invalid metadata key: {key!r}")
+        path = key.split(".")
+
+        is_operator_dict = (
+            isinstance(value, dict) and value and all(str(k).startswith("$") for k in value)
+        )
+        if not is_operator_dict:
+            # Equality/containment on nested objects and arrays
+            _set_path(containment, path, value)
+            continue
+
+        for op, operand in value.items():
+            if op not in _OPERATORS:
+                raise MetadataFilterError(f"Unsupported operator {op!r} on '{key}'")
+
+            if op == "$eq":
+                _set_path(containment, path, operand)
+            elif op == "$ne":
+                conditions.append(
+                    f"({column} #> {placeholder(path, '::text[]')}) IS DISTINCT FROM "
+                    f"{placeholder(json.dumps(operand), '::jsonb')}"
+                )
+            elif op == "$in":
+                if not isinstance(operand, list) or not operand:
+                    raise MetadataFilterError(f"$in on '{key}' needs a non-empty list")
+                if not all(_is_scalar(v) for v in operand):
+                    raise MetadataFilterError(f"$in on '{key}' only accepts scalar values")
+                conditions.append(
+                    f"({column} #> {placeholder(path, '::text[]')}) = "
+                    f"ANY({placeholder([json.dumps(v) for v in operand], '::jsonb[]')})"
+                )
+            else:
+                sql_op = _RANGE_OPERATORS[op]
+                if isinstance(operand, bool) or not isinstance(operand, (str, int, float)):
+                    raise MetadataFilterError(f"{op} on '{key}' needs a number or string")
+                path_ref = placeholder(path, "::text[]")
+                if isinstance(operand, str):
+                    conditions.append(f"({column} #>> {path_ref}) {sql_op} {placeholder(operand)}")
+                else:
+                    # CASE guards the cast: non-numeric values never match
+                    conditions.append(
+                        f"(CASE WHEN jsonb_typeof({column} #> {path_ref}) = 'number' "
+                        f"THEN ({column} #>> {path_ref})::numeric END) "
+                        f"{sql_op} {placeholder(Decimal(str(operand)), '::numeric')}"
+                    )
+
+    if containment:
+        conditions.insert(0, f"{column} @> {placeholder(json.dumps(containment), '::jsonb')}")
+
+    return conditions
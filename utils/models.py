@@ -210,6 +210,7 @@ class IngestionResult(BaseModel):
     document_id: str
     title: str
     chunks_created: int
+    tokens_processed: int = 0
     processing_time_ms: float
     errors: List[str] = Field(default_factory=list)
 
@@ -4,12 +4,13 @@ Simplified provider configuration for OpenAI models only.
 
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import openai
 from dotenv import load_dotenv
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
+
+if TYPE_CHECKING:
+    import openai
+    from pydantic_ai.models.openai import OpenAIModel
 
 # Load environment variables
 load_dotenv()
@@ -35,7 +36,7 @@ def get_provider_config() -> ProviderConfig:
     )
 
 
-def get_llm_model() -> OpenAIModel:
+def get_llm_model() -> "OpenAIModel":
     """
     Get LLM model configuration for OpenAI.
 
@@ -48,10 +49,14 @@ def get_llm_model() -> OpenAIModel:
     if not api_key:
         raise ValueError("OPENAI_API_KEY environment variable is required")
 
+    # Imported lazily: search-serving processes only need get_provider_config()
+    from pydantic_ai.models.openai import OpenAIModel
+    from pydantic_ai.providers.openai import OpenAIProvider
+
     return OpenAIModel(llm_choice, provider=OpenAIProvider(api_key=api_key))
 
 
-def get_embedding_client() -> openai.AsyncOpenAI:
+def get_embedding_client() -> "openai.AsyncOpenAI":
     """
     Get OpenAI client for embeddings.
 
@@ -63,6 +68,8 @@ def get_embedding_client() -> openai.AsyncOpenAI:
     if not api_key:
         raise ValueError("OPENAI_API_KEY environment variable is required")
 
+    import openai
+
     return openai.AsyncOpenAI(api_key=api_key)
 
 
@@ -76,7 +83,7 @@ def get_embedding_model() -> str:
     return os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
 
 
-def get_ingestion_model() -> OpenAIModel:
+def get_ingestion_model() -> "OpenAIModel":
     """
     Get model for ingestion tasks (uses same model as main LLM).
 
@@ -13,12 +13,14 @@ import os
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID
 
 import asyncpg
 from dotenv import load_dotenv
 
+from utils.tracing import get_tracing_client
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -248,6 +250,8 @@ async def extract_cost_from_langfuse(trace_id: str) -> Decimal:
     Extract total cost from a LangFuse trace.
 
     Sums calculated_total_cost from all GENERATION type observations.
+    Flushes and reads the trace synchronously: for scripts. Logged queries get
+    their cost from reconcile_query_costs instead.
 
     Args:
         trace_id: LangFuse trace ID.
@@ -292,6 +296,120 @@ async def extract_cost_from_langfuse(trace_id: str) -> Decimal:
         return Decimal("0.0")
 
 
+def _generation_cost(trace) -> Decimal:
+    """Sum of calculated_total_cost over the GENERATION observations of a trace."""
+    total_cost = Decimal("0.0")
+    for obs in trace.observations or []:
+        if obs.type == "GENERATION" and obs.calculated_total_cost is not None:
+            total_cost += Decimal(str(obs.calculated_total_cost))
+    return total_cost
+
+
+async def fetch_trace_cost(trace_id: str) -> Optional[Decimal]:
+    """
+    Total cost of a LangFuse trace, read without flushing or blocking the event loop.
+
+    Args:
+        trace_id: LangFuse trace ID.
+
+    Returns:
+        Cost in USD, or None while the trace cannot be read (not ingested yet,
+        LangFuse unreachable or not configured).
+    """
+    client = get_tracing_client()
+    if client is None:
+        return None
+    try:
+        trace = await client.async_api.trace.get(trace_id)
+    except Exception as e:
+        logger.debug(f"LangFuse trace {trace_id} not available: {e}")
+        return None
+    return _generation_cost(trace)
+
+
+async def reconcile_query_costs(
+    delay_seconds: float, max_age_seconds: float, batch_size: int = 100
+) -> Dict[str, int]:
+    """
+    Backfill query_logs.cost from the LangFuse traces of logged queries.
+
+    Reads the traces of query logs not reconciled yet (cost_reconciled_at IS NULL,
+    sql/query-logs-cost-backfill.sql), writes each cost and adds the difference to
+    the session's total_cost. Safe to run from several processes: a row is only
+    counted by the process that marks it reconciled.
+
+    Args:
+        delay_seconds: Skip queries logged more recently (trace not exported yet).
+        max_age_seconds: Queries whose trace is still missing after this long
+            keep their logged cost and are marked reconciled.
+        batch_size: Rows read per round-trip.
+
+    Returns:
+        Number of rows "reconciled" (cost read from the trace) and "expired".
+
+    Raises:
+        asyncpg.UndefinedColumnError: If the migration has not been applied.
+    """
+    counts = {"reconciled": 0, "expired": 0}
+    conn = await _get_connection()
+    try:
+        last_id = 0
+        while True:
+            rows = await conn.fetch(
+                """
+                SELECT id, session_id, langfuse_trace_id, cost,
+                       timestamp < NOW() - make_interval(secs => $2) AS expired
+                FROM query_logs
+                WHERE cost_reconciled_at IS NULL
+                  AND langfuse_trace_id IS NOT NULL
+                  AND timestamp < NOW() - make_interval(secs => $1)
+                  AND id > $3
+                ORDER BY id
+                LIMIT $4
+                """,
+                float(delay_seconds),
+                float(max_age_seconds),
+                last_id,
+                batch_size,
+            )
+            for row in rows:
+                cost = await fetch_trace_cost(row["langfuse_trace_id"])
+                if cost is None:
+                    if row["expired"]:
+                        await conn.execute(
+                            "UPDATE query_logs SET cost_reconciled_at = NOW() WHERE id = $1",
+                            row["id"],
+                        )
+                        counts["expired"] += 1
+                    continue
+
+                async with conn.transaction():
+                    status = await conn.execute(
+                        """
+                        UPDATE query_logs SET cost = $2, cost_reconciled_at = NOW()
+                        WHERE id = $1 AND cost_reconciled_at IS NULL
+                        """,
+                        row["id"],
+                        float(cost),
+                    )
+                    if status == "UPDATE 1":
+                        await conn.execute(
+                            """
+                            UPDATE sessions SET total_cost = total_cost + $2
+                            WHERE session_id = $1
+                            """,
+                            row["session_id"],
+                            float(cost - Decimal(str(row["cost"]))),
+                        )
+                        counts["reconciled"] += 1
+
+            if len(rows) < batch_size:
+                return counts
+            last_id = rows[-1]["id"]
+    finally:
+        await conn.close()
+
+
 class InMemorySessionStats:
     """
     In-memory session statistics for graceful degradation when DB unavailable.
@@ -0,0 +1,266 @@
+"""
+Tracing facade.
+
+Every traced entry point (MCP tools, API search, Streamlit queries) goes through
+this module instead of calling the LangFuse SDK directly:
+
+- Cached client: the LangFuse client is looked up once per process
+  (get_tracing_client); None when the SDK or its keys are missing, and then
+  traced functions run undecorated.
+- Head-based sampling: the decision is taken once, when the request enters
+  (TRACE_SAMPLE_RATE, overridden per source by TRACE_SAMPLE_RATE_MCP / _API;
+  Streamlit queries: TRACE_SAMPLE_RATE_STREAMLIT, default 1). A request sampled
+  out runs without the LangFuse decorator, and an unsampled OpenTelemetry parent
+  is attached so the spans it would start further down (langfuse.openai
+  embedding and LLM calls) are dropped too.
+- Metadata instead of payloads: observations carry the metadata set with
+  annotate() (tool name, query, limits); arguments and return values, serialized
+  on the request path, are only captured with TRACE_CAPTURE_IO=true.
+- Export off the request path: spans go to the OpenTelemetry batch processor of
+  the LangFuse SDK, exported by its background thread every LANGFUSE_FLUSH_AT
+  spans or LANGFUSE_FLUSH_INTERVAL seconds. Nothing here flushes or reads traces
+  back while a request is served: query costs are reconciled later from the
+  traces by utils/cost_backfill.py.
+
+The time tracing adds to each request (sampling decision, decorator, metadata
+updates; not the traced function itself) is recorded in
+rag_tracing_overhead_seconds{source, sampled}. The budget is 1ms per request:
+under 0.5ms for a sampled request, tens of microseconds for one sampled out.
+"""
+
+import functools
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from docling_mcp.metrics import record_tracing_overhead
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+# Record arguments and return values of traced functions (serialized on the request path)
+TRACE_CAPTURE_IO = os.getenv("TRACE_CAPTURE_IO", "false").lower() == "true"
+
+# Head-sampling rate per traced source. Streamlit query costs are read from their
+# traces (utils/cost_backfill.py): its queries are all traced unless set otherwise.
+sample_rates: Dict[str, float] = {
+    "mcp": float(os.getenv("TRACE_SAMPLE_RATE_MCP", TRACE_SAMPLE_RATE)),
+    "api": float(os.getenv("TRACE_SAMPLE_RATE_API", TRACE_SAMPLE_RATE)),
+    "streamlit": float(os.getenv("TRACE_SAMPLE_RATE_STREAMLIT", "1.0")),
+}
+
+# Whether the current request is traced (True outside sampled entry points)
+_sampled: ContextVar[bool] = ContextVar("trace_sampled", default=True)
+# Tracing time of the current request, accumulated by the facade
+_overhead: ContextVar[Optional[List[float]]] = ContextVar("trace_overhead", default=None)
+
+_client: Any = None
+_client_initialized = False
+_client_lock = threading.Lock()
+
+
+def get_tracing_client() -> Any:
+    """
+    LangFuse client of this process, looked up once.
+
+    Returns:
+        The client, or None when the SDK is not installed or LANGFUSE_PUBLIC_KEY /
+        LANGFUSE_SECRET_KEY are not set.
+    """
+    global _client, _client_initialized
+
+    if _client_initialized:
+        return _client
+
+    with _client_lock:
+        if not _client_initialized:
+            _client = _create_client()
+            _client_initialized = True
+    return _client
+
+
+def _create_client() -> Any:
+    if not os.environ.get("LANGFUSE_PUBLIC_KEY") or not os.environ.get("LANGFUSE_SECRET_KEY"):
+        logger.debug("LangFuse API keys not configured. Tracing disabled.")
+        return None
+    try:
+        from langfuse import get_client
+
+        client = get_client()
+        _skip_span_debug_formatting()
+        return client
+    except ImportError:
+        logger.info("LangFuse SDK not installed, tracing disabled")
+    except Exception as e:
+        logger.warning(f"Failed to initialize LangFuse client: {e}. Tracing disabled.")
+    return None
+
+
+def _skip_span_debug_formatting() -> None:
+    """
+    Stop the LangFuse span processor from formatting every ended span as JSON.
+
+    The SDK builds a debug message with the full span on each span end, whether or
+    not debug logging is on: about half a millisecond per span, more than the rest
+    of the tracing overhead together. The formatting is kept with LANGFUSE_DEBUG.
+    """
+    if logging.getLogger("langfuse").isEnabledFor(logging.DEBUG):
+        return
+    try:
+        from langfuse._client import span_processor
+
+        if hasattr(span_processor, "span_formatter"):
+            span_processor.span_formatter = lambda span: "(set LANGFUSE_DEBUG for details)"
+    except ImportError:
+        pass  # SDK layout changed: formatting stays, tracing still works
+
+
+def reset_tracing() -> None:
+    """Forget the cached client (tests, or after the LangFuse environment changed)."""
+    global _client, _client_initialized
+
+    with _client_lock:
+        _client = None
+        _client_initialized = False
+
+
+def is_sampled() -> bool:
+    """Whether the current request is traced."""
+    return _sampled.get()
+
+
+def _decide(source: str) -> bool:
+    rate = sample_rates.get(source, TRACE_SAMPLE_RATE)
+    if rate >= 1.0:
+        return True
+    return rate > 0.0 and random.random() < rate
+
+
+def _unsampled_parent() -> Any:
+    """Attach an unsampled OpenTelemetry parent span; returns the token to detach."""
+    try:
+        from opentelemetry import context as otel_context
+        from opentelemetry import trace as otel_trace
+    except ImportError:
+        return None
+
+    span_context = otel_trace.SpanContext(
+        trace_id=random.getrandbits(128) | 1,
+        span_id=random.getrandbits(64) | 1,
+        is_remote=False,
+        trace_flags=otel_trace.TraceFlags(otel_trace.TraceFlags.DEFAULT),
+    )
+    span = otel_trace.NonRecordingSpan(span_context)
+    return otel_context.attach(otel_trace.set_span_in_context(span))
+
+
+def _detach(token: Any) -> None:
+    if token is not None:
+        from opentelemetry import context as otel_context
+
+        otel_context.detach(token)
+
+
+@contextmanager
+def head_sample(source: str) -> Iterator[bool]:
+    """
+    Take the sampling decision for a request entering through `source`.
+
+    Inside the block, is_sampled() returns the decision and, when the request is
+    sampled out, spans started by instrumented libraries are not recorded.
+
+    Yields:
+        True if the request is traced
+    """
+    sampled = _decide(source)
+    token = _sampled.set(sampled)
+    parent = None if sampled or get_tracing_client() is None else _unsampled_parent()
+    try:
+        yield sampled
+    finally:
+        _detach(parent)
+        _sampled.reset(token)
+
+
+def traced(name: str, source: str) -> Callable[[F], F]:
+    """
+    Trace an async entry point as a LangFuse observation, head-sampled per `source`.
+
+    Replaces langfuse.observe on request handlers: the decorator only runs for
+    sampled requests, and the wrapper keeps the signature of the function (FastMCP
+    and FastAPI read it).
+
+    Args:
+        name: Observation name
+        source: Sampling source ("mcp", "api", "streamlit")
+    """
+
+    def decorator(func: F) -> F:
+        async def timed(*args, **kwargs):
+            # The traced function's own time is not tracing overhead
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                spent = _overhead.get()
+                if spent is not None:
+                    spent[0] -= time.perf_counter() - start
+
+        # The SDK is imported on the first sampled call, not when modules are loaded
+        observed: Optional[Callable[..., Any]] = None
+
+        def observe_timed() -> Callable[..., Any]:
+            nonlocal observed
+            if observed is None:
+                from langfuse import observe
+
+                observed = observe(
+                    name=name, capture_input=TRACE_CAPTURE_IO, capture_output=TRACE_CAPTURE_IO
+                )(timed)
+            return observed
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if get_tracing_client() is None:
+                return await func(*args, **kwargs)
+
+            start = time.perf_counter()
+            spent = [0.0]
+            overhead_token = _overhead.set(spent)
+            sampled = True
+            try:
+                with head_sample(source) as sampled:
+                    if sampled:
+                        return await observe_timed()(*args, **kwargs)
+                    return await timed(*args, **kwargs)
+            finally:
+                _overhead.reset(overhead_token)
+                record_tracing_overhead(source, sampled, time.perf_counter() - start + spent[0])
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def annotate(metadata: dict) -> None:
+    """Add metadata to the current observation (no-op when the request is not traced)."""
+    if not _sampled.get():
+        return
+    start = time.perf_counter()
+    try:
+        client = get_tracing_client()
+        if client is not None:
+            client.update_current_span(metadata=metadata)
+    except Exception:
+        pass  # Graceful degradation - don't fail if LangFuse unavailable
+    finally:
+        spent = _overhead.get()
+        if spent is not None:
+            spent[0] += time.perf_counter() - start